@@ -0,0 +1,467 @@
+# aira/agent.py
+
+"""
+Agentic analysis: the LLM gathers its own context through connector tools.
+
+Instead of fetching every source before the LLM is called, only the incident
+is sent up front and the connectors' lookups are offered as tools. The model
+asks for the logs, commits, deploys and resource status it needs; the calls
+of one turn run in parallel. Steps, wall-clock time and tokens are budgeted,
+and once any budget is spent the model must answer with what it has.
+"""
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type
+
+from aira.config import AgentConfig
+from aira.connectors.base import (
+    AlertingProvider,
+    BaseConnector,
+    DeploymentProvider,
+    InfrastructureProvider,
+    ObservabilityProvider,
+    SourceControlProvider,
+)
+from aira.connectors.records import Commit, Deployment, Incident, LogEvent
+from aira.context import IncidentContext
+from aira.llm_interfaces.tools import (
+    ChatTurn,
+    Message,
+    ToolCall,
+    ToolResult,
+    ToolSpec,
+)
+from aira.render import (
+    render_commits,
+    render_deployments,
+    render_incident,
+    render_logs,
+)
+from aira.telemetry import get_telemetry
+
+AGENT_INSTRUCTIONS = (
+    "Only the incident is provided up front. Use the tools to fetch the logs, "
+    "commits, deploys and resource status you need, calling independent tools "
+    "together in one turn. Tool calls are budgeted, so stop as soon as the "
+    "evidence supports a conclusion."
+)
+
+BUDGET_SPENT = (
+    "The {budget} budget for this analysis is spent, so no more tools can be "
+    "called. Answer now from the context gathered so far, and say what you "
+    "could not check."
+)
+
+# Upper bounds on the windows the model may ask for.
+MAX_LOOKBACK_HOURS = 7 * 24
+MAX_LOG_MINUTES = 24 * 60
+
+# Calls a connector method by connection name, as Orchestrator._call_connector
+# does: returns the result (None if unavailable) and the reason it was not.
+ConnectorCall = Callable[..., Tuple[Any, Optional[str]]]
+
+# Continues the conversation, as LLMProvider.chat does: takes the messages,
+# the tools offered and a timeout, and returns the model's turn.
+Chat = Callable[..., ChatTurn]
+
+TIMED_OUT = "The time budget for this analysis ran out before the LLM answered."
+
+
+@dataclass(frozen=True, slots=True)
+class ToolOutput:
+    """
+    What a tool call returns to the model, and what it fetched. Nothing is
+    applied to the incident until the caller merges the outputs of the calls
+    that finished in time, so calls abandoned at the deadline change nothing.
+    """
+
+    text: str
+    # The connector call made: (connection, method, args, result, reason).
+    call: Optional[Tuple[str, str, Tuple[Any, ...], Any, Optional[str]]] = None
+    # Adds the fetched records to an incident context.
+    merge: Optional[Callable[[IncidentContext], None]] = None
+
+
+@dataclass(frozen=True, slots=True)
+class Tool:
+    """A tool offered to the model, and the function that carries it out."""
+
+    spec: ToolSpec
+    run: Callable[..., ToolOutput]
+
+
+@dataclass
+class AgentRun:
+    """The outcome of an agentic analysis."""
+
+    text: str = ""
+    # LLM turns taken, tokens spent and tools called.
+    steps: int = 0
+    tokens: int = 0
+    tool_calls: int = 0
+    # The budget that ended the investigation ("step", "time" or "token"),
+    # or None if the model answered on its own.
+    exhausted: Optional[str] = None
+    # The outputs of the tool calls that finished within the time budget.
+    outputs: List[ToolOutput] = field(default_factory=list)
+
+
+def render_leads(trigger: Dict[str, Any]) -> str:
+    """Formats what the trigger suggests looking at, as a prompt section."""
+    leads = [
+        f"- Log query: `{trigger['log_query']}`" if trigger.get("log_query") else "",
+        *(
+            f"- Log query for {connection}: `{query}`"
+            for connection, query in (trigger.get("log_queries") or {}).items()
+        ),
+        f"- Repository: `{trigger['repo']}`" if trigger.get("repo") else "",
+        (
+            f"- Resources: {', '.join(trigger['resources'])}"
+            if trigger.get("resources")
+            else ""
+        ),
+        f"- Lookback: {trigger.get('lookback_hours', 3)} hours for commits and "
+        f"deploys, {trigger.get('time_window_minutes', 15)} minutes for logs",
+    ]
+    return "## Leads from the trigger\n" + "\n".join(lead for lead in leads if lead)
+
+
+def connector_tools(
+    connectors: Dict[str, BaseConnector], call: ConnectorCall
+) -> List[Tool]:
+    """
+    Offers the connectors' lookups as tools, one tool per lookup with the
+    connection as a parameter. Each output carries the records it fetched,
+    so that the analysis can be stored with the evidence it used.
+    """
+
+    def names(kind: Type[BaseConnector]) -> List[str]:
+        return sorted(n for n, c in connectors.items() if isinstance(c, kind))
+
+    def fetch(
+        allowed: List[str],
+        connection: str,
+        method: str,
+        args: Tuple[Any, ...],
+        render: Callable[[Any], str],
+        merge: Callable[[IncidentContext, Any], None],
+    ) -> ToolOutput:
+        if connection not in allowed:
+            raise ValueError(
+                f"unknown connection '{connection}'; use one of {', '.join(allowed)}"
+            )
+        result, reason = call(connection, method, *args)
+        made = (connection, method, args, result, reason)
+        if result is None:
+            return ToolOutput(f"Unavailable: {reason or 'no result'}", made)
+        return ToolOutput(render(result), made, lambda context: merge(context, result))
+
+    tools: List[Tool] = []
+
+    alerting = names(AlertingProvider)
+    if alerting:
+
+        def add_incident(context: IncidentContext, incident: Incident):
+            if all(i.id != incident.id for i in context.incidents):
+                context.incidents.append(incident)
+
+        def get_incident_details(connection: str, incident_id: str) -> ToolOutput:
+            return fetch(
+                alerting,
+                connection,
+                "get_incident_details",
+                (incident_id,),
+                render_incident,
+                add_incident,
+            )
+
+        tools.append(
+            Tool(
+                _spec(
+                    "get_incident_details",
+                    "Fetches an incident, e.g. a related one, with its comments.",
+                    alerting,
+                    incident_id={"type": "string"},
+                ),
+                get_incident_details,
+            )
+        )
+
+    source_control = names(SourceControlProvider)
+    if source_control:
+
+        def fetch_recent_commits(
+            connection: str, repo: str, hours: int = 3
+        ) -> ToolOutput:
+            hours = _clamp(hours, MAX_LOOKBACK_HOURS)
+
+            def add(context: IncidentContext, commits: List[Commit]):
+                context.commits.extend(commits)
+                if repo not in context.repos_checked:
+                    context.repos_checked.append(repo)
+
+            return fetch(
+                source_control,
+                connection,
+                "fetch_recent_commits",
+                (repo, hours),
+                lambda commits: render_commits(commits, repo, hours),
+                add,
+            )
+
+        tools.append(
+            Tool(
+                _spec(
+                    "fetch_recent_commits",
+                    "Lists the commits to a repository ('owner/name') in the last "
+                    "hours.",
+                    source_control,
+                    repo={"type": "string"},
+                    hours={"type": "integer", "minimum": 1},
+                ),
+                fetch_recent_commits,
+            )
+        )
+
+    observability = names(ObservabilityProvider)
+    if observability:
+
+        def fetch_logs(connection: str, query: str, minutes: int = 15) -> ToolOutput:
+            minutes = _clamp(minutes, MAX_LOG_MINUTES)
+
+            def add(context: IncidentContext, events: List[LogEvent]):
+                context.logs.extend(events)
+                if query not in context.log_queries:
+                    context.log_queries.append(query)
+
+            return fetch(
+                observability,
+                connection,
+                "fetch_logs",
+                (query, minutes),
+                lambda events: render_logs(events, query, minutes),
+                add,
+            )
+
+        tools.append(
+            Tool(
+                _spec(
+                    "fetch_logs",
+                    "Runs a log or metrics query in the connection's own query "
+                    "language over the last minutes.",
+                    observability,
+                    query={"type": "string"},
+                    minutes={"type": "integer", "minimum": 1},
+                ),
+                fetch_logs,
+            )
+        )
+
+    deployment = [
+        name for name in names(DeploymentProvider) if connectors[name].lists_deployments
+    ]
+    if deployment:
+
+        def add_deployments(context: IncidentContext, deployments: List[Deployment]):
+            context.deployments.extend(deployments)
+            context.deployments_checked = True
+
+        def fetch_recent_deployments(connection: str, hours: int = 3) -> ToolOutput:
+            hours = _clamp(hours, MAX_LOOKBACK_HOURS)
+            return fetch(
+                deployment,
+                connection,
+                "fetch_recent_deployments",
+                (hours,),
+                lambda deployments: render_deployments(deployments, hours),
+                add_deployments,
+            )
+
+        tools.append(
+            Tool(
+                _spec(
+                    "fetch_recent_deployments",
+                    "Lists the deploys of the last hours, with their status.",
+                    deployment,
+                    hours={"type": "integer", "minimum": 1},
+                ),
+                fetch_recent_deployments,
+            )
+        )
+
+    infrastructure = names(InfrastructureProvider)
+    if infrastructure:
+
+        def get_resource_status(connection: str, resource: str) -> ToolOutput:
+            return fetch(
+                infrastructure,
+                connection,
+                "get_resource_status",
+                (resource,),
+                str,
+                lambda context, status: context.infrastructure.append(status),
+            )
+
+        tools.append(
+            Tool(
+                _spec(
+                    "get_resource_status",
+                    "Reports the health of an infrastructure resource, e.g. a "
+                    "service, deployment or instance.",
+                    infrastructure,
+                    resource={"type": "string"},
+                ),
+                get_resource_status,
+            )
+        )
+    return tools
+
+
+def _spec(
+    name: str, description: str, connections: List[str], **parameters: Any
+) -> ToolSpec:
+    required = ["connection"] + [
+        key for key, schema in parameters.items() if schema["type"] == "string"
+    ]
+    return ToolSpec(
+        name=name,
+        description=description,
+        parameters={
+            "type": "object",
+            "properties": {
+                "connection": {"type": "string", "enum": connections},
+                **parameters,
+            },
+            "required": required,
+            "additionalProperties": False,
+        },
+    )
+
+
+def _clamp(value: Any, upper: int) -> int:
+    return max(1, min(int(value), upper))
+
+
+def run_agent(
+    chat: Chat,
+    system_prompt: str,
+    prompt: str,
+    tools: Sequence[Tool],
+    budget: AgentConfig,
+) -> AgentRun:
+    """
+    Lets the model call tools until it answers or a budget is spent.
+
+    `chat` is usually the provider's `chat`; replays pass one that serves
+    recorded turns.
+
+    The tool calls of one turn run concurrently, up to
+    `budget.max_parallel_tools` at a time. `budget.max_seconds` bounds the
+    whole run: LLM requests are given the time that is left as their
+    timeout, and calls still running when tools are withdrawn are reported
+    to the model as timed out and left out of `AgentRun.outputs`.
+
+    Returns:
+        AgentRun: The final answer and what it took to reach it.
+    """
+    deadline = time.monotonic() + budget.max_seconds
+    tools_deadline = deadline - budget.answer_seconds
+    by_name = {tool.spec.name: tool for tool in tools}
+    specs = [tool.spec for tool in tools]
+    messages: List[Message] = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": prompt},
+    ]
+    run = AgentRun()
+    telemetry = get_telemetry()
+    executor = ThreadPoolExecutor(
+        max_workers=budget.max_parallel_tools, thread_name_prefix="aira-tool"
+    )
+    late = False
+    try:
+        while True:
+            offered = specs
+            if specs:
+                run.exhausted = "time" if late else _spent(run, budget, tools_deadline)
+                if run.exhausted is not None:
+                    offered = []
+                    telemetry.increment(
+                        "aira_agent_budget_exhausted_total", budget=run.exhausted
+                    )
+                    if run.steps:
+                        messages.append(
+                            {
+                                "role": "user",
+                                "content": BUDGET_SPENT.format(budget=run.exhausted),
+                            }
+                        )
+            # Tool-using turns must leave the answer its time.
+            remaining = (tools_deadline if offered else deadline) - time.monotonic()
+            try:
+                if remaining <= 0:
+                    raise TimeoutError()
+                turn = chat(messages, offered, timeout=remaining)
+            except TimeoutError:
+                if offered:
+                    # Tools are withdrawn on the next pass; the answer is due.
+                    late = True
+                    continue
+                run.text, run.exhausted = TIMED_OUT, "time"
+                return run
+            run.steps += 1
+            run.tokens += turn.tokens
+            if not offered or not turn.tool_calls:
+                run.text = turn.text
+                return run
+
+            messages.append(turn)
+            futures = [
+                executor.submit(_run_tool, by_name, tool_call)
+                for tool_call in turn.tool_calls
+            ]
+            wait(futures, timeout=max(0.0, tools_deadline - time.monotonic()))
+            for tool_call, future in zip(turn.tool_calls, futures):
+                telemetry.increment("aira_agent_tool_calls_total", tool=tool_call.name)
+                if future.done():
+                    output = future.result()
+                    run.outputs.append(output)
+                    content = output.text
+                else:
+                    future.cancel()
+                    content = "Timed out: the time budget ran out before this returned."
+                if len(content) > budget.max_tool_chars:
+                    content = content[: budget.max_tool_chars] + "\n… (truncated)"
+                messages.append(ToolResult(tool_call.id, content))
+            run.tool_calls += len(turn.tool_calls)
+    finally:
+        # Tool calls that outlived the time budget are not waited for; their
+        # outputs are discarded.
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _spent(run: AgentRun, budget: AgentConfig, tools_deadline: float) -> Optional[str]:
+    """Names the budget that leaves room for no more than the final answer."""
+    if run.steps + 1 >= budget.max_steps:
+        return "step"
+    if time.monotonic() >= tools_deadline:
+        return "time"
+    if run.tokens >= budget.max_tokens:
+        return "token"
+    return None
+
+
+def _run_tool(by_name: Dict[str, Tool], tool_call: ToolCall) -> ToolOutput:
+    """Carries out a tool call; failures are reported to the model as text."""
+    tool = by_name.get(tool_call.name)
+    if tool is None:
+        return ToolOutput(f"Error: there is no tool named '{tool_call.name}'.")
+    try:
+        arguments = json.loads(tool_call.arguments or "{}")
+        if not isinstance(arguments, dict):
+            raise ValueError("the arguments must be a JSON object")
+        return tool.run(**arguments)
+    except Exception as e:
+        return ToolOutput(f"Error: {e}")
@@ -0,0 +1,134 @@
+# aira/batch.py
+
+"""
+Batch analysis: reading many trigger events and analysing them concurrently.
+
+Used by `aira analyze` so that a bad deploy that fires dozens of alerts can
+be processed in one run against a single, already-initialised Orchestrator.
+"""
+
+import json
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, Set, Tuple
+
+TRIGGER_SUFFIXES = (".yaml", ".yml", ".json", ".jsonl")
+RECORDING_SUFFIX = ".json.gz"
+
+
+def _check_trigger(source: str, trigger: Any) -> Tuple[str, Any]:
+    if not isinstance(trigger, dict):
+        return source, ValueError(f"{source}: a trigger event must be a mapping.")
+    return source, trigger
+
+
+def _read_jsonl(lines: Iterable[str], name: str) -> Iterator[Tuple[str, Any]]:
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        source = f"{name}:{number}"
+        try:
+            trigger = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield source, ValueError(f"{source}: invalid JSON: {e}")
+            continue
+        yield _check_trigger(source, trigger)
+
+
+def _read_document(path: Path) -> Iterator[Tuple[str, Any]]:
+    """Reads a YAML or JSON file holding one trigger or a list of them."""
+    import yaml
+
+    try:
+        text = path.read_text()
+        document = json.loads(text) if path.suffix == ".json" else yaml.safe_load(text)
+    except (OSError, ValueError, yaml.YAMLError) as e:
+        yield str(path), ValueError(f"{path}: could not be read: {e}")
+        return
+    if isinstance(document, list):
+        for index, trigger in enumerate(document):
+            yield _check_trigger(f"{path}[{index}]", trigger)
+    else:
+        yield _check_trigger(str(path), document)
+
+
+def load_triggers(path: str) -> Iterator[Tuple[str, Any]]:
+    """
+    Lazily reads trigger events, each paired with a label naming where it
+    came from (used in results and errors). A malformed event is yielded as
+    a ValueError in place of the trigger, so one bad line does not stop the
+    rest of a stream.
+
+    Args:
+        path (str): A YAML/JSON file, a JSONL file, a directory of such files
+            (read in name order), or '-' for JSONL on stdin.
+
+    Raises:
+        ValueError: If the path is not a supported file type.
+    """
+    if path == "-":
+        yield from _read_jsonl(sys.stdin, "<stdin>")
+        return
+    target = Path(path)
+    files = sorted(target.iterdir()) if target.is_dir() else [target]
+    for file in files:
+        if file.suffix not in TRIGGER_SUFFIXES:
+            if target.is_dir():
+                continue
+            raise ValueError(f"{file}: expected one of {', '.join(TRIGGER_SUFFIXES)}.")
+        if file.suffix == ".jsonl":
+            with open(file) as f:
+                yield from _read_jsonl(f, str(file))
+        else:
+            yield from _read_document(file)
+
+
+def find_recordings(path: str) -> Iterator[Tuple[str, Path]]:
+    """Lists recording archives: a single archive or every one in a directory."""
+    target = Path(path)
+    if target.is_dir():
+        files = sorted(target.glob(f"*{RECORDING_SUFFIX}"))
+    else:
+        files = [target]
+    for file in files:
+        yield str(file), file
+
+
+def run_batch(
+    items: Iterable[Tuple[str, Any]],
+    analyze: Callable[[int, Any], Dict[str, Any]],
+    parallel: int = 4,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Runs `analyze(index, item)` for every item with at most `parallel` running
+    at once, yielding one result dict per item as soon as it completes.
+
+    Items are consumed lazily, with at most 2 x `parallel` submitted ahead,
+    so an unbounded stdin stream never piles up in memory. An item that
+    fails, or is itself an exception from `load_triggers`, yields an `error`
+    result instead of aborting the batch.
+    """
+
+    def run_one(index: int, source: str, item: Any) -> Dict[str, Any]:
+        start = time.perf_counter()
+        try:
+            if isinstance(item, Exception):
+                raise item
+            result = {"source": source, **analyze(index, item)}
+        except Exception as e:
+            result = {"source": source, "error": str(e)}
+        result["duration_seconds"] = round(time.perf_counter() - start, 3)
+        return result
+
+    with ThreadPoolExecutor(max_workers=parallel) as pool:
+        pending: Set[Future] = set()
+        for index, (source, item) in enumerate(items):
+            if len(pending) >= 2 * parallel:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                yield from (future.result() for future in done)
+            pending.add(pool.submit(run_one, index, source, item))
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            yield from (future.result() for future in done)
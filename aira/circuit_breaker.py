@@ -0,0 +1,97 @@
+# aira/circuit_breaker.py
+
+import threading
+import time
+from enum import Enum
+from typing import Callable, Optional
+
+
+class CircuitState(str, Enum):
+    """The three states of a circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    A per-connector circuit breaker.
+
+    While CLOSED, calls flow through and consecutive failures are counted.
+    Once `failure_threshold` consecutive failures are seen the circuit OPENs
+    and calls are rejected immediately, so an unreachable upstream costs
+    nothing instead of a full request timeout. After `recovery_timeout`
+    seconds the circuit goes HALF_OPEN and lets a single trial call through:
+    success closes the circuit, failure opens it again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 3,
+        recovery_timeout: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            name (str): The name of the connector this breaker protects.
+            failure_threshold (int): Consecutive failures before the circuit opens.
+            recovery_timeout (float): Seconds to stay open before allowing a trial call.
+            clock (Callable[[], float]): Monotonic time source, injectable for tests.
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> CircuitState:
+        """The current state, moving OPEN to HALF_OPEN once the timeout elapses."""
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> CircuitState:
+        if (
+            self._state is CircuitState.OPEN
+            and self._clock() - self._opened_at >= self.recovery_timeout
+        ):
+            self._state = CircuitState.HALF_OPEN
+            self._trial_in_flight = False
+        return self._state
+
+    def allow_request(self) -> bool:
+        """Returns True if a call may be attempted right now."""
+        with self._lock:
+            state = self._current_state()
+            if state is CircuitState.CLOSED:
+                return True
+            if state is CircuitState.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        """Closes the circuit and resets the failure count."""
+        with self._lock:
+            self._state = CircuitState.CLOSED
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        """Counts a failure, opening the circuit when the threshold is reached."""
+        with self._lock:
+            self._failures += 1
+            if (
+                self._state is CircuitState.HALF_OPEN
+                or self._failures >= self.failure_threshold
+            ):
+                self._state = CircuitState.OPEN
+                self._opened_at = self._clock()
+                self._trial_in_flight = False
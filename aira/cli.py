@@ -1,10 +1,21 @@
 import typer
+import contextlib
+import dataclasses
+import functools
 import json
+import re
+import signal
+import sys
+import threading
 import time
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 from rich.console import Console
 import importlib.resources
 
+if TYPE_CHECKING:
+    from aira.orchestrator import AnalysisResult
+
 # --- Main Application Objects & Constants ---
 app = typer.Typer(
     name="aira",
@@ -24,19 +35,42 @@ ConfigReadOption = typer.Option(
     help="Path to the Aira config file.",
 )
 
-# Load prompt configurations from dedicated template files at startup
-try:
-    SECRET_PROMPTS = json.loads(
-        importlib.resources.read_text("aira.templates", "secret_prompts.json")
-    )
-    NON_SECRET_PROMPTS = json.loads(
-        importlib.resources.read_text("aira.templates", "non_secret_prompts.json")
-    )
-except Exception as e:
-    console.print(
-        f"[bold red]Error: A template file is missing or corrupted: {e}[/bold red]"
-    )
-    SECRET_PROMPTS, NON_SECRET_PROMPTS = {}, {}
+
+@functools.lru_cache(maxsize=None)
+def load_prompts() -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Loads the secret and non-secret prompt templates used by `aira init`.
+
+    Loaded on first use rather than at import time, so commands that never
+    prompt (and `--help`) don't pay for reading and parsing them.
+    """
+    try:
+        secret_prompts = json.loads(
+            importlib.resources.read_text("aira.templates", "secret_prompts.json")
+        )
+        non_secret_prompts = json.loads(
+            importlib.resources.read_text("aira.templates", "non_secret_prompts.json")
+        )
+        return secret_prompts, non_secret_prompts
+    except Exception as e:
+        console.print(
+            f"[bold red]Error: A template file is missing or corrupted: {e}[/bold red]"
+        )
+        return {}, {}
+
+
+def _result_json(trigger: Dict[str, Any], result: "AnalysisResult") -> Dict[str, Any]:
+    """The JSON line streamed for one analysis."""
+    return {
+        "trigger": trigger,
+        "hypothesis": result.hypothesis,
+        "degraded": result.degraded,
+        "missing_context": result.missing_context,
+        "follow_up": result.follow_up,
+        "structured": (
+            dataclasses.asdict(result.structured) if result.structured else None
+        ),
+    }
 
 
 # --- CLI Commands ---
@@ -73,13 +107,14 @@ def init(
             raise typer.Exit()
 
     output_dir.mkdir(parents=True, exist_ok=True)
+    secret_prompts, non_secret_prompts = load_prompts()
 
     # --- Step 1: Gather Secrets ---
     console.print(
         f"\nI will ask for your secret API keys. They will be stored securely in:\n[bold yellow]{env_file_path}[/bold yellow]"
     )
     with open(env_file_path, "w") as f:
-        for key, info in SECRET_PROMPTS.items():
+        for key, info in secret_prompts.items():
             prompt_text = (
                 f"\nTo get your [bold]{info['prompt']}[/bold], visit: "
                 f"[link={info['url']}][cyan]{info['url']}[/link]"
@@ -93,7 +128,7 @@ def init(
     console.print(
         "\nNow, let's configure some default settings. Press Enter to accept the default."
     )
-    for key, info in NON_SECRET_PROMPTS.items():
+    for key, info in non_secret_prompts.items():
         user_value = typer.prompt(info["prompt"], default=info.get("default"))
         replacements[info["placeholder"]] = user_value
 
@@ -189,6 +224,9 @@ def doctor(
                         success = False
 
                 if not success and attempt < retries:
+                    orchestrator.telemetry.increment(
+                        "aira_retries_total", component=name
+                    )
                     time.sleep(retry_delay)
 
             if not success:
@@ -200,6 +238,8 @@ def doctor(
             else:
                 console.print(f"❌ [red]{name}:[/red] {message}")
 
+        orchestrator.flush_telemetry()
+
     except Exception as e:
         console.print(f"\n[bold red]An unexpected error occurred:[/bold red] {e}")
         health_status[0] = False
@@ -219,17 +259,379 @@ def doctor(
 
 @app.command()
 def analyze(
-    trigger_file: Path = typer.Argument(
-        ..., help="Path to the trigger event YAML file."
+    triggers: str = typer.Argument(
+        ...,
+        help="A trigger event YAML/JSON file, a JSONL file, a directory of them, "
+        "or '-' to read JSONL from stdin. With --replay: a recording or a "
+        "directory of recordings.",
     ),
     config_path: Path = ConfigReadOption,
+    parallel: int = typer.Option(
+        4, "--parallel", "-p", min=1, help="Maximum number of concurrent analyses."
+    ),
+    record_dir: Optional[Path] = typer.Option(
+        None,
+        "--record",
+        help="Save a replayable recording of each analysis in this directory.",
+        file_okay=False,
+        dir_okay=True,
+    ),
+    replay: bool = typer.Option(
+        False, "--replay", help="Replay recordings instead of calling live services."
+    ),
+    notify: bool = typer.Option(
+        False,
+        "--notify",
+        help="Post each analysis to the actions its routes select.",
+    ),
+    incremental: bool = typer.Option(
+        False,
+        "--incremental",
+        help="Update the analysis of an incident seen earlier in this run from "
+        "the evidence that arrived since, instead of starting over.",
+    ),
 ):
     """
-    (Placeholder) Analyzes an incident based on a trigger event file.
+    Analyzes one or more incidents, streaming each result as a JSON line.
     """
-    console.print(f"⚙️  Loading configuration from {config_path}...")
-    console.print(f"⚡ Triggering analysis with event file: {trigger_file}...")
-    console.print("[yellow]⚠️ The 'analyze' command is not yet implemented.[/yellow]")
+    from aira.batch import find_recordings, load_triggers, run_batch
+    from aira.config import load_config
+    from aira.orchestrator import Orchestrator
+    from aira.recording import Recording, Replayer
+
+    err_console = Console(stderr=True)
+    for path, label in ((config_path, "Configuration file"), (Path(triggers), "Input")):
+        if str(path) != "-" and not path.exists():
+            err_console.print(
+                f"❌ [bold red]Error:[/bold red] {label} not found at [yellow]{path}[/yellow]"
+            )
+            raise typer.Exit(code=1)
+    if incremental and (record_dir or replay):
+        # A follow-up builds on earlier analyses that a recording does not hold.
+        err_console.print(
+            "❌ [bold red]Error:[/bold red] --incremental cannot be combined with "
+            "--record or --replay."
+        )
+        raise typer.Exit(code=1)
+
+    out = sys.stdout
+    failures = 0
+    # Connectors report progress with print(); keep stdout for the JSON lines.
+    with contextlib.redirect_stdout(sys.stderr):
+        orchestrator = Orchestrator(load_config(config_path), [True])
+
+        def analyze_one(index: int, item: Any) -> Dict[str, Any]:
+            if replay:
+                recording = Recording.load(item)
+                result = orchestrator.replay_analysis(Replayer(recording))
+                return _result_json(recording.trigger, result)
+            recording = Recording(item) if record_dir else None
+            result = orchestrator.run_analysis(item, recording, incremental)
+            fields = _result_json(item, result)
+            if notify:
+                fields["notified"] = orchestrator.notify(result)
+            if recording is not None:
+                name = re.sub(r"[^\w.-]", "_", str(item.get("incident_id", "trigger")))
+                archive = record_dir / f"{index:04d}-{name}.json.gz"
+                recording.save(archive)
+                fields["recording"] = str(archive)
+            return fields
+
+        items = find_recordings(triggers) if replay else load_triggers(triggers)
+        try:
+            for result in run_batch(items, analyze_one, parallel):
+                failures += "error" in result
+                out.write(json.dumps(result, default=str) + "\n")
+                out.flush()
+        except ValueError as e:
+            err_console.print(f"❌ [bold red]Error:[/bold red] {e}")
+            raise typer.Exit(code=2)
+        finally:
+            if notify and not orchestrator.flush_notifications(timeout=60):
+                err_console.print(
+                    "[yellow]⚠️ Some notifications were not delivered.[/yellow]"
+                )
+        orchestrator.flush_telemetry()
+
+    if failures:
+        err_console.print(f"[yellow]⚠️ {failures} analysis(es) failed.[/yellow]")
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def watch(
+    config_path: Path = ConfigReadOption,
+    connections: Optional[List[str]] = typer.Option(
+        None,
+        "--connection",
+        help="An alerting connection to poll; repeat for several. Defaults to "
+        "every connection with an incident change feed.",
+    ),
+    trigger_path: Optional[Path] = typer.Option(
+        None,
+        "--trigger",
+        help="A YAML/JSON file of trigger fields (e.g. repo, log_queries) to "
+        "analyze every incident with.",
+    ),
+    state_dir: Path = typer.Option(
+        CONFIG_DIR / "feeds",
+        "--state-dir",
+        help="Where each feed keeps its cursor, so that a restart resumes.",
+        file_okay=False,
+        dir_okay=True,
+    ),
+    notify: bool = typer.Option(
+        False,
+        "--notify",
+        help="Post each analysis to the actions its routes select.",
+    ),
+    once: bool = typer.Option(
+        False, "--once", help="Poll every feed once and exit, e.g. from cron."
+    ),
+):
+    """
+    Watches alerting connections for new or updated incidents and analyzes
+    each as it arrives, streaming results as JSON lines until stopped. An
+    update to an incident analyzed recently is analyzed as a follow-up.
+    Edits to the config file (and its .env) apply without a restart: feeds
+    start and stop with the connections they poll.
+    """
+    from aira.batch import load_triggers
+    from aira.config import AppConfig, ConfigWatcher, load_config
+    from aira.connectors.base import AlertingProvider
+    from aira.feed import IncidentFeed
+    from aira.orchestrator import Orchestrator
+
+    err_console = Console(stderr=True)
+    for path, label in ((config_path, "Configuration file"), (trigger_path, "Trigger")):
+        if path is not None and not path.is_file():
+            err_console.print(
+                f"❌ [bold red]Error:[/bold red] {label} not found at [yellow]{path}[/yellow]"
+            )
+            raise typer.Exit(code=1)
+    defaults: Dict[str, Any] = {}
+    if trigger_path is not None:
+        try:
+            _, defaults = next(load_triggers(str(trigger_path)), ("", {}))
+        except ValueError as e:
+            defaults = e
+        if isinstance(defaults, Exception):
+            err_console.print(f"❌ [bold red]Error:[/bold red] {defaults}")
+            raise typer.Exit(code=1)
+
+    out = sys.stdout
+    out_lock = threading.Lock()
+    failures = 0
+    # Connectors report progress with print(); keep stdout for the JSON lines.
+    with contextlib.redirect_stdout(sys.stderr):
+        orchestrator = Orchestrator(load_config(config_path), [True])
+
+        def feedable() -> List[str]:
+            return [
+                name
+                for name, connector in orchestrator.connectors.items()
+                if isinstance(connector, AlertingProvider) and connector.has_change_feed
+            ]
+
+        names = connections or feedable()
+        unknown = [name for name in names if name not in feedable()]
+        if unknown or not names:
+            err_console.print(
+                "❌ [bold red]Error:[/bold red] No incident change feed for "
+                f"{', '.join(unknown) or 'any configured connection'}."
+            )
+            raise typer.Exit(code=1)
+
+        def new_feed(name: str) -> IncidentFeed:
+            return IncidentFeed(
+                orchestrator.connectors[name], state_path=state_dir / f"{name}.json"
+            )
+
+        feeds = {name: new_feed(name) for name in names}
+
+        def analyze_incidents(name: str, incidents: List[Any]):
+            nonlocal failures
+            for incident in incidents:
+                trigger = {**defaults, "incident_id": incident.id, "source": name}
+                try:
+                    result = orchestrator.run_analysis(trigger, incremental=True)
+                    fields = _result_json(trigger, result)
+                    if notify:
+                        fields["notified"] = orchestrator.notify(result)
+                except Exception as e:
+                    fields = {"trigger": trigger, "error": str(e)}
+                with out_lock:
+                    failures += "error" in fields
+                    out.write(json.dumps(fields, default=str) + "\n")
+                    out.flush()
+
+        if once:
+            for name, feed in feeds.items():
+                try:
+                    analyze_incidents(name, feed.poll())
+                except Exception as e:
+                    err_console.print(f"⚠️ Incident feed for '{name}' failed: {e}")
+                    failures += 1
+        else:
+
+            # Feed name -> its thread and the event that stops it.
+            running: Dict[str, Tuple[threading.Thread, threading.Event]] = {}
+            retired: List[threading.Thread] = []
+            running_lock = threading.Lock()
+
+            def start_feed(name: str):
+                feed_stop = threading.Event()
+                thread = threading.Thread(
+                    target=feeds[name].run,
+                    args=(functools.partial(analyze_incidents, name), feed_stop),
+                    name=f"aira-feed-{name}",
+                    daemon=True,
+                )
+                running[name] = (thread, feed_stop)
+                thread.start()
+
+            def reload(config: AppConfig):
+                changed = orchestrator.reload(config)
+                available = feedable()
+                with running_lock:
+                    # Feeds keep their cursors; only the connector behind them moves.
+                    for name in list(feeds):
+                        if name in available:
+                            feeds[name].connector = orchestrator.connectors[name]
+                            continue
+                        # Its connector was closed by the reload.
+                        thread, feed_stop = running.pop(name)
+                        feed_stop.set()
+                        retired.append(thread)
+                        del feeds[name]
+                        err_console.print(f"⏹️ Stopped the feed for removed '{name}'.")
+                    for name in connections or available:
+                        if name in available and name not in feeds:
+                            feeds[name] = new_feed(name)
+                            start_feed(name)
+                            err_console.print(f"▶️ Started a feed for '{name}'.")
+                err_console.print(
+                    f"🔄 Reloaded {config_path}: "
+                    f"{', '.join(changed) or 'nothing'} changed."
+                )
+
+            stop = threading.Event()
+            previous_handler = signal.signal(signal.SIGTERM, lambda *_: stop.set())
+            with running_lock:
+                for name in feeds:
+                    start_feed(name)
+            watcher = ConfigWatcher(config_path, reload)
+            watcher.start()
+            err_console.print(f"👀 Watching {', '.join(feeds)} for incidents...")
+            flushed_at = time.monotonic()
+            try:
+                while not stop.wait(1):
+                    with running_lock:
+                        alive = any(t.is_alive() for t, _ in running.values())
+                    if not alive:
+                        err_console.print("⚠️ No incident feeds are left to watch.")
+                        break
+                    if time.monotonic() - flushed_at >= 15:
+                        orchestrator.flush_telemetry()
+                        flushed_at = time.monotonic()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                signal.signal(signal.SIGTERM, previous_handler)
+                watcher.stop()
+            with running_lock:
+                threads = retired + [thread for thread, _ in running.values()]
+                for _, feed_stop in running.values():
+                    feed_stop.set()
+            for thread in threads:
+                thread.join()
+
+        if notify and not orchestrator.flush_notifications(timeout=60):
+            err_console.print(
+                "[yellow]⚠️ Some notifications were not delivered.[/yellow]"
+            )
+        orchestrator.flush_telemetry()
+
+    if failures:
+        err_console.print(f"[yellow]⚠️ {failures} analysis(es) failed.[/yellow]")
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def index(
+    docs_dir: Optional[Path] = typer.Argument(
+        None,
+        help="The markdown runbooks to index. Defaults to `runbooks.docs_dir`.",
+    ),
+    config_path: Path = ConfigReadOption,
+    index_dir: Optional[Path] = typer.Option(
+        None, "--index-dir", help="Where to write the index (`runbooks.index_dir`)."
+    ),
+):
+    """
+    Indexes runbooks and postmortems for retrieval during analysis. Only files
+    that changed since the last run are re-embedded.
+    """
+    from aira.runbooks import build_index
+
+    if docs_dir is None or index_dir is None:
+        from aira.config import load_config
+
+        settings = load_config(config_path).runbooks
+        docs_dir = docs_dir or settings.docs_dir
+        index_dir = index_dir or settings.index_dir
+    if docs_dir is None:
+        console.print(
+            "❌ [bold red]Error:[/bold red] No docs directory given "
+            "(pass one or set `runbooks.docs_dir`)."
+        )
+        raise typer.Exit(code=1)
+
+    started = time.monotonic()
+    try:
+        stats = build_index(docs_dir, index_dir)
+    except FileNotFoundError as e:
+        console.print(f"❌ [bold red]Error:[/bold red] {e}")
+        raise typer.Exit(code=1)
+    console.print(
+        f"✅ Indexed {stats.chunks} chunks into [cyan]{index_dir}[/cyan] in "
+        f"{time.monotonic() - started:.1f}s ({stats.added} added, {stats.updated} "
+        f"updated, {stats.removed} removed, {stats.unchanged} unchanged files)."
+    )
+
+
+@app.command()
+def resolve(
+    incident_id: str = typer.Argument(..., help="The incident to annotate."),
+    resolution: str = typer.Argument(..., help="What fixed it, in a sentence or two."),
+    config_path: Path = ConfigReadOption,
+    source: Optional[str] = typer.Option(
+        None, "--source", help="Only match incidents from this source (e.g. jsm)."
+    ),
+):
+    """
+    Records how an incident was resolved, so similar incidents can learn from it.
+    """
+    from aira.config import load_config
+    from aira.knowledge import KnowledgeStore
+
+    config = load_config(config_path)
+    if not config.knowledge.path:
+        console.print(
+            "❌ [bold red]Error:[/bold red] No knowledge store is configured "
+            "(set `knowledge.path`)."
+        )
+        raise typer.Exit(code=1)
+    store = KnowledgeStore(config.knowledge.path)
+    updated = store.resolve(incident_id, resolution, source)
+    store.close()
+    if not updated:
+        console.print(
+            f"❌ [bold red]Error:[/bold red] Incident [yellow]{incident_id}[/yellow] "
+            "has not been analyzed yet."
+        )
+        raise typer.Exit(code=1)
+    console.print(f"✅ Recorded the resolution of [bold]{incident_id}[/bold].")
 
 
 if __name__ == "__main__":
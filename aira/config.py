@@ -1,102 +1,593 @@
+import hashlib
 import os
+import threading
 import yaml
+from dataclasses import dataclass
 from pathlib import Path
-from pydantic import BaseModel, SecretStr, Field, ValidationError
-from typing import Dict, Optional, Union, Literal
-from dotenv import load_dotenv
+from pydantic import (
+    BaseModel,
+    SecretStr,
+    Field,
+    ValidationError,
+    SerializeAsAny,
+    field_validator,
+    model_validator,
+)
+from typing import Any, Callable, Dict, List, Optional, Literal, Type
+from dotenv import dotenv_values
+
+from aira.telemetry import get_telemetry
+
+
+# --- Base Models ---
+# Every LLM provider and connector config extends one of these. Plugins
+# shipped outside Aira subclass them and own the validation of their fields.
+class LLMConfig(BaseModel):
+    """Base model for an LLM provider's configuration."""
+
+    provider: str
+    # Ask for a typed hypothesis (cause, confidence, evidence, next steps)
+    # instead of free text.
+    structured_output: bool = False
+
+
+class ConnectorConfig(BaseModel):
+    """Base model for a connection's or action's configuration."""
+
+    type: str
 
 
 # --- Individual LLM Provider Models ---
-class OpenAIConfig(BaseModel):
+class OpenAIConfig(LLMConfig):
     provider: Literal["openai"]
     model: str = "gpt-4o"
     api_key: SecretStr
+    # For OpenAI-compatible gateways or local stand-ins.
+    base_url: Optional[str] = None
 
 
-class AnthropicConfig(BaseModel):
+class AnthropicConfig(LLMConfig):
     provider: Literal["anthropic"]
     model: str = "claude-3-5-sonnet-20240620"
     api_key: SecretStr
 
 
-class GoogleConfig(BaseModel):
+class GoogleConfig(LLMConfig):
     provider: Literal["google"]
     model: str = "gemini-1.5-pro"
     api_key: SecretStr
 
 
-# Discriminated Union for LLM providers
-AnyLLM = Union[OpenAIConfig, AnthropicConfig, GoogleConfig]
-
-
 # --- Individual Connector and Action Models ---
-class GitHubConfig(BaseModel):
+class GitHubConfig(ConnectorConfig):
     type: Literal["github"]
     token: SecretStr
     default_repo: str
     api_base_url: Optional[str] = "https://api.github.com"
 
 
-class PagerDutyConfig(BaseModel):
+class PagerDutyConfig(ConnectorConfig):
     type: Literal["pagerduty"]
     api_key: SecretStr
     from_email: str
     api_base_url: Optional[str] = "https://api.pagerduty.com"
 
 
-class JSMConfig(BaseModel):
+class JSMConfig(ConnectorConfig):
     type: Literal["jsm"]
     instance_url: str
     user_email: str
     api_token: SecretStr
+    # Extra JQL that scopes the incident change feed, e.g. "project = OPS".
+    feed_jql: Optional[str] = None
+    # Issue fields to request. Defaults to the ones Aira reads; listing them
+    # keeps custom fields and rendered content out of every response.
+    fields: Optional[List[str]] = None
+    # How many of the latest comments to include with an incident (0 to skip).
+    max_comments: int = Field(5, ge=0)
 
 
-class DatadogConfig(BaseModel):
+class DatadogConfig(ConnectorConfig):
     type: Literal["datadog"]
     api_key: SecretStr
     app_key: SecretStr
     # Datadog site URL varies by region (e.g., datadoghq.com, datadoghq.eu)
     site: Optional[str] = "datadoghq.com"
+    # Overrides the URL derived from `site`, e.g. for a proxy or a local stand-in.
+    api_base_url: Optional[str] = None
+
+
+class PrometheusConfig(ConnectorConfig):
+    type: Literal["prometheus"]
+    # e.g. http://prometheus:9090, or a local binary or stand-in.
+    url: str
+    bearer_token: Optional[SecretStr] = None
+    # Extra headers sent with every query, e.g. for an auth proxy.
+    headers: Dict[str, str] = Field(default_factory=dict)
+    # Only the top series of a query are fetched, chosen server-side.
+    max_series: int = Field(10, ge=1)
+    # Label that names the service a series or alert belongs to.
+    service_label: str = "service"
+    # Responses larger than this are abandoned while streaming.
+    max_response_bytes: int = Field(5_000_000, gt=0)
 
 
-class SlackConfig(BaseModel):
+class LokiConfig(ConnectorConfig):
+    type: Literal["loki"]
+    # e.g. http://loki:3100, or a local binary or stand-in.
+    url: str
+    bearer_token: Optional[SecretStr] = None
+    # Sent as X-Scope-OrgID on multi-tenant installations.
+    tenant_id: Optional[str] = None
+    headers: Dict[str, str] = Field(default_factory=dict)
+    # The newest lines returned as-is; everything else is only counted.
+    max_lines: int = Field(25, ge=1)
+    # How many (service, level) groups to report line counts for.
+    max_groups: int = Field(5, ge=0)
+    service_label: str = "service_name"
+    level_label: str = "detected_level"
+    max_response_bytes: int = Field(5_000_000, gt=0)
+
+
+class KubernetesConfig(ConnectorConfig):
+    type: Literal["kubernetes"]
+    # Defaults to ~/.kube/config and its current context.
+    kubeconfig: Optional[str] = None
+    context: Optional[str] = None
+    # Use the service account of the pod Aira runs in.
+    in_cluster: bool = False
+    # Namespaces to cache; all of them when empty.
+    namespaces: List[str] = Field(default_factory=list)
+    # How long the first lookup waits for the caches to fill.
+    sync_timeout_seconds: float = Field(30.0, gt=0)
+    # How far back warning events are reported.
+    event_window_minutes: int = Field(60, gt=0)
+
+
+class AWSConfig(ConnectorConfig):
+    type: Literal["aws"]
+    regions: List[str] = Field(min_length=1)
+    # A named profile; the default credential chain is used when unset.
+    profile: Optional[str] = None
+    # Overrides every service endpoint, e.g. for a local stand-in like moto.
+    endpoint_url: Optional[str] = None
+    # Concurrent API calls across regions and services.
+    max_workers: int = Field(16, ge=1)
+    # Only alarms whose names start with this are considered.
+    alarm_name_prefix: Optional[str] = None
+    # How far back CloudTrail changes are reported.
+    change_window_minutes: int = Field(60, gt=0)
+
+
+class GitHubDeploymentsConfig(ConnectorConfig):
+    type: Literal["github_deployments"]
+    token: SecretStr
+    repos: List[str] = Field(min_length=1)
+    api_base_url: Optional[str] = "https://api.github.com"
+    # Environments to track, e.g. ["production"]; all of them when empty.
+    environments: List[str] = Field(default_factory=list)
+    # Maps a repository to the service it deploys; defaults to the repo name.
+    services: Dict[str, str] = Field(default_factory=dict)
+    # Lookups within this many seconds of the last refresh use the cache as-is.
+    refresh_interval_seconds: float = Field(60.0, ge=0)
+    # How long deploys stay on the in-memory timeline.
+    retention_hours: int = Field(24, gt=0)
+    # Concurrent status lookups.
+    max_workers: int = Field(8, ge=1)
+
+
+class SlackConfig(ConnectorConfig):
     type: Literal["slack"]
-    webhook_url: SecretStr
+    webhook_url: Optional[SecretStr] = None
+    # With a bot token and channel, messages go through the Web API instead,
+    # which lets follow-up updates for an incident be threaded.
+    bot_token: Optional[SecretStr] = None
+    channel: Optional[str] = None
+    # Seconds between posts; Slack allows about one message per second.
+    min_post_interval_seconds: float = Field(1.0, ge=0)
+
+    @model_validator(mode="after")
+    def _require_destination(self) -> "SlackConfig":
+        if not self.webhook_url and not (self.bot_token and self.channel):
+            raise ValueError(
+                "Set either 'webhook_url' or both 'bot_token' and 'channel'."
+            )
+        return self
+
+
+# Kept for backwards compatibility: any validated LLM, connection or action config.
+AnyLLM = LLMConfig
+AnyConnection = ConnectorConfig
+AnyAction = ConnectorConfig
+
+# Built-in schemas, resolved without importing the provider or connector itself.
+BUILTIN_LLM_MODELS: Dict[str, Type[LLMConfig]] = {
+    "openai": OpenAIConfig,
+    "anthropic": AnthropicConfig,
+    "google": GoogleConfig,
+}
+BUILTIN_CONNECTION_MODELS: Dict[str, Type[ConnectorConfig]] = {
+    "github": GitHubConfig,
+    "pagerduty": PagerDutyConfig,
+    "jsm": JSMConfig,
+    "datadog": DatadogConfig,
+    "kubernetes": KubernetesConfig,
+    "aws": AWSConfig,
+    "github_deployments": GitHubDeploymentsConfig,
+    "prometheus": PrometheusConfig,
+    "loki": LokiConfig,
+}
+BUILTIN_ACTION_MODELS: Dict[str, Type[ConnectorConfig]] = {
+    "slack": SlackConfig,
+}
+
+
+def _plugin_config_model(plugin_class: Any, kind: str, name: str) -> Type[BaseModel]:
+    """Returns the config model a plugin class declares for itself."""
+    model = getattr(plugin_class, "config_model", None)
+    if model is None:
+        raise ValueError(f"{kind} plugin '{name}' does not declare a config_model.")
+    return model
+
+
+def resolve_llm_model(provider: str) -> Type[LLMConfig]:
+    """Finds the config model for an LLM provider, built-in or plugin."""
+    if provider in BUILTIN_LLM_MODELS:
+        return BUILTIN_LLM_MODELS[provider]
+
+    from aira.llm_interfaces import PROVIDER_REGISTRY
+
+    provider_class = PROVIDER_REGISTRY.get(provider)
+    if provider_class is None:
+        raise ValueError(
+            f"Unknown LLM provider '{provider}'. Available: {PROVIDER_REGISTRY.names()}"
+        )
+    return _plugin_config_model(provider_class, "LLM provider", provider)
+
+
+def resolve_connector_model(connector_type: str, action: bool) -> Type[ConnectorConfig]:
+    """
+    Finds the config model for a connector type, built-in or plugin.
+
+    Raises:
+        ValueError: If the type is unknown or belongs in the other section
+            (e.g. a Slack action configured under 'connections').
+    """
+    expected, other = (
+        (BUILTIN_ACTION_MODELS, BUILTIN_CONNECTION_MODELS)
+        if action
+        else (BUILTIN_CONNECTION_MODELS, BUILTIN_ACTION_MODELS)
+    )
+    section = "actions" if action else "connections"
+    if connector_type in expected:
+        return expected[connector_type]
+    if connector_type in other:
+        raise ValueError(f"'{connector_type}' cannot be configured under '{section}'.")
+
+    from aira.connectors import CONNECTOR_REGISTRY
+    from aira.connectors.base import CollaborationProvider
+
+    connector_class = CONNECTOR_REGISTRY.get(connector_type)
+    if connector_class is None:
+        raise ValueError(
+            f"Unknown connector type '{connector_type}'. "
+            f"Available: {CONNECTOR_REGISTRY.names()}"
+        )
+    if issubclass(connector_class, CollaborationProvider) != action:
+        raise ValueError(f"'{connector_type}' cannot be configured under '{section}'.")
+    return _plugin_config_model(connector_class, "Connector", connector_type)
+
+
+def _validate_connectors(entries: Any, action: bool) -> Any:
+    """Validates each raw connector entry against its own config model."""
+    if not isinstance(entries, dict):
+        return entries
+    validated = {}
+    for name, raw in entries.items():
+        if isinstance(raw, ConnectorConfig) or not isinstance(raw, dict):
+            validated[name] = raw
+            continue
+        connector_type = raw.get("type")
+        if not connector_type:
+            raise ValueError(f"'{name}' is missing the required 'type' field.")
+        model = resolve_connector_model(str(connector_type).lower(), action)
+        validated[name] = model.model_validate(raw)
+    return validated
+
+
+# --- Runtime Behaviour Models ---
+class CircuitBreakerConfig(BaseModel):
+    """Controls how quickly Aira stops calling an unhealthy connector."""
+
+    failure_threshold: int = Field(3, ge=1)
+    recovery_timeout_seconds: float = Field(60.0, gt=0)
+
+
+class CorrelationConfig(BaseModel):
+    """Controls how commits and deploys are ranked against incident symptoms."""
 
+    horizon_minutes: float = Field(60.0, gt=0)
+    decay_minutes: float = Field(15.0, gt=0)
+    max_suspects: int = Field(5, ge=1)
 
-# Discriminated Unions for Connectors and Actions
-AnyConnection = Union[GitHubConfig, PagerDutyConfig, JSMConfig, DatadogConfig]
-AnyAction = Union[SlackConfig]
+
+class TelemetryConfig(BaseModel):
+    """Controls pipeline instrumentation and where metrics are exported."""
+
+    enabled: bool = False
+    # Written after each command, for the node_exporter textfile collector.
+    prometheus_textfile: Optional[Path] = None
+    # Mirror spans and metrics to OpenTelemetry (requires opentelemetry-api).
+    opentelemetry: bool = False
+
+
+class KnowledgeConfig(BaseModel):
+    """Controls the local store of past incidents consulted during analysis."""
+
+    # The SQLite database; the store is disabled when unset.
+    path: Optional[Path] = None
+    max_similar: int = Field(3, ge=0)
+
+
+class RunbooksConfig(BaseModel):
+    """Controls retrieval of runbook excerpts for the analysis prompt."""
+
+    # Markdown runbooks and postmortems, indexed by `aira index`; retrieval
+    # is disabled when unset.
+    docs_dir: Optional[Path] = None
+    index_dir: Path = Path("~/.aira/runbook-index")
+    top_k: int = Field(3, ge=0)
+    # The share of the prompt runbook excerpts may take, in tokens.
+    max_tokens: int = Field(1000, ge=0)
+
+
+class FollowUpConfig(BaseModel):
+    """Controls incremental re-analysis of incidents analyzed before."""
+
+    # How many incidents keep their state in memory.
+    max_incidents: int = Field(256, ge=1)
+    # After this long, a repeat trigger gets a full analysis again.
+    full_after_minutes: float = Field(240.0, gt=0)
+
+
+class AgentConfig(BaseModel):
+    """
+    Controls agentic analysis, where the LLM fetches context itself through
+    connector tools instead of receiving everything up front.
+    """
+
+    enabled: bool = False
+    # Budgets for one analysis, checked before each LLM turn. Once one is
+    # spent, the LLM gets a last turn, without tools, to give its answer.
+    max_steps: int = Field(6, ge=1)
+    max_tokens: int = Field(40000, ge=1)
+    # A hard limit on the whole analysis, LLM requests included. Tools are
+    # withdrawn `answer_seconds` before it, to leave time for the answer.
+    max_seconds: float = Field(90.0, gt=0)
+    answer_seconds: float = Field(20.0, gt=0)
+    # How many tool calls of one turn run at once.
+    max_parallel_tools: int = Field(4, ge=1)
+    # Longer tool results are truncated before they reach the LLM.
+    max_tool_chars: int = Field(4000, ge=200)
+
+    @model_validator(mode="after")
+    def _leave_time_for_tools(self) -> "AgentConfig":
+        if self.answer_seconds >= self.max_seconds:
+            raise ValueError("'answer_seconds' must be less than 'max_seconds'.")
+        return self
+
+
+class RouteConfig(BaseModel):
+    """
+    Sends analyses matching a service/severity rule to some actions. An
+    empty list matches anything; matching is case-insensitive.
+    """
+
+    actions: List[str] = Field(min_length=1)
+    services: List[str] = Field(default_factory=list)
+    severities: List[str] = Field(default_factory=list)
 
 
 # --- Main Application Configuration ---
 class AppConfig(BaseModel):
     """The root model for the entire config.yaml file."""
 
-    llm: AnyLLM = Field(..., discriminator="provider")
-    connections: Dict[str, AnyConnection]
-    actions: Dict[str, AnyAction] = Field(default_factory=dict)
+    llm: SerializeAsAny[LLMConfig]
+    connections: Dict[str, SerializeAsAny[ConnectorConfig]]
+    actions: Dict[str, SerializeAsAny[ConnectorConfig]] = Field(default_factory=dict)
+    circuit_breaker: CircuitBreakerConfig = Field(default_factory=CircuitBreakerConfig)
+    correlation: CorrelationConfig = Field(default_factory=CorrelationConfig)
+    telemetry: TelemetryConfig = Field(default_factory=TelemetryConfig)
+    knowledge: KnowledgeConfig = Field(default_factory=KnowledgeConfig)
+    runbooks: RunbooksConfig = Field(default_factory=RunbooksConfig)
+    follow_up: FollowUpConfig = Field(default_factory=FollowUpConfig)
+    agent: AgentConfig = Field(default_factory=AgentConfig)
+    # Where analyses are posted. Without routes, every action receives all.
+    routes: List[RouteConfig] = Field(default_factory=list)
+
+    @field_validator("llm", mode="before")
+    @classmethod
+    def _validate_llm(cls, value: Any) -> Any:
+        if isinstance(value, dict) and value.get("provider"):
+            return resolve_llm_model(str(value["provider"]).lower()).model_validate(
+                value
+            )
+        return value
+
+    @field_validator("connections", mode="before")
+    @classmethod
+    def _validate_connections(cls, value: Any) -> Any:
+        return _validate_connectors(value, action=False)
+
+    @field_validator("actions", mode="before")
+    @classmethod
+    def _validate_actions(cls, value: Any) -> Any:
+        return _validate_connectors(value, action=True)
+
+    @model_validator(mode="after")
+    def _validate_routes(self) -> "AppConfig":
+        for route in self.routes:
+            unknown = [name for name in route.actions if name not in self.actions]
+            if unknown:
+                raise ValueError(f"Routes refer to unknown actions: {unknown}")
+        return self
 
 
 # --- Main Loading Function ---
-def load_config(config_path: Path) -> AppConfig:
-    """Loads, validates, and returns the application configuration."""
+@dataclass
+class _CachedConfig:
+    digest: str
+    config: AppConfig
+
+
+# Validated configs keyed by resolved path. The key is the hash of the file
+# *after* environment substitution, so edits and changed secrets both miss.
+_CONFIG_CACHE: Dict[Path, _CachedConfig] = {}
+_ENV_FILES_LOADED: Dict[Path, int] = {}
+# .env path -> the variables it set, i.e. those the environment did not.
+_ENV_FILE_KEYS: Dict[Path, Dict[str, str]] = {}
+_CACHE_LOCK = threading.Lock()
+
+
+def _load_env_file(env_path: Path):
+    """
+    Loads a .env file, skipping it if it is unchanged since the last load.
+
+    Variables already exported win over the file. On reload, only those the
+    file set itself are updated (or removed), so that edits apply.
+    """
+    mtime_ns = env_path.stat().st_mtime_ns
+    if _ENV_FILES_LOADED.get(env_path) == mtime_ns:
+        return
+    print(f"📄 Loading environment variables from {env_path}")
+    owned = _ENV_FILE_KEYS.get(env_path, {})
+    values = {k: v for k, v in dotenv_values(env_path).items() if v is not None}
+    applied: Dict[str, str] = {}
+    for key, value in values.items():
+        current = os.environ.get(key)
+        # Ours if unset, or still holding what this file last set.
+        if current is None or owned.get(key) == current:
+            os.environ[key] = value
+            applied[key] = value
+    for key, value in owned.items():
+        if key not in values and os.environ.get(key) == value:
+            del os.environ[key]
+    _ENV_FILE_KEYS[env_path] = applied
+    _ENV_FILES_LOADED[env_path] = mtime_ns
+
+
+def load_config(config_path: Path, use_cache: bool = True) -> AppConfig:
+    """
+    Loads, validates, and returns the application configuration.
+
+    Parsing and validation only happen when the file's content (after
+    environment substitution) differs from the last load of the same path;
+    otherwise the previously validated AppConfig is returned.
+    """
     if not config_path.is_file():
         raise FileNotFoundError(f"Configuration file not found: {config_path}")
+    cache_key = config_path.resolve()
 
     # Look for a .env file in the same directory as the config file.
     env_path = config_path.parent / ".env"
     if env_path.is_file():
-        print(f"📄 Loading environment variables from {env_path}")
-        load_dotenv(dotenv_path=env_path)
+        _load_env_file(env_path.resolve())
 
     with open(config_path, "r") as f:
         content = os.path.expandvars(f.read())
-        raw_config = yaml.safe_load(content)
+    digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
 
+    telemetry = get_telemetry()
+    with _CACHE_LOCK:
+        cached = _CONFIG_CACHE.get(cache_key)
+        if use_cache and cached and cached.digest == digest:
+            telemetry.increment("aira_cache_hits_total", cache="config")
+            return cached.config
+    telemetry.increment("aira_cache_misses_total", cache="config")
+
+    raw_config = yaml.safe_load(content)
     try:
         app_config = AppConfig(**raw_config)
         print("✅ Configuration loaded and validated successfully.")
-        return app_config
     except ValidationError as e:
         raise ValueError(f"Configuration validation failed:\n{e}")
+
+    with _CACHE_LOCK:
+        _CONFIG_CACHE[cache_key] = _CachedConfig(digest, app_config)
+    return app_config
+
+
+class ConfigWatcher:
+    """
+    Polls a config file and calls `on_change` with the newly validated
+    AppConfig whenever its content changes. Used by long-running modes to
+    hot-reload without a restart.
+
+    Polling only stats the file and the .env beside it; the config is re-read
+    when the mtime or size of either moves. Invalid edits are reported and
+    ignored, keeping the last good config.
+    """
+
+    def __init__(
+        self,
+        config_path: Path,
+        on_change: Callable[[AppConfig], None],
+        interval: float = 2.0,
+    ):
+        self.config_path = config_path
+        self.on_change = on_change
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_stat = self._stat()
+
+    def _stat(self) -> Optional[tuple]:
+        try:
+            stat = self.config_path.stat()
+        except OSError:
+            return None
+        try:
+            env = (self.config_path.parent / ".env").stat()
+            env_stat = env.st_mtime_ns, env.st_size
+        except OSError:
+            env_stat = None
+        return stat.st_mtime_ns, stat.st_size, env_stat
+
+    def check(self) -> bool:
+        """
+        Checks the file once.
+
+        Returns:
+            bool: True if a changed, valid config was delivered to `on_change`.
+        """
+        current = self._stat()
+        if current is None or current == self._last_stat:
+            return False
+        self._last_stat = current
+        previous = _CONFIG_CACHE.get(self.config_path.resolve())
+        try:
+            config = load_config(self.config_path)
+        except (ValueError, OSError, yaml.YAMLError) as e:
+            print(f"⚠️ Ignoring invalid config change in {self.config_path}: {e}")
+            return False
+        if previous is not None and config is previous.config:
+            return False  # Touched, but the content is unchanged
+        self.on_change(config)
+        return True
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def start(self):
+        """Starts polling on a daemon thread."""
+        self._thread = threading.Thread(
+            target=self._run, name="aira-config-watcher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stops polling and waits for the thread to exit."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
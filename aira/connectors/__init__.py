@@ -2,35 +2,38 @@
 
 from .base import BaseConnector
 from aira.config import AnyAction, AnyConnection
-from .source_control import GitHubConnector
-from .alerting import PagerDutyConnector
-from .alerting import JSMConnector
-from .collaboration import SlackConnector
-from .observability import DatadogConnector
+from aira.registry import LazyRegistry
 
-
-# The Registry Map: Maps a 'type' string from config to the actual class.
-# We will uncomment the entries as each connector is built.
+# The Registry Map: Maps a 'type' string from config to the import path of
+# the connector class. Classes are imported only when a config references them.
+# Third-party connectors register themselves under the "aira.connectors"
+# entry point group instead of being added here.
 CONNECTOR_MAP = {
-    "pagerduty": PagerDutyConnector,
-    "jsm": JSMConnector,
-    "github": GitHubConnector,
-    "slack": SlackConnector,
-    "datadog": DatadogConnector,
+    "pagerduty": "aira.connectors.alerting.pagerduty:PagerDutyConnector",
+    "jsm": "aira.connectors.alerting.jsm:JSMConnector",
+    "github": "aira.connectors.source_control.github:GitHubConnector",
+    "slack": "aira.connectors.collaboration.slack:SlackConnector",
+    "datadog": "aira.connectors.observability.datadog:DatadogConnector",
+    "kubernetes": "aira.connectors.infrastructure.kubernetes:KubernetesConnector",
+    "aws": "aira.connectors.infrastructure.aws:AWSConnector",
+    "github_deployments": "aira.connectors.deployment.github:GitHubDeploymentsConnector",
+    "prometheus": "aira.connectors.observability.prometheus:PrometheusConnector",
+    "loki": "aira.connectors.observability.loki:LokiConnector",
 }
 
+CONNECTOR_REGISTRY = LazyRegistry(CONNECTOR_MAP, group="aira.connectors")
+
 
 def get_connector(name: str, config: AnyConnection | AnyAction) -> BaseConnector:
     """
     Factory function to get an instance of a connector.
     """
     connector_type = config.type.lower()
-    connector_class = CONNECTOR_MAP.get(connector_type)
+    connector_class = CONNECTOR_REGISTRY.get(connector_type)
 
     if not connector_class:
-        # CORRECTED ERROR MESSAGE: This is now much clearer.
         raise ValueError(
             f"Connector type '{config.type}' is not yet supported by Aira. Please check for spelling or contribute the connector."
         )
 
-    return connector_class(name=name, config=config.model_dump())
+    return connector_class(name=name, config=config)
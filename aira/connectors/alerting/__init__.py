@@ -1,8 +1,21 @@
 # aira/connectors/alerting/__init__.py
 
-from .pagerduty import PagerDutyConnector
-from .jsm import JSMConnector
+import importlib
+
+# Connector classes are resolved on first access so that importing one
+# connector module does not import its siblings (and their dependencies).
+_LAZY_IMPORTS = {
+    "PagerDutyConnector": ".pagerduty",
+    "JSMConnector": ".jsm",
+}
 
 # This line explicitly declares which names are part of this package's
-# public interface, silencing the "unused import" warning.
+# public interface.
 __all__ = ["PagerDutyConnector", "JSMConnector"]
+
+
+def __getattr__(name: str):
+    if name in _LAZY_IMPORTS:
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,106 @@
+# aira/connectors/alerting/adf.py
+
+"""
+Flattens Atlassian Document Format (ADF) trees into compact plain text.
+
+Jira returns descriptions and comments as ADF: deeply nested JSON that is
+several times larger than the text it holds. `adf_to_text` walks the tree
+with an explicit stack, so deeply nested documents cannot hit the recursion
+limit, and stops as soon as its character budget is spent, so a huge ticket
+costs no more than a small one.
+"""
+
+import re
+from typing import Any, List, Union
+
+# Nodes whose content ends with a line break.
+_BLOCK_NODES = {
+    "paragraph",
+    "heading",
+    "blockquote",
+    "codeBlock",
+    "panel",
+    "rule",
+    "tableRow",
+    "mediaGroup",
+    "mediaSingle",
+    "decisionItem",
+    "taskItem",
+}
+_LIST_ITEM_NODES = {"listItem", "taskItem", "decisionItem"}
+_BLANK_LINES = re.compile(r"[ \t]*\n[\s]*")
+
+ELLIPSIS = "…"
+
+
+def adf_to_text(document: Union[dict, str, None], max_chars: int = 2000) -> str:
+    """
+    Converts an ADF document to plain text of at most `max_chars` characters.
+
+    Args:
+        document (Union[dict, str, None]): An ADF document, or a plain string
+            (as returned by the v2 API), or None.
+        max_chars (int): The budget; longer text is cut and ends with '…'.
+
+    Returns:
+        str: One line per block, blank lines removed, list items as '- '.
+    """
+    if not document:
+        return ""
+    if isinstance(document, str):
+        return _truncate(_BLANK_LINES.sub("\n", document).strip(), max_chars)
+
+    pieces: List[str] = []
+    size = 0
+    # Stack items are either ADF nodes or literal strings to emit.
+    stack: List[Any] = [document]
+    while stack and size <= max_chars:
+        item = stack.pop()
+        if isinstance(item, str):
+            text = item
+        else:
+            text = _open(item, stack)
+        # Consecutive line breaks collapse, so they must not eat the budget.
+        if text and not (text == "\n" and pieces and pieces[-1].endswith("\n")):
+            pieces.append(text)
+            size += len(text)
+
+    text = _BLANK_LINES.sub("\n", "".join(pieces)).strip()
+    return _truncate(text, max_chars, force=bool(stack))
+
+
+def _open(node: dict, stack: List[Any]) -> str:
+    """
+    Handles one node: returns the text it emits immediately and pushes its
+    children (and any closing text) for later.
+    """
+    kind = node.get("type")
+    attrs = node.get("attrs") or {}
+    if kind == "text":
+        return node.get("text", "")
+    if kind == "hardBreak":
+        return "\n"
+    if kind == "mention":
+        return attrs.get("text") or "@user"
+    if kind == "emoji":
+        return attrs.get("text") or attrs.get("shortName", "")
+    if kind in ("inlineCard", "blockCard"):
+        return attrs.get("url", "")
+    if kind == "status":
+        return f"[{attrs.get('text', '')}]"
+    if kind == "date":
+        return attrs.get("timestamp", "")
+
+    children = node.get("content") or []
+    if kind in _BLOCK_NODES or kind in _LIST_ITEM_NODES:
+        stack.append("\n")
+    elif kind in ("tableCell", "tableHeader"):
+        stack.append(" | ")
+    stack.extend(reversed(children))
+    return "\n- " if kind in _LIST_ITEM_NODES else ""
+
+
+def _truncate(text: str, max_chars: int, force: bool = False) -> str:
+    if len(text) <= max_chars and not force:
+        return text
+    return text[: max(max_chars - 1, 0)].rstrip() + ELLIPSIS
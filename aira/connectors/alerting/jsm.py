@@ -1,9 +1,36 @@
+import dataclasses
+import math
 import requests
+from datetime import datetime, timezone
 from requests.auth import HTTPBasicAuth
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Iterator, List, Sequence, Tuple, Union
 
-from ..base import AlertingProvider
+from ..base import AlertingProvider, ConnectorError, NotFoundError
+from ..records import Comment, Incident, parse_timestamp
 from ...config import JSMConfig
+from .adf import adf_to_text
+
+# The issue fields `_to_incident` reads, requested unless `fields` is configured.
+INCIDENT_FIELDS = (
+    "summary",
+    "status",
+    "priority",
+    "components",
+    "created",
+    "updated",
+    "description",
+)
+
+# Character budgets for flattened ADF, keeping a single ticket's share of
+# the prompt bounded however long its description or comments are.
+DESCRIPTION_MAX_CHARS = 2000
+COMMENT_MAX_CHARS = 500
+
+# The largest page size the enhanced JQL search endpoint returns.
+SEARCH_PAGE_SIZE = 100
+
+# Keys per `key in (...)` query, keeping the JQL well under request size limits.
+BULK_CHUNK_SIZE = 100
 
 
 class JSMConnector(AlertingProvider):
@@ -11,20 +38,23 @@ class JSMConnector(AlertingProvider):
     Connector for interacting with the Jira Service Management (JSM) API.
     """
 
-    def __init__(self, name: str, config: Dict[str, Any]):
+    config_model = JSMConfig
+
+    def __init__(self, name: str, config: Union[Dict[str, Any], JSMConfig]):
         super().__init__(name, config)
-        self.validated_config = JSMConfig(**self.config)
         self.base_url = self.validated_config.instance_url.rstrip("/")
         self.auth = HTTPBasicAuth(
             self.validated_config.user_email,
             self.validated_config.api_token.get_secret_value(),
         )
         self.headers = {"Accept": "application/json"}
+        self.fields = tuple(self.validated_config.fields or INCIDENT_FIELDS)
 
     def test_connection(self) -> Tuple[bool, str]:
         """Validates the Jira API token by fetching user details."""
         try:
-            response = requests.get(
+            response = self._request(
+                "GET",
                 f"{self.base_url}/rest/api/3/myself",
                 headers=self.headers,
                 auth=self.auth,
@@ -46,32 +76,215 @@ class JSMConnector(AlertingProvider):
         except requests.exceptions.RequestException as e:
             return False, f"Connection failed: Network error - {str(e)}."
 
-    def get_incident_details(self, incident_id: str) -> Dict[str, Any]:
+    def get_incident_details(self, incident_id: str) -> Incident:
         """
         Fetches detailed information about a specific Jira issue (incident).
 
         Args:
             incident_id (str): The Jira issue key (e.g., 'PROJ-123').
+
+        Raises:
+            NotFoundError: If the issue does not exist.
+            ConnectorError: If the issue could not be fetched.
         """
         url = f"{self.base_url}/rest/api/3/issue/{incident_id}"
         print(f"-> Fetching issue details for {incident_id} from JSM...")
         try:
-            response = requests.get(
-                url, headers=self.headers, auth=self.auth, timeout=10
+            response = self._request(
+                "GET",
+                url,
+                headers=self.headers,
+                auth=self.auth,
+                params={"fields": ",".join(self.fields)},
+                timeout=10,
             )
             response.raise_for_status()
             print("   ...issue details found.")
-            return response.json()
+            incident = self._to_incident(response.json())
         except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 404:
-                print(f"   !!! Error: Jira issue '{incident_id}' not found.")
-            else:
-                print(
-                    f"   !!! Error: Could not fetch Jira issue '{incident_id}'. HTTP {e.response.status_code}."
-                )
-            return {}
+            status = e.response.status_code
+            if status == 404:
+                raise NotFoundError(
+                    f"Jira issue '{incident_id}' not found.", status
+                ) from e
+            raise ConnectorError(
+                f"Could not fetch Jira issue '{incident_id}'. HTTP {status}.", status
+            ) from e
         except requests.exceptions.RequestException as e:
-            print(
-                f"   !!! Error: Network issue while fetching Jira issue '{incident_id}': {e}"
+            raise ConnectorError(
+                f"Network issue while fetching Jira issue '{incident_id}': {e}"
+            ) from e
+
+        if not self.validated_config.max_comments:
+            return incident
+        try:
+            comments = self.fetch_comments(
+                incident_id, self.validated_config.max_comments
             )
-            return {}
+        except ConnectorError as e:
+            # The issue itself is the essential context; comments are a bonus.
+            print(f"   ...comments unavailable: {e}")
+            return incident
+        return dataclasses.replace(incident, comments=tuple(comments))
+
+    def fetch_comments(self, incident_id: str, limit: int) -> List[Comment]:
+        """
+        Fetches the latest `limit` comments on an issue, newest pages first,
+        with each body flattened from ADF to compact text.
+
+        Returns:
+            List[Comment]: The comments, oldest first.
+
+        Raises:
+            ConnectorError: If the comments could not be fetched.
+        """
+        comments: List[Comment] = []
+        start_at = 0
+        while len(comments) < limit:
+            try:
+                response = self._request(
+                    "GET",
+                    f"{self.base_url}/rest/api/3/issue/{incident_id}/comment",
+                    headers=self.headers,
+                    auth=self.auth,
+                    params={
+                        "orderBy": "-created",
+                        "startAt": start_at,
+                        "maxResults": min(limit - len(comments), SEARCH_PAGE_SIZE),
+                    },
+                    timeout=10,
+                )
+                response.raise_for_status()
+            except requests.exceptions.HTTPError as e:
+                status = e.response.status_code
+                raise ConnectorError(
+                    f"Could not fetch comments on Jira issue '{incident_id}'. "
+                    f"HTTP {status}.",
+                    status,
+                ) from e
+            except requests.exceptions.RequestException as e:
+                raise ConnectorError(
+                    f"Network issue while fetching comments on '{incident_id}': {e}"
+                ) from e
+            page = response.json()
+            batch = page.get("comments", [])
+            comments.extend(self._to_comment(c) for c in batch)
+            start_at += len(batch)
+            if not batch or start_at >= page.get("total", 0):
+                break
+        return comments[:limit][::-1]
+
+    def _search(self, jql: str, fields: Sequence[str]) -> Iterator[Dict[str, Any]]:
+        """
+        Yields every issue matching a JQL query, following `nextPageToken`
+        pagination of the enhanced search endpoint.
+
+        Raises:
+            ConnectorError: If the search failed.
+        """
+        body: Dict[str, Any] = {
+            "jql": jql,
+            "fields": list(fields),
+            "maxResults": SEARCH_PAGE_SIZE,
+        }
+        while True:
+            try:
+                response = self._request(
+                    "POST",
+                    f"{self.base_url}/rest/api/3/search/jql",
+                    headers=self.headers,
+                    auth=self.auth,
+                    json=body,
+                    timeout=10,
+                )
+                response.raise_for_status()
+            except requests.exceptions.HTTPError as e:
+                status = e.response.status_code
+                raise ConnectorError(
+                    f"Jira search failed. HTTP {status}.", status
+                ) from e
+            except requests.exceptions.RequestException as e:
+                raise ConnectorError(f"Network issue during Jira search: {e}") from e
+            page = response.json()
+            yield from page.get("issues", [])
+            token = page.get("nextPageToken")
+            if page.get("isLast", True) or not token:
+                return
+            body["nextPageToken"] = token
+
+    def get_incidents(self, incident_ids: Sequence[str]) -> List[Incident]:
+        """
+        Fetches many issues with paginated `key in (...)` searches instead of
+        one request per issue.
+
+        Args:
+            incident_ids (Sequence[str]): Jira issue keys (e.g., ['PROJ-1', 'PROJ-2']).
+
+        Returns:
+            List[Incident]: The issues found, in the order requested. Keys the
+                search does not return are left out.
+
+        Raises:
+            ConnectorError: If the issues could not be fetched.
+        """
+        keys = list(dict.fromkeys(incident_ids))
+        found: Dict[str, Incident] = {}
+        for start in range(0, len(keys), BULK_CHUNK_SIZE):
+            chunk = keys[start : start + BULK_CHUNK_SIZE]
+            quoted = ", ".join(_quote(key) for key in chunk)
+            for issue in self._search(f"key in ({quoted})", self.fields):
+                incident = self._to_incident(issue)
+                found[incident.id] = incident
+        return [found[key] for key in keys if key in found]
+
+    def fetch_updated_incidents(
+        self, since: datetime, until: datetime
+    ) -> List[Incident]:
+        """
+        Fetches issues updated within [since, until], scoped by `feed_jql`.
+
+        JQL date literals are read in the Jira user's own timezone, so the
+        lower bound is sent as a relative offset (e.g. '-15m'), rounded up to
+        whole minutes, and the window is then applied exactly on our side.
+        """
+        minutes = math.ceil((datetime.now(timezone.utc) - since).total_seconds() / 60)
+        jql = f'updated >= "-{max(minutes, 1)}m" ORDER BY updated ASC'
+        if self.validated_config.feed_jql:
+            jql = f"({self.validated_config.feed_jql}) AND {jql}"
+        fields = tuple(dict.fromkeys((*self.fields, "updated")))
+        incidents = [self._to_incident(issue) for issue in self._search(jql, fields)]
+        return [
+            incident
+            for incident in incidents
+            if incident.updated_at is None or since <= incident.updated_at <= until
+        ]
+
+    def _to_incident(self, issue: Dict[str, Any]) -> Incident:
+        """Maps a Jira issue payload onto an Incident record."""
+        fields = issue.get("fields", {})
+        components = fields.get("components") or []
+        return Incident(
+            id=issue.get("key", ""),
+            title=fields.get("summary", ""),
+            status=(fields.get("status") or {}).get("name", ""),
+            source=self.name,
+            severity=(fields.get("priority") or {}).get("name"),
+            service=components[0].get("name") if components else None,
+            created_at=parse_timestamp(fields.get("created")),
+            url=f"{self.base_url}/browse/{issue.get('key', '')}",
+            updated_at=parse_timestamp(fields.get("updated")),
+            description=adf_to_text(fields.get("description"), DESCRIPTION_MAX_CHARS),
+        )
+
+    def _to_comment(self, data: Dict[str, Any]) -> Comment:
+        """Maps a Jira comment payload onto a Comment record."""
+        return Comment(
+            author=(data.get("author") or {}).get("displayName", "Unknown"),
+            body=adf_to_text(data.get("body"), COMMENT_MAX_CHARS),
+            created_at=parse_timestamp(data.get("created")),
+        )
+
+
+def _quote(value: str) -> str:
+    """Quotes a value as a JQL string literal."""
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
@@ -1,26 +1,36 @@
 import requests
-from typing import Dict, Any, Tuple
+from dataclasses import replace
+from datetime import datetime
+from typing import Dict, Any, Iterator, List, Optional, Sequence, Tuple, Union
 
-from ..base import AlertingProvider
+from ..base import AlertingProvider, ConnectorError, NotFoundError
+from ..records import Alert, Incident, parse_timestamp
 from ...config import PagerDutyConfig
 
+# Expanded inline via `include[]`, so one request returns an enriched incident
+# instead of one follow-up request per service, assignee and log entry.
+INCIDENT_INCLUDES = ("services", "assignees", "first_trigger_log_entries")
+
+# The largest page size the PagerDuty REST API accepts.
+PAGE_LIMIT = 100
+
 
 class PagerDutyConnector(AlertingProvider):
     """
     Connector for interacting with the PagerDuty REST API v2.
     """
 
-    def __init__(self, name: str, config: Dict[str, Any]):
+    config_model = PagerDutyConfig
+
+    def __init__(self, name: str, config: Union[Dict[str, Any], PagerDutyConfig]):
         """
         Initializes the connector and validates its specific configuration.
 
         Args:
             name (str): The user-defined name of the connection.
-            config (Dict[str, Any]): The configuration dictionary for this connector.
+            config (Union[Dict[str, Any], PagerDutyConfig]): The configuration for this connector.
         """
         super().__init__(name, config)
-        # Validate the received dictionary against the specific Pydantic model
-        self.validated_config = PagerDutyConfig(**self.config)
         self.headers = {
             "Authorization": f"Token token={self.validated_config.api_key.get_secret_value()}",
             "Accept": "application/vnd.pagerduty+json;version=2",
@@ -35,7 +45,8 @@ class PagerDutyConnector(AlertingProvider):
         """
         try:
             # The /incidents endpoint is a lightweight way to check auth
-            response = requests.get(
+            response = self._request(
+                "GET",
                 f"{self.api_base_url}/incidents?limit=1",
                 headers=self.headers,
                 timeout=10,
@@ -49,33 +60,217 @@ class PagerDutyConnector(AlertingProvider):
         except requests.exceptions.RequestException as e:
             return False, f"Connection failed: Network error - {e}."
 
-    def get_incident_details(self, incident_id: str) -> Dict[str, Any]:
+    def _get_json(
+        self, path: str, description: str, params: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """
-        Fetches detailed information about a specific PagerDuty incident.
+        GETs an API path and returns the decoded body.
+
+        Raises:
+            NotFoundError: If the resource does not exist.
+            ConnectorError: If the request failed.
+        """
+        try:
+            response = self._request(
+                "GET",
+                f"{self.api_base_url}{path}",
+                headers=self.headers,
+                params=params,
+                timeout=10,
+            )
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.HTTPError as e:
+            status = e.response.status_code
+            if status == 404:
+                raise NotFoundError(
+                    f"PagerDuty {description} not found.", status
+                ) from e
+            raise ConnectorError(
+                f"Could not fetch PagerDuty {description}. HTTP {status}.", status
+            ) from e
+        except requests.exceptions.RequestException as e:
+            raise ConnectorError(
+                f"Network issue while fetching PagerDuty {description}: {e}"
+            ) from e
+
+    def _paginate(
+        self, path: str, key: str, description: str, params: Dict[str, Any]
+    ) -> Iterator[Dict[str, Any]]:
+        """Yields every item of a classic offset-paginated list endpoint."""
+        offset = 0
+        while True:
+            page = self._get_json(
+                path,
+                description,
+                {**params, "limit": PAGE_LIMIT, "offset": offset, "total": "false"},
+            )
+            items = page.get(key, [])
+            yield from items
+            if not page.get("more") or not items:
+                return
+            offset += len(items)
+
+    def get_incident_details(self, incident_id: str) -> Incident:
+        """
+        Fetches detailed information about a specific PagerDuty incident,
+        with its service, assignees and triggering alert expanded inline.
 
         Args:
             incident_id (str): The unique identifier for the incident (e.g., 'P123ABC').
 
         Returns:
-            A dictionary containing the incident details or an empty dict on failure.
+            An Incident record.
+
+        Raises:
+            NotFoundError: If the incident does not exist.
+            ConnectorError: If the incident could not be fetched.
         """
-        url = f"{self.api_base_url}/incidents/{incident_id}"
         print(f"-> Fetching incident details for {incident_id} from PagerDuty...")
-        try:
-            response = requests.get(url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            print("   ...incident details found.")
-            return response.json().get("incident", {})
-        except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 404:
-                print(f"   !!! Error: PagerDuty incident '{incident_id}' not found.")
-            else:
-                print(
-                    f"   !!! Error: Could not fetch PagerDuty incident '{incident_id}'. HTTP {e.response.status_code}."
-                )
-            return {}
-        except requests.exceptions.RequestException as e:
-            print(
-                f"   !!! Error: Network issue while fetching PagerDuty incident '{incident_id}': {e}"
+        body = self._get_json(
+            f"/incidents/{incident_id}",
+            f"incident '{incident_id}'",
+            {"include[]": list(INCIDENT_INCLUDES)},
+        )
+        print("   ...incident details found.")
+        return self._to_incident(body.get("incident", {}))
+
+    def list_incidents(
+        self,
+        service_ids: Sequence[str] = (),
+        urgencies: Sequence[str] = (),
+        statuses: Sequence[str] = ("triggered", "acknowledged"),
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> List[Incident]:
+        """
+        Lists incidents in bulk, following pagination, with each incident's
+        service, assignees and triggering alert expanded in the same requests.
+
+        Args:
+            service_ids (Sequence[str]): Only incidents on these services.
+            urgencies (Sequence[str]): Only these urgencies ('high', 'low').
+            statuses (Sequence[str]): Only these statuses; open incidents by default.
+            since (Optional[str]): ISO 8601 start of the creation window.
+            until (Optional[str]): ISO 8601 end of the creation window.
+
+        Returns:
+            List[Incident]: The matching incidents, oldest first.
+
+        Raises:
+            ConnectorError: If the incidents could not be listed.
+        """
+        params: Dict[str, Any] = {
+            "service_ids[]": list(service_ids),
+            "urgencies[]": list(urgencies),
+            "statuses[]": list(statuses),
+            "include[]": list(INCIDENT_INCLUDES),
+            "sort_by": "created_at:asc",
+        }
+        if since:
+            params["since"] = since
+        if until:
+            params["until"] = until
+        return [
+            self._to_incident(data)
+            for data in self._paginate("/incidents", "incidents", "incidents", params)
+        ]
+
+    def fetch_updated_incidents(
+        self, since: datetime, until: datetime
+    ) -> List[Incident]:
+        """
+        Fetches the incidents with any activity within [since, until], in any
+        status, oldest change first. The incident list only windows on
+        creation time, so the window is read from the log entries, which
+        record every trigger, acknowledgement, reassignment and resolution.
+        Each incident's `updated_at` is its latest change in the window.
+        """
+        params = {
+            "since": since.isoformat(),
+            "until": until.isoformat(),
+            "is_overview": "true",
+            "include[]": ["incidents"],
+        }
+        latest: Dict[str, Tuple[datetime, Dict[str, Any]]] = {}
+        for entry in self._paginate(
+            "/log_entries", "log_entries", "log entries", params
+        ):
+            data = entry.get("incident") or {}
+            changed = parse_timestamp(entry.get("created_at"))
+            if not data.get("id") or changed is None:
+                continue
+            known = latest.get(data["id"])
+            if known is None or changed > known[0]:
+                latest[data["id"]] = (changed, data)
+        return [
+            replace(self._to_incident(data), updated_at=changed)
+            for changed, data in sorted(latest.values(), key=lambda item: item[0])
+        ]
+
+    def get_related_alerts(self, incident_id: str) -> List[Alert]:
+        """
+        Fetches every alert grouped under an incident.
+
+        Raises:
+            NotFoundError: If the incident does not exist.
+            ConnectorError: If the alerts could not be fetched.
+        """
+        return [
+            self._to_alert(data, incident_id)
+            for data in self._paginate(
+                f"/incidents/{incident_id}/alerts",
+                "alerts",
+                f"alerts for incident '{incident_id}'",
+                {"include[]": ["services"]},
             )
-            return {}
+        ]
+
+    def _to_incident(self, data: Dict[str, Any]) -> Incident:
+        """
+        Maps a PagerDuty incident payload onto an Incident record. Works for
+        both plain references and objects expanded with `include[]`.
+        """
+        trigger_entry = data.get("first_trigger_log_entry") or {}
+        trigger_details = (trigger_entry.get("channel") or {}).get("summary")
+        return Incident(
+            id=data.get("id", ""),
+            title=data.get("title", ""),
+            status=data.get("status", ""),
+            source=self.name,
+            severity=data.get("urgency"),
+            service=_summary(data.get("service")),
+            created_at=parse_timestamp(data.get("created_at")),
+            url=data.get("html_url"),
+            description=data.get("description") or trigger_details or "",
+            updated_at=parse_timestamp(
+                data.get("updated_at") or data.get("last_status_change_at")
+            ),
+            assignees=tuple(
+                name
+                for name in (
+                    _summary(a.get("assignee")) for a in data.get("assignments", [])
+                )
+                if name
+            ),
+        )
+
+    def _to_alert(self, data: Dict[str, Any], incident_id: str) -> Alert:
+        """Maps a PagerDuty alert payload onto an Alert record."""
+        return Alert(
+            id=data.get("id", ""),
+            summary=data.get("summary", ""),
+            status=data.get("status", ""),
+            severity=data.get("severity"),
+            service=_summary(data.get("service")),
+            created_at=parse_timestamp(data.get("created_at")),
+            url=data.get("html_url"),
+            incident_id=incident_id,
+        )
+
+
+def _summary(reference: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Names a PagerDuty object, whether a reference or an expanded object."""
+    if not reference:
+        return None
+    return reference.get("summary") or reference.get("name")
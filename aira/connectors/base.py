@@ -1,5 +1,28 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Tuple
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Sequence, Tuple, Type, Union
+
+from pydantic import BaseModel
+
+from aira.telemetry import get_telemetry
+from .records import Commit, Deployment, Incident, LogEvent
+
+
+class ConnectorError(Exception):
+    """
+    Raised when a connector cannot fetch data from its upstream service.
+
+    Carries the HTTP status code when one is available so callers can tell
+    an unhealthy dependency apart from a bad request.
+    """
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class NotFoundError(ConnectorError):
+    """Raised when the requested resource does not exist upstream."""
 
 
 class BaseConnector(ABC):
@@ -8,19 +31,57 @@ class BaseConnector(ABC):
 
     Ensures all connectors have a consistent initialization and a mandatory
     health check method for the 'aira doctor' command.
+
+    Subclasses set `config_model` to the Pydantic model that validates their
+    entry in config.yaml; this is how plugin connectors own their schema.
     """
 
-    def __init__(self, name: str, config: Dict[str, Any]):
+    config_model: Optional[Type[BaseModel]] = None
+
+    def __init__(self, name: str, config: Union[Dict[str, Any], BaseModel]):
         """
         Initializes the connector.
 
         Args:
             name (str): The user-defined name of the connection (e.g., 'my_github').
-            config (Dict[str, Any]): The configuration dictionary for this specific
-                                     connector, loaded from config.yaml.
+            config (Union[Dict[str, Any], BaseModel]): The configuration for this
+                connector. An instance of `config_model` (as produced by
+                `load_config`) is used as-is; a dict is validated here.
         """
         self.name = name
-        self.config = config
+        if self.config_model is not None and not isinstance(config, self.config_model):
+            config = self.config_model.model_validate(config)
+        self.validated_config = config
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        """The connector's configuration as a plain dictionary."""
+        if isinstance(self.validated_config, BaseModel):
+            return self.validated_config.model_dump()
+        return self.validated_config
+
+    def _request(self, method: str, url: str, **kwargs):
+        """
+        Sends an HTTP request, recording its latency and response size.
+
+        Accepts the same keyword arguments as `requests.request` and returns
+        its response; errors propagate unchanged. With `stream=True` the body
+        is left unread, and the caller records its size as it consumes it.
+        """
+        import requests
+
+        telemetry = get_telemetry()
+        with telemetry.timer(
+            "aira_http_request_duration_seconds", connector=self.name, method=method
+        ):
+            response = requests.request(method, url, **kwargs)
+        if not kwargs.get("stream"):
+            telemetry.increment(
+                "aira_http_response_bytes_total",
+                len(response.content),
+                connector=self.name,
+            )
+        return response
 
     @abstractmethod
     def test_connection(self) -> Tuple[bool, str]:
@@ -33,22 +94,64 @@ class BaseConnector(ABC):
         """
         pass
 
+    def close(self):
+        """
+        Releases what the connector holds beyond its own lifetime, such as
+        background threads, once it is no longer used. The default holds
+        nothing.
+        """
+
 
 class AlertingProvider(BaseConnector):
     """Contract for alerting platforms like PagerDuty or Opsgenie."""
 
     @abstractmethod
-    def get_incident_details(self, incident_id: str) -> Dict[str, Any]:
-        """Fetches detailed information about a specific incident."""
+    def get_incident_details(self, incident_id: str) -> Incident:
+        """
+        Fetches detailed information about a specific incident.
+
+        Raises:
+            NotFoundError: If the incident does not exist.
+            ConnectorError: If the incident could not be fetched.
+        """
         pass
 
+    def fetch_updated_incidents(
+        self, since: datetime, until: datetime
+    ) -> List[Incident]:
+        """
+        Fetches incidents that appeared or changed within [since, until],
+        oldest first. This powers `aira.feed.IncidentFeed`; providers that
+        cannot support it keep this default.
+
+        Raises:
+            NotImplementedError: If the provider has no change feed.
+            ConnectorError: If the incidents could not be fetched.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support an incident change feed."
+        )
+
+    @property
+    def has_change_feed(self) -> bool:
+        """True if the provider implements `fetch_updated_incidents`."""
+        return (
+            type(self).fetch_updated_incidents
+            is not AlertingProvider.fetch_updated_incidents
+        )
+
 
 class SourceControlProvider(BaseConnector):
     """Contract for source control platforms like GitHub or GitLab."""
 
     @abstractmethod
-    def fetch_recent_commits(self, repo: str, hours: int) -> str:
-        """Fetches and formats recent commits for a given repository."""
+    def fetch_recent_commits(self, repo: str, hours: float) -> List[Commit]:
+        """
+        Fetches recent commits for a given repository, newest first.
+
+        Raises:
+            ConnectorError: If the commits could not be fetched.
+        """
         pass
 
     # As a future enhancement, you would add the method for diffs here
@@ -61,8 +164,13 @@ class ObservabilityProvider(BaseConnector):
     """Contract for observability platforms like Datadog or Prometheus."""
 
     @abstractmethod
-    def fetch_logs(self, query: str, time_window_minutes: int) -> str:
-        """Fetches and formats logs based on a query."""
+    def fetch_logs(self, query: str, time_window_minutes: int) -> List[LogEvent]:
+        """
+        Fetches logs matching a query, newest first.
+
+        Raises:
+            ConnectorError: If the logs could not be fetched.
+        """
         pass
 
 
@@ -83,6 +191,31 @@ class DeploymentProvider(BaseConnector):
         """Gets the status of a specific deployment job."""
         pass
 
+    def fetch_recent_deployments(
+        self, hours: float, services: Optional[Sequence[str]] = None
+    ) -> List[Deployment]:
+        """
+        Fetches the deployments started within the last `hours`, oldest
+        first, and only those of `services` if given. This feeds deploys into
+        correlation; providers that cannot list deployments keep this
+        default, and are not asked.
+
+        Raises:
+            NotImplementedError: If the provider cannot list deployments.
+            ConnectorError: If the deployments could not be fetched.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support listing deployments."
+        )
+
+    @property
+    def lists_deployments(self) -> bool:
+        """True if the provider implements `fetch_recent_deployments`."""
+        return (
+            type(self).fetch_recent_deployments
+            is not DeploymentProvider.fetch_recent_deployments
+        )
+
 
 class CollaborationProvider(BaseConnector):
     """Contract for notification services like Slack or MS Teams."""
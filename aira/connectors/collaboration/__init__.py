@@ -1,7 +1,20 @@
 # aira/connectors/collaboration/__init__.py
 
-from .slack import SlackConnector
+import importlib
+
+# Connector classes are resolved on first access so that importing one
+# connector module does not import its siblings (and their dependencies).
+_LAZY_IMPORTS = {
+    "SlackConnector": ".slack",
+}
 
 # This line explicitly declares which names are part of this package's
-# public interface, silencing the "unused import" warning.
+# public interface.
 __all__ = ["SlackConnector"]
+
+
+def __getattr__(name: str):
+    if name in _LAZY_IMPORTS:
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,268 @@
+# aira/connectors/collaboration/delivery.py
+
+"""
+Rate-limit-aware outbound delivery for collaboration connectors.
+
+Chat platforms accept roughly one message per second per destination. A
+`DeliveryQueue` sits between the pipeline and a destination: submitting is
+non-blocking, updates for the same incident coalesce while they wait, queued
+messages are batched into one post, and the worker honours `Retry-After`.
+The queue also keeps the destination's thread per incident, so follow-ups
+are threaded whichever connector posts them.
+"""
+
+import atexit
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from aira.telemetry import get_telemetry
+from ..base import ConnectorError
+
+
+class RateLimitedError(ConnectorError):
+    """Raised by a send function when the destination asks us to slow down."""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message, 429)
+        self.retry_after = retry_after
+
+
+@dataclass
+class OutboundMessage:
+    """A message waiting for delivery."""
+
+    blocks: List[Dict[str, Any]]
+    # Messages with the same key (e.g. an incident id) replace each other.
+    key: Optional[str] = None
+    attempts: int = 0
+    _slot: str = field(default="", repr=False)
+
+
+class DeliveryQueue:
+    """
+    A per-destination outbound queue served by one background worker.
+
+    Usage:
+        queue = DeliveryQueue("slack:#incidents", send=connector._deliver)
+        queue.submit(blocks, key="P123")  # returns immediately
+    """
+
+    def __init__(
+        self,
+        name: str,
+        send: Callable[[List[OutboundMessage]], None],
+        min_interval: float = 1.0,
+        max_batch: int = 10,
+        max_retries: int = 3,
+        can_batch: Callable[[OutboundMessage], bool] = lambda message: True,
+        clock: Callable[[], float] = time.monotonic,
+        max_threads: int = 1000,
+    ):
+        """
+        Args:
+            name (str): Identifies the destination in logs and metrics.
+            send (Callable): Delivers a batch as a single post. Raises
+                RateLimitedError to be retried after its delay, or
+                ConnectorError (retried if it has no status or a 5xx status).
+            min_interval (float): Minimum seconds between posts.
+            max_batch (int): The most queued messages merged into one post.
+            max_retries (int): Attempts after the first before a message is dropped.
+            can_batch (Callable): Whether a message may share a post with others.
+                Called with the queue's lock held.
+            clock (Callable[[], float]): A monotonic clock.
+            max_threads (int): How many keys to remember the thread of.
+        """
+        self.name = name
+        self._send = send
+        self.min_interval = min_interval
+        self.max_batch = max_batch
+        self.max_retries = max_retries
+        self._can_batch = can_batch
+        self._clock = clock
+        self._pending: "OrderedDict[str, OutboundMessage]" = OrderedDict()
+        self._ids = itertools.count()
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._next_send_at = 0.0
+        self._closed = False
+        self._worker: Optional[threading.Thread] = None
+        self.dropped = 0
+        # Key -> the id of the message that started its thread.
+        self._threads: "OrderedDict[str, str]" = OrderedDict()
+        self.max_threads = max_threads
+
+    def configure(
+        self,
+        send: Callable[[List[OutboundMessage]], None],
+        min_interval: float,
+        can_batch: Callable[[OutboundMessage], bool],
+    ):
+        """
+        Hands delivery to the connector now posting to the destination, e.g.
+        after a reload replaced the one that created the queue.
+        """
+        with self._cond:
+            self._send = send
+            self.min_interval = min_interval
+            self._can_batch = can_batch
+
+    def thread(self, key: Optional[str]) -> Optional[str]:
+        """The id of the message that started `key`'s thread, if any."""
+        if key is None:
+            return None
+        with self._cond:
+            return self._threads.get(key)
+
+    def remember_thread(self, keys: Iterable[str], thread_id: str):
+        """Records `thread_id` as the thread of each key that has none yet."""
+        with self._cond:
+            for key in keys:
+                self._threads.setdefault(key, thread_id)
+            while len(self._threads) > self.max_threads:
+                self._threads.popitem(last=False)
+
+    def submit(self, blocks: List[Dict[str, Any]], key: Optional[str] = None):
+        """
+        Queues a message without blocking. If a message with the same `key`
+        is still waiting, it is replaced in place by this newer one.
+        """
+        slot = f"key:{key}" if key is not None else f"id:{next(self._ids)}"
+        with self._cond:
+            if self._closed:
+                raise RuntimeError(f"Delivery queue '{self.name}' is closed.")
+            existing = self._pending.get(slot)
+            if existing is not None:
+                existing.blocks = blocks
+            else:
+                self._pending[slot] = OutboundMessage(blocks, key, _slot=slot)
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name=f"delivery-{self.name}", daemon=True
+                )
+                self._worker.start()
+            self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits until every queued message has been delivered or dropped.
+
+        Returns:
+            bool: False if `timeout` expired first.
+        """
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not self._pending and not self._in_flight, timeout
+            )
+
+    def close(self, timeout: Optional[float] = None):
+        """Delivers what is queued (up to `timeout`), then stops the worker."""
+        self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._worker is not None:
+            self._worker.join(timeout)
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+    def _take_batch(self) -> List[OutboundMessage]:
+        first_slot = next(iter(self._pending))
+        batch = [self._pending.pop(first_slot)]
+        if not self._can_batch(batch[0]):
+            return batch
+        for slot in list(self._pending):
+            if len(batch) >= self.max_batch:
+                break
+            if self._can_batch(self._pending[slot]):
+                batch.append(self._pending.pop(slot))
+        return batch
+
+    def _requeue(self, batch: List[OutboundMessage]):
+        """Puts a failed batch back at the front, unless superseded meanwhile."""
+        for message in reversed(batch):
+            if message._slot not in self._pending:
+                self._pending[message._slot] = message
+                self._pending.move_to_end(message._slot, last=False)
+
+    def _run(self):
+        telemetry = get_telemetry()
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                delay = self._next_send_at - self._clock()
+                if delay > 0:
+                    # Sleeping here lets further updates coalesce into the batch.
+                    self._cond.wait(delay)
+                    continue
+                batch = self._take_batch()
+                self._in_flight = len(batch)
+                send, min_interval = self._send, self.min_interval
+
+            retry: List[OutboundMessage] = []
+            next_send_at = self._clock() + min_interval
+            try:
+                send(batch)
+            except RateLimitedError as e:
+                retry = batch
+                next_send_at = self._clock() + max(e.retry_after, min_interval)
+            except ConnectorError as e:
+                retryable = e.status_code is None or e.status_code >= 500
+                for message in batch:
+                    message.attempts += 1
+                if retryable and batch[0].attempts <= self.max_retries:
+                    retry = batch
+                    backoff = min_interval * 2 ** batch[0].attempts
+                    next_send_at = self._clock() + backoff
+                else:
+                    print(
+                        f"   !!! Dropping {len(batch)} message(s) for '{self.name}': {e}"
+                    )
+                    self.dropped += len(batch)
+            except Exception as e:
+                print(f"   !!! Dropping {len(batch)} message(s) for '{self.name}': {e}")
+                self.dropped += len(batch)
+
+            with self._cond:
+                if retry:
+                    telemetry.increment("aira_retries_total", component=self.name)
+                    self._requeue(retry)
+                self._in_flight = 0
+                self._next_send_at = next_send_at
+                self._cond.notify_all()
+
+
+_QUEUES: Dict[str, DeliveryQueue] = {}
+_QUEUES_LOCK = threading.Lock()
+
+
+def get_delivery_queue(
+    destination: str, factory: Callable[[], DeliveryQueue]
+) -> DeliveryQueue:
+    """
+    Returns the process-wide queue for a destination, creating it with
+    `factory` on first use, so every connector posting to the same webhook or
+    channel shares one rate limit.
+    """
+    with _QUEUES_LOCK:
+        queue = _QUEUES.get(destination)
+        if queue is None:
+            queue = _QUEUES[destination] = factory()
+        return queue
+
+
+@atexit.register
+def _flush_queues(timeout: float = 10.0):
+    """Gives queued messages a bounded chance to go out at interpreter exit."""
+    with _QUEUES_LOCK:
+        queues = list(_QUEUES.values())
+    for queue in queues:
+        queue.flush(timeout)
@@ -1,21 +1,46 @@
 import requests
 import typer
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Union
 
-from ..base import CollaborationProvider
+from ..base import CollaborationProvider, ConnectorError
 from ...config import SlackConfig
+from .delivery import (
+    DeliveryQueue,
+    OutboundMessage,
+    RateLimitedError,
+    get_delivery_queue,
+)
+
+WEB_API_URL = "https://slack.com/api/chat.postMessage"
+
+# Slack rejects messages with more blocks than this.
+MAX_BLOCKS = 50
 
 
 class SlackConnector(CollaborationProvider):
-    """Connector for posting messages to Slack via Incoming Webhooks."""
+    """
+    Connector for posting messages to Slack via Incoming Webhooks, or via the
+    Web API (`chat.postMessage`) when a bot token and channel are configured.
+    """
+
+    config_model = SlackConfig
 
-    def __init__(self, name: str, config: Dict[str, Any]):
+    def __init__(self, name: str, config: Union[Dict[str, Any], SlackConfig]):
         super().__init__(name, config)
-        self.validated_config = SlackConfig(**self.config)
-        self.webhook_url = self.validated_config.webhook_url.get_secret_value()
+        webhook_url = self.validated_config.webhook_url
+        self.webhook_url = webhook_url.get_secret_value() if webhook_url else None
+        bot_token = self.validated_config.bot_token
+        self.bot_token = bot_token.get_secret_value() if bot_token else None
+        self.channel = self.validated_config.channel
+
+    @property
+    def uses_web_api(self) -> bool:
+        return bool(self.bot_token and self.channel)
 
     def _is_url_format_valid(self) -> bool:
         """Performs a quick, offline check of the webhook URL format."""
+        if self.uses_web_api:
+            return True
         return self.webhook_url and self.webhook_url.startswith(
             "https://hooks.slack.com/"
         )
@@ -44,26 +69,139 @@ class SlackConnector(CollaborationProvider):
         }
 
         try:
-            response = requests.post(self.webhook_url, json=test_payload, timeout=10)
-            response.raise_for_status()  # This will raise an HTTPError for 4xx/5xx statuses
+            self._send(test_payload)
             return True, "Successfully posted a test message to the Slack channel."
-
-        except requests.exceptions.HTTPError as e:
-            return (
-                False,
-                f"Live connection test failed: Received HTTP {e.response.status_code} error.",
-            )
-
-        except requests.exceptions.RequestException as e:
-            return False, f"Live connection test failed: Network error - {e}"
+        except ConnectorError as e:
+            if e.status_code:
+                return (
+                    False,
+                    f"Live connection test failed: Received HTTP {e.status_code} error.",
+                )
+            return False, f"Live connection test failed: {e}"
 
     def post_message(self, blocks: List[Dict[str, Any]]):
         """Posts a richly formatted message using Slack's Block Kit structure."""
         print(f"-> Posting message to Slack via connector '{self.name}'...")
-        payload = {"blocks": blocks}
         try:
-            response = requests.post(self.webhook_url, json=payload, timeout=15)
-            response.raise_for_status()
+            self._send({"blocks": blocks})
             print("   ...message posted successfully.")
-        except requests.exceptions.RequestException as e:
+        except ConnectorError as e:
             print(f"   !!! Error: Failed to post message to Slack. Details: {e}")
+
+    def enqueue_message(self, blocks: List[Dict[str, Any]], key: Optional[str] = None):
+        """
+        Queues a message for background delivery and returns immediately.
+
+        Messages for the same destination are sent at most once per
+        `min_post_interval_seconds`; while waiting, a newer message with the
+        same `key` (e.g. an incident id) replaces the older one, and other
+        waiting messages are merged into a single post. With the Web API,
+        later messages for a key are posted as replies in that key's thread.
+        """
+        queue = self.delivery_queue
+        # The queue outlives connectors; deliver with the latest settings.
+        queue.configure(
+            self._deliver,
+            self.validated_config.min_post_interval_seconds,
+            self._can_batch,
+        )
+        queue.submit(blocks, key)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Waits for queued messages to be delivered. False on timeout."""
+        return self.delivery_queue.flush(timeout)
+
+    @property
+    def delivery_queue(self) -> DeliveryQueue:
+        """
+        The queue shared by every connector posting to this destination. It
+        holds the destination's threads, keyed by incident.
+        """
+        destination = (
+            f"channel:{self.channel}" if self.uses_web_api else self.webhook_url
+        )
+        return get_delivery_queue(
+            destination,
+            lambda: DeliveryQueue(
+                f"slack:{self.name}",
+                self._deliver,
+                min_interval=self.validated_config.min_post_interval_seconds,
+                can_batch=self._can_batch,
+            ),
+        )
+
+    def _can_batch(self, message: OutboundMessage) -> bool:
+        # Thread replies must be posted on their own.
+        return not (self.uses_web_api and self.delivery_queue.thread(message.key))
+
+    def _deliver(self, batch: List[OutboundMessage]):
+        """Sends a batch from the delivery queue as one message."""
+        blocks: List[Dict[str, Any]] = []
+        for message in batch:
+            if blocks:
+                blocks.append({"type": "divider"})
+            blocks.extend(message.blocks)
+        if len(blocks) > MAX_BLOCKS:
+            blocks = blocks[: MAX_BLOCKS - 1] + [
+                {
+                    "type": "context",
+                    "elements": [
+                        {"type": "mrkdwn", "text": "_Truncated: too many updates._"}
+                    ],
+                }
+            ]
+
+        queue = self.delivery_queue
+        thread_ts = None
+        if self.uses_web_api and len(batch) == 1:
+            thread_ts = queue.thread(batch[0].key)
+        ts = self._send({"blocks": blocks}, thread_ts)
+        if ts and not thread_ts:
+            queue.remember_thread((m.key for m in batch if m.key), ts)
+
+    def _send(
+        self, payload: Dict[str, Any], thread_ts: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Posts one message through the webhook or the Web API.
+
+        Returns:
+            Optional[str]: The message `ts` (Web API only), for threading.
+
+        Raises:
+            RateLimitedError: If Slack answered 429.
+            ConnectorError: If the message could not be posted.
+        """
+        if self.uses_web_api:
+            url = WEB_API_URL
+            headers = {"Authorization": f"Bearer {self.bot_token}"}
+            body = {"channel": self.channel, "text": "Aira update", **payload}
+            if thread_ts:
+                body["thread_ts"] = thread_ts
+        else:
+            url, headers, body = self.webhook_url, {}, payload
+
+        try:
+            response = self._request(
+                "POST", url, json=body, headers=headers, timeout=15
+            )
+        except requests.exceptions.RequestException as e:
+            raise ConnectorError(f"Network error posting to Slack: {e}") from e
+        if response.status_code == 429:
+            retry_after = float(response.headers.get("Retry-After", 1))
+            raise RateLimitedError(
+                f"Slack rate limit hit; retry after {retry_after:g}s.", retry_after
+            )
+        if response.status_code >= 400:
+            raise ConnectorError(
+                f"Slack rejected the message. HTTP {response.status_code}.",
+                response.status_code,
+            )
+        if not self.uses_web_api:
+            return None
+        data = response.json()
+        if not data.get("ok"):
+            raise ConnectorError(
+                f"Slack API error: {data.get('error', 'unknown')}.", 400
+            )
+        return data.get("ts")
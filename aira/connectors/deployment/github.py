@@ -0,0 +1,388 @@
+# aira/connectors/deployment/github.py
+
+"""
+A deployment connector backed by the GitHub Deployments API.
+
+GitHub Actions jobs that target an environment create a deployment for every
+run, so this also covers Actions-driven rollouts. Deploys are kept on an
+in-memory timeline that is refreshed incrementally: the deployment list is
+requested with its ETag, so an unchanged repository costs a free 304, and
+otherwise only the pages newer than the last seen deployment are read.
+Statuses cost a request per deploy, so they are only fetched for the deploys
+a lookup returns, concurrently.
+"""
+
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta, timezone
+from operator import itemgetter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+import requests
+
+from ..base import ConnectorError, DeploymentProvider, NotFoundError
+from ..records import FINAL_DEPLOY_STATES, Deployment, parse_timestamp
+from ...config import GitHubDeploymentsConfig
+
+
+class DeployTimeline:
+    """
+    Recent deploys per service, sorted by time.
+
+    Each service keeps a sorted list of (timestamp, id) keys, so a window
+    query costs two bisections per service and finding where a deploy goes
+    is O(log n). Deploys are replaced by id when their status changes.
+    """
+
+    def __init__(self):
+        self._keys: Dict[str, List[Tuple[float, str]]] = {}
+        self._deploys: Dict[str, Deployment] = {}
+
+    def __len__(self) -> int:
+        return len(self._deploys)
+
+    def __contains__(self, deployment_id: str) -> bool:
+        return deployment_id in self._deploys
+
+    def get(self, deployment_id: str) -> Optional[Deployment]:
+        return self._deploys.get(deployment_id)
+
+    def add(self, deploy: Deployment):
+        """Inserts a deploy, replacing any earlier version with the same id."""
+        if deploy.timestamp is None:
+            return
+        self.remove(deploy.id)
+        self._deploys[deploy.id] = deploy
+        insort(self._keys.setdefault(deploy.service, []), _key(deploy))
+
+    def remove(self, deployment_id: str):
+        old = self._deploys.pop(deployment_id, None)
+        if old is None:
+            return
+        keys = self._keys[old.service]
+        del keys[bisect_left(keys, _key(old))]
+        if not keys:
+            del self._keys[old.service]
+
+    def between(
+        self,
+        start: datetime,
+        end: datetime,
+        services: Optional[Iterable[str]] = None,
+    ) -> List[Deployment]:
+        """Returns the deploys within [start, end], oldest first."""
+        lo, hi = start.timestamp(), end.timestamp()
+        names = self._keys.keys() if services is None else services
+        found: List[Tuple[float, str]] = []
+        for service in names:
+            keys = self._keys.get(service, [])
+            start_at = bisect_left(keys, lo, key=itemgetter(0))
+            found.extend(keys[start_at : bisect_right(keys, hi, key=itemgetter(0))])
+        found.sort()
+        return [self._deploys[deployment_id] for _, deployment_id in found]
+
+    def prune(self, before: datetime):
+        """Drops the deploys that happened before `before`."""
+        cutoff = before.timestamp()
+        for service in list(self._keys):
+            keys = self._keys[service]
+            stale = bisect_left(keys, cutoff, key=itemgetter(0))
+            for _, deployment_id in keys[:stale]:
+                del self._deploys[deployment_id]
+            del keys[:stale]
+            if not keys:
+                del self._keys[service]
+
+
+def _key(deploy: Deployment) -> Tuple[float, str]:
+    return deploy.timestamp.timestamp(), deploy.id
+
+
+@dataclass(slots=True)
+class RepoCursor:
+    """How far the timeline has caught up with one repository."""
+
+    etag: Optional[str] = None
+    newest_id: int = 0
+
+
+class GitHubDeploymentsConnector(DeploymentProvider):
+    """
+    Connector for deployments recorded through the GitHub Deployments API.
+
+    Lookups within `refresh_interval_seconds` of the last refresh are served
+    from the timeline without any API calls.
+    """
+
+    config_model = GitHubDeploymentsConfig
+
+    def __init__(
+        self, name: str, config: Union[Dict[str, Any], GitHubDeploymentsConfig]
+    ):
+        super().__init__(name, config)
+        self.headers = {
+            "Authorization": f"Bearer {self.validated_config.token.get_secret_value()}",
+            "Accept": "application/vnd.github+json",
+        }
+        self.api_base_url = self.validated_config.api_base_url
+        self.timeline = DeployTimeline()
+        self.cursors: Dict[str, RepoCursor] = {
+            repo: RepoCursor() for repo in self.validated_config.repos
+        }
+        # Which repository each cached deployment belongs to.
+        self._repos: Dict[str, str] = {}
+        # Deploys whose status is unknown or may have moved since it was read.
+        self._stale: Set[str] = set()
+        self._refreshed_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def test_connection(self) -> Tuple[bool, str]:
+        """Checks that the token can list deployments in every repository."""
+        for repo in self.validated_config.repos:
+            try:
+                response = self._request(
+                    "GET",
+                    f"{self.api_base_url}/repos/{repo}/deployments",
+                    headers=self.headers,
+                    params={"per_page": 1},
+                    timeout=10,
+                )
+                response.raise_for_status()
+            except requests.exceptions.HTTPError as e:
+                status = e.response.status_code
+                if status == 401:
+                    return False, "Connection failed: Invalid or expired GitHub token."
+                return False, f"Connection failed: HTTP {status} for '{repo}'."
+            except requests.exceptions.RequestException as e:
+                return False, f"Connection failed: Network error - {e}."
+        repos = len(self.validated_config.repos)
+        return True, f"Successfully listed deployments in {repos} repositories."
+
+    def fetch_recent_deployments(
+        self, hours: float, services: Optional[Sequence[str]] = None
+    ) -> List[Deployment]:
+        """
+        Returns the deploys of the last `hours` (at most `retention_hours`),
+        oldest first, refreshing the timeline if it is stale. Only the
+        returned deploys have their statuses brought up to date.
+        """
+        self.refresh()
+        now = datetime.now(timezone.utc)
+        start = now - timedelta(hours=hours)
+        with self._lock:
+            stale = [
+                (self._repos[deploy.id], deploy)
+                for deploy in self.timeline.between(start, now, services)
+                if deploy.id in self._stale
+            ]
+        self._update_statuses(stale)
+        with self._lock:
+            return self.timeline.between(start, now, services)
+
+    def get_deployment_status(self, deployment_id: str) -> str:
+        """
+        Describes a deployment and its latest status.
+
+        Args:
+            deployment_id (str): Either `owner/repo#id` or the id of a
+                deployment already on the timeline.
+
+        Raises:
+            NotFoundError: If the deployment is unknown.
+            ConnectorError: If the deployment could not be fetched.
+        """
+        repo, _, number = deployment_id.rpartition("#")
+        repo = repo or self._repos.get(number)
+        if not repo:
+            raise NotFoundError(
+                f"Deployment '{deployment_id}' is not in the last "
+                f"{self.validated_config.retention_hours} hours of deploys; "
+                "use 'owner/repo#id'."
+            )
+        item = self._get(f"/repos/{repo}/deployments/{number}", f"deployment {number}")
+        deploy = self._with_status(repo, self._to_deployment(repo, item))
+        creator = (item.get("creator") or {}).get("login", "unknown")
+        line = (
+            f"{repo} deployment {deploy.id} of {deploy.ref} to "
+            f"{deploy.environment}: {deploy.status or 'pending'} (by {creator}"
+        )
+        if deploy.timestamp:
+            line += f", {deploy.timestamp.strftime('%Y-%m-%d %H:%M UTC')}"
+        line += ")"
+        return f"{line}\n  - {deploy.url}" if deploy.url else line
+
+    def refresh(self, force: bool = False):
+        """
+        Brings the timeline up to date unless it was refreshed recently. New
+        deploys are added without a status, and deploys still rolling out
+        are marked for their status to be read again.
+
+        Raises:
+            ConnectorError: If a repository could not be read. Repositories
+                read before the failure keep their updates.
+        """
+        with self._lock:
+            interval = self.validated_config.refresh_interval_seconds
+            fresh = (
+                self._refreshed_at is not None
+                and time.monotonic() - self._refreshed_at < interval
+            )
+            if fresh and not force:
+                return
+            horizon = datetime.now(timezone.utc) - timedelta(
+                hours=self.validated_config.retention_hours
+            )
+            self.timeline.prune(horizon)
+            self._repos = {d: r for d, r in self._repos.items() if d in self.timeline}
+            # Deploys still rolling out are the only ones whose status can move.
+            self._stale = {
+                deployment_id
+                for deployment_id in self._repos
+                if self.timeline.get(deployment_id).status not in FINAL_DEPLOY_STATES
+            }
+            for repo in self.validated_config.repos:
+                self._refresh_repo(repo, horizon)
+            self._refreshed_at = time.monotonic()
+
+    def _refresh_repo(self, repo: str, horizon: datetime):
+        """Reads the deployments created since the last refresh of `repo`."""
+        for item in self._new_deployments(repo, self.cursors[repo], horizon):
+            deploy = self._to_deployment(repo, item)
+            if self._tracked(deploy):
+                self.timeline.add(deploy)
+                if deploy.id in self.timeline:
+                    self._repos[deploy.id] = repo
+                    self._stale.add(deploy.id)
+
+    def _update_statuses(self, deploys: List[Tuple[str, Deployment]]):
+        """
+        Reads the latest status of each (repo, deploy) concurrently, outside
+        the lock, and puts the results on the timeline.
+
+        Raises:
+            ConnectorError: If a status could not be read. The statuses read
+                before the failure are kept.
+        """
+        if not deploys:
+            return
+        workers = min(self.validated_config.max_workers, len(deploys))
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix=f"github-{self.name}"
+        ) as pool:
+            futures = [
+                pool.submit(self._with_status, repo, deploy) for repo, deploy in deploys
+            ]
+        updated = [f.result() for f in futures if f.exception() is None]
+        with self._lock:
+            for deploy in updated:
+                # Pruned while its status was read.
+                if deploy.id in self.timeline:
+                    self.timeline.add(deploy)
+                    self._stale.discard(deploy.id)
+        for future in futures:
+            if future.exception() is not None:
+                raise future.exception()
+
+    def _new_deployments(
+        self, repo: str, cursor: RepoCursor, horizon: datetime
+    ) -> List[Dict[str, Any]]:
+        """
+        Lists the deployments newer than the cursor, newest first, walking
+        pages only until it reaches one it has seen or one past the horizon.
+        """
+        url: Optional[str] = f"{self.api_base_url}/repos/{repo}/deployments"
+        params: Optional[Dict[str, Any]] = {"per_page": 100}
+        headers = dict(self.headers)
+        if cursor.etag:
+            headers["If-None-Match"] = cursor.etag
+        items: List[Dict[str, Any]] = []
+        etag: Optional[str] = None
+        first_page = True
+        while url:
+            response = self._send(url, f"deployments of '{repo}'", headers, params)
+            if response.status_code == 304:
+                return []
+            if first_page:
+                # Only saved once every page is read, or a failure partway
+                # would leave the rest hidden behind a 304.
+                etag = response.headers.get("ETag")
+                headers.pop("If-None-Match", None)
+                first_page = False
+            for item in response.json():
+                created = parse_timestamp(item.get("created_at"))
+                if item["id"] <= cursor.newest_id or (created and created < horizon):
+                    url = None
+                    break
+                items.append(item)
+            else:
+                url = response.links.get("next", {}).get("url")
+            params = None  # The next link carries them.
+        cursor.etag = etag
+        if items:
+            cursor.newest_id = max(item["id"] for item in items)
+        return items
+
+    def _tracked(self, deploy: Deployment) -> bool:
+        environments = self.validated_config.environments
+        return not environments or deploy.environment in environments
+
+    def _with_status(self, repo: str, deploy: Deployment) -> Deployment:
+        """
+        Returns the deploy with its latest status. A successful deploy is
+        timed by when it succeeded, since that is when the change went live.
+        """
+        statuses = self._get(
+            f"/repos/{repo}/deployments/{deploy.id}/statuses",
+            f"statuses of deployment {deploy.id}",
+            {"per_page": 1},
+        )
+        if not statuses:
+            return deploy
+        latest = statuses[0]
+        state = latest.get("state", "")
+        timestamp = deploy.timestamp
+        if state == "success":
+            timestamp = parse_timestamp(latest.get("created_at")) or timestamp
+        url = latest.get("log_url") or latest.get("target_url") or deploy.url
+        return replace(deploy, status=state, timestamp=timestamp, url=url)
+
+    def _to_deployment(self, repo: str, item: Dict[str, Any]) -> Deployment:
+        """Maps a GitHub deployment payload onto a Deployment record."""
+        service = self.validated_config.services.get(repo, repo.rsplit("/", 1)[-1])
+        return Deployment(
+            id=str(item["id"]),
+            service=service,
+            environment=item.get("environment"),
+            timestamp=parse_timestamp(item.get("created_at")),
+            ref=item.get("ref") or item.get("sha", "")[:7],
+        )
+
+    def _get(self, path: str, what: str, params: Optional[Dict[str, Any]] = None):
+        response = self._send(f"{self.api_base_url}{path}", what, self.headers, params)
+        return response.json()
+
+    def _send(
+        self,
+        url: str,
+        what: str,
+        headers: Dict[str, str],
+        params: Optional[Dict[str, Any]],
+    ) -> requests.Response:
+        try:
+            response = self._request(
+                "GET", url, headers=headers, params=params, timeout=15
+            )
+            response.raise_for_status()
+            return response
+        except requests.exceptions.HTTPError as e:
+            status = e.response.status_code
+            if status == 404:
+                raise NotFoundError(f"GitHub has no {what}.", status) from e
+            raise ConnectorError(
+                f"Could not fetch {what}. HTTP {status}.", status
+            ) from e
+        except requests.exceptions.RequestException as e:
+            raise ConnectorError(f"Network issue while fetching {what}: {e}") from e
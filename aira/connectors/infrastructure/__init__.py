@@ -0,0 +1,21 @@
+# aira/connectors/infrastructure/__init__.py
+
+import importlib
+
+# Connector classes are resolved on first access so that importing one
+# connector module does not import its siblings (and their dependencies).
+_LAZY_IMPORTS = {
+    "AWSConnector": ".aws",
+    "KubernetesConnector": ".kubernetes",
+}
+
+# This line explicitly declares which names are part of this package's
+# public interface.
+__all__ = ["AWSConnector", "KubernetesConnector"]
+
+
+def __getattr__(name: str):
+    if name in _LAZY_IMPORTS:
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
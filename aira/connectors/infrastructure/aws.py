@@ -0,0 +1,451 @@
+# aira/connectors/infrastructure/aws.py
+
+"""
+AWS connector: CloudWatch alarms and metrics, CloudTrail changes, and the
+health of ECS services, EC2 instances and RDS databases.
+
+A lookup fans out across the configured regions in parallel, and within a
+region it makes one batched call per API: a single `DescribeAlarms` for all
+firing alarms (cached briefly and shared across lookups), and a single
+`GetMetricData` carrying every metric query. Clients are created once per
+service and region and reused, so their connection pools stay warm.
+"""
+
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from ..base import ConnectorError, InfrastructureProvider, NotFoundError
+from ...config import AWSConfig
+
+# Firing alarms are shared by every lookup in a region for this long.
+ALARM_CACHE_SECONDS = 30.0
+METRIC_WINDOW_MINUTES = 15
+MAX_CHANGES = 5
+
+_ARN = re.compile(
+    r"^arn:aws[\w-]*:(?P<service>[\w-]+):(?P<region>[\w-]*):\d*:(?P<rest>.+)$"
+)
+
+# The CloudWatch metrics worth showing per resource type.
+_METRICS = {
+    "ecs": ("AWS/ECS", ["CPUUtilization", "MemoryUtilization"]),
+    "ec2": ("AWS/EC2", ["CPUUtilization", "StatusCheckFailed"]),
+    "rds": ("AWS/RDS", ["CPUUtilization", "DatabaseConnections", "FreeStorageSpace"]),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class ResourceRef:
+    """A resource named in a trigger, e.g. 'ecs:prod/checkout' or an ARN."""
+
+    kind: str  # 'ecs', 'ec2', 'rds' or 'name' for a bare name
+    id: str
+    region: Optional[str] = None
+
+    @property
+    def name(self) -> str:
+        """The short name CloudTrail and alarm names refer to."""
+        return self.id.rsplit("/", 1)[-1]
+
+
+def parse_resource(resource_id: str) -> ResourceRef:
+    """Parses 'ecs:<cluster>/<service>', 'ec2:<id>', 'rds:<id>', an ARN or a name."""
+    match = _ARN.match(resource_id)
+    if match:
+        service, region, rest = match["service"], match["region"] or None, match["rest"]
+        if service == "ecs" and rest.startswith("service/"):
+            return ResourceRef("ecs", rest[len("service/") :], region)
+        if service == "ec2" and rest.startswith("instance/"):
+            return ResourceRef("ec2", rest[len("instance/") :], region)
+        if service == "rds" and rest.startswith("db:"):
+            return ResourceRef("rds", rest[len("db:") :], region)
+        return ResourceRef("name", re.split(r"[:/]", rest)[-1], region)
+    kind, sep, rest = resource_id.partition(":")
+    if sep and kind in _METRICS:
+        return ResourceRef(kind, rest)
+    if re.fullmatch(r"i-[0-9a-f]{8,17}", resource_id):
+        return ResourceRef("ec2", resource_id)
+    return ResourceRef("name", resource_id)
+
+
+def _client_error(e: Exception, what: str) -> ConnectorError:
+    response = getattr(e, "response", None) or {}
+    status = response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+    return ConnectorError(f"Could not {what}: {e}", status)
+
+
+class AWSConnector(InfrastructureProvider):
+    """
+    Connector for one AWS account across several regions.
+    """
+
+    config_model = AWSConfig
+
+    def __init__(
+        self,
+        name: str,
+        config: Union[Dict[str, Any], AWSConfig],
+        session: Any = None,
+    ):
+        """
+        Args:
+            session: A boto3 Session to use instead of one built from the
+                config (e.g. in tests).
+        """
+        super().__init__(name, config)
+        self._session = session
+        self._clients: Dict[Tuple[str, str], Any] = {}
+        self._alarms: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    # --- Shared clients ---
+
+    def client(self, service: str, region: str) -> Any:
+        """Returns the shared client for a service in a region."""
+        key = (service, region)
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+        with self._lock:
+            if key not in self._clients:
+                import boto3
+                from botocore.config import Config
+
+                settings = self.validated_config
+                if self._session is None:
+                    self._session = boto3.session.Session(profile_name=settings.profile)
+                self._clients[key] = self._session.client(
+                    service,
+                    region_name=region,
+                    endpoint_url=settings.endpoint_url,
+                    config=Config(
+                        max_pool_connections=settings.max_workers,
+                        retries={"max_attempts": 3, "mode": "adaptive"},
+                        connect_timeout=5,
+                        read_timeout=15,
+                    ),
+                )
+            return self._clients[key]
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.validated_config.max_workers,
+                    thread_name_prefix=f"aws-{self.name}",
+                )
+            return self._executor
+
+    def close(self):
+        """Shuts down the lookup threads once their running lookups finish."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def test_connection(self) -> Tuple[bool, str]:
+        """Checks the credentials with STS GetCallerIdentity."""
+        region = self.validated_config.regions[0]
+        try:
+            identity = self.client("sts", region).get_caller_identity()
+            return True, f"Connected to AWS account {identity['Account']}."
+        except Exception as e:
+            return False, f"Connection failed: {e}"
+
+    # --- Lookups ---
+
+    def get_resource_status(self, resource_id: str) -> str:
+        """
+        Summarises a resource's health, firing alarms, key metrics and recent
+        changes, looking in every configured region at once.
+
+        Args:
+            resource_id (str): 'ecs:<cluster>/<service>', 'ec2:<instance-id>',
+                'rds:<db-id>', an ARN, or a bare name (matched against alarm
+                names and CloudTrail resource names).
+
+        Raises:
+            NotFoundError: If no region knows the resource.
+            ConnectorError: If every region failed.
+        """
+        ref = parse_resource(resource_id)
+        regions = [ref.region] if ref.region else self.validated_config.regions
+        parts = {
+            "health": self._health,
+            "alarms": self._matching_alarms,
+            "changes": self._recent_changes,
+        }
+        # Every call is submitted from here, never from a worker, so a full
+        # pool cannot deadlock on nested waits.
+        pending = {
+            region: {
+                part: self.executor.submit(fn, ref, region)
+                for part, fn in parts.items()
+            }
+            for region in regions
+        }
+        results: Dict[str, Dict[str, Any]] = {}
+        failures: List[str] = []
+        for region, futures in pending.items():
+            try:
+                results[region] = {part: f.result() for part, f in futures.items()}
+            except ConnectorError as e:
+                failures.append(f"{region}: {e}")
+        metrics = {
+            region: self.executor.submit(self._metrics, ref, region)
+            for region, result in results.items()
+            if result["health"] is not None
+        }
+
+        lines: List[str] = []
+        for region, result in results.items():
+            try:
+                metric_lines = metrics[region].result() if region in metrics else []
+            except ConnectorError as e:
+                metric_lines = [f"(metrics unavailable: {e})"]
+            lines.extend(self._describe(ref, region, metric_lines, **result))
+        if not lines:
+            if failures and len(failures) == len(regions):
+                raise ConnectorError(
+                    f"AWS lookup of '{resource_id}' failed: {failures[0]}"
+                )
+            raise NotFoundError(f"'{resource_id}' not found in {', '.join(regions)}.")
+        lines.extend(f"  (unavailable: {failure})" for failure in failures)
+        return "\n".join(lines)
+
+    def _describe(
+        self,
+        ref: ResourceRef,
+        region: str,
+        metrics: List[str],
+        health: Optional[str],
+        alarms: List[str],
+        changes: List[str],
+    ) -> List[str]:
+        """Formats one region's findings; empty if the region knows nothing."""
+        if health is None and (ref.kind != "name" or not (alarms or changes)):
+            return []
+        kind = "" if ref.kind == "name" else f"{ref.kind} "
+        header = f"{self.name}: {region} {kind}{ref.id}"
+        lines = [f"{header}: {health}" if health else header]
+        lines.extend(f"  - {line}" for line in alarms + metrics + changes)
+        return lines
+
+    def _health(self, ref: ResourceRef, region: str) -> Optional[str]:
+        if ref.kind == "ecs":
+            return self._ecs_health(ref, region)
+        if ref.kind == "ec2":
+            return self._ec2_health(ref, region)
+        if ref.kind == "rds":
+            return self._rds_health(ref, region)
+        return None
+
+    def _ecs_health(self, ref: ResourceRef, region: str) -> Optional[str]:
+        cluster, _, service = ref.id.rpartition("/")
+        try:
+            response = self.client("ecs", region).describe_services(
+                cluster=cluster or "default", services=[service]
+            )
+        except Exception as e:
+            if "ClusterNotFound" in str(e):
+                return None
+            raise _client_error(e, f"describe ECS service {ref.id}") from e
+        services = [
+            s for s in response.get("services", []) if s.get("status") != "INACTIVE"
+        ]
+        if not services:
+            return None
+        svc = services[0]
+        text = (
+            f"{svc.get('runningCount', 0)}/{svc.get('desiredCount', 0)} tasks running"
+        )
+        if svc.get("pendingCount"):
+            text += f", {svc['pendingCount']} pending"
+        rollouts = [
+            d
+            for d in svc.get("deployments", [])
+            if d.get("rolloutState") not in (None, "COMPLETED")
+        ]
+        if rollouts:
+            text += f", deployment {rollouts[0]['rolloutState']}"
+        events = svc.get("events") or []
+        if events:
+            text += f"; latest event: {events[0].get('message', '')}"
+        return text
+
+    def _ec2_health(self, ref: ResourceRef, region: str) -> Optional[str]:
+        try:
+            response = self.client("ec2", region).describe_instance_status(
+                InstanceIds=[ref.id], IncludeAllInstances=True
+            )
+        except Exception as e:
+            if "InvalidInstanceID" in str(e):
+                return None
+            raise _client_error(e, f"describe EC2 instance {ref.id}") from e
+        statuses = response.get("InstanceStatuses", [])
+        if not statuses:
+            return None
+        status = statuses[0]
+        text = (
+            f"{status.get('InstanceState', {}).get('Name', 'unknown')}, "
+            f"system {status.get('SystemStatus', {}).get('Status', 'unknown')}, "
+            f"instance {status.get('InstanceStatus', {}).get('Status', 'unknown')}"
+        )
+        scheduled = [e.get("Description", "") for e in status.get("Events", [])]
+        if scheduled:
+            text += f"; scheduled: {', '.join(scheduled)}"
+        return text
+
+    def _rds_health(self, ref: ResourceRef, region: str) -> Optional[str]:
+        try:
+            response = self.client("rds", region).describe_db_instances(
+                DBInstanceIdentifier=ref.id
+            )
+        except Exception as e:
+            if "DBInstanceNotFound" in str(e):
+                return None
+            raise _client_error(e, f"describe RDS instance {ref.id}") from e
+        instances = response.get("DBInstances", [])
+        if not instances:
+            return None
+        db = instances[0]
+        text = f"{db.get('DBInstanceStatus', 'unknown')}, {db.get('Engine', '')} {db.get('DBInstanceClass', '')}"
+        if db.get("MultiAZ"):
+            text += ", Multi-AZ"
+        return " ".join(text.split())
+
+    def firing_alarms(self, region: str) -> List[Dict[str, Any]]:
+        """
+        Every alarm in the ALARM state in a region, fetched with one paginated
+        DescribeAlarms call and shared by lookups for `ALARM_CACHE_SECONDS`.
+        """
+        now = time.monotonic()
+        cached = self._alarms.get(region)
+        if cached and now - cached[0] < ALARM_CACHE_SECONDS:
+            return cached[1]
+        params: Dict[str, Any] = {
+            "StateValue": "ALARM",
+            "AlarmTypes": ["MetricAlarm", "CompositeAlarm"],
+        }
+        if self.validated_config.alarm_name_prefix:
+            params["AlarmNamePrefix"] = self.validated_config.alarm_name_prefix
+        alarms: List[Dict[str, Any]] = []
+        try:
+            paginator = self.client("cloudwatch", region).get_paginator(
+                "describe_alarms"
+            )
+            for page in paginator.paginate(**params):
+                alarms.extend(page.get("MetricAlarms", []))
+                alarms.extend(page.get("CompositeAlarms", []))
+        except Exception as e:
+            raise _client_error(e, "describe CloudWatch alarms") from e
+        self._alarms[region] = (now, alarms)
+        return alarms
+
+    def _matching_alarms(self, ref: ResourceRef, region: str) -> List[str]:
+        needle = ref.name.lower()
+        lines = []
+        for alarm in self.firing_alarms(region):
+            dimensions = " ".join(
+                d.get("Value", "") for d in alarm.get("Dimensions", [])
+            )
+            if needle in f"{alarm.get('AlarmName', '')} {dimensions}".lower():
+                since = alarm.get("StateUpdatedTimestamp")
+                when = (
+                    f" since {since:%H:%M} UTC" if isinstance(since, datetime) else ""
+                )
+                reason = alarm.get("StateReason", "")
+                lines.append(f"ALARM {alarm.get('AlarmName')}{when}: {reason}")
+        return lines
+
+    def _metric_dimensions(self, ref: ResourceRef) -> List[Dict[str, str]]:
+        if ref.kind == "ecs":
+            cluster, _, service = ref.id.rpartition("/")
+            return [
+                {"Name": "ClusterName", "Value": cluster or "default"},
+                {"Name": "ServiceName", "Value": service},
+            ]
+        if ref.kind == "ec2":
+            return [{"Name": "InstanceId", "Value": ref.id}]
+        return [{"Name": "DBInstanceIdentifier", "Value": ref.id}]
+
+    def _metrics(self, ref: ResourceRef, region: str) -> List[str]:
+        """Fetches every metric of `ref` with a single GetMetricData call."""
+        namespace, names = _METRICS[ref.kind]
+        dimensions = self._metric_dimensions(ref)
+        queries = []
+        for i, metric in enumerate(names):
+            for stat in ("Average", "Maximum"):
+                queries.append(
+                    {
+                        "Id": f"m{i}{stat[:3].lower()}",
+                        "Label": f"{metric} {stat}",
+                        "MetricStat": {
+                            "Metric": {
+                                "Namespace": namespace,
+                                "MetricName": metric,
+                                "Dimensions": dimensions,
+                            },
+                            "Period": 60 * METRIC_WINDOW_MINUTES,
+                            "Stat": stat,
+                        },
+                    }
+                )
+        end = datetime.now(timezone.utc)
+        try:
+            response = self.client("cloudwatch", region).get_metric_data(
+                MetricDataQueries=queries,
+                StartTime=end - timedelta(minutes=METRIC_WINDOW_MINUTES),
+                EndTime=end,
+            )
+        except Exception as e:
+            raise _client_error(e, "fetch CloudWatch metrics") from e
+        values = {
+            r["Label"]: r["Values"][0]
+            for r in response.get("MetricDataResults", [])
+            if r.get("Values")
+        }
+        lines = []
+        for metric in names:
+            avg, peak = values.get(f"{metric} Average"), values.get(f"{metric} Maximum")
+            if avg is not None:
+                lines.append(
+                    f"{metric} avg {avg:.1f}, max {peak if peak is not None else avg:.1f} "
+                    f"(last {METRIC_WINDOW_MINUTES}m)"
+                )
+        return lines
+
+    def _recent_changes(self, ref: ResourceRef, region: str) -> List[str]:
+        """Recent write API calls on the resource, from CloudTrail."""
+        end = datetime.now(timezone.utc)
+        start = end - timedelta(minutes=self.validated_config.change_window_minutes)
+        try:
+            response = self.client("cloudtrail", region).lookup_events(
+                LookupAttributes=[
+                    {"AttributeKey": "ResourceName", "AttributeValue": ref.name}
+                ],
+                StartTime=start,
+                EndTime=end,
+                MaxResults=20,
+            )
+        except Exception as e:
+            raise _client_error(e, "look up CloudTrail events") from e
+        lines = []
+        for event in response.get("Events", []):
+            if event.get("ReadOnly") == "true":
+                continue
+            when = event.get("EventTime")
+            when = f" at {when:%H:%M} UTC" if isinstance(when, datetime) else ""
+            lines.append(
+                f"Change: {event.get('EventName')} by {event.get('Username', 'unknown')}{when}"
+            )
+            if len(lines) == MAX_CHANGES:
+                break
+        return lines
@@ -0,0 +1,641 @@
+# aira/connectors/infrastructure/kubernetes.py
+
+"""
+Kubernetes connector backed by informer-style caches.
+
+Instead of querying the API server for every incident, the connector lists
+pods, deployments and events once and then follows their watch streams,
+keeping a compact in-memory copy. Per-workload health (ready pods, restarts,
+crash loops, OOM kills) is updated as pod events arrive, so a status lookup
+during an incident is a dictionary read. One connection per cluster keeps
+the API load flat however many incidents are analyzed.
+"""
+
+import functools
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from ..base import ConnectorError, InfrastructureProvider, NotFoundError
+from ..records import parse_timestamp
+from ...config import KubernetesConfig
+
+# Container waiting reasons that mean a pod cannot become ready on its own.
+FAILING_REASONS = frozenset(
+    {
+        "CrashLoopBackOff",
+        "ImagePullBackOff",
+        "ErrImagePull",
+        "CreateContainerConfigError",
+        "CreateContainerError",
+        "RunContainerError",
+        "InvalidImageName",
+    }
+)
+# How long a watch request stays open before it is renewed.
+WATCH_TIMEOUT_SECONDS = 300
+# At most this many warning events are kept per cluster.
+MAX_EVENTS = 5_000
+HTTP_GONE = 410
+
+
+@dataclass(frozen=True, slots=True)
+class PodState:
+    """The parts of a pod that matter for health."""
+
+    namespace: str
+    name: str
+    workload: str
+    phase: str
+    ready: bool
+    restarts: int
+    # The first container waiting reason that blocks readiness, if any.
+    failing_reason: Optional[str] = None
+    oom_killed: bool = False
+    node: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class DeploymentState:
+    namespace: str
+    name: str
+    desired: int
+    ready: int
+    updated: int
+    available: int
+    # True while a rollout has not finished.
+    progressing: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class KubeEvent:
+    namespace: str
+    kind: str
+    name: str
+    reason: str
+    message: str
+    count: int = 1
+    last_seen: Optional[datetime] = None
+
+
+@dataclass
+class WorkloadHealth:
+    """Pod counters for one workload, maintained as pod events arrive."""
+
+    namespace: str
+    name: str
+    pods: int = 0
+    ready: int = 0
+    restarts: int = 0
+    crash_looping: int = 0
+    oom_killed: int = 0
+    failing_reasons: Dict[str, int] = field(default_factory=dict)
+
+    def apply(self, pod: PodState, sign: int):
+        self.pods += sign
+        self.ready += sign * pod.ready
+        self.restarts += sign * pod.restarts
+        self.oom_killed += sign * pod.oom_killed
+        if pod.failing_reason:
+            self.crash_looping += sign * (pod.failing_reason == "CrashLoopBackOff")
+            count = self.failing_reasons.get(pod.failing_reason, 0) + sign
+            if count:
+                self.failing_reasons[pod.failing_reason] = count
+            else:
+                self.failing_reasons.pop(pod.failing_reason, None)
+
+    @property
+    def healthy(self) -> bool:
+        return self.ready == self.pods and not self.failing_reasons
+
+
+def _key(namespace: str, name: str) -> str:
+    return f"{namespace}/{name}"
+
+
+def _workload_name(pod: Dict[str, Any]) -> str:
+    """Names the workload that owns a pod, following ReplicaSets to Deployments."""
+    metadata = pod.get("metadata") or {}
+    for owner in metadata.get("ownerReferences") or []:
+        if not owner.get("controller", True):
+            continue
+        name = owner.get("name", "")
+        template_hash = (metadata.get("labels") or {}).get("pod-template-hash")
+        if owner.get("kind") == "ReplicaSet" and template_hash:
+            return re.sub(rf"-{re.escape(template_hash)}$", "", name)
+        return name
+    return metadata.get("name", "")
+
+
+def to_pod_state(pod: Dict[str, Any]) -> PodState:
+    """Reduces a pod (as returned by the API) to a PodState."""
+    metadata = pod.get("metadata") or {}
+    spec = pod.get("spec") or {}
+    status = pod.get("status") or {}
+    statuses = status.get("containerStatuses") or []
+    failing_reason = None
+    oom_killed = False
+    for container in statuses:
+        waiting = (container.get("state") or {}).get("waiting") or {}
+        if failing_reason is None and waiting.get("reason") in FAILING_REASONS:
+            failing_reason = waiting["reason"]
+        for state in (container.get("state") or {}, container.get("lastState") or {}):
+            terminated = state.get("terminated") or {}
+            oom_killed = oom_killed or terminated.get("reason") == "OOMKilled"
+    phase = status.get("phase", "Unknown")
+    return PodState(
+        namespace=metadata.get("namespace", ""),
+        name=metadata.get("name", ""),
+        workload=_workload_name(pod),
+        phase=phase,
+        ready=phase == "Running" and all(c.get("ready") for c in statuses),
+        restarts=sum(c.get("restartCount", 0) for c in statuses),
+        failing_reason=failing_reason,
+        oom_killed=oom_killed,
+        node=spec.get("nodeName"),
+    )
+
+
+def to_deployment_state(deployment: Dict[str, Any]) -> DeploymentState:
+    metadata = deployment.get("metadata") or {}
+    status = deployment.get("status") or {}
+    desired = (deployment.get("spec") or {}).get("replicas", 1)
+    updated = status.get("updatedReplicas", 0)
+    return DeploymentState(
+        namespace=metadata.get("namespace", ""),
+        name=metadata.get("name", ""),
+        desired=desired,
+        ready=status.get("readyReplicas", 0),
+        updated=updated,
+        available=status.get("availableReplicas", 0),
+        progressing=updated < desired
+        or status.get("observedGeneration", 0) < metadata.get("generation", 0),
+    )
+
+
+def to_event(event: Dict[str, Any]) -> KubeEvent:
+    metadata = event.get("metadata") or {}
+    involved = event.get("involvedObject") or {}
+    return KubeEvent(
+        namespace=metadata.get("namespace", ""),
+        kind=involved.get("kind", ""),
+        name=involved.get("name", ""),
+        reason=event.get("reason", ""),
+        message=" ".join((event.get("message") or "").split()),
+        count=event.get("count") or 1,
+        last_seen=parse_timestamp(event.get("lastTimestamp") or event.get("eventTime")),
+    )
+
+
+class ClusterCache:
+    """
+    The in-memory state of one cluster. Informers feed it; lookups read it.
+    All methods are thread-safe.
+    """
+
+    def __init__(self, max_events: int = MAX_EVENTS):
+        self.max_events = max_events
+        self._lock = threading.Lock()
+        self.pods: Dict[str, PodState] = {}
+        self.deployments: Dict[str, DeploymentState] = {}
+        self.events: "OrderedDict[str, KubeEvent]" = OrderedDict()
+        self.workloads: Dict[str, WorkloadHealth] = {}
+
+    # --- Updates (called by informers) ---
+
+    def apply(self, kind: str, event_type: str, obj: Dict[str, Any]):
+        """Applies one watch event (ADDED, MODIFIED or DELETED)."""
+        metadata = obj.get("metadata") or {}
+        key = _key(metadata.get("namespace", ""), metadata.get("name", ""))
+        deleted = event_type == "DELETED"
+        with self._lock:
+            if kind == "pods":
+                self._set_pod(key, None if deleted else to_pod_state(obj))
+            elif kind == "deployments":
+                if deleted:
+                    self.deployments.pop(key, None)
+                else:
+                    self.deployments[key] = to_deployment_state(obj)
+            elif kind == "events":
+                self._set_event(metadata.get("uid") or key, obj, deleted)
+
+    def replace(
+        self, kind: str, objects: Iterable[Dict[str, Any]], namespace: str = ""
+    ):
+        """Replaces everything of `kind` (in `namespace`, if given) after a relist."""
+        objects = list(objects)
+        with self._lock:
+            if kind == "pods":
+                fresh = {}
+                for obj in objects:
+                    pod = to_pod_state(obj)
+                    fresh[_key(pod.namespace, pod.name)] = pod
+                for key in [k for k in self.pods if _in(k, namespace)]:
+                    if key not in fresh:
+                        self._set_pod(key, None)
+                for key, pod in fresh.items():
+                    self._set_pod(key, pod)
+            elif kind == "deployments":
+                for key in [k for k in self.deployments if _in(k, namespace)]:
+                    del self.deployments[key]
+                for obj in objects:
+                    deployment = to_deployment_state(obj)
+                    key = _key(deployment.namespace, deployment.name)
+                    self.deployments[key] = deployment
+            elif kind == "events":
+                for key in [
+                    k
+                    for k, e in self.events.items()
+                    if not namespace or e.namespace == namespace
+                ]:
+                    del self.events[key]
+                for obj in objects:
+                    metadata = obj.get("metadata") or {}
+                    self._set_event(
+                        metadata.get("uid") or metadata.get("name"), obj, False
+                    )
+
+    def _set_pod(self, key: str, pod: Optional[PodState]):
+        old = self.pods.pop(key, None)
+        if old is not None:
+            health = self.workloads[_key(old.namespace, old.workload)]
+            health.apply(old, -1)
+            if not health.pods:
+                del self.workloads[_key(old.namespace, old.workload)]
+        if pod is not None:
+            self.pods[key] = pod
+            workload = _key(pod.namespace, pod.workload)
+            health = self.workloads.get(workload)
+            if health is None:
+                health = self.workloads[workload] = WorkloadHealth(
+                    pod.namespace, pod.workload
+                )
+            health.apply(pod, 1)
+
+    def _set_event(self, key: str, obj: Dict[str, Any], deleted: bool):
+        self.events.pop(key, None)
+        # Normal events (scheduled, pulled, started...) are not worth keeping.
+        if deleted or obj.get("type") != "Warning":
+            return
+        self.events[key] = to_event(obj)
+        while len(self.events) > self.max_events:
+            self.events.popitem(last=False)
+
+    # --- Lookups ---
+
+    def workload(
+        self, namespace: Optional[str], name: str
+    ) -> Tuple[Optional[WorkloadHealth], Optional[DeploymentState]]:
+        """
+        Finds a workload by name, in any namespace when `namespace` is None.
+        Returns a copy of its pod counters and its deployment, if either exists.
+        """
+        with self._lock:
+            if namespace is not None:
+                key = _key(namespace, name)
+                health = self.workloads.get(key)
+                return (health and _copy(health)), self.deployments.get(key)
+            for key, health in self.workloads.items():
+                if _matches(key, name):
+                    return _copy(health), self.deployments.get(key)
+            for key, deployment in self.deployments.items():
+                if _matches(key, name):
+                    return None, deployment
+        return None, None
+
+    def unhealthy_workloads(self) -> List[WorkloadHealth]:
+        with self._lock:
+            return [_copy(h) for h in self.workloads.values() if not h.healthy]
+
+    def recent_events(
+        self, namespace: str, names: Iterable[str], since: datetime, limit: int = 5
+    ) -> List[KubeEvent]:
+        """Warning events for the given objects (matched by prefix), newest first."""
+        prefixes = tuple(names)
+        with self._lock:
+            events = [
+                e
+                for e in self.events.values()
+                if e.namespace == namespace
+                and e.name.startswith(prefixes)
+                and (e.last_seen is None or e.last_seen >= since)
+            ]
+        events.sort(key=lambda e: e.last_seen or since, reverse=True)
+        return events[:limit]
+
+
+def _in(key: str, namespace: str) -> bool:
+    return not namespace or key.startswith(f"{namespace}/")
+
+
+def _matches(key: str, name: str) -> bool:
+    return key.partition("/")[2] == name
+
+
+def _copy(health: WorkloadHealth) -> WorkloadHealth:
+    return WorkloadHealth(
+        health.namespace,
+        health.name,
+        health.pods,
+        health.ready,
+        health.restarts,
+        health.crash_looping,
+        health.oom_killed,
+        dict(health.failing_reasons),
+    )
+
+
+class Informer:
+    """
+    Keeps one kind of object in a ClusterCache current: lists it, then
+    follows its watch stream from the listed resourceVersion, relisting when
+    the server says that version is too old (HTTP 410).
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        list_fn: Callable[..., Any],
+        cache: ClusterCache,
+        namespace: str = "",
+        watch_factory: Optional[Callable[[], Any]] = None,
+        max_backoff: float = 60.0,
+    ):
+        """
+        Args:
+            kind (str): 'pods', 'deployments' or 'events'.
+            list_fn (Callable): The API list function, e.g.
+                CoreV1Api.list_pod_for_all_namespaces.
+            cache (ClusterCache): The cache to keep current.
+            namespace (str): The namespace `list_fn` is bound to, if any.
+            watch_factory (Callable): Builds a kubernetes.watch.Watch.
+            max_backoff (float): The longest pause after repeated failures.
+        """
+        self.kind = kind
+        self.list_fn = list_fn
+        self.cache = cache
+        self.namespace = namespace
+        if watch_factory is None:
+            from kubernetes import watch
+
+            watch_factory = watch.Watch
+        self.watch_factory = watch_factory
+        self.max_backoff = max_backoff
+        self.synced = threading.Event()
+        self.resource_version: Optional[str] = None
+        self.last_error: Optional[str] = None
+
+    def list(self):
+        """Lists every object and replaces the cached copies."""
+        response = self.list_fn(_preload_content=False)
+        body = json.loads(response.data)
+        self.cache.replace(self.kind, body.get("items") or [], self.namespace)
+        self.resource_version = (body.get("metadata") or {}).get("resourceVersion")
+        self.synced.set()
+
+    def watch_once(self):
+        """Follows the watch stream until the server closes it."""
+        watcher = self.watch_factory()
+        for event in watcher.stream(
+            self.list_fn,
+            resource_version=self.resource_version,
+            timeout_seconds=WATCH_TIMEOUT_SECONDS,
+            allow_watch_bookmarks=True,
+        ):
+            obj = event.get("raw_object") or {}
+            version = (obj.get("metadata") or {}).get("resourceVersion")
+            if event["type"] != "BOOKMARK":
+                self.cache.apply(self.kind, event["type"], obj)
+            if version:
+                self.resource_version = version
+
+    def run(self, stop: threading.Event):
+        """Lists and watches until `stop` is set, backing off on errors."""
+        failures = 0
+        while not stop.is_set():
+            try:
+                if self.resource_version is None:
+                    self.list()
+                self.watch_once()
+                failures = 0
+            except Exception as e:
+                if getattr(e, "status", None) == HTTP_GONE:
+                    # Our version fell out of the server's window: relist.
+                    self.resource_version = None
+                    continue
+                failures += 1
+                self.last_error = str(e)
+                # Relist after an error: events may have been missed.
+                self.resource_version = None
+                stop.wait(min(2**failures, self.max_backoff))
+
+
+class KubernetesConnector(InfrastructureProvider):
+    """
+    Connector for one Kubernetes cluster.
+
+    Informers start on first use and run in daemon threads for the life of
+    the process, so long-running deployments answer from warm caches.
+    """
+
+    config_model = KubernetesConfig
+
+    def __init__(
+        self,
+        name: str,
+        config: Union[Dict[str, Any], KubernetesConfig],
+        api_client: Any = None,
+    ):
+        """
+        Args:
+            api_client: A kubernetes.client.ApiClient to use instead of one
+                built from the kubeconfig (e.g. in tests).
+        """
+        super().__init__(name, config)
+        self._api_client = api_client
+        self.cache = ClusterCache()
+        self.informers: List[Informer] = []
+        self._stop = threading.Event()
+        self._start_lock = threading.Lock()
+
+    @property
+    def api_client(self) -> Any:
+        if self._api_client is None:
+            from kubernetes import client
+            from kubernetes import config as kube_config
+
+            settings = self.validated_config
+            if settings.in_cluster:
+                configuration = client.Configuration()
+                kube_config.load_incluster_config(client_configuration=configuration)
+                self._api_client = client.ApiClient(configuration)
+            else:
+                self._api_client = kube_config.new_client_from_config(
+                    config_file=settings.kubeconfig, context=settings.context
+                )
+        return self._api_client
+
+    def test_connection(self) -> Tuple[bool, str]:
+        """Checks that the API server is reachable with the configured credentials."""
+        from kubernetes import client
+
+        try:
+            version = client.VersionApi(self.api_client).get_code()
+            return True, f"Connected to Kubernetes {version.git_version}."
+        except Exception as e:
+            return False, f"Connection failed: {e}"
+
+    def _build_informers(self) -> List[Informer]:
+        from kubernetes import client
+
+        core = client.CoreV1Api(self.api_client)
+        apps = client.AppsV1Api(self.api_client)
+        namespaces = self.validated_config.namespaces
+        informers = []
+        if not namespaces:
+            listers = {
+                "pods": core.list_pod_for_all_namespaces,
+                "deployments": apps.list_deployment_for_all_namespaces,
+                "events": core.list_event_for_all_namespaces,
+            }
+            return [Informer(k, f, self.cache) for k, f in listers.items()]
+        for namespace in namespaces:
+            listers = {
+                "pods": core.list_namespaced_pod,
+                "deployments": apps.list_namespaced_deployment,
+                "events": core.list_namespaced_event,
+            }
+            for kind, list_fn in listers.items():
+                bound = _bind_namespace(list_fn, namespace)
+                informers.append(Informer(kind, bound, self.cache, namespace))
+        return informers
+
+    def start(self, wait: bool = True) -> bool:
+        """
+        Starts the informers if they are not running yet.
+
+        Args:
+            wait (bool): Block until every cache holds its initial list, or
+                until `sync_timeout_seconds` expires.
+
+        Returns:
+            bool: True if every cache is synced.
+        """
+        with self._start_lock:
+            if not self.informers:
+                self.informers = self._build_informers()
+                for informer in self.informers:
+                    threading.Thread(
+                        target=informer.run,
+                        args=(self._stop,),
+                        name=f"k8s-{self.name}-{informer.kind}",
+                        daemon=True,
+                    ).start()
+        if not wait:
+            return self.synced
+        deadline = time.monotonic() + self.validated_config.sync_timeout_seconds
+        for informer in self.informers:
+            if not informer.synced.wait(max(deadline - time.monotonic(), 0)):
+                return False
+        return True
+
+    @property
+    def synced(self) -> bool:
+        return bool(self.informers) and all(i.synced.is_set() for i in self.informers)
+
+    def stop(self):
+        self._stop.set()
+
+    def close(self):
+        """Stops the informers' watch threads."""
+        self.stop()
+
+    def _ensure_synced(self):
+        if not self.start(wait=True):
+            errors = {i.last_error for i in self.informers if i.last_error}
+            raise ConnectorError(
+                f"Kubernetes caches for '{self.name}' are not synced"
+                + (f": {'; '.join(sorted(errors))}" if errors else ".")
+            )
+
+    def get_resource_status(self, resource_id: str) -> str:
+        """
+        Summarises the health of a workload from the caches.
+
+        Args:
+            resource_id (str): A workload name, optionally prefixed by its
+                namespace ('payments/checkout').
+
+        Raises:
+            NotFoundError: If no such workload is running in the cluster.
+            ConnectorError: If the caches could not be filled.
+        """
+        self._ensure_synced()
+        namespace, _, name = resource_id.rpartition("/")
+        health, deployment = self.cache.workload(namespace or None, name)
+        if health is None and deployment is None:
+            raise NotFoundError(
+                f"No workload '{resource_id}' in cluster '{self.name}'."
+            )
+        namespace = (health or deployment).namespace
+        return self._describe(namespace, name, health, deployment)
+
+    def get_unhealthy_workloads(self) -> List[WorkloadHealth]:
+        """Returns every workload with unready or failing pods."""
+        self._ensure_synced()
+        return self.cache.unhealthy_workloads()
+
+    def _describe(
+        self,
+        namespace: str,
+        name: str,
+        health: Optional[WorkloadHealth],
+        deployment: Optional[DeploymentState],
+    ) -> str:
+        parts = []
+        if deployment is not None:
+            parts.append(
+                f"{deployment.ready}/{deployment.desired} replicas ready, "
+                f"{deployment.updated} updated"
+                + (", rollout in progress" if deployment.progressing else "")
+            )
+        if health is not None:
+            if deployment is None:
+                parts.append(f"{health.ready}/{health.pods} pods ready")
+            if health.restarts:
+                parts.append(f"{health.restarts} restarts")
+            if health.oom_killed:
+                parts.append(f"{health.oom_killed} pod(s) OOMKilled")
+            parts.extend(
+                f"{count} pod(s) in {reason}"
+                for reason, count in sorted(health.failing_reasons.items())
+            )
+        lines = [f"{self.name}: {namespace}/{name}: {', '.join(parts)}"]
+
+        since = datetime.now(timezone.utc) - timedelta(
+            minutes=self.validated_config.event_window_minutes
+        )
+        for event in self.cache.recent_events(namespace, [name], since):
+            count = f" (x{event.count})" if event.count > 1 else ""
+            lines.append(
+                f"  - {event.reason}{count} on {event.kind} {event.name}: {event.message}"
+            )
+        return "\n".join(lines)
+
+
+def _bind_namespace(list_fn: Callable[..., Any], namespace: str) -> Callable[..., Any]:
+    """
+    Binds the namespace of a namespaced list call. The docstring is kept
+    because the watch reads the return type from it.
+    """
+
+    @functools.wraps(list_fn)
+    def bound(*args, **kwargs):
+        return list_fn(namespace, *args, **kwargs)
+
+    return bound
@@ -1,7 +1,22 @@
 # aira/connectors/obervability/__init__.py
 
-from .datadog import DatadogConnector
+import importlib
+
+# Connector classes are resolved on first access so that importing one
+# connector module does not import its siblings (and their dependencies).
+_LAZY_IMPORTS = {
+    "DatadogConnector": ".datadog",
+    "LokiConnector": ".loki",
+    "PrometheusConnector": ".prometheus",
+}
 
 # This line explicitly declares which names are part of this package's
-# public interface, silencing the "unused import" warning.
-__all__ = ["DatadogConnector"]
+# public interface.
+__all__ = ["DatadogConnector", "LokiConnector", "PrometheusConnector"]
+
+
+def __getattr__(name: str):
+    if name in _LAZY_IMPORTS:
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
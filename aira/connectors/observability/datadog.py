@@ -1,8 +1,9 @@
 import requests
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Tuple, List, Union
 from datetime import datetime, timedelta, timezone
 
-from ..base import ObservabilityProvider
+from ..base import ObservabilityProvider, ConnectorError
+from ..records import LogEvent, parse_timestamp
 from ...config import DatadogConfig
 
 
@@ -11,13 +12,17 @@ class DatadogConnector(ObservabilityProvider):
     Connector for interacting with the Datadog API.
     """
 
-    def __init__(self, name: str, config: Dict[str, Any]):
+    config_model = DatadogConfig
+
+    def __init__(self, name: str, config: Union[Dict[str, Any], DatadogConfig]):
         """
         Initializes the connector and validates its specific configuration.
         """
         super().__init__(name, config)
-        self.validated_config = DatadogConfig(**self.config)
-        self.api_base_url = f"https://api.{self.validated_config.site}"
+        self.api_base_url = (
+            self.validated_config.api_base_url
+            or f"https://api.{self.validated_config.site}"
+        ).rstrip("/")
         self.headers = {
             "DD-API-KEY": self.validated_config.api_key.get_secret_value(),
             "DD-APPLICATION-KEY": self.validated_config.app_key.get_secret_value(),
@@ -30,8 +35,11 @@ class DatadogConnector(ObservabilityProvider):
         """
         try:
             # The validate endpoint is designed for this purpose
-            response = requests.get(
-                f"{self.api_base_url}/api/v1/validate", headers=self.headers, timeout=10
+            response = self._request(
+                "GET",
+                f"{self.api_base_url}/api/v1/validate",
+                headers=self.headers,
+                timeout=10,
             )
             response.raise_for_status()
             if response.json().get("valid"):
@@ -48,16 +56,16 @@ class DatadogConnector(ObservabilityProvider):
         except requests.exceptions.RequestException as e:
             return False, f"Connection failed: Network error - {e}."
 
-    def fetch_logs(self, query: str, time_window_minutes: int = 15) -> str:
+    def fetch_logs(self, query: str, time_window_minutes: int = 15) -> List[LogEvent]:
         """
-        Fetches and formats logs from Datadog Logs.
+        Fetches logs from Datadog Logs, newest first.
 
         Args:
             query (str): The search query to execute (e.g., 'service:api-checkout status:error').
             time_window_minutes (int): The number of minutes to look back for logs.
 
         Returns:
-            A formatted string of log lines or an error/empty message.
+            A list of LogEvent records, empty if nothing matched.
         """
         url = f"{self.api_base_url}/api/v2/logs/events/search"
         print(f"-> Fetching logs from Datadog with query: '{query}'...")
@@ -78,22 +86,31 @@ class DatadogConnector(ObservabilityProvider):
         }
 
         try:
-            response = requests.post(
-                url, headers=self.headers, json=payload, timeout=15
+            response = self._request(
+                "POST", url, headers=self.headers, json=payload, timeout=15
             )
             response.raise_for_status()
             logs = response.json().get("data", [])
-
-            if not logs:
-                return f"No logs found in Datadog for query '{query}' in the last {time_window_minutes} minutes."
-
-            summaries = [
-                f"- [{log['attributes'].get('status', 'INFO').upper()}] {log['attributes'].get('message', '')}"
-                for log in logs
-            ]
             print(f"   ...found {len(logs)} log entries.")
-            return "\n".join(summaries)
+            return [self._to_log_event(log) for log in logs]
         except requests.exceptions.HTTPError as e:
-            return f"Error: Could not fetch logs from Datadog. HTTP {e.response.status_code}."
+            status = e.response.status_code
+            raise ConnectorError(
+                f"Could not fetch logs from Datadog. HTTP {status}.", status
+            ) from e
         except requests.exceptions.RequestException as e:
-            return f"Error: Network issue while fetching logs from Datadog: {e}"
+            raise ConnectorError(
+                f"Network issue while fetching logs from Datadog: {e}"
+            ) from e
+
+    @staticmethod
+    def _to_log_event(log: Dict[str, Any]) -> LogEvent:
+        """Maps a Datadog log payload onto a LogEvent record."""
+        attributes = log.get("attributes", {})
+        return LogEvent(
+            message=attributes.get("message", ""),
+            status=attributes.get("status", "info"),
+            timestamp=parse_timestamp(attributes.get("timestamp")),
+            service=attributes.get("service"),
+            host=attributes.get("host"),
+        )
@@ -0,0 +1,121 @@
+# aira/connectors/observability/loki.py
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Union
+
+from ..base import ConnectorError
+from ..records import LogEvent
+from ...config import LokiConfig
+from .query_api import QueryAPIConnector
+
+
+class LokiConnector(QueryAPIConnector):
+    """
+    Connector for Grafana Loki.
+
+    Log queries are LogQL log queries such as `{app="checkout"} |= "error"`.
+    Only the newest `max_lines` lines are downloaded; the volume behind them
+    is counted on the server with `count_over_time` and reported per
+    service and level.
+    """
+
+    config_model = LokiConfig
+    display_name = "Loki"
+    ready_path = "/ready"
+
+    def __init__(self, name: str, config: Union[Dict[str, Any], LokiConfig]):
+        super().__init__(name, config)
+        if self.validated_config.tenant_id:
+            self.headers["X-Scope-OrgID"] = self.validated_config.tenant_id
+
+    def fetch_logs(self, query: str, time_window_minutes: int = 15) -> List[LogEvent]:
+        """
+        Fetches log lines matching a LogQL query.
+
+        Returns:
+            List[LogEvent]: One summary per (service, level) group with the
+            most lines, busiest first, followed by the newest lines.
+
+        Raises:
+            ConnectorError: If the query failed or is not a log query.
+        """
+        print(f"-> Fetching logs from Loki with query: '{query}'...")
+        settings = self.validated_config
+        end = datetime.now(timezone.utc)
+        start = end - timedelta(minutes=time_window_minutes)
+
+        data = self._query(
+            "/loki/api/v1/query_range",
+            {
+                "query": query,
+                "start": _nanoseconds(start),
+                "end": _nanoseconds(end),
+                "limit": settings.max_lines,
+                "direction": "backward",
+            },
+        )
+        if data.get("resultType") != "streams":
+            raise ConnectorError(
+                f"Loki query '{query}' is a metric query; a log query is expected."
+            )
+        lines = [
+            self._to_log_event(stream.get("stream", {}), value)
+            for stream in data.get("result", [])
+            for value in stream.get("values", [])
+        ]
+        lines.sort(key=lambda e: e.timestamp, reverse=True)
+        lines = lines[: settings.max_lines]
+        print(f"   ...found {len(lines)} log lines.")
+        if not lines or not settings.max_groups:
+            return lines
+        return self._count_groups(query, time_window_minutes, end) + lines
+
+    def _count_groups(self, query: str, minutes: int, end: datetime) -> List[LogEvent]:
+        """Counts the matching lines of the busiest groups on the server."""
+        settings = self.validated_config
+        labels = f"{settings.service_label}, {settings.level_label}"
+        data = self._query(
+            "/loki/api/v1/query",
+            {
+                "query": (
+                    f"topk({settings.max_groups}, sum by ({labels}) "
+                    f"(count_over_time({query} [{minutes}m])))"
+                ),
+                "time": _nanoseconds(end),
+            },
+        )
+        groups = sorted(
+            data.get("result", []), key=lambda g: float(g["value"][1]), reverse=True
+        )
+        events = []
+        for group in groups:
+            metric = group.get("metric", {})
+            service = metric.get(settings.service_label)
+            level = metric.get(settings.level_label) or "info"
+            count = int(float(group["value"][1]))
+            events.append(
+                LogEvent(
+                    message=(
+                        f"{service or 'unknown service'}: {count} {level} lines "
+                        f"in the last {minutes} minutes"
+                    ),
+                    status=level,
+                    service=service,
+                )
+            )
+        return events
+
+    def _to_log_event(self, labels: Dict[str, str], value: List[str]) -> LogEvent:
+        """Maps a Loki stream entry onto a LogEvent record."""
+        settings = self.validated_config
+        return LogEvent(
+            message=value[1],
+            status=labels.get(settings.level_label) or labels.get("level") or "info",
+            timestamp=datetime.fromtimestamp(int(value[0]) / 1e9, tz=timezone.utc),
+            service=labels.get(settings.service_label) or labels.get("job"),
+            host=labels.get("host") or labels.get("instance"),
+        )
+
+
+def _nanoseconds(moment: datetime) -> int:
+    return int(moment.timestamp() * 1_000_000_000)
@@ -0,0 +1,148 @@
+# aira/connectors/observability/prometheus.py
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Sequence, Tuple
+
+from ..records import LogEvent
+from ...config import PrometheusConfig
+from .query_api import QueryAPIConnector
+
+# Label that tags each series of a batched query with the query it came from.
+BATCH_LABEL = "aira_query"
+FIRING_ALERTS = 'ALERTS{alertstate="firing"}'
+# Range queries are stepped so that a series has at most this many points.
+MAX_POINTS = 120
+
+
+def batch_queries(queries: Sequence[str]) -> str:
+    """
+    Combines several PromQL expressions into one, so that they cost a single
+    round trip. Each expression's series are tagged with its index, which
+    also stops `or` from dropping series whose labels collide.
+    """
+    return " or ".join(
+        f'label_replace({query}, "{BATCH_LABEL}", "{index}", "", "")'
+        for index, query in enumerate(queries)
+    )
+
+
+def split_batch(result: List[Dict[str, Any]], count: int) -> List[List[Dict[str, Any]]]:
+    """Splits the series of a batched query back out per expression."""
+    batches: List[List[Dict[str, Any]]] = [[] for _ in range(count)]
+    for series in result:
+        index = series.get("metric", {}).pop(BATCH_LABEL, None)
+        if index is not None and index.isdigit() and int(index) < count:
+            batches[int(index)].append(series)
+    return batches
+
+
+def series_name(metric: Dict[str, str]) -> str:
+    """Formats a series' labels the way PromQL writes a selector."""
+    labels = ",".join(
+        f'{key}="{value}"' for key, value in sorted(metric.items()) if key != "__name__"
+    )
+    return f"{metric.get('__name__', '')}{{{labels}}}"
+
+
+class PrometheusConnector(QueryAPIConnector):
+    """
+    Connector for Prometheus and PromQL-compatible servers (Thanos, Mimir,
+    VictoriaMetrics).
+
+    Log queries are PromQL expressions. Each series is summarised as one
+    event, and firing alerts are reported as alert events from the time they
+    started, so they take part in correlation like error logs do.
+    """
+
+    config_model = PrometheusConfig
+    display_name = "Prometheus"
+    ready_path = "/-/ready"
+
+    def query_range_batch(
+        self, queries: Sequence[str], start: datetime, end: datetime, step: int
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Evaluates several range queries in one request.
+
+        Returns:
+            List[List[Dict[str, Any]]]: The matrix series of each query, in order.
+
+        Raises:
+            ConnectorError: If the query failed.
+        """
+        data = self._query(
+            "/api/v1/query_range",
+            {
+                "query": batch_queries(queries),
+                "start": start.timestamp(),
+                "end": end.timestamp(),
+                "step": f"{step}s",
+            },
+        )
+        return split_batch(data.get("result", []), len(queries))
+
+    def fetch_logs(self, query: str, time_window_minutes: int = 15) -> List[LogEvent]:
+        """
+        Evaluates a PromQL expression over the time window, together with the
+        firing alerts, newest first.
+
+        Only the top `max_series` series are fetched; the selection is made by
+        `topk` on the server rather than after downloading every series.
+        """
+        print(f"-> Querying Prometheus with: '{query}'...")
+        end = datetime.now(timezone.utc)
+        start = end - timedelta(minutes=time_window_minutes)
+        step = max(15, time_window_minutes * 60 // MAX_POINTS)
+        limit = self.validated_config.max_series
+
+        series, alerts = self.query_range_batch(
+            [f"topk({limit}, {query})", FIRING_ALERTS], start, end, step
+        )
+        summaries = [
+            self._to_summary(s, time_window_minutes) for s in series if s.get("values")
+        ]
+        summaries.sort(key=lambda pair: pair[0], reverse=True)
+        events = [self._to_alert(s) for s in alerts if s.get("values")]
+        events.sort(key=lambda e: e.timestamp, reverse=True)
+        events = events[:limit] + [event for _, event in summaries[:limit]]
+        print(f"   ...found {len(series)} series and {len(alerts)} firing alerts.")
+        return events
+
+    def _to_summary(
+        self, series: Dict[str, Any], minutes: int
+    ) -> Tuple[float, LogEvent]:
+        """Maps a series onto an event; returns it with its latest value."""
+        metric = series["metric"]
+        values = [float(v) for _, v in series["values"]]
+        message = (
+            f"{series_name(metric)} = {values[-1]:g} "
+            f"(min {min(values):g}, max {max(values):g} over the last {minutes}m)"
+        )
+        event = LogEvent(
+            message=message,
+            timestamp=_sample_time(series["values"][-1]),
+            service=metric.get(self.validated_config.service_label),
+            host=metric.get("instance"),
+        )
+        return values[-1], event
+
+    def _to_alert(self, series: Dict[str, Any]) -> LogEvent:
+        """Maps a firing ALERTS series onto an event timed at its first sample."""
+        metric = series["metric"]
+        started = _sample_time(series["values"][0])
+        severity = f" ({metric['severity']})" if metric.get("severity") else ""
+        return LogEvent(
+            message=(
+                f"Alert {metric.get('alertname', 'unknown')}{severity} firing "
+                f"since {started.strftime('%H:%M UTC')}"
+            ),
+            status="alert",
+            timestamp=started,
+            service=metric.get(self.validated_config.service_label)
+            or metric.get("job"),
+            host=metric.get("instance"),
+        )
+
+
+def _sample_time(sample: List[Any]) -> datetime:
+    return datetime.fromtimestamp(float(sample[0]), tz=timezone.utc)
@@ -0,0 +1,105 @@
+# aira/connectors/observability/query_api.py
+
+"""
+Shared plumbing for the Prometheus-style HTTP query APIs, which Prometheus
+and Loki both expose: the same parameters, the same `{"status", "data"}`
+envelope, and the same error format.
+"""
+
+import json
+from typing import Any, Dict, Tuple
+
+import requests
+
+from aira.telemetry import get_telemetry
+from ..base import ConnectorError, ObservabilityProvider
+
+# Bytes read from the socket at a time while streaming a response.
+CHUNK_SIZE = 64 * 1024
+
+
+class QueryAPIConnector(ObservabilityProvider):
+    """
+    Base class for connectors that query a Prometheus-style HTTP API.
+
+    Subclasses set `display_name` and `ready_path` and configure `url`,
+    `bearer_token`, `headers` and `max_response_bytes`.
+    """
+
+    display_name = ""
+    ready_path = ""
+
+    def __init__(self, name: str, config: Any):
+        super().__init__(name, config)
+        settings = self.validated_config
+        self.url = settings.url.rstrip("/")
+        self.headers = dict(settings.headers)
+        if settings.bearer_token is not None:
+            token = settings.bearer_token.get_secret_value()
+            self.headers["Authorization"] = f"Bearer {token}"
+
+    def test_connection(self) -> Tuple[bool, str]:
+        """Checks that the server is up and answering queries."""
+        try:
+            response = self._request(
+                "GET", f"{self.url}{self.ready_path}", headers=self.headers, timeout=10
+            )
+            response.raise_for_status()
+            return True, f"{self.display_name} at {self.url} is ready."
+        except requests.exceptions.HTTPError as e:
+            if e.response.status_code in [401, 403]:
+                return False, f"Connection failed: {self.display_name} denied access."
+            return False, f"Connection failed: HTTP {e.response.status_code} error."
+        except requests.exceptions.RequestException as e:
+            return False, f"Connection failed: Network error - {e}."
+
+    def _query(self, path: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Runs a query and returns the `data` member of its response.
+
+        The body is streamed and abandoned as soon as it grows past
+        `max_response_bytes`, so an overly broad query fails fast instead of
+        being buffered in full.
+
+        Raises:
+            ConnectorError: If the query failed or its response was too large.
+        """
+        limit = self.validated_config.max_response_bytes
+        try:
+            response = self._request(
+                "GET",
+                f"{self.url}{path}",
+                headers=self.headers,
+                params=params,
+                timeout=30,
+                stream=True,
+            )
+            with response:
+                body = bytearray()
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    body += chunk
+                    if len(body) > limit:
+                        raise ConnectorError(
+                            f"{self.display_name} response exceeded {limit} bytes; "
+                            "narrow the query."
+                        )
+                get_telemetry().increment(
+                    "aira_http_response_bytes_total", len(body), connector=self.name
+                )
+            payload = json.loads(body) if body else {}
+        except requests.exceptions.RequestException as e:
+            raise ConnectorError(
+                f"Network issue while querying {self.display_name}: {e}"
+            ) from e
+        except ValueError as e:
+            raise ConnectorError(
+                f"{self.display_name} returned a malformed response: {e}"
+            ) from e
+
+        if response.status_code >= 400 or payload.get("status") != "success":
+            status = response.status_code
+            error = payload.get("error") or body.decode(errors="replace")[:200]
+            raise ConnectorError(
+                f"{self.display_name} query failed. HTTP {status}: {error}", status
+            )
+        return payload.get("data", {})
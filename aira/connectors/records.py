@@ -0,0 +1,117 @@
+# aira/connectors/records.py
+
+import re
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+
+_OFFSET_WITHOUT_COLON = re.compile(r"([+-]\d{2})(\d{2})$")
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """
+    Parses the ISO 8601 variants returned by provider APIs into an aware datetime.
+
+    Handles the 'Z' suffix (GitHub, Datadog, PagerDuty) and offsets without a
+    colon such as '+0000' (Jira). Returns None for missing or unparseable values.
+    """
+    if not value:
+        return None
+    text = value.strip().replace("Z", "+00:00")
+    text = _OFFSET_WITHOUT_COLON.sub(r"\1:\2", text)
+    try:
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+@dataclass(frozen=True, slots=True)
+class Commit:
+    """A single source control commit."""
+
+    sha: str
+    author: str
+    message: str
+    timestamp: Optional[datetime] = None
+    repo: str = ""
+    url: Optional[str] = None
+
+    @property
+    def short_sha(self) -> str:
+        return self.sha[:7]
+
+    @property
+    def summary(self) -> str:
+        """The first line of the commit message."""
+        return self.message.splitlines()[0] if self.message else ""
+
+
+@dataclass(frozen=True, slots=True)
+class LogEvent:
+    """A single log line from an observability platform."""
+
+    message: str
+    status: str = "info"
+    timestamp: Optional[datetime] = None
+    service: Optional[str] = None
+    host: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class Comment:
+    """A comment on an incident or ticket."""
+
+    author: str
+    body: str
+    created_at: Optional[datetime] = None
+
+
+@dataclass(frozen=True, slots=True)
+class Incident:
+    """An incident or ticket from an alerting platform."""
+
+    id: str
+    title: str
+    status: str = ""
+    source: str = ""
+    severity: Optional[str] = None
+    service: Optional[str] = None
+    created_at: Optional[datetime] = None
+    url: Optional[str] = None
+    description: str = ""
+    assignees: Tuple[str, ...] = ()
+    updated_at: Optional[datetime] = None
+    # The latest comments, oldest first.
+    comments: Tuple[Comment, ...] = ()
+
+
+@dataclass(frozen=True, slots=True)
+class Alert:
+    """A single alert grouped under an incident."""
+
+    id: str
+    summary: str
+    status: str = ""
+    severity: Optional[str] = None
+    service: Optional[str] = None
+    created_at: Optional[datetime] = None
+    url: Optional[str] = None
+    incident_id: Optional[str] = None
+
+
+# Deployment states that will not change any more (bar becoming "inactive").
+FINAL_DEPLOY_STATES = frozenset({"success", "failure", "error", "inactive"})
+
+
+@dataclass(frozen=True, slots=True)
+class Deployment:
+    """A single deployment of a service to an environment."""
+
+    id: str
+    service: str
+    status: str = ""
+    environment: Optional[str] = None
+    timestamp: Optional[datetime] = None
+    ref: Optional[str] = None
+    url: Optional[str] = None
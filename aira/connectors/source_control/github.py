@@ -2,9 +2,10 @@
 
 import requests
 from datetime import datetime, timedelta, timezone
-from typing import Tuple, Dict, Any
+from typing import Tuple, Dict, Any, List, Union
 
-from ..base import SourceControlProvider
+from ..base import SourceControlProvider, ConnectorError, NotFoundError
+from ..records import Commit, parse_timestamp
 from ...config import GitHubConfig
 
 
@@ -14,13 +15,13 @@ class GitHubConnector(SourceControlProvider):
     Handles both github.com and GitHub Enterprise instances.
     """
 
-    def __init__(self, name: str, config: Dict[str, Any]):
+    config_model = GitHubConfig
+
+    def __init__(self, name: str, config: Union[Dict[str, Any], GitHubConfig]):
         """
         Initializes the connector and validates its specific configuration.
         """
         super().__init__(name, config)
-        # Validate the received dictionary against the specific Pydantic model
-        self.validated_config = GitHubConfig(**self.config)
         self.headers = {
             "Authorization": f"Bearer {self.validated_config.token.get_secret_value()}",
             "Accept": "application/vnd.github.v3+json",
@@ -33,8 +34,8 @@ class GitHubConnector(SourceControlProvider):
         Validates the GitHub token by making a lightweight API call to the /user endpoint.
         """
         try:
-            response = requests.get(
-                f"{self.api_base_url}/user", headers=self.headers, timeout=10
+            response = self._request(
+                "GET", f"{self.api_base_url}/user", headers=self.headers, timeout=10
             )
             response.raise_for_status()  # Raises an HTTPError for bad responses (4xx or 5xx)
             user_login = response.json().get("login")
@@ -46,9 +47,9 @@ class GitHubConnector(SourceControlProvider):
         except requests.exceptions.RequestException as e:
             return False, f"Connection failed: Network error - {e}."
 
-    def fetch_recent_commits(self, repo: str, hours: int = 3) -> str:
+    def fetch_recent_commits(self, repo: str, hours: float = 3) -> List[Commit]:
         """
-        Fetches and formats recent commits for a given repository.
+        Fetches recent commits for a given repository, newest first.
         """
         # Ensure we are using a timezone-aware datetime object for comparison
         since_time = (datetime.now(timezone.utc) - timedelta(hours=hours)).isoformat()
@@ -56,24 +57,35 @@ class GitHubConnector(SourceControlProvider):
         params = {"since": since_time}
 
         try:
-            response = requests.get(
-                url, headers=self.headers, params=params, timeout=15
+            response = self._request(
+                "GET", url, headers=self.headers, params=params, timeout=15
             )
             response.raise_for_status()
-            commits = response.json()
-
-            if not commits:
-                return f"No new commits found in repository '{repo}' in the last {hours} hours."
-
-            # Format the output for better readability in prompts and reports
-            summaries = [
-                f"- Commit `{c['sha'][:7]}` by *{c['commit']['author']['name']}*: {c['commit']['message'].splitlines()[0]}"
-                for c in commits
-            ]
-            return "\n".join(summaries)
+            return [self._to_commit(c, repo) for c in response.json()]
         except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 404:
-                return f"Error: Repository '{repo}' not found or access denied."
-            return f"Error: Could not fetch commits from '{repo}'. HTTP {e.response.status_code}."
+            status = e.response.status_code
+            if status == 404:
+                raise NotFoundError(
+                    f"Repository '{repo}' not found or access denied.", status
+                ) from e
+            raise ConnectorError(
+                f"Could not fetch commits from '{repo}'. HTTP {status}.", status
+            ) from e
         except requests.exceptions.RequestException as e:
-            return f"Error: Network issue while fetching commits from '{repo}': {e}"
+            raise ConnectorError(
+                f"Network issue while fetching commits from '{repo}': {e}"
+            ) from e
+
+    @staticmethod
+    def _to_commit(item: Dict[str, Any], repo: str) -> Commit:
+        """Maps a GitHub commit payload onto a Commit record."""
+        details = item["commit"]
+        author = details.get("author") or {}
+        return Commit(
+            sha=item["sha"],
+            author=author.get("name", "unknown"),
+            message=details.get("message", ""),
+            timestamp=parse_timestamp(author.get("date")),
+            repo=repo,
+            url=item.get("html_url"),
+        )
@@ -0,0 +1,58 @@
+# aira/context.py
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from aira.connectors.records import Commit, Deployment, Incident, LogEvent
+
+if TYPE_CHECKING:
+    from aira.correlation import Suspect
+    from aira.knowledge import PriorIncident
+    from aira.runbooks import RunbookChunk
+
+
+@dataclass
+class IncidentContext:
+    """Everything gathered from the connectors for one analysis."""
+
+    trigger: Dict[str, Any]
+    incidents: List[Incident] = field(default_factory=list)
+    commits: List[Commit] = field(default_factory=list)
+    logs: List[LogEvent] = field(default_factory=list)
+    deployments: List[Deployment] = field(default_factory=list)
+    missing: List[str] = field(default_factory=list)
+    suspects: List["Suspect"] = field(default_factory=list)
+    similar: List["PriorIncident"] = field(default_factory=list)
+    runbooks: List["RunbookChunk"] = field(default_factory=list)
+    # Status summaries from infrastructure connectors, one per resource.
+    infrastructure: List[str] = field(default_factory=list)
+    # Which lookups succeeded, so that "nothing found" can be told apart from
+    # "not checked" when rendering.
+    repos_checked: List[str] = field(default_factory=list)
+    log_queries: List[str] = field(default_factory=list)
+    deployments_checked: bool = False
+    # Per connection, the point its next lookup must reach back to: the
+    # newest record it returned, or the oldest deploy still in progress.
+    marks: Dict[str, datetime] = field(default_factory=dict)
+
+    @property
+    def logs_checked(self) -> bool:
+        return bool(self.log_queries)
+
+    @property
+    def lookback_hours(self) -> int:
+        return self.trigger.get("lookback_hours", 3)
+
+    @property
+    def time_window_minutes(self) -> int:
+        return self.trigger.get("time_window_minutes", 15)
+
+    def log_query(self, connection: str) -> Optional[str]:
+        """
+        The query to run on an observability connection: its entry in the
+        trigger's `log_queries`, as platforms speak different query languages,
+        or else the shared `log_query`.
+        """
+        queries = self.trigger.get("log_queries") or {}
+        return queries.get(connection) or self.trigger.get("log_query")
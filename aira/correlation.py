@@ -0,0 +1,190 @@
+# aira/correlation.py
+
+"""
+The correlation stage: places commits, deploys, log error onsets and alerts on
+a single timeline and ranks the changes most likely to have caused an incident.
+"""
+
+import math
+import re
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, FrozenSet, Iterable, List, Optional, Sequence, Tuple, Union
+
+from aira.connectors.records import Commit, Deployment
+from aira.context import IncidentContext
+
+ERROR_STATUSES = frozenset({"error", "critical", "alert", "emergency", "fatal"})
+
+Cause = Union[Commit, Deployment]
+
+_TOKEN_SPLIT = re.compile(r"[^a-z0-9]+")
+# Tokens too generic to count as evidence that two names refer to one service.
+_STOPWORDS = frozenset({"api", "app", "service", "svc", "prod", "production", "main"})
+
+
+def service_tokens(name: Optional[str]) -> FrozenSet[str]:
+    """Splits a service or repository name into comparable tokens."""
+    if not name:
+        return frozenset()
+    tokens = _TOKEN_SPLIT.split(name.lower())
+    return frozenset(t for t in tokens if len(t) > 1 and t not in _STOPWORDS)
+
+
+@dataclass(frozen=True, slots=True)
+class Effect:
+    """An observed symptom: an alert firing or errors starting in a service."""
+
+    timestamp: float
+    kind: str
+    service: Optional[str]
+    tokens: FrozenSet[str]
+    weight: float = 1.0
+
+
+@dataclass
+class Suspect:
+    """A candidate cause together with its score and supporting evidence."""
+
+    cause: Cause
+    score: float
+    evidence: List[str] = field(default_factory=list)
+
+
+class Timeline:
+    """
+    An immutable, time-sorted index of events.
+
+    Built once in O(n log n); `between` answers window queries in
+    O(log n + k) by bisecting the parallel timestamp array.
+    """
+
+    def __init__(self, events: Iterable[Tuple[float, Any]]):
+        ordered = sorted(events, key=lambda pair: pair[0])
+        self._times = [t for t, _ in ordered]
+        self._items = [item for _, item in ordered]
+
+    def __len__(self) -> int:
+        return len(self._times)
+
+    def between(self, start: float, end: float) -> List[Any]:
+        """Returns the items whose timestamp lies within [start, end]."""
+        lo = bisect_left(self._times, start)
+        hi = bisect_right(self._times, end)
+        return self._items[lo:hi]
+
+
+def _epoch(value: Optional[datetime]) -> Optional[float]:
+    return value.timestamp() if value else None
+
+
+def build_effects(context: IncidentContext) -> Timeline:
+    """
+    Collapses the raw symptoms into a timeline of effects.
+
+    Every alert is an effect. Error logs are reduced to one onset per service,
+    weighted by how many errors followed, so that thousands of log lines cost
+    a single entry instead of thousands.
+    """
+    effects: List[Tuple[float, Effect]] = []
+    for incident in context.incidents:
+        ts = _epoch(incident.created_at)
+        if ts is not None:
+            effects.append(
+                (
+                    ts,
+                    Effect(
+                        ts, "alert", incident.service, service_tokens(incident.service)
+                    ),
+                )
+            )
+
+    onsets = {}
+    for event in context.logs:
+        ts = _epoch(event.timestamp)
+        if ts is None or event.status.lower() not in ERROR_STATUSES:
+            continue
+        first, count = onsets.get(event.service, (ts, 0))
+        onsets[event.service] = (min(first, ts), count + 1)
+    for service, (ts, count) in onsets.items():
+        effect = Effect(
+            ts,
+            "error_onset",
+            service,
+            service_tokens(service),
+            weight=1.0 + math.log10(count),
+        )
+        effects.append((ts, effect))
+
+    return Timeline(effects)
+
+
+def _cause_details(cause: Cause) -> Tuple[Optional[float], FrozenSet[str], str]:
+    if isinstance(cause, Deployment):
+        label = f"deploy {cause.id} of {cause.service}"
+        return _epoch(cause.timestamp), service_tokens(cause.service), label
+    label = f"commit {cause.short_sha} in {cause.repo}"
+    return _epoch(cause.timestamp), service_tokens(cause.repo), label
+
+
+def rank_suspects(
+    causes: Sequence[Cause],
+    effects: Timeline,
+    horizon_minutes: float = 60,
+    decay_minutes: float = 15,
+    overlap_bonus: float = 1.0,
+) -> List[Suspect]:
+    """
+    Scores each candidate cause by the effects that followed it.
+
+    An effect within `horizon_minutes` after a cause contributes
+    exp(-delay / decay_minutes) times its weight, multiplied by
+    (1 + overlap_bonus) when the effect's service shares a token with the
+    cause's service or repository. Effects before a cause never count.
+
+    Returns:
+        List[Suspect]: Suspects with a positive score, highest first.
+    """
+    horizon = horizon_minutes * 60
+    decay = decay_minutes * 60
+    suspects: List[Suspect] = []
+    for cause in causes:
+        ts, tokens, label = _cause_details(cause)
+        if ts is None:
+            continue
+        score = 0.0
+        evidence: List[str] = []
+        for effect in effects.between(ts, ts + horizon):
+            delay = effect.timestamp - ts
+            contribution = math.exp(-delay / decay) * effect.weight
+            overlap = bool(tokens & effect.tokens)
+            if overlap:
+                contribution *= 1 + overlap_bonus
+            score += contribution
+            kind = "alert" if effect.kind == "alert" else "error onset"
+            where = f" in {effect.service}" if effect.service else ""
+            evidence.append(
+                f"{kind}{where} {delay / 60:.0f}m after {label}"
+                + (" (same service)" if overlap else "")
+            )
+        if score > 0:
+            suspects.append(Suspect(cause=cause, score=score, evidence=evidence))
+
+    suspects.sort(key=lambda s: s.score, reverse=True)
+    return suspects
+
+
+def correlate(
+    context: IncidentContext,
+    horizon_minutes: float = 60,
+    decay_minutes: float = 15,
+    max_suspects: int = 5,
+) -> List[Suspect]:
+    """Ranks the commits and deploys in a context against its symptoms."""
+    effects = build_effects(context)
+    if not effects:
+        return []
+    causes: List[Cause] = [*context.commits, *context.deployments]
+    suspects = rank_suspects(causes, effects, horizon_minutes, decay_minutes)
+    return suspects[:max_suspects]
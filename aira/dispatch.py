@@ -0,0 +1,193 @@
+# aira/dispatch.py
+
+"""
+Fan-out of finished analyses to collaboration destinations.
+
+The `ActionDispatcher` picks the destinations whose route matches an
+analysis' service and severity and delivers to each on its own worker, so a
+slow or failing channel never delays the others.
+"""
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Sequence
+
+from aira.config import RouteConfig
+from aira.connectors.base import CollaborationProvider
+from aira.telemetry import get_telemetry
+
+# Slack rejects section text longer than this.
+MAX_SECTION_CHARS = 3000
+
+
+def analysis_blocks(
+    hypothesis: str, title: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Formats an analysis as Block Kit blocks."""
+    blocks: List[Dict[str, Any]] = []
+    if title:
+        blocks.append(
+            {"type": "header", "text": {"type": "plain_text", "text": title[:150]}}
+        )
+    for start in range(0, len(hypothesis) or 1, MAX_SECTION_CHARS):
+        blocks.append(
+            {
+                "type": "section",
+                "text": {
+                    "type": "mrkdwn",
+                    "text": hypothesis[start : start + MAX_SECTION_CHARS] or "-",
+                },
+            }
+        )
+    return blocks
+
+
+def _matches(values: Sequence[str], candidates: Sequence[Optional[str]]) -> bool:
+    if not values:
+        return True
+    wanted = {v.lower() for v in values}
+    return any(c and c.lower() in wanted for c in candidates)
+
+
+class ActionDispatcher:
+    """
+    Routes messages to destinations and delivers them concurrently.
+
+    Each destination gets a dedicated single-thread worker, so deliveries to
+    one destination stay in order while destinations progress independently.
+    Connectors with their own delivery queue (`enqueue_message`) are handed
+    the message directly; others are called with `post_message` and retried.
+    """
+
+    def __init__(
+        self,
+        routes: Sequence[RouteConfig] = (),
+        max_retries: int = 2,
+        retry_delay: float = 1.0,
+    ):
+        """
+        Args:
+            routes (Sequence[RouteConfig]): The routing rules. With none, every
+                destination receives every message.
+            max_retries (int): Retries per destination after a failed post.
+            retry_delay (float): Seconds before the first retry; doubles each time.
+        """
+        self.routes = list(routes)
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self._workers: Dict[str, ThreadPoolExecutor] = {}
+        self._pending: List[Future] = []
+        self._lock = threading.Lock()
+
+    def destinations(
+        self,
+        available: Sequence[str],
+        services: Sequence[Optional[str]] = (),
+        severities: Sequence[Optional[str]] = (),
+    ) -> List[str]:
+        """Returns the available destinations whose routes match, in order."""
+        if not self.routes:
+            return list(available)
+        selected: Dict[str, None] = {}
+        for route in self.routes:
+            if _matches(route.services, services) and _matches(
+                route.severities, severities
+            ):
+                selected.update((name, None) for name in route.actions)
+        return [name for name in selected if name in available]
+
+    def dispatch(
+        self,
+        connectors: Dict[str, Any],
+        blocks: List[Dict[str, Any]],
+        services: Sequence[Optional[str]] = (),
+        severities: Sequence[Optional[str]] = (),
+        key: Optional[str] = None,
+    ) -> List[str]:
+        """
+        Queues `blocks` for every matching destination without blocking.
+
+        Args:
+            connectors (Dict[str, Any]): The loaded connectors; only
+                collaboration connectors are considered as destinations.
+            blocks (List[Dict[str, Any]]): The Block Kit message.
+            services (Sequence[Optional[str]]): The affected services.
+            severities (Sequence[Optional[str]]): The incident severities.
+            key (Optional[str]): Identifies the incident, so destinations that
+                support it can coalesce or thread updates.
+
+        Returns:
+            List[str]: The destinations the message was routed to.
+        """
+        available = [
+            name
+            for name, connector in connectors.items()
+            if isinstance(connector, CollaborationProvider)
+        ]
+        names = self.destinations(available, services, severities)
+        with self._lock:
+            self._pending = [f for f in self._pending if not f.done()]
+            for name in names:
+                worker = self._workers.get(name)
+                if worker is None:
+                    worker = self._workers[name] = ThreadPoolExecutor(
+                        max_workers=1, thread_name_prefix=f"dispatch-{name}"
+                    )
+                self._pending.append(
+                    worker.submit(self._deliver, name, connectors[name], blocks, key)
+                )
+        return names
+
+    def _deliver(self, name: str, connector: Any, blocks, key: Optional[str]) -> bool:
+        if hasattr(connector, "enqueue_message"):
+            connector.enqueue_message(blocks, key=key)
+            return True
+        telemetry = get_telemetry()
+        for attempt in range(self.max_retries + 1):
+            try:
+                connector.post_message(blocks)
+                return True
+            except Exception as e:
+                if attempt == self.max_retries:
+                    print(
+                        f"   !!! Giving up on '{name}' after {attempt + 1} attempts: {e}"
+                    )
+                    return False
+                telemetry.increment("aira_retries_total", component=name)
+                time.sleep(self.retry_delay * 2**attempt)
+        return False
+
+    def flush(
+        self, connectors: Dict[str, Any], timeout: Optional[float] = None
+    ) -> bool:
+        """
+        Waits for dispatched messages to be handed over and, for destinations
+        with their own queue, delivered.
+
+        Returns:
+            bool: False if `timeout` expired first.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            pending = list(self._pending)
+            names = list(self._workers)
+        _, not_done = wait(pending, timeout=timeout)
+        if not_done:
+            return False
+        for name in names:
+            connector = connectors.get(name)
+            if hasattr(connector, "flush"):
+                remaining = (
+                    None if deadline is None else max(deadline - time.monotonic(), 0)
+                )
+                if not connector.flush(remaining):
+                    return False
+        return True
+
+    def close(self):
+        """Stops the per-destination workers after their current deliveries."""
+        with self._lock:
+            workers, self._workers = list(self._workers.values()), {}
+        for worker in workers:
+            worker.shutdown(wait=True)
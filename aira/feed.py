@@ -0,0 +1,154 @@
+# aira/feed.py
+
+"""
+Incremental incident discovery for deployments without inbound webhooks.
+
+An `IncidentFeed` polls an AlertingProvider for incidents that appeared or
+changed since its cursor, instead of rescanning the full incident list. The
+cursor and the last change seen of recent incidents are persisted so a
+restart neither misses nor repeats incidents, and the polling interval backs
+off while nothing happens.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from aira.connectors.base import AlertingProvider
+from aira.connectors.records import Incident
+
+
+class IncidentFeed:
+    """
+    Polls one alerting connector for new or changed incidents.
+
+    Usage:
+        feed = IncidentFeed(connector, state_path=Path("~/.aira/feeds/pd.json"))
+        for incident in feed.poll():
+            ...
+    """
+
+    def __init__(
+        self,
+        connector: AlertingProvider,
+        state_path: Optional[Path] = None,
+        min_interval: float = 5.0,
+        max_interval: float = 300.0,
+        overlap_seconds: float = 60.0,
+        initial_lookback_seconds: float = 900.0,
+        max_seen: int = 10_000,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            connector (AlertingProvider): The connector to poll.
+            state_path (Optional[Path]): Where the cursor and seen changes persist.
+            min_interval (float): Seconds between polls while incidents arrive.
+            max_interval (float): The ceiling the interval backs off to when idle.
+            overlap_seconds (float): How far each window reaches back before the
+                cursor, to catch late-indexed updates; seen changes are dropped.
+            initial_lookback_seconds (float): The first window, when no state exists.
+            max_seen (int): How many incidents to remember the last change of.
+            clock (Callable[[], float]): Returns the current epoch time.
+        """
+        self.connector = connector
+        self.state_path = state_path
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.overlap_seconds = overlap_seconds
+        self.max_seen = max_seen
+        self._clock = clock
+        self.interval = min_interval
+        self.cursor = clock() - initial_lookback_seconds
+        # The last change emitted per incident id, least recently changed first.
+        self._seen: "OrderedDict[str, float]" = OrderedDict()
+        self._load_state()
+
+    def poll(self) -> List[Incident]:
+        """
+        Fetches one window and returns the incidents that are new or changed
+        after the last change emitted for them, oldest first. Copies of a
+        change already emitted, e.g. from the overlap, are dropped. The
+        cursor only advances when the fetch succeeds.
+
+        Raises:
+            ConnectorError: If the connector could not be polled.
+        """
+        now = self._clock()
+        since = datetime.fromtimestamp(self.cursor - self.overlap_seconds, timezone.utc)
+        until = datetime.fromtimestamp(now, timezone.utc)
+        try:
+            incidents = self.connector.fetch_updated_incidents(since, until)
+        except Exception:
+            self.interval = min(self.interval * 2, self.max_interval)
+            raise
+
+        fresh = []
+        for incident in incidents:
+            changed = incident.updated_at.timestamp() if incident.updated_at else 0.0
+            last = self._seen.get(incident.id)
+            if last is not None and changed <= last:
+                continue
+            self._seen[incident.id] = changed
+            self._seen.move_to_end(incident.id)
+            fresh.append(incident)
+        while len(self._seen) > self.max_seen:
+            self._seen.popitem(last=False)
+
+        self.cursor = now
+        # Poll eagerly while incidents are arriving, back off while idle.
+        if fresh:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.interval * 2, self.max_interval)
+        self._save_state()
+        return fresh
+
+    def run(
+        self,
+        on_incidents: Callable[[List[Incident]], None],
+        stop: threading.Event,
+    ):
+        """Polls until `stop` is set, passing each non-empty batch to `on_incidents`."""
+        while not stop.is_set():
+            try:
+                fresh = self.poll()
+            except Exception as e:
+                print(f"⚠️ Incident feed for '{self.connector.name}' failed: {e}")
+            else:
+                if fresh:
+                    on_incidents(fresh)
+            stop.wait(self.interval)
+
+    # --- Persistence ---
+
+    def _load_state(self):
+        if not self.state_path or not self.state_path.is_file():
+            return
+        try:
+            state = json.loads(self.state_path.read_text())
+            self.cursor = float(state["cursor"])
+            self._seen = OrderedDict(
+                (str(incident_id), float(changed))
+                for incident_id, changed in state.get("seen", [])
+            )
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"⚠️ Ignoring unreadable feed state {self.state_path}: {e}")
+
+    def _save_state(self):
+        """Atomically writes the cursor and the seen changes."""
+        if not self.state_path:
+            return
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(
+            dir=self.state_path.parent, prefix=f".{self.state_path.name}."
+        )
+        with os.fdopen(fd, "w") as f:
+            json.dump({"cursor": self.cursor, "seen": list(self._seen.items())}, f)
+        os.replace(tmp, self.state_path)
@@ -0,0 +1,229 @@
+# aira/followup.py
+
+"""
+Incremental re-analysis: what a repeat trigger for an incident needs to
+know about the analyses that came before it.
+
+A `FollowUpState` keeps the evidence an incident has accumulated, the last
+hypothesis and when it was made. A follow-up only asks each connection for
+the time since its high-water mark (the newest record it returned, plus a
+small overlap for late-indexed records), and `absorb` reduces what comes
+back to the records that were not seen before.
+"""
+
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence, Set, Tuple, Union
+
+from aira.connectors.records import (
+    FINAL_DEPLOY_STATES,
+    Commit,
+    Deployment,
+    Incident,
+    LogEvent,
+)
+from aira.context import IncidentContext
+from aira.llm_interfaces.structured import Hypothesis
+
+# How far a follow-up's windows reach back before a high-water mark.
+OVERLAP_SECONDS = 60
+
+
+def follow_up_key(trigger: Dict[str, Any]) -> Optional[str]:
+    """Names the incident a trigger is about, or None if it names none."""
+    incident_id = trigger.get("incident_id")
+    if not incident_id:
+        return None
+    return f"{trigger.get('source') or ''}:{incident_id}"
+
+
+def high_water_mark(
+    records: Sequence[Union[Commit, Deployment, LogEvent]],
+) -> Optional[datetime]:
+    """
+    The point a connection's next lookup must reach back to: the newest of
+    its records, or the oldest deploy still in progress, whose status may
+    yet change. None if no record has a timestamp.
+    """
+    pending = [
+        r.timestamp
+        for r in records
+        if isinstance(r, Deployment)
+        and r.timestamp
+        and r.status not in FINAL_DEPLOY_STATES
+    ]
+    if pending:
+        return min(pending)
+    times = [r.timestamp for r in records if r.timestamp]
+    return max(times) if times else None
+
+
+def record_key(record: Any) -> str:
+    """
+    Identifies one version of a record. An incident's key changes when it is
+    escalated, reassigned or commented on; a deploy's when its status moves.
+    """
+    if isinstance(record, Commit):
+        return f"commit:{record.repo}:{record.sha}"
+    if isinstance(record, Deployment):
+        return f"deploy:{record.id}:{record.status}"
+    if isinstance(record, Incident):
+        return (
+            f"incident:{record.source}:{record.id}:{record.status}:"
+            f"{record.severity}:{','.join(record.assignees)}:{len(record.comments)}"
+        )
+    if isinstance(record, LogEvent):
+        when = record.timestamp.isoformat() if record.timestamp else ""
+        return f"log:{record.service}:{when}:{record.message}"
+    return f"status:{record}"
+
+
+@dataclass
+class FollowUpState:
+    """The evidence and conclusion of an incident's analyses so far."""
+
+    context: IncidentContext
+    hypothesis: str
+    # When the hypothesis was made, and when the connectors were last asked
+    # for new evidence (later if a follow-up found nothing new).
+    analyzed_at: datetime
+    checked_at: Optional[datetime] = None
+    seen: Set[str] = field(default_factory=set)
+    # The typed form of `hypothesis`, with `llm.structured_output`.
+    structured: Optional[Hypothesis] = None
+
+    def __post_init__(self):
+        if self.checked_at is None:
+            self.checked_at = self.analyzed_at
+        context = self.context
+        for record in (
+            *context.incidents,
+            *context.commits,
+            *context.deployments,
+            *context.logs,
+            *context.infrastructure,
+        ):
+            self.seen.add(record_key(record))
+
+    def since(self, names: Iterable[str]) -> Dict[str, datetime]:
+        """
+        Where each connection's next lookup starts, so that it only returns
+        what may be new: its high-water mark, or the last check if it has
+        none, less a small overlap.
+        """
+        overlap = timedelta(seconds=OVERLAP_SECONDS)
+        marks = self.context.marks
+        return {name: marks.get(name, self.checked_at) - overlap for name in names}
+
+    def absorb(self, fresh: IncidentContext) -> IncidentContext:
+        """
+        Merges freshly gathered records into the accumulated context.
+
+        Returns:
+            IncidentContext: Only the records that were not seen before, with
+            the trigger of the original analysis and the lookups that failed
+            this time.
+        """
+        delta = IncidentContext(trigger=self.context.trigger, missing=fresh.missing)
+        delta.repos_checked = fresh.repos_checked
+        delta.log_queries = fresh.log_queries
+        delta.deployments_checked = fresh.deployments_checked
+        for name in ("incidents", "commits", "deployments", "logs", "infrastructure"):
+            new = [r for r in getattr(fresh, name) if record_key(r) not in self.seen]
+            self.seen.update(record_key(r) for r in new)
+            setattr(delta, name, new)
+
+        context = self.context
+        if delta.incidents:
+            changed = {i.id: i for i in delta.incidents}
+            context.incidents = [changed.pop(i.id, i) for i in context.incidents]
+            context.incidents.extend(changed.values())
+        context.commits.extend(delta.commits)
+        context.logs.extend(delta.logs)
+        if delta.deployments:
+            moved = {d.id for d in delta.deployments}
+            context.deployments = [d for d in context.deployments if d.id not in moved]
+            context.deployments.extend(delta.deployments)
+        # Status lookups are snapshots: the latest ones replace the old.
+        if fresh.infrastructure:
+            context.infrastructure = list(fresh.infrastructure)
+        context.repos_checked = list(
+            dict.fromkeys(context.repos_checked + fresh.repos_checked)
+        )
+        context.log_queries = list(
+            dict.fromkeys(context.log_queries + fresh.log_queries)
+        )
+        context.deployments_checked |= fresh.deployments_checked
+        context.marks.update(fresh.marks)
+        context.missing = fresh.missing
+        return delta
+
+
+def has_evidence(delta: IncidentContext) -> bool:
+    """True if a follow-up found anything an updated hypothesis could use."""
+    return bool(
+        delta.incidents
+        or delta.commits
+        or delta.deployments
+        or delta.logs
+        or delta.infrastructure
+    )
+
+
+class FollowUpTracker:
+    """
+    The follow-up state of recently analyzed incidents, least recently used
+    first out. Analyses of one incident are serialized through `lock`, so
+    that two triggers for it never build on the same stale state.
+    """
+
+    def __init__(self, max_incidents: int = 256):
+        self.max_incidents = max_incidents
+        self._states: "OrderedDict[str, FollowUpState]" = OrderedDict()
+        # Key -> its lock and how many callers hold or await it.
+        self._locks: Dict[str, Tuple[threading.Lock, int]] = {}
+        self._guard = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    @contextmanager
+    def lock(self, key: str) -> Iterator[None]:
+        """
+        Holds the lock of one incident. A lock only exists while a caller
+        holds or awaits it, so keys never pile up.
+        """
+        with self._guard:
+            lock, users = self._locks.get(key) or (threading.Lock(), 0)
+            self._locks[key] = (lock, users + 1)
+        try:
+            with lock:
+                yield
+        finally:
+            with self._guard:
+                _, users = self._locks[key]
+                if users == 1:
+                    del self._locks[key]
+                else:
+                    self._locks[key] = (lock, users - 1)
+
+    def get(self, key: str) -> Optional[FollowUpState]:
+        with self._guard:
+            state = self._states.get(key)
+            if state is not None:
+                self._states.move_to_end(key)
+            return state
+
+    def put(self, key: str, state: FollowUpState):
+        with self._guard:
+            self._states[key] = state
+            self._states.move_to_end(key)
+            while len(self._states) > self.max_incidents:
+                self._states.popitem(last=False)
+
+    def discard(self, key: str):
+        with self._guard:
+            self._states.pop(key, None)
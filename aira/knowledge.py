@@ -0,0 +1,332 @@
+# aira/knowledge.py
+
+"""
+A local memory of past incidents and how they were explained.
+
+Every analysis is stored in an embedded SQLite database with an FTS5 index
+over its title, service, key context, hypothesis and resolution. Before the
+LLM is called, the `KnowledgeStore` looks up the most similar prior incidents
+so recurring issues are recognised without any extra API calls. Rows are
+indexed incrementally by triggers, so the cost of a write does not grow with
+the size of the store. Lookups rank only on terms that are rare in the store,
+which keeps them around a millisecond with hundreds of thousands of incidents.
+"""
+
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from aira.connectors.records import Incident
+from aira.context import IncidentContext
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS incidents (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    incident_id TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    service TEXT NOT NULL DEFAULT '',
+    title TEXT NOT NULL DEFAULT '',
+    context TEXT NOT NULL DEFAULT '',
+    hypothesis TEXT NOT NULL DEFAULT '',
+    resolution TEXT NOT NULL DEFAULT '',
+    analyzed_at REAL NOT NULL,
+    UNIQUE (source, incident_id)
+);
+CREATE INDEX IF NOT EXISTS incidents_fingerprint
+    ON incidents (fingerprint, analyzed_at);
+CREATE VIRTUAL TABLE IF NOT EXISTS incidents_fts USING fts5(
+    title, service, context, hypothesis, resolution,
+    content='incidents', content_rowid='id'
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS incidents_vocab USING fts5vocab(incidents_fts, row);
+CREATE TRIGGER IF NOT EXISTS incidents_ai AFTER INSERT ON incidents BEGIN
+    INSERT INTO incidents_fts (rowid, title, service, context, hypothesis, resolution)
+    VALUES (new.id, new.title, new.service, new.context, new.hypothesis, new.resolution);
+END;
+CREATE TRIGGER IF NOT EXISTS incidents_ad AFTER DELETE ON incidents BEGIN
+    INSERT INTO incidents_fts
+        (incidents_fts, rowid, title, service, context, hypothesis, resolution)
+    VALUES ('delete', old.id, old.title, old.service, old.context, old.hypothesis,
+            old.resolution);
+END;
+CREATE TRIGGER IF NOT EXISTS incidents_au AFTER UPDATE ON incidents BEGIN
+    INSERT INTO incidents_fts
+        (incidents_fts, rowid, title, service, context, hypothesis, resolution)
+    VALUES ('delete', old.id, old.title, old.service, old.context, old.hypothesis,
+            old.resolution);
+    INSERT INTO incidents_fts (rowid, title, service, context, hypothesis, resolution)
+    VALUES (new.id, new.title, new.service, new.context, new.hypothesis, new.resolution);
+END;
+"""
+
+# Matches in the title and service count for more than matches in free text.
+_RANK = "bm25(4.0, 2.0, 1.0, 1.0, 1.0)"
+
+# Variable parts of a title (ids, numbers, hashes) that differ between
+# occurrences of the same problem.
+_VARIABLE = re.compile(
+    r"\b(?:[0-9a-f]{8}-[0-9a-f-]{27}|[0-9a-f]{7,}|\d[\w.:-]*)\b", re.IGNORECASE
+)
+# Words as FTS5's default tokenizer splits them.
+_TOKEN = re.compile(r"[a-z][a-z0-9]{2,}")
+_STOPWORDS = frozenset(
+    {"the", "and", "for", "with", "from", "was", "are", "not", "has", "this", "that"}
+)
+MAX_QUERY_TERMS = 32
+# Terms in more than this share of incidents (and at least COMMON_TERM_MIN_DOCS)
+# are too common to rank by: scoring them would touch most of the index.
+COMMON_TERM_RATIO = 0.01
+COMMON_TERM_MIN_DOCS = 200
+# How many terms' document frequencies are cached.
+MAX_CACHED_TERMS = 50_000
+MAX_HYPOTHESIS_CHARS = 4000
+
+
+def fingerprint(incident: Incident) -> str:
+    """
+    Identifies recurrences of the same problem: incidents with the same
+    service and the same title once ids and numbers are masked.
+    """
+    title = _VARIABLE.sub("#", incident.title.lower())
+    key = f"{(incident.service or '').lower()}|{' '.join(title.split())}"
+    return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+
+def key_context(context: IncidentContext, max_chars: int = 1000) -> str:
+    """Distills the searchable essence of an analysis' context."""
+    lines: List[str] = []
+    for incident in context.incidents:
+        if incident.description and incident.description != incident.title:
+            lines.append(incident.description)
+    for suspect in context.suspects:
+        cause = suspect.cause
+        lines.append(getattr(cause, "summary", None) or f"deploy {cause.id}")
+    lines.extend(e.message for e in context.logs if e.status.lower() != "info")
+    return "\n".join(lines)[:max_chars]
+
+
+@dataclass(frozen=True, slots=True)
+class PriorIncident:
+    """A previously analyzed incident returned by a similarity lookup."""
+
+    source: str
+    incident_id: str
+    title: str
+    service: str
+    hypothesis: str
+    resolution: str
+    analyzed_at: datetime
+    # True when the fingerprint matched, i.e. the same problem recurred.
+    recurrence: bool = False
+
+
+class KnowledgeStore:
+    """
+    The embedded store of past incidents.
+
+    Usage:
+        store = KnowledgeStore("~/.aira/knowledge.db")
+        similar = store.similar(context, limit=3)
+        store.record(context, hypothesis)
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Args:
+            path (Union[str, Path]): The database file, created if missing, or
+                ':memory:'.
+        """
+        if str(path) != ":memory:":
+            path = Path(path).expanduser()
+            path.parent.mkdir(parents=True, exist_ok=True)
+        # One connection shared by analysis threads; SQLite calls are short.
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        # Approximate document frequencies; they drift slowly, so caching them
+        # avoids walking the posting lists of common terms on every lookup.
+        self._doc_freq: Dict[str, int] = {}
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+            self._conn.execute(
+                "INSERT INTO incidents_fts (incidents_fts, rank) VALUES ('rank', ?)",
+                (_RANK,),
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT count(*) FROM incidents").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def record(self, context: IncidentContext, hypothesis: str):
+        """
+        Stores or updates every incident of an analysis. A resolution recorded
+        earlier is kept when an incident is analyzed again.
+        """
+        now = time.time()
+        summary = key_context(context)
+        rows = [
+            (
+                incident.source,
+                incident.id,
+                fingerprint(incident),
+                incident.service or "",
+                incident.title,
+                summary,
+                hypothesis[:MAX_HYPOTHESIS_CHARS],
+                now,
+            )
+            for incident in context.incidents
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                """
+                INSERT INTO incidents (source, incident_id, fingerprint, service,
+                    title, context, hypothesis, analyzed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (source, incident_id) DO UPDATE SET
+                    fingerprint = excluded.fingerprint,
+                    service = excluded.service,
+                    title = excluded.title,
+                    context = excluded.context,
+                    hypothesis = excluded.hypothesis,
+                    analyzed_at = excluded.analyzed_at
+                """,
+                rows,
+            )
+
+    def resolve(
+        self, incident_id: str, resolution: str, source: Optional[str] = None
+    ) -> int:
+        """
+        Records how an incident was resolved, so future lookups surface it.
+
+        Returns:
+            int: The number of stored incidents updated (0 if unknown).
+        """
+        query = "UPDATE incidents SET resolution = ? WHERE incident_id = ?"
+        params = [resolution, incident_id]
+        if source:
+            query += " AND source = ?"
+            params.append(source)
+        with self._lock, self._conn:
+            return self._conn.execute(query, params).rowcount
+
+    def similar(self, context: IncidentContext, limit: int = 3) -> List[PriorIncident]:
+        """
+        Returns up to `limit` prior incidents most similar to the current one:
+        recurrences of the same fingerprint first, then the best BM25 matches
+        on its title, service and key context.
+        """
+        if not context.incidents or limit <= 0:
+            return []
+        current = {(i.source, i.id) for i in context.incidents}
+        fingerprints = sorted({fingerprint(i) for i in context.incidents})
+        text = " ".join(
+            [i.title for i in context.incidents]
+            + [i.service or "" for i in context.incidents]
+            + [key_context(context)]
+        )
+        terms = list(
+            dict.fromkeys(
+                t for t in _TOKEN.findall(text.lower()) if t not in _STOPWORDS
+            )
+        )[:MAX_QUERY_TERMS]
+        # Fetch extra rows so excluding the current incidents still fills `limit`.
+        fetch = limit + len(current)
+
+        with self._lock:
+            placeholders = ",".join("?" * len(fingerprints))
+            rows = self._conn.execute(
+                f"""
+                SELECT *, 1 AS recurrence FROM incidents
+                WHERE fingerprint IN ({placeholders})
+                ORDER BY analyzed_at DESC LIMIT ?
+                """,
+                (*fingerprints, fetch),
+            ).fetchall()
+            rare, common = self._split_terms(terms)
+            if rare:
+                rows += self._conn.execute(
+                    """
+                    SELECT incidents.*, 0 AS recurrence FROM incidents_fts
+                    JOIN incidents ON incidents.id = incidents_fts.rowid
+                    WHERE incidents_fts MATCH ? ORDER BY rank LIMIT ?
+                    """,
+                    (" OR ".join(f'"{t}"' for t in rare), fetch + limit),
+                ).fetchall()
+            if common and len(rows) < fetch + limit:
+                # Only common terms left: the latest incidents sharing the
+                # most distinctive of them, which FTS5 finds without scoring.
+                rows += self._conn.execute(
+                    """
+                    SELECT incidents.*, 0 AS recurrence FROM incidents_fts
+                    JOIN incidents ON incidents.id = incidents_fts.rowid
+                    WHERE incidents_fts MATCH ? ORDER BY incidents_fts.rowid DESC
+                    LIMIT ?
+                    """,
+                    (" ".join(f'"{t}"' for t in common[:3]), fetch + limit),
+                ).fetchall()
+
+        results: List[PriorIncident] = []
+        seen = set(current)
+        for row in rows:
+            key = (row["source"], row["incident_id"])
+            if key in seen:
+                continue
+            seen.add(key)
+            results.append(_to_prior(row))
+            if len(results) == limit:
+                break
+        return results
+
+    def _split_terms(self, terms: List[str]) -> Tuple[List[str], List[str]]:
+        """
+        Splits query terms into rare and common ones (rarest first), dropping
+        terms no stored incident contains. Call with the lock held.
+        """
+        unknown = [t for t in terms if t not in self._doc_freq]
+        if unknown:
+            if len(self._doc_freq) + len(unknown) > MAX_CACHED_TERMS:
+                self._doc_freq.clear()
+            placeholders = ",".join("?" * len(unknown))
+            # Terms no incident contains yet are not cached: the next `record`
+            # may add them, and the cache is not invalidated when it does.
+            self._doc_freq.update(
+                self._conn.execute(
+                    f"SELECT term, doc FROM incidents_vocab WHERE term IN ({placeholders})",
+                    unknown,
+                ).fetchall()
+            )
+        total = self._conn.execute("SELECT max(id) FROM incidents").fetchone()[0] or 0
+        threshold = max(COMMON_TERM_MIN_DOCS, total * COMMON_TERM_RATIO)
+        known = sorted(
+            (t for t in terms if self._doc_freq.get(t)), key=self._doc_freq.get
+        )
+        rare = [t for t in known if self._doc_freq[t] <= threshold]
+        return rare, known[len(rare) :]
+
+
+def _to_prior(row: sqlite3.Row) -> PriorIncident:
+    return PriorIncident(
+        source=row["source"],
+        incident_id=row["incident_id"],
+        title=row["title"],
+        service=row["service"],
+        hypothesis=row["hypothesis"],
+        resolution=row["resolution"],
+        analyzed_at=datetime.fromtimestamp(row["analyzed_at"], timezone.utc),
+        recurrence=bool(row["recurrence"]),
+    )
@@ -1,16 +1,19 @@
 # aira/llm_interfaces/__init__.py
 
 from aira.config import AnyLLM  # Import the Union of all LLM Pydantic models
-from .base import LLMProvider
-from .openai_provider import OpenAIProvider
-# from .anthropic_provider import AnthropicProvider # Import future providers here
+from aira.registry import LazyRegistry
+from .base import LLMError, LLMProvider
 
-# The registry mapping the 'provider' string to the actual class.
+# The registry mapping the 'provider' string to the import path of its class.
+# Provider SDKs are heavy, so a provider is only imported once it is selected.
+# Third-party providers register under the "aira.llm_providers" entry point group.
 PROVIDER_MAP = {
-    "openai": OpenAIProvider,
-    # "anthropic": AnthropicProvider,
+    "openai": "aira.llm_interfaces.openai_provider:OpenAIProvider",
+    # "anthropic": "aira.llm_interfaces.anthropic_provider:AnthropicProvider",
 }
 
+PROVIDER_REGISTRY = LazyRegistry(PROVIDER_MAP, group="aira.llm_providers")
+
 
 def get_llm_provider(config: AnyLLM) -> LLMProvider:
     """
@@ -30,13 +33,13 @@ def get_llm_provider(config: AnyLLM) -> LLMProvider:
         ValueError: If the specified provider is not supported.
     """
     provider_name = config.provider.lower()
-    provider_class = PROVIDER_MAP.get(provider_name)
+    provider_class = PROVIDER_REGISTRY.get(provider_name)
 
     if not provider_class:
         raise ValueError(
-            f"Unsupported LLM provider: '{config.provider}'. Supported are: {list(PROVIDER_MAP.keys())}"
+            f"Unsupported LLM provider: '{config.provider}'. Supported are: {PROVIDER_REGISTRY.names()}"
         )
 
-    # Instantiate the chosen provider, passing the configuration
-    # as a dictionary to its constructor.
-    return provider_class(config=config.model_dump())
+    # Instantiate the chosen provider, passing the already-validated
+    # configuration model straight to its constructor.
+    return provider_class(config=config)
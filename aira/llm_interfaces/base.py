@@ -1,7 +1,24 @@
 # aira/llm_interface/base.py
 
 from abc import ABC, abstractmethod
-from typing import Tuple, Dict, Any
+from typing import Tuple, Dict, Any, Optional, Sequence, Type, Union
+
+from pydantic import BaseModel
+
+from .structured import (
+    FieldCallback,
+    Hypothesis,
+    parse_hypothesis,
+    structured_instructions,
+)
+from .tools import ChatTurn, Message, ToolSpec
+
+
+class LLMError(Exception):
+    """
+    Raised when the LLM could not produce an analysis, so that callers never
+    mistake an error message for a finding.
+    """
 
 
 class LLMProvider(ABC):
@@ -10,17 +27,31 @@ class LLMProvider(ABC):
 
     This class defines the standard interface that the Orchestrator will use
     to interact with any supported Large Language Model.
+
+    Subclasses set `config_model` to the Pydantic model for their `llm` block.
     """
 
-    def __init__(self, config: Dict[str, Any]):
+    config_model: Optional[Type[BaseModel]] = None
+
+    def __init__(self, config: Union[Dict[str, Any], BaseModel]):
         """
         Initializes the LLM provider with its specific configuration.
 
         Args:
-            config (Dict[str, Any]): The configuration dictionary for this specific
-                                     LLM provider, loaded from config.yaml.
+            config (Union[Dict[str, Any], BaseModel]): The configuration for this
+                provider. An instance of `config_model` is used as-is; a dict
+                is validated here.
         """
-        self.config = config
+        if self.config_model is not None and not isinstance(config, self.config_model):
+            config = self.config_model.model_validate(config)
+        self.validated_config = config
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        """The provider's configuration as a plain dictionary."""
+        if isinstance(self.validated_config, BaseModel):
+            return self.validated_config.model_dump()
+        return self.validated_config
 
     @abstractmethod
     def test_connection(self) -> Tuple[bool, str]:
@@ -33,5 +64,64 @@ class LLMProvider(ABC):
     def generate_hypothesis(self, context: str, system_prompt: str) -> str:
         """
         Generates an incident hypothesis based on the provided context.
+
+        Raises:
+            LLMError: If the request failed or the model returned nothing.
         """
         pass
+
+    def generate_structured(
+        self,
+        context: str,
+        system_prompt: str,
+        on_field: Optional[FieldCallback] = None,
+    ) -> Hypothesis:
+        """
+        Generates an incident hypothesis as a typed result.
+
+        This default asks for JSON in the system prompt and parses the reply
+        once it is complete. Providers with a JSON schema or tool-calling mode
+        override it to constrain generation and to report fields while the
+        response is still streaming.
+
+        Args:
+            on_field (Optional[FieldCallback]): Called with each completed
+                field, and with each element of the list fields.
+
+        Raises:
+            LLMError: If the request failed or the model returned nothing.
+        """
+        text = self.generate_hypothesis(
+            context, f"{system_prompt}\n\n{structured_instructions()}"
+        )
+        return parse_hypothesis(text, on_field)
+
+    # Whether `chat` is implemented, i.e. the provider can call tools.
+    supports_tools: bool = False
+
+    def chat(
+        self,
+        messages: Sequence[Message],
+        tools: Sequence[ToolSpec] = (),
+        timeout: Optional[float] = None,
+    ) -> ChatTurn:
+        """
+        Continues a conversation in which the model may call tools.
+
+        Args:
+            messages (Sequence[Message]): The conversation so far, starting
+                with the system prompt.
+            tools (Sequence[ToolSpec]): The tools the model may call this
+                turn. With none, the model must answer in text.
+            timeout (Optional[float]): Seconds the whole request may take,
+                retries included.
+
+        Returns:
+            ChatTurn: The model's reply and the tokens it cost.
+
+        Raises:
+            TimeoutError: If the model did not reply within `timeout`.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support tool calling."
+        )
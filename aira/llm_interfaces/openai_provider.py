@@ -1,20 +1,27 @@
 # aira/llm_interfaces/openai_provider.py
 
-from openai import OpenAI, AuthenticationError
-from typing import Tuple, Dict, Any
+from openai import APITimeoutError, OpenAI, AuthenticationError
+from typing import Tuple, Dict, Any, List, Optional, Sequence, Union
 
-from .base import LLMProvider
+from .base import FieldCallback, LLMError, LLMProvider
+from .structured import HYPOTHESIS_SCHEMA, Hypothesis, IncrementalJSONParser
+from .tools import ChatTurn, Message, ToolCall, ToolResult, ToolSpec
+from aira.telemetry import get_telemetry
 from aira.config import OpenAIConfig
 
 
 class OpenAIProvider(LLMProvider):
     """Concrete implementation for OpenAI's Chat-based models."""
 
-    def __init__(self, config: Dict[str, Any]):
+    config_model = OpenAIConfig
+    supports_tools = True
+
+    def __init__(self, config: Union[Dict[str, Any], OpenAIConfig]):
         super().__init__(config)
-        # Validate the generic dict against the specific Pydantic model
-        self.validated_config = OpenAIConfig(**self.config)
-        self.client = OpenAI(api_key=self.validated_config.api_key.get_secret_value())
+        self.client = OpenAI(
+            api_key=self.validated_config.api_key.get_secret_value(),
+            base_url=self.validated_config.base_url,
+        )
 
     def test_connection(self) -> Tuple[bool, str]:
         """Validates the OpenAI API key by making a lightweight API call."""
@@ -27,7 +34,12 @@ class OpenAIProvider(LLMProvider):
             return False, f"Failed to connect to OpenAI: {e}"
 
     def generate_hypothesis(self, context: str, system_prompt: str) -> str:
-        """Generates a hypothesis using the OpenAI ChatCompletions endpoint."""
+        """
+        Generates a hypothesis using the OpenAI ChatCompletions endpoint.
+
+        Raises:
+            LLMError: If the request failed or the model returned nothing.
+        """
         print(
             f"🧠 Generating hypothesis with OpenAI model: {self.validated_config.model}..."
         )
@@ -41,7 +53,160 @@ class OpenAIProvider(LLMProvider):
                 temperature=0.1,
                 max_tokens=1024,
             )
+            self._record_usage(response)
             hypothesis = response.choices[0].message.content
-            return hypothesis or "LLM returned an empty response."
         except Exception as e:
-            return f"Error during OpenAI analysis: {e}"
+            raise LLMError(f"OpenAI analysis failed: {e}") from e
+        if not hypothesis:
+            raise LLMError("OpenAI returned an empty response.")
+        return hypothesis
+
+    def generate_structured(
+        self,
+        context: str,
+        system_prompt: str,
+        on_field: Optional[FieldCallback] = None,
+    ) -> Hypothesis:
+        """
+        Generates a hypothesis constrained to the hypothesis JSON schema,
+        streaming the response so that fields are reported as they complete.
+
+        Raises:
+            LLMError: If the request failed or no field was completed.
+        """
+        print(
+            f"🧠 Generating structured hypothesis with OpenAI model: "
+            f"{self.validated_config.model}..."
+        )
+        parser = IncrementalJSONParser()
+        try:
+            stream = self.client.chat.completions.create(
+                model=self.validated_config.model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": context},
+                ],
+                temperature=0.1,
+                max_tokens=1024,
+                response_format={
+                    "type": "json_schema",
+                    "json_schema": {
+                        "name": "incident_hypothesis",
+                        "schema": HYPOTHESIS_SCHEMA,
+                        "strict": True,
+                    },
+                },
+                stream=True,
+                stream_options={"include_usage": True},
+            )
+            for chunk in stream:
+                self._record_usage(chunk)
+                for choice in chunk.choices:
+                    for key, value in parser.feed(choice.delta.content or ""):
+                        if on_field is not None:
+                            on_field(key, value)
+        except Exception as e:
+            raise LLMError(f"OpenAI analysis failed: {e}") from e
+        if not parser.fields:
+            raise LLMError("OpenAI returned an empty response.")
+        if not parser.complete:
+            print(
+                "⚠️ The structured response was cut short; keeping the fields completed."
+            )
+        return Hypothesis.from_dict(parser.fields)
+
+    def chat(
+        self,
+        messages: Sequence[Message],
+        tools: Sequence[ToolSpec] = (),
+        timeout: Optional[float] = None,
+    ) -> ChatTurn:
+        """
+        Continues a tool-calling conversation. The model may call several
+        tools in one turn.
+
+        Raises:
+            TimeoutError: If the model did not reply within `timeout`.
+            openai.OpenAIError: If the request fails; an agent loop cannot
+                continue from an error message the way a single call can.
+        """
+        options: Dict[str, Any] = {}
+        if tools:
+            options["tools"] = [
+                {
+                    "type": "function",
+                    "function": {
+                        "name": t.name,
+                        "description": t.description,
+                        "parameters": t.parameters,
+                    },
+                }
+                for t in tools
+            ]
+            options["parallel_tool_calls"] = True
+        client = self.client
+        if timeout is not None:
+            # A retry would outlive the deadline the timeout stands for.
+            client = client.with_options(timeout=timeout, max_retries=0)
+        try:
+            response = client.chat.completions.create(
+                model=self.validated_config.model,
+                messages=[self._wire_message(m) for m in messages],
+                temperature=0.1,
+                max_tokens=1024,
+                **options,
+            )
+        except APITimeoutError as e:
+            raise TimeoutError("OpenAI did not reply in time.") from e
+        self._record_usage(response)
+        message = response.choices[0].message
+        usage = getattr(response, "usage", None)
+        tokens = getattr(usage, "total_tokens", None)
+        return ChatTurn(
+            text=message.content or "",
+            tool_calls=tuple(
+                ToolCall(c.id, c.function.name, c.function.arguments or "{}")
+                for c in message.tool_calls or ()
+            ),
+            tokens=tokens if isinstance(tokens, int) else 0,
+        )
+
+    @staticmethod
+    def _wire_message(message: Message) -> Dict[str, Any]:
+        """Translates a provider-neutral message to the Chat Completions format."""
+        if isinstance(message, ToolResult):
+            return {
+                "role": "tool",
+                "tool_call_id": message.call_id,
+                "content": message.content,
+            }
+        if isinstance(message, ChatTurn):
+            wire: Dict[str, Any] = {"role": "assistant", "content": message.text}
+            if message.tool_calls:
+                calls: List[Dict[str, Any]] = [
+                    {
+                        "id": c.id,
+                        "type": "function",
+                        "function": {"name": c.name, "arguments": c.arguments},
+                    }
+                    for c in message.tool_calls
+                ]
+                wire["tool_calls"] = calls
+            return wire
+        return dict(message)
+
+    def _record_usage(self, response: Any):
+        """Records the prompt and completion token counts of a response."""
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return
+        telemetry = get_telemetry()
+        model = self.validated_config.model
+        for direction, tokens in (
+            ("in", getattr(usage, "prompt_tokens", None)),
+            ("out", getattr(usage, "completion_tokens", None)),
+        ):
+            if isinstance(tokens, int):
+                telemetry.increment(
+                    "aira_llm_tokens_total", tokens, direction=direction, model=model
+                )
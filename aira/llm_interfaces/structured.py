@@ -0,0 +1,264 @@
+# aira/llm_interfaces/structured.py
+
+"""
+Structured analysis output.
+
+Holds the typed `Hypothesis` an analysis can be returned as, the JSON schema
+that providers constrain generation with, and an incremental parser that
+reports each field as soon as it is complete in a streamed response, so that
+callers can act on the probable cause before the next steps are written.
+"""
+
+import json
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+CONFIDENCE_LEVELS = ("low", "medium", "high")
+
+# Called with each field of a structured hypothesis as soon as it is complete.
+FieldCallback = Callable[[str, Any], None]
+
+# Fields are generated in this order, so the cause streams in first. The
+# schema satisfies OpenAI's strict mode: every property is required and no
+# others are allowed.
+HYPOTHESIS_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "probable_cause": {
+            "type": "string",
+            "description": "The most probable root cause, in one or two sentences.",
+        },
+        "confidence": {"type": "string", "enum": list(CONFIDENCE_LEVELS)},
+        "evidence": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "ref": {
+                        "type": "string",
+                        "description": "The context item relied on, e.g. "
+                        "'commit abc1234', 'deploy 42', 'incident P1' or 'logs'.",
+                    },
+                    "detail": {"type": "string"},
+                },
+                "required": ["ref", "detail"],
+                "additionalProperties": False,
+            },
+        },
+        "next_steps": {"type": "array", "items": {"type": "string"}},
+    },
+    "required": ["probable_cause", "confidence", "evidence", "next_steps"],
+    "additionalProperties": False,
+}
+
+
+def structured_instructions() -> str:
+    """The instruction that asks for the schema in the prompt itself."""
+    return (
+        "Respond with a single JSON object, without code fences, that matches "
+        f"this JSON schema: {json.dumps(HYPOTHESIS_SCHEMA)}"
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class Evidence:
+    """A piece of context the hypothesis relies on."""
+
+    ref: str
+    detail: str = ""
+
+
+@dataclass(frozen=True, slots=True)
+class Hypothesis:
+    """An analysis as a typed result."""
+
+    probable_cause: str
+    confidence: str = "low"
+    evidence: Tuple[Evidence, ...] = ()
+    next_steps: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Hypothesis":
+        """Builds a hypothesis from parsed JSON, tolerating missing fields."""
+        confidence = str(data.get("confidence", "")).lower()
+        evidence = []
+        for item in data.get("evidence") or []:
+            if isinstance(item, dict):
+                evidence.append(
+                    Evidence(str(item.get("ref", "")), item.get("detail", ""))
+                )
+            else:
+                evidence.append(Evidence(str(item)))
+        return cls(
+            probable_cause=str(data.get("probable_cause", "")),
+            confidence=confidence if confidence in CONFIDENCE_LEVELS else "low",
+            evidence=tuple(evidence),
+            next_steps=tuple(str(step) for step in data.get("next_steps") or []),
+        )
+
+    @classmethod
+    def from_text(cls, text: str) -> "Hypothesis":
+        """Wraps a free-text answer, for models that ignored the schema."""
+        return cls(probable_cause=text.strip())
+
+    def to_markdown(self) -> str:
+        """Formats the hypothesis the way free-text analyses read."""
+        lines = [
+            f"*Probable cause* ({self.confidence} confidence): {self.probable_cause}"
+        ]
+        if self.evidence:
+            lines += ["", "*Evidence*"]
+            lines += [
+                f"- `{e.ref}`: {e.detail}" if e.detail else f"- `{e.ref}`"
+                for e in self.evidence
+            ]
+        if self.next_steps:
+            lines += ["", "*Next steps*"]
+            lines += [f"{n}. {step}" for n, step in enumerate(self.next_steps, 1)]
+        return "\n".join(lines)
+
+
+class IncrementalJSONParser:
+    """
+    Parses a JSON object as it streams in.
+
+    Each top-level field is reported once its value is complete; the
+    elements of a top-level array are reported one by one, as each element
+    completes. Every character is scanned once, however the text is split.
+
+    Usage:
+        parser = IncrementalJSONParser()
+        for chunk in stream:
+            for key, value in parser.feed(chunk):
+                ...
+        hypothesis = Hypothesis.from_dict(parser.fields)
+    """
+
+    def __init__(self):
+        self.text = ""
+        # The fields completed so far; array fields hold the elements so far.
+        self.fields: Dict[str, Any] = {}
+        self._pos = 0
+        self._stack: List[str] = []
+        self._started = False
+        self._done = False
+        self._in_string = False
+        self._escape = False
+        self._key: Optional[str] = None
+        self._key_start: Optional[int] = None
+        self._value_start: Optional[int] = None
+        self._element_start: Optional[int] = None
+
+    @property
+    def complete(self) -> bool:
+        """True once the top-level object has been closed."""
+        return self._done
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """
+        Adds the next piece of the response.
+
+        Returns:
+            List[Tuple[str, Any]]: The (field, value) pairs completed by this
+            chunk, where array fields yield one pair per element.
+        """
+        self.text += chunk
+        events: List[Tuple[str, Any]] = []
+        text = self.text
+        for i in range(self._pos, len(text)):
+            if self._done:
+                break
+            char = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._key_start is not None:
+                        self._key = json.loads(text[self._key_start : i + 1])
+                        self._key_start = None
+                continue
+            if not self._started:
+                # Anything before the object, such as a code fence, is skipped.
+                if char == "{":
+                    self._started = True
+                    self._stack.append(char)
+                continue
+
+            depth = len(self._stack)
+            if char == '"':
+                self._in_string = True
+                if depth == 1 and self._key is None:
+                    self._key_start = i
+            elif char == ":" and depth == 1:
+                self._value_start = i + 1
+            elif char in "{[":
+                self._stack.append(char)
+                if depth == 1 and char == "[":
+                    self._element_start = i + 1
+            elif char in "}]":
+                if depth == 2 and self._stack[-1] == "[":
+                    self._end_element(i, events)
+                self._stack.pop()
+                if not self._stack:
+                    self._end_value(i, events)
+                    self._done = True
+            elif char == ",":
+                if depth == 1:
+                    self._end_value(i, events)
+                elif depth == 2 and self._stack[-1] == "[":
+                    self._end_element(i, events)
+                    self._element_start = i + 1
+        self._pos = len(text)
+        return events
+
+    def _end_value(self, end: int, events: List[Tuple[str, Any]]):
+        key, start = self._key, self._value_start
+        self._key = self._value_start = None
+        if key is None or start is None:
+            return
+        raw = self.text[start:end].strip()
+        if raw.startswith("["):
+            # Reported element by element; an empty array still sets the field.
+            self.fields.setdefault(key, [])
+            return
+        value = _loads(raw)
+        if value is not _INVALID:
+            self.fields[key] = value
+            events.append((key, value))
+
+    def _end_element(self, end: int, events: List[Tuple[str, Any]]):
+        start, self._element_start = self._element_start, None
+        if self._key is None or start is None:
+            return
+        raw = self.text[start:end].strip()
+        value = _loads(raw) if raw else _INVALID
+        if value is not _INVALID:
+            self.fields.setdefault(self._key, []).append(value)
+            events.append((self._key, value))
+
+
+def parse_hypothesis(text: str, on_field: Optional[FieldCallback] = None) -> Hypothesis:
+    """
+    Parses a complete reply written to `structured_instructions()`, falling
+    back to the raw text if the model did not answer with a JSON object.
+    """
+    parser = IncrementalJSONParser()
+    for key, value in parser.feed(text):
+        if on_field is not None:
+            on_field(key, value)
+    if not parser.complete:
+        return Hypothesis.from_text(text)
+    return Hypothesis.from_dict(parser.fields)
+
+
+_INVALID = object()
+
+
+def _loads(raw: str) -> Any:
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return _INVALID
@@ -0,0 +1,52 @@
+# aira/llm_interfaces/tools.py
+
+"""
+Provider-neutral types for tool-calling conversations.
+
+A conversation is a list of messages: plain `{"role", "content"}` dicts for
+the system prompt and user turns, `ChatTurn`s for the model's replies and
+`ToolResult`s for the outcome of each tool call. Providers translate these
+to their own wire format in `LLMProvider.chat`.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Tuple, Union
+
+
+@dataclass(frozen=True, slots=True)
+class ToolSpec:
+    """A tool offered to the model, with its parameters as a JSON schema."""
+
+    name: str
+    description: str
+    parameters: Dict[str, Any]
+
+
+@dataclass(frozen=True, slots=True)
+class ToolCall:
+    """A call the model asked for. `arguments` is the raw JSON it wrote."""
+
+    id: str
+    name: str
+    arguments: str
+
+
+@dataclass(frozen=True, slots=True)
+class ToolResult:
+    """The outcome of a tool call, as text for the model."""
+
+    call_id: str
+    content: str
+
+
+@dataclass(frozen=True, slots=True)
+class ChatTurn:
+    """One reply of the model: text, tool calls, or both."""
+
+    text: str = ""
+    tool_calls: Tuple[ToolCall, ...] = ()
+    # Prompt plus completion tokens spent on this turn.
+    tokens: int = 0
+
+
+Message = Union[Dict[str, str], ChatTurn, ToolResult]
@@ -1,11 +1,88 @@
-from typing import Dict, Any, Optional, List
+import math
+import sqlite3
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, Optional, List, Sequence, Tuple
 
+from aira.agent import (
+    AGENT_INSTRUCTIONS,
+    TIMED_OUT,
+    connector_tools,
+    render_leads,
+    run_agent,
+)
 from aira.config import AppConfig
-from aira.connectors.base import BaseConnector
-from aira.llm_interfaces.base import LLMProvider
+from aira.circuit_breaker import CircuitBreaker
+from aira.connectors.base import (
+    BaseConnector,
+    AlertingProvider,
+    SourceControlProvider,
+    ObservabilityProvider,
+    InfrastructureProvider,
+    DeploymentProvider,
+    NotFoundError,
+)
+from aira.connectors.records import Incident
+from aira.context import IncidentContext
+from aira.correlation import Suspect, correlate
+from aira.dispatch import ActionDispatcher, analysis_blocks
+from aira.followup import (
+    FollowUpState,
+    FollowUpTracker,
+    follow_up_key,
+    has_evidence,
+    high_water_mark,
+    record_key,
+)
+from aira.knowledge import KnowledgeStore, key_context
+from aira.recording import Recording, Replayer
+from aira.render import render_context, render_followup, render_missing
+from aira.runbooks import RunbookIndex
+from aira.telemetry import Telemetry, configure_telemetry
+from aira.llm_interfaces.base import FieldCallback, LLMError, LLMProvider
+from aira.llm_interfaces.tools import ChatTurn, Message, ToolSpec
+from aira.llm_interfaces.structured import (
+    Hypothesis,
+    parse_hypothesis,
+    structured_instructions,
+)
 from aira.llm_interfaces import get_llm_provider
 from aira.connectors import get_connector
 
+SYSTEM_PROMPT = (
+    "You are Aira, an expert Site Reliability Engineer. Using only the incident "
+    "context provided, state the most probable root cause, the evidence that "
+    "supports it, and the next steps to confirm and mitigate it. If a context "
+    "source is listed as missing, say how its absence limits your confidence."
+)
+
+FOLLOW_UP_SYSTEM_PROMPT = (
+    "You are Aira, an expert Site Reliability Engineer, updating your earlier "
+    "analysis of an ongoing incident. You are given your previous hypothesis and "
+    "only the evidence that arrived since. Say whether the new evidence confirms, "
+    "changes or refutes it, then state the updated root cause, the evidence that "
+    "supports it, and the next steps. If a context source is listed as missing, "
+    "say how its absence limits your confidence."
+)
+
+
+@dataclass
+class AnalysisResult:
+    """The outcome of a single incident analysis."""
+
+    hypothesis: str
+    missing_context: List[str] = field(default_factory=list)
+    incidents: List[Incident] = field(default_factory=list)
+    # True when this updates an earlier analysis of the same incident.
+    follow_up: bool = False
+    # The typed hypothesis, when `llm.structured_output` is enabled.
+    structured: Optional[Hypothesis] = None
+
+    @property
+    def degraded(self) -> bool:
+        """True if one or more context sources could not be consulted."""
+        return bool(self.missing_context)
+
 
 class Orchestrator:
     """The main engine that loads connectors and orchestrates workflows."""
@@ -17,12 +94,22 @@ class Orchestrator:
         if any component fails to initialize.
         """
         self.config = config
+        self.telemetry: Telemetry = configure_telemetry(
+            config.telemetry.enabled, config.telemetry.opentelemetry
+        )
         self.llm_provider: Optional[LLMProvider] = self._initialize_llm_provider(
             health_status
         )
         self.connectors: Dict[str, BaseConnector] = self._initialize_connectors(
             health_status
         )
+        self.breakers: Dict[str, CircuitBreaker] = {
+            name: self._new_breaker(name) for name in self.connectors
+        }
+        self.dispatcher = ActionDispatcher(config.routes)
+        self.knowledge: Optional[KnowledgeStore] = self._open_knowledge()
+        self.runbooks: Optional[RunbookIndex] = self._open_runbooks()
+        self.follow_ups = FollowUpTracker(config.follow_up.max_incidents)
 
     def _initialize_llm_provider(
         self, health_status: List[bool]
@@ -50,7 +137,617 @@ class Orchestrator:
 
         return loaded_connectors
 
-    def run_analysis(self, trigger_data: Dict[str, Any]):
-        """(Placeholder) The main workflow for analyzing an incident."""
-        print("Orchestrator `run_analysis` is not yet implemented.")
-        pass
+    def _open_knowledge(self) -> Optional[KnowledgeStore]:
+        """Opens the store of past incidents, if one is configured."""
+        path = self.config.knowledge.path
+        if not path:
+            return None
+        try:
+            return KnowledgeStore(path)
+        except (OSError, sqlite3.Error) as e:
+            print(f"⚠️ Knowledge store {path} is unavailable: {e}")
+            return None
+
+    def _open_runbooks(self) -> Optional[RunbookIndex]:
+        """Maps the runbook index, if runbook retrieval is configured."""
+        settings = self.config.runbooks
+        if not settings.docs_dir:
+            return None
+        try:
+            return RunbookIndex(settings.index_dir)
+        except (OSError, ValueError, KeyError) as e:
+            print(
+                f"⚠️ Runbook index {settings.index_dir} is unavailable ({e}); "
+                "run 'aira index' to build it."
+            )
+            return None
+
+    def flush_telemetry(self):
+        """Exports recorded metrics to the configured Prometheus textfile, if any."""
+        textfile = self.config.telemetry.prometheus_textfile
+        if textfile:
+            self.telemetry.write_prometheus_textfile(textfile)
+
+    def reload(self, config: AppConfig) -> List[str]:
+        """
+        Applies a new configuration, rebuilding only the components whose
+        config actually changed. Unchanged connectors keep their state,
+        including their circuit breakers.
+
+        Returns:
+            List[str]: The names of the components that were rebuilt or removed.
+        """
+        old_config, self.config = self.config, config
+        changed: List[str] = []
+        health_status = [True]
+
+        if config.llm != old_config.llm:
+            self.llm_provider = self._initialize_llm_provider(health_status)
+            changed.append("llm")
+
+        old_entries = {**old_config.connections, **old_config.actions}
+        new_entries = {**config.connections, **config.actions}
+        connectors = dict(self.connectors)
+        breakers = dict(self.breakers)
+        retired: List[BaseConnector] = []
+        for name in old_entries.keys() - new_entries.keys():
+            if name in connectors:
+                retired.append(connectors.pop(name))
+            breakers.pop(name, None)
+            changed.append(name)
+        for name, conf in new_entries.items():
+            if name in connectors and old_entries.get(name) == conf:
+                continue
+            changed.append(name)
+            if name in connectors:
+                retired.append(connectors.pop(name))
+            try:
+                connectors[name] = get_connector(name=name, config=conf)
+                breakers[name] = self._new_breaker(name)
+            except Exception as e:
+                print(f"❌ {name} ({conf.type}): Failed to initialize: {e}")
+                breakers.pop(name, None)
+
+        if config.circuit_breaker != old_config.circuit_breaker:
+            for breaker in breakers.values():
+                breaker.failure_threshold = config.circuit_breaker.failure_threshold
+                breaker.recovery_timeout = (
+                    config.circuit_breaker.recovery_timeout_seconds
+                )
+
+        self.dispatcher.routes = list(config.routes)
+        self.follow_ups.max_incidents = config.follow_up.max_incidents
+        if config.knowledge.path != old_config.knowledge.path:
+            old_store, self.knowledge = self.knowledge, self._open_knowledge()
+            if old_store is not None:
+                old_store.close()
+            changed.append("knowledge")
+        if config.runbooks != old_config.runbooks:
+            old_index, self.runbooks = self.runbooks, self._open_runbooks()
+            if old_index is not None:
+                old_index.close()
+            changed.append("runbooks")
+        # Swap in whole dicts so concurrent analyses never see a partial update.
+        self.connectors, self.breakers = connectors, breakers
+        for connector in retired:
+            try:
+                connector.close()
+            except Exception as e:
+                print(f"⚠️ {connector.name}: Could not be closed: {e}")
+        return sorted(changed)
+
+    def _new_breaker(self, name: str) -> CircuitBreaker:
+        """Creates a circuit breaker for a connector from the app settings."""
+        settings = self.config.circuit_breaker
+        return CircuitBreaker(
+            name,
+            failure_threshold=settings.failure_threshold,
+            recovery_timeout=settings.recovery_timeout_seconds,
+        )
+
+    def _call_connector(
+        self,
+        name: str,
+        method: str,
+        *args,
+        recording: Optional[Recording] = None,
+        replayer: Optional[Replayer] = None,
+    ) -> Tuple[Any, Optional[str]]:
+        """
+        Calls a connector method through its circuit breaker.
+
+        Args:
+            recording (Optional[Recording]): Captures the call's outcome.
+            replayer (Optional[Replayer]): Serves the outcome from a recording
+                instead of calling the connector.
+
+        Returns:
+            Tuple[Any, Optional[str]]: The result (None if unavailable) and, when
+            the call was skipped or failed, a reason describing the missing context.
+        """
+        if replayer is not None:
+            return replayer.replay_call(name, method, args)
+        result, reason = self._call_live_connector(name, method, *args)
+        if recording is not None:
+            recording.record_call(name, method, args, result, reason)
+        return result, reason
+
+    def _call_live_connector(
+        self, name: str, method: str, *args
+    ) -> Tuple[Any, Optional[str]]:
+        breaker = self.breakers[name]
+        if not breaker.allow_request():
+            print(f"⏭️  Skipping '{name}': circuit is open.")
+            self.telemetry.increment("aira_circuit_open_skips_total", connector=name)
+            return None, f"{name}: skipped, circuit open after repeated failures"
+
+        try:
+            with self.telemetry.timer(
+                "aira_connector_call_duration_seconds", connector=name, method=method
+            ):
+                result = getattr(self.connectors[name], method)(*args)
+        except NotFoundError as e:
+            # The upstream answered, so it is healthy; the lookup was just wrong.
+            breaker.record_success()
+            return None, f"{name}: {e}"
+        except NotImplementedError as e:
+            # Not supported by this connector, which says nothing of its health.
+            return None, f"{name}: {e}"
+        except Exception as e:
+            breaker.record_failure()
+            self.telemetry.increment("aira_connector_errors_total", connector=name)
+            return None, f"{name}: {e}"
+
+        breaker.record_success()
+        return result, None
+
+    def _gather_context(
+        self,
+        trigger_data: Dict[str, Any],
+        recording: Optional[Recording] = None,
+        replayer: Optional[Replayer] = None,
+        incidents_only: bool = False,
+        since: Optional[Dict[str, datetime]] = None,
+    ) -> IncidentContext:
+        """
+        Collects structured records from every applicable connector, or with
+        `incidents_only`, just the incidents (the agent fetches the rest).
+        With `since`, the commits, logs and deploys of the connections it
+        names are only fetched from that point on (within the trigger's
+        windows).
+        """
+        tape = {"recording": recording, "replayer": replayer}
+        context = IncidentContext(trigger=trigger_data)
+        now = datetime.now(timezone.utc)
+
+        def elapsed(name: str, limit_seconds: float) -> float:
+            if since is None or name not in since:
+                return limit_seconds
+            return min(limit_seconds, max(0.0, (now - since[name]).total_seconds()))
+
+        def hours(name: str) -> float:
+            return elapsed(name, context.lookback_hours * 3600) / 3600
+
+        def minutes(name: str) -> int:
+            window = context.time_window_minutes
+            return max(1, math.ceil(elapsed(name, window * 60) / 60))
+
+        infrastructure: List[str] = []
+        incident_id = trigger_data.get("incident_id")
+        source = trigger_data.get("source")
+
+        # Incidents come first: deploys are looked up for their services.
+        ordered = sorted(
+            self.connectors.items(),
+            key=lambda item: not isinstance(item[1], AlertingProvider),
+        )
+        for name, connector in ordered:
+            if incidents_only and not isinstance(connector, AlertingProvider):
+                continue
+            if isinstance(connector, AlertingProvider):
+                if not incident_id or (source and source != name):
+                    continue
+                result, reason = self._call_connector(
+                    name, "get_incident_details", incident_id, **tape
+                )
+                if result is not None:
+                    context.incidents.append(result)
+            elif isinstance(connector, SourceControlProvider):
+                repo = trigger_data.get("repo") or getattr(
+                    connector.validated_config, "default_repo", None
+                )
+                if not repo:
+                    continue
+                result, reason = self._call_connector(
+                    name, "fetch_recent_commits", repo, hours(name), **tape
+                )
+                if result is not None:
+                    context.commits.extend(result)
+                    context.repos_checked.append(repo)
+            elif isinstance(connector, ObservabilityProvider):
+                query = context.log_query(name)
+                if not query:
+                    continue
+                result, reason = self._call_connector(
+                    name, "fetch_logs", query, minutes(name), **tape
+                )
+                if result is not None:
+                    context.logs.extend(result)
+                    if query not in context.log_queries:
+                        context.log_queries.append(query)
+            elif isinstance(connector, DeploymentProvider):
+                if not connector.lists_deployments:
+                    continue
+                services = sorted({i.service for i in context.incidents if i.service})
+                args = (hours(name), services) if services else (hours(name),)
+                result, reason = self._call_connector(
+                    name, "fetch_recent_deployments", *args, **tape
+                )
+                if result is not None:
+                    context.deployments.extend(result)
+                    context.deployments_checked = True
+            elif isinstance(connector, InfrastructureProvider):
+                # Resources may come from incidents, so these run last.
+                infrastructure.append(name)
+                continue
+            else:
+                continue
+
+            if reason:
+                context.missing.append(reason)
+            elif not isinstance(connector, AlertingProvider):
+                mark = high_water_mark(result)
+                if mark is not None:
+                    context.marks[name] = mark
+
+        # Explicit resources must be found; incident services are a best guess.
+        explicit = trigger_data.get("resources") or []
+        guessed = [i.service for i in context.incidents if i.service]
+        for name in infrastructure:
+            for resource in dict.fromkeys(explicit or guessed):
+                result, reason = self._call_connector(
+                    name, "get_resource_status", resource, **tape
+                )
+                if result is not None:
+                    context.infrastructure.append(result)
+                elif reason and explicit:
+                    context.missing.append(reason)
+
+        return context
+
+    def run_analysis(
+        self,
+        trigger_data: Dict[str, Any],
+        recording: Optional[Recording] = None,
+        incremental: bool = False,
+        on_field: Optional[FieldCallback] = None,
+    ) -> AnalysisResult:
+        """
+        The main workflow for analyzing an incident.
+
+        Args:
+            trigger_data (Dict[str, Any]): The trigger event. Recognised keys are
+                `incident_id`, `source` (the alerting connection that owns the
+                incident), `repo`, `log_query`, `log_queries` (per observability
+                connection, overriding `log_query`), `resources` (infrastructure
+                resources to check; defaults to the incidents' services),
+                `lookback_hours` and `time_window_minutes`.
+            recording (Optional[Recording]): If given, every connector response
+                and LLM exchange is captured into it for later replay.
+            incremental (bool): If the incident was analyzed recently, only
+                fetch what changed since and ask the LLM to update its previous
+                hypothesis, instead of analyzing from scratch.
+            on_field (Optional[FieldCallback]): With `llm.structured_output`,
+                called with each field of the hypothesis as soon as the LLM
+                has written it, e.g. to post the probable cause early.
+
+        Returns:
+            AnalysisResult: The hypothesis, noting any context that was unavailable.
+
+        Raises:
+            ValueError: If both `recording` and `incremental` are given; a
+                follow-up cannot be replayed without the analyses before it.
+            LLMError: If the LLM could not produce a hypothesis. Nothing is
+                remembered, so a failure never passes for a finding.
+        """
+        if not self.llm_provider:
+            raise RuntimeError("No LLM provider is available for analysis.")
+        if recording is not None and incremental:
+            raise ValueError("Incremental analyses cannot be recorded for replay.")
+        key = follow_up_key(trigger_data) if incremental else None
+        if key is None:
+            return self._analyze(trigger_data, recording=recording, on_field=on_field)
+
+        with self.follow_ups.lock(key):
+            started = datetime.now(timezone.utc)
+            state = self.follow_ups.get(key)
+            max_age = timedelta(minutes=self.config.follow_up.full_after_minutes)
+            if state is None or started - state.analyzed_at > max_age:
+                return self._analyze(
+                    trigger_data, recording=recording, track=key, on_field=on_field
+                )
+            try:
+                return self._follow_up(
+                    state, trigger_data, started, recording, on_field
+                )
+            except Exception:
+                # The state has absorbed evidence the LLM never saw.
+                self.follow_ups.discard(key)
+                raise
+
+    def replay_analysis(self, replayer: Replayer) -> AnalysisResult:
+        """
+        Runs the pipeline against a recording instead of live services. Connector
+        outcomes and the LLM response come from the recording, as do the chat
+        turns of an agentic analysis, whose tool calls are replayed in turn;
+        correlation and rendering run for real, so their cost and output can
+        be compared.
+        Connections are matched by name, so use the config the recording was
+        made with (credentials are never used).
+        """
+        return self._analyze(replayer.recording.trigger, replayer=replayer)
+
+    def _analyze(
+        self,
+        trigger_data: Dict[str, Any],
+        recording: Optional[Recording] = None,
+        replayer: Optional[Replayer] = None,
+        track: Optional[str] = None,
+        on_field: Optional[FieldCallback] = None,
+    ) -> AnalysisResult:
+        started = datetime.now(timezone.utc)
+        # Replays follow the recording, whatever the agent settings are now.
+        if replayer is not None:
+            agentic = replayer.recording.agentic
+        else:
+            agentic = self.config.agent.enabled and self.llm_provider.supports_tools
+        with self.telemetry.span("gather"):
+            context = self._gather_context(
+                trigger_data, recording, replayer, incidents_only=agentic
+            )
+        with self.telemetry.span("correlate"):
+            context.suspects = self._correlate(context)
+        # Replays leave the local stores alone so that they stay reproducible.
+        knowledge = self.knowledge if replayer is None else None
+        if knowledge is not None:
+            with self.telemetry.span("recall"):
+                try:
+                    context.similar = knowledge.similar(
+                        context, self.config.knowledge.max_similar
+                    )
+                except sqlite3.Error as e:
+                    print(f"⚠️ Could not look up similar incidents: {e}")
+        runbooks = self.runbooks if replayer is None else None
+        if runbooks is not None and context.incidents:
+            with self.telemetry.span("retrieve"):
+                query = " ".join(
+                    [f"{i.title} {i.service or ''}" for i in context.incidents]
+                    + [key_context(context)]
+                )
+                context.runbooks = runbooks.search(
+                    query, self.config.runbooks.top_k, self.config.runbooks.max_tokens
+                )
+        with self.telemetry.span("render"):
+            prompt = render_context(context)
+            if agentic:
+                prompt += "\n\n" + render_leads(trigger_data)
+        with self.telemetry.span("llm"):
+            structured = None
+            if agentic:
+                hypothesis, structured = self._investigate(
+                    context, prompt, recording, replayer, on_field
+                )
+            elif replayer is not None:
+                hypothesis, structured = self._replay_answer(replayer, prompt)
+            else:
+                hypothesis, structured = self._generate(
+                    SYSTEM_PROMPT, prompt, recording, on_field
+                )
+        if knowledge is not None:
+            self._remember(context, hypothesis)
+        if track is not None:
+            self.follow_ups.put(
+                track,
+                FollowUpState(context, hypothesis, started, structured=structured),
+            )
+        return self._result(hypothesis, context, structured=structured)
+
+    def _follow_up(
+        self,
+        state: FollowUpState,
+        trigger_data: Dict[str, Any],
+        started: datetime,
+        recording: Optional[Recording] = None,
+        on_field: Optional[FieldCallback] = None,
+    ) -> AnalysisResult:
+        """
+        Updates an earlier analysis from the evidence gathered since. When
+        nothing new turned up, the previous hypothesis stands without an LLM
+        call.
+        """
+        with self.telemetry.span("gather"):
+            fresh = self._gather_context(
+                trigger_data, recording, since=state.since(self.connectors)
+            )
+        delta = state.absorb(fresh)
+        state.checked_at = started
+        if not has_evidence(delta):
+            return self._result(state.hypothesis, state.context, True, state.structured)
+
+        with self.telemetry.span("correlate"):
+            # Ranked over all the evidence, but only resent when it changed.
+            suspects = self._correlate(state.context)
+            if [record_key(s.cause) for s in suspects] != [
+                record_key(s.cause) for s in state.context.suspects
+            ]:
+                delta.suspects = suspects
+            state.context.suspects = suspects
+        with self.telemetry.span("render"):
+            prompt = render_followup(state.hypothesis, delta, state.analyzed_at)
+        with self.telemetry.span("llm"):
+            hypothesis, structured = self._generate(
+                FOLLOW_UP_SYSTEM_PROMPT, prompt, recording, on_field
+            )
+        if self.knowledge is not None:
+            self._remember(state.context, hypothesis)
+        state.hypothesis, state.analyzed_at = hypothesis, started
+        state.structured = structured
+        return self._result(hypothesis, state.context, True, structured)
+
+    def _correlate(self, context: IncidentContext) -> List[Suspect]:
+        settings = self.config.correlation
+        return correlate(
+            context,
+            horizon_minutes=settings.horizon_minutes,
+            decay_minutes=settings.decay_minutes,
+            max_suspects=settings.max_suspects,
+        )
+
+    def _generate(
+        self,
+        system_prompt: str,
+        prompt: str,
+        recording: Optional[Recording],
+        on_field: Optional[FieldCallback] = None,
+    ) -> Tuple[str, Optional[Hypothesis]]:
+        structured = None
+        if self.config.llm.structured_output:
+            structured = self.llm_provider.generate_structured(
+                prompt, system_prompt, on_field
+            )
+            hypothesis = structured.to_markdown()
+        else:
+            hypothesis = self.llm_provider.generate_hypothesis(prompt, system_prompt)
+        if recording is not None:
+            recording.record_llm(
+                system_prompt, prompt, hypothesis, _as_dict(structured)
+            )
+        return hypothesis, structured
+
+    @staticmethod
+    def _replay_answer(
+        replayer: Replayer, prompt: str
+    ) -> Tuple[str, Optional[Hypothesis]]:
+        exchange = replayer.replay_exchange(prompt)
+        structured = None
+        if exchange.get("structured") is not None:
+            structured = Hypothesis.from_dict(exchange["structured"])
+        return exchange["response"], structured
+
+    def _investigate(
+        self,
+        context: IncidentContext,
+        prompt: str,
+        recording: Optional[Recording],
+        replayer: Optional[Replayer] = None,
+        on_field: Optional[FieldCallback] = None,
+    ) -> Tuple[str, Optional[Hypothesis]]:
+        """
+        Lets the LLM fetch the context it needs through connector tools, within
+        the `agent` budgets. What it fetches is added to `context`. Every chat
+        turn is recorded; a replay serves them back, so the tools are called
+        as they were and answered from the recording.
+        """
+        system_prompt = f"{SYSTEM_PROMPT} {AGENT_INSTRUCTIONS}"
+        if self.config.llm.structured_output:
+            system_prompt += f"\n\n{structured_instructions()}"
+
+        def call(name: str, method: str, *args) -> Tuple[Any, Optional[str]]:
+            return self._call_connector(name, method, *args, replayer=replayer)
+
+        def chat(
+            messages: Sequence[Message],
+            tools: Sequence[ToolSpec] = (),
+            timeout: Optional[float] = None,
+        ) -> ChatTurn:
+            if replayer is not None:
+                return replayer.replay_turn()
+            try:
+                turn = self.llm_provider.chat(messages, tools, timeout=timeout)
+            except TimeoutError:
+                if recording is not None:
+                    recording.record_turn(None)
+                raise
+            if recording is not None:
+                recording.record_turn(turn)
+            return turn
+
+        tools = connector_tools(self.connectors, call)
+        run = run_agent(chat, system_prompt, prompt, tools, self.config.agent)
+        # Only calls that finished in time count; abandoned ones may still be
+        # running, and must not touch the context or the recording.
+        for output in run.outputs:
+            if output.call is not None and recording is not None:
+                recording.record_call(*output.call)
+            if output.merge is not None:
+                output.merge(context)
+        self.telemetry.increment("aira_agent_steps_total", run.steps)
+        if run.exhausted is not None:
+            print(f"⚠️ The agent's {run.exhausted} budget ran out; answering early.")
+        if not run.text or run.text == TIMED_OUT:
+            raise LLMError(run.text or "The LLM returned an empty response.")
+        if replayer is not None:
+            return self._replay_answer(replayer, prompt)
+        structured = None
+        hypothesis = run.text
+        if self.config.llm.structured_output:
+            structured = parse_hypothesis(run.text, on_field)
+            hypothesis = structured.to_markdown()
+        if recording is not None:
+            recording.record_llm(
+                system_prompt, prompt, hypothesis, _as_dict(structured)
+            )
+        return hypothesis, structured
+
+    def _remember(self, context: IncidentContext, hypothesis: str):
+        try:
+            self.knowledge.record(context, hypothesis)
+        except sqlite3.Error as e:
+            print(f"⚠️ Could not store the analysis: {e}")
+
+    @staticmethod
+    def _result(
+        hypothesis: str,
+        context: IncidentContext,
+        follow_up: bool = False,
+        structured: Optional[Hypothesis] = None,
+    ) -> AnalysisResult:
+        if context.missing:
+            hypothesis += (
+                "\n\n⚠️ Degraded analysis: the following context was unavailable:\n"
+                + render_missing(context.missing)
+            )
+        return AnalysisResult(
+            hypothesis=hypothesis,
+            missing_context=context.missing,
+            incidents=list(context.incidents),
+            follow_up=follow_up,
+            structured=structured,
+        )
+
+    def notify(self, result: AnalysisResult) -> List[str]:
+        """
+        Posts an analysis to every action whose route matches its incidents'
+        services and severities. Returns immediately; delivery happens on
+        per-destination workers (see `flush_notifications`).
+
+        Returns:
+            List[str]: The actions the analysis was routed to.
+        """
+        incidents = result.incidents
+        title = f"{incidents[0].id}: {incidents[0].title}" if incidents else None
+        return self.dispatcher.dispatch(
+            self.connectors,
+            analysis_blocks(result.hypothesis, title),
+            services=[i.service for i in incidents],
+            severities=[i.severity for i in incidents],
+            key=incidents[0].id if incidents else None,
+        )
+
+    def flush_notifications(self, timeout: Optional[float] = None) -> bool:
+        """Waits for notifications to be delivered. False on timeout."""
+        return self.dispatcher.flush(self.connectors, timeout)
+
+
+def _as_dict(structured: Optional[Hypothesis]) -> Optional[Dict[str, Any]]:
+    return asdict(structured) if structured is not None else None
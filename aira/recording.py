@@ -0,0 +1,265 @@
+# aira/recording.py
+
+"""
+Record and replay of incident analyses.
+
+A `Recording` captures everything one analysis read from the outside world:
+the trigger, the outcome of every connector call and every LLM exchange,
+including the tool-calling turns of an agentic analysis.
+Saved as gzip-compressed JSON it is small enough to attach to a bug report,
+and `Orchestrator.replay_analysis()` runs the same pipeline against it with no
+network access, so slow or wrong analyses can be profiled deterministically
+and prompt changes compared on real incidents without API cost.
+"""
+
+import dataclasses
+import gzip
+import json
+from collections import defaultdict, deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from aira.connectors.records import (
+    Alert,
+    Comment,
+    Commit,
+    Deployment,
+    Incident,
+    LogEvent,
+)
+from aira.llm_interfaces.tools import ChatTurn, ToolCall
+
+ARCHIVE_VERSION = 1
+
+RECORD_TYPES = {
+    cls.__name__: cls
+    for cls in (Alert, Comment, Commit, Deployment, Incident, LogEvent)
+}
+
+
+def _encode(value: Any) -> Any:
+    """Converts connector results into JSON-safe values, tagging records."""
+    if isinstance(value, datetime):
+        return {"$datetime": value.isoformat()}
+    if dataclasses.is_dataclass(value) and type(value).__name__ in RECORD_TYPES:
+        encoded = {
+            f.name: _encode(getattr(value, f.name)) for f in dataclasses.fields(value)
+        }
+        return {"$record": type(value).__name__, **encoded}
+    if isinstance(value, (list, tuple)):
+        return [_encode(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _encode(item) for key, item in value.items()}
+    return value
+
+
+def _decode(value: Any) -> Any:
+    """Reverses `_encode`."""
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if "$datetime" in value:
+        return datetime.fromisoformat(value["$datetime"])
+    if "$record" in value:
+        # Records are immutable, so any sequence field was a tuple.
+        fields = {
+            k: tuple(v) if isinstance(v, list) else v
+            for k, v in ((k, _decode(v)) for k, v in value.items() if k != "$record")
+        }
+        return RECORD_TYPES[value["$record"]](**fields)
+    return {key: _decode(item) for key, item in value.items()}
+
+
+class Recording:
+    """The connector responses and LLM exchanges of a single analysis."""
+
+    def __init__(
+        self,
+        trigger: Dict[str, Any],
+        calls: Optional[List[Dict[str, Any]]] = None,
+        llm: Optional[List[Dict[str, Any]]] = None,
+        turns: Optional[List[Optional[Dict[str, Any]]]] = None,
+    ):
+        self.trigger = trigger
+        self.calls: List[Dict[str, Any]] = calls or []
+        self.llm: List[Dict[str, Any]] = llm or []
+        # The agent's chat turns in order; None where a request timed out.
+        self.turns: List[Optional[Dict[str, Any]]] = turns or []
+
+    @property
+    def agentic(self) -> bool:
+        """True if the analysis was an agentic one."""
+        return bool(self.turns)
+
+    def record_call(
+        self,
+        connector: str,
+        method: str,
+        args: Tuple[Any, ...],
+        result: Any,
+        reason: Optional[str],
+    ):
+        """Captures the outcome of one connector call."""
+        self.calls.append(
+            {
+                "connector": connector,
+                "method": method,
+                "args": _encode(list(args)),
+                "result": _encode(result),
+                "reason": reason,
+            }
+        )
+
+    def record_llm(
+        self,
+        system_prompt: str,
+        prompt: str,
+        response: str,
+        structured: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Captures one LLM exchange, with the typed hypothesis as a dict when
+        the response was structured.
+        """
+        exchange: Dict[str, Any] = {
+            "system_prompt": system_prompt,
+            "prompt": prompt,
+            "response": response,
+        }
+        if structured is not None:
+            exchange["structured"] = structured
+        self.llm.append(exchange)
+
+    def record_turn(self, turn: Optional[ChatTurn]):
+        """Captures one chat turn of the agent, or None if it timed out."""
+        if turn is None:
+            self.turns.append(None)
+            return
+        self.turns.append(
+            {
+                "text": turn.text,
+                "tool_calls": [
+                    {"id": c.id, "name": c.name, "arguments": c.arguments}
+                    for c in turn.tool_calls
+                ],
+                "tokens": turn.tokens,
+            }
+        )
+
+    def save(self, path: Path):
+        """
+        Writes the recording as a gzip-compressed JSON archive. The gzip header
+        carries no name or timestamp, so saving the same data is byte-identical.
+        """
+        payload = {
+            "version": ARCHIVE_VERSION,
+            "trigger": self.trigger,
+            "calls": self.calls,
+            "llm": self.llm,
+            "turns": self.turns,
+        }
+        data = json.dumps(payload, separators=(",", ":"), default=str)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as raw, gzip.GzipFile(
+            filename="", fileobj=raw, mode="wb", compresslevel=9, mtime=0
+        ) as f:
+            f.write(data.encode("utf-8"))
+
+    @classmethod
+    def load(cls, path: Path) -> "Recording":
+        """
+        Reads an archive written by `save()`.
+
+        Raises:
+            ValueError: If the archive is from an unsupported version.
+        """
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            payload = json.load(f)
+        if payload.get("version") != ARCHIVE_VERSION:
+            raise ValueError(
+                f"Unsupported recording version {payload.get('version')!r} in {path}."
+            )
+        return cls(
+            payload["trigger"],
+            payload["calls"],
+            payload["llm"],
+            payload.get("turns"),
+        )
+
+
+class Replayer:
+    """
+    Serves a Recording's outcomes in place of live connectors and the LLM.
+
+    Calls are matched on connector, method and arguments; repeated identical
+    calls are answered in the order they were recorded.
+    """
+
+    def __init__(self, recording: Recording):
+        self.recording = recording
+        self._calls: Dict[Tuple[str, str, str], Deque[Dict[str, Any]]] = defaultdict(
+            deque
+        )
+        for call in recording.calls:
+            self._calls[
+                self._key(call["connector"], call["method"], call["args"])
+            ].append(call)
+        self._llm = deque(recording.llm)
+        self._turns = deque(recording.turns)
+        # The prompts rendered during replay, for comparing against the recording.
+        self.prompts: List[str] = []
+
+    @staticmethod
+    def _key(connector: str, method: str, encoded_args: Any) -> Tuple[str, str, str]:
+        return connector, method, json.dumps(encoded_args, sort_keys=True, default=str)
+
+    def replay_call(
+        self, connector: str, method: str, args: Tuple[Any, ...]
+    ) -> Tuple[Any, Optional[str]]:
+        """Returns the recorded (result, reason) for a connector call."""
+        queue = self._calls.get(self._key(connector, method, _encode(list(args))))
+        if not queue:
+            return None, f"{connector}: no recorded response for {method}"
+        call = queue.popleft()
+        return _decode(call["result"]), call["reason"]
+
+    def replay_llm(self, prompt: str) -> str:
+        """
+        Returns the next recorded LLM response. The recorded response is used
+        even if `prompt` differs, so prompt changes can be compared offline.
+
+        Raises:
+            LookupError: If the recording holds no further LLM exchanges.
+        """
+        return self.replay_exchange(prompt)["response"]
+
+    def replay_exchange(self, prompt: str) -> Dict[str, Any]:
+        """
+        Like `replay_llm`, but returns the whole recorded exchange, including
+        the typed hypothesis ("structured") if one was recorded.
+        """
+        self.prompts.append(prompt)
+        if not self._llm:
+            raise LookupError("The recording holds no further LLM exchanges.")
+        return self._llm.popleft()
+
+    def replay_turn(self) -> ChatTurn:
+        """
+        Returns the agent's next recorded chat turn.
+
+        Raises:
+            TimeoutError: If the recorded request timed out.
+            LookupError: If the recording holds no further turns.
+        """
+        if not self._turns:
+            raise LookupError("The recording holds no further chat turns.")
+        turn = self._turns.popleft()
+        if turn is None:
+            raise TimeoutError("The recorded request timed out.")
+        return ChatTurn(
+            turn["text"],
+            tuple(ToolCall(**call) for call in turn["tool_calls"]),
+            turn["tokens"],
+        )
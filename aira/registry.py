@@ -0,0 +1,86 @@
+# aira/registry.py
+
+import importlib
+import threading
+from importlib.metadata import entry_points
+from typing import Any, Dict, List, Optional
+
+
+def import_string(path: str) -> Any:
+    """
+    Imports an object from a 'package.module:attribute' path.
+
+    Raises:
+        ImportError: If the module or attribute cannot be found.
+    """
+    module_path, _, attribute = path.partition(":")
+    if not attribute:
+        raise ImportError(f"'{path}' is not a 'module:attribute' import path.")
+    module = importlib.import_module(module_path)
+    try:
+        return getattr(module, attribute)
+    except AttributeError as e:
+        raise ImportError(
+            f"Module '{module_path}' has no attribute '{attribute}'."
+        ) from e
+
+
+class LazyRegistry:
+    """
+    Maps a short name (e.g. a connector 'type') to a class that is only
+    imported the first time it is requested.
+
+    Keeping registries as import paths means `aira --help` and commands that
+    use a single connector never pay for importing the rest.
+
+    Third-party packages can add entries by declaring entry points in the
+    registry's `group`, e.g. in their setup.py:
+
+        entry_points={
+            "aira.connectors": ["influxdb = acme_aira.influx:InfluxDBConnector"],
+        }
+
+    Entry points are only listed (never imported) until a name is looked up,
+    and built-in entries take precedence over plugins with the same name.
+    """
+
+    def __init__(self, entries: Dict[str, str], group: Optional[str] = None):
+        """
+        Args:
+            entries (Dict[str, str]): Names mapped to 'module:Class' import paths.
+            group (Optional[str]): The entry point group to discover plugins from.
+        """
+        self._entries = dict(entries)
+        self._group = group
+        self._discovered = group is None
+        self._loaded: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def _discover(self):
+        """Adds plugin entry points to the registry, once."""
+        if self._discovered:
+            return
+        for entry_point in entry_points(group=self._group):
+            self._entries.setdefault(entry_point.name, entry_point.value)
+        self._discovered = True
+
+    def __contains__(self, name: str) -> bool:
+        if name not in self._entries:
+            with self._lock:
+                self._discover()
+        return name in self._entries
+
+    def names(self) -> List[str]:
+        """Returns every registered name without importing anything."""
+        with self._lock:
+            self._discover()
+        return sorted(self._entries)
+
+    def get(self, name: str) -> Any:
+        """Returns the class registered under `name`, or None if unknown."""
+        if name not in self:
+            return None
+        with self._lock:
+            if name not in self._loaded:
+                self._loaded[name] = import_string(self._entries[name])
+            return self._loaded[name]
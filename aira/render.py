@@ -0,0 +1,230 @@
+# aira/render.py
+
+"""
+The render stage: turns structured connector records into the compact
+markdown sections that make up the LLM prompt and human-facing reports.
+"""
+
+from datetime import datetime
+from typing import Dict, List, Sequence, Union
+
+from aira.connectors.records import Commit, Deployment, Incident, LogEvent
+from aira.context import IncidentContext
+from aira.correlation import Suspect
+from aira.knowledge import PriorIncident
+from aira.runbooks import RunbookChunk
+
+# How much of a prior hypothesis or resolution is repeated in the prompt.
+PRIOR_EXCERPT_CHARS = 300
+
+
+def render_incident(incident: Incident) -> str:
+    """Formats an incident as a short markdown summary."""
+    lines = [f"- *{incident.id}*: {incident.title}"]
+    details = [
+        f"status: {incident.status}" if incident.status else "",
+        f"severity: {incident.severity}" if incident.severity else "",
+        f"service: {incident.service}" if incident.service else "",
+        f"created: {incident.created_at.isoformat()}" if incident.created_at else "",
+        f"assigned: {', '.join(incident.assignees)}" if incident.assignees else "",
+    ]
+    details = [d for d in details if d]
+    if details:
+        lines.append(f"  ({', '.join(details)})")
+    if incident.description and incident.description != incident.title:
+        lines.append(_indent(incident.description))
+    if incident.comments:
+        lines.append("  Latest comments:")
+        lines.extend(
+            _indent(f"- {c.author}: {c.body}", "    ") for c in incident.comments
+        )
+    return "\n".join(lines)
+
+
+def _indent(text: str, prefix: str = "  ") -> str:
+    return "\n".join(prefix + line for line in text.splitlines())
+
+
+def _quoted(items: Sequence[str]) -> str:
+    return ", ".join(f"'{item}'" for item in items)
+
+
+def render_commits(commits: Sequence[Commit], repo: str, hours: int) -> str:
+    """Formats commits as one markdown bullet per commit."""
+    if not commits:
+        return f"No new commits found in repository '{repo}' in the last {hours} hours."
+    return "\n".join(
+        f"- Commit `{c.short_sha}` by *{c.author}*: {c.summary}" for c in commits
+    )
+
+
+def render_deployments(deployments: Sequence[Deployment], hours: int) -> str:
+    """Formats deploys as one markdown bullet per deploy."""
+    if not deployments:
+        return f"No deployments found in the last {hours} hours."
+    lines = []
+    for d in deployments:
+        where = f" to {d.environment}" if d.environment else ""
+        when = f" at {d.timestamp.strftime('%H:%M UTC')}" if d.timestamp else ""
+        lines.append(
+            f"- Deploy `{d.id}` of *{d.service}* ({d.ref}){where}{when}: "
+            f"{d.status or 'pending'}"
+        )
+    return "\n".join(lines)
+
+
+def render_logs(
+    events: Sequence[LogEvent], query: Union[str, Sequence[str]], minutes: int
+) -> str:
+    """Formats log events, found by one query or several, one bullet per line."""
+    if not events:
+        queries = [query] if isinstance(query, str) else query
+        noun = "query" if len(queries) == 1 else "queries"
+        return f"No logs found for {noun} {_quoted(queries)} in the last {minutes} minutes."
+    return "\n".join(f"- [{e.status.upper()}] {e.message}" for e in events)
+
+
+def render_missing(missing: List[str]) -> str:
+    """Formats the list of context sources that could not be consulted."""
+    return "\n".join(f"- {m}" for m in missing)
+
+
+def render_suspects(suspects: Sequence[Suspect]) -> str:
+    """Formats ranked suspects with the evidence behind each score."""
+    lines = []
+    for rank, suspect in enumerate(suspects, start=1):
+        cause = suspect.cause
+        if isinstance(cause, Commit):
+            label = f"Commit `{cause.short_sha}` by *{cause.author}*: {cause.summary}"
+        else:
+            label = f"Deploy `{cause.id}` of *{cause.service}* ({cause.status})"
+        lines.append(f"{rank}. {label} (score {suspect.score:.2f})")
+        lines.extend(f"   - {e}" for e in suspect.evidence[:3])
+    return "\n".join(lines)
+
+
+def render_similar(similar: Sequence[PriorIncident]) -> str:
+    """Formats prior incidents with an excerpt of how each was explained."""
+    lines = []
+    for prior in similar:
+        label = "Recurrence of" if prior.recurrence else "Similar to"
+        when = prior.analyzed_at.date().isoformat()
+        lines.append(f"- {label} *{prior.incident_id}*: {prior.title} ({when})")
+        if prior.resolution:
+            lines.append(_indent(f"Resolution: {_excerpt(prior.resolution)}"))
+        lines.append(_indent(f"Hypothesis: {_excerpt(prior.hypothesis)}"))
+    return "\n".join(lines)
+
+
+def _excerpt(text: str) -> str:
+    text = " ".join(text.split())
+    if len(text) <= PRIOR_EXCERPT_CHARS:
+        return text
+    return text[: PRIOR_EXCERPT_CHARS - 1].rstrip() + "…"
+
+
+def render_runbooks(chunks: Sequence[RunbookChunk]) -> str:
+    """Formats retrieved runbook excerpts under their source and heading."""
+    sections = []
+    for chunk in chunks:
+        source = f"{chunk.path} › {chunk.heading}" if chunk.heading else chunk.path
+        sections.append(f"### {source}\n{chunk.text}")
+    return "\n\n".join(sections)
+
+
+def render_followup(
+    previous: str, delta: IncidentContext, analyzed_at: datetime
+) -> str:
+    """
+    Renders the prompt for a follow-up analysis: the previous hypothesis and
+    only the evidence that arrived after it was made.
+    """
+    sections = [
+        f"## Previous hypothesis ({analyzed_at.strftime('%H:%M UTC')})\n{previous}"
+    ]
+    for incident in delta.incidents:
+        sections.append(
+            f"## Incident {incident.id} changed\n{render_incident(incident)}"
+        )
+    if delta.suspects:
+        sections.append(
+            "## Ranked suspects, now including earlier evidence\n"
+            + render_suspects(delta.suspects)
+        )
+    commits_by_repo: Dict[str, List[Commit]] = {}
+    for commit in delta.commits:
+        commits_by_repo.setdefault(commit.repo, []).append(commit)
+    for repo, commits in commits_by_repo.items():
+        sections.append(f"## New commits in {repo}\n{render_commits(commits, repo, 0)}")
+    if delta.deployments:
+        sections.append(
+            f"## New or updated deployments\n{render_deployments(delta.deployments, 0)}"
+        )
+    if delta.infrastructure:
+        sections.append(
+            "## Infrastructure status changes\n" + "\n".join(delta.infrastructure)
+        )
+    if delta.log_queries and delta.logs:
+        body = render_logs(delta.logs, delta.log_queries, 0)
+        sections.append(f"## New logs for {_quoted(delta.log_queries)}\n{body}")
+    if delta.missing:
+        sections.append(f"## Missing context\n{render_missing(delta.missing)}")
+    return "\n\n".join(sections)
+
+
+def render_context(context: IncidentContext) -> str:
+    """
+    Renders all gathered context into the prompt body sent to the LLM.
+
+    When the correlation stage has ranked suspects, only those commits are
+    rendered in full; the rest are summarised by count to keep the prompt small.
+    """
+    sections: List[str] = []
+    for incident in context.incidents:
+        sections.append(
+            f"## Incident {incident.id} ({incident.source})\n{render_incident(incident)}"
+        )
+
+    if context.similar:
+        sections.append(f"## Similar past incidents\n{render_similar(context.similar)}")
+
+    if context.runbooks:
+        sections.append(f"## Relevant runbooks\n{render_runbooks(context.runbooks)}")
+
+    if context.suspects:
+        sections.append(f"## Ranked suspects\n{render_suspects(context.suspects)}")
+    suspected = {id(s.cause) for s in context.suspects}
+
+    commits_by_repo: Dict[str, List[Commit]] = {}
+    for commit in context.commits:
+        commits_by_repo.setdefault(commit.repo, []).append(commit)
+    for repo in context.repos_checked:
+        commits = commits_by_repo.get(repo, [])
+        if suspected:
+            others = sum(1 for c in commits if id(c) not in suspected)
+            body = f"{others} other commit(s) not correlated with the symptoms."
+        else:
+            body = render_commits(commits, repo, context.lookback_hours)
+        sections.append(f"## Recent commits in {repo}\n{body}")
+
+    if context.deployments_checked:
+        if suspected:
+            others = sum(1 for d in context.deployments if id(d) not in suspected)
+            body = f"{others} other deploy(s) not correlated with the symptoms."
+        else:
+            body = render_deployments(context.deployments, context.lookback_hours)
+        sections.append(f"## Recent deployments\n{body}")
+
+    if context.infrastructure:
+        sections.append(
+            "## Infrastructure status\n" + "\n".join(context.infrastructure)
+        )
+
+    if context.logs_checked:
+        queries = context.log_queries
+        body = render_logs(context.logs, queries, context.time_window_minutes)
+        sections.append(f"## Logs for {_quoted(queries)}\n{body}")
+
+    if context.missing:
+        sections.append(f"## Missing context\n{render_missing(context.missing)}")
+    return "\n\n".join(sections) or "No context could be gathered."
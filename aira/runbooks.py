@@ -0,0 +1,409 @@
+# aira/runbooks.py
+
+"""
+Retrieval of runbook and postmortem excerpts for the analysis prompt.
+
+`build_index` splits a directory of markdown files into heading-scoped chunks,
+embeds each chunk on the CPU and writes the vectors to a memory-mapped file.
+Rebuilding only embeds files whose content hash changed. Each build is
+written to a directory of its own and published by atomically replacing the
+`CURRENT` file that names it, so readers never mix two builds. A `RunbookIndex`
+maps that file and returns the chunks closest to an incident, packed into a
+token budget.
+
+Embeddings are signed feature hashes of words and word pairs: they need no
+model download, are deterministic, and are sparse, so a query only touches
+the few dimensions it uses. Vectors are stored dimension-major so those
+dimensions are contiguous runs of memory. With numpy installed
+(`pip install "incident-aira[vectors]"`) a lookup over tens of thousands of
+chunks takes a few milliseconds; the pure-Python fallback gives the same
+results but takes tens of milliseconds at that size.
+"""
+
+import hashlib
+import heapq
+import json
+import math
+import mmap
+import os
+import re
+import shutil
+import zlib
+from dataclasses import dataclass
+from operator import add
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised when numpy is missing
+    np = None
+
+DIMENSIONS = 384
+MAX_CHUNK_CHARS = 1200
+INDEX_VERSION = 1
+# A query only scores its heaviest dimensions, which bounds lookup cost.
+MAX_QUERY_DIMS = 48
+# Roughly how many characters make up one LLM token.
+CHARS_PER_TOKEN = 4
+
+_CURRENT = "CURRENT"
+_BUILD = re.compile(r"^build-(\d+)$")
+_MANIFEST = "manifest.json"
+_CHUNKS = "chunks.jsonl"
+_VECTORS = "vectors.f32"
+
+_WORD = re.compile(r"[a-z0-9][a-z0-9_.-]*[a-z0-9]|[a-z0-9]")
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have if in is it of on or that the "
+    "this to was were will with".split()
+)
+
+
+def embed(text: str, dimensions: int = DIMENSIONS) -> Dict[int, float]:
+    """
+    Embeds text as a sparse, L2-normalised hashed bag of words and word pairs.
+
+    Returns:
+        Dict[int, float]: The non-zero dimensions and their weights.
+    """
+    words = [w for w in _WORD.findall(text.lower()) if w not in _STOPWORDS]
+    features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    vector: Dict[int, float] = {}
+    for feature in features:
+        h = zlib.crc32(feature.encode())
+        sign = 1.0 if h & 0x80000000 else -1.0
+        vector[h % dimensions] = vector.get(h % dimensions, 0.0) + sign
+    norm = math.sqrt(sum(v * v for v in vector.values()))
+    return {d: v / norm for d, v in vector.items() if v} if norm else {}
+
+
+def chunk_markdown(
+    text: str, max_chars: int = MAX_CHUNK_CHARS
+) -> List[Tuple[str, str]]:
+    """
+    Splits markdown into chunks that never cross a heading.
+
+    Returns:
+        List[Tuple[str, str]]: (heading path, text) pairs, e.g.
+            ("Database › Failover", "1. Promote the replica...").
+    """
+    chunks: List[Tuple[str, str]] = []
+    headings: List[str] = []
+    paragraphs: List[str] = []
+
+    def flush():
+        heading = " › ".join(headings)
+        current = ""
+        for paragraph in paragraphs:
+            while len(paragraph) > max_chars:
+                if current:
+                    chunks.append((heading, current))
+                    current = ""
+                chunks.append((heading, paragraph[:max_chars]))
+                paragraph = paragraph[max_chars:]
+            if current and len(current) + len(paragraph) + 2 > max_chars:
+                chunks.append((heading, current))
+                current = ""
+            current = f"{current}\n\n{paragraph}" if current else paragraph
+        if current:
+            chunks.append((heading, current))
+        paragraphs.clear()
+
+    block: List[str] = []
+    in_code = False
+    for line in text.splitlines() + [""]:
+        if line.lstrip().startswith("```"):
+            in_code = not in_code
+        match = None if in_code else _HEADING.match(line)
+        if match or (not line.strip() and not in_code):
+            if block:
+                paragraphs.append("\n".join(block).strip())
+                block = []
+            if match:
+                flush()
+                level = len(match.group(1))
+                del headings[level - 1 :]
+                headings.extend([""] * (level - 1 - len(headings)))
+                headings.append(match.group(2))
+                headings[:] = [h for h in headings if h]
+            continue
+        block.append(line)
+    flush()
+    return [(heading, body) for heading, body in chunks if body.strip()]
+
+
+@dataclass(frozen=True, slots=True)
+class RunbookChunk:
+    """A retrieved excerpt of a runbook."""
+
+    path: str
+    heading: str
+    text: str
+    score: float = 0.0
+
+    @property
+    def tokens(self) -> int:
+        return len(self.text) // CHARS_PER_TOKEN + 1
+
+
+@dataclass(frozen=True, slots=True)
+class BuildStats:
+    """What an index build changed."""
+
+    added: int
+    updated: int
+    removed: int
+    unchanged: int
+    chunks: int
+
+
+class RunbookIndex:
+    """
+    A read-only, memory-mapped runbook index.
+
+    Usage:
+        index = RunbookIndex(Path("~/.aira/runbook-index"))
+        chunks = index.search("checkout latency after deploy", k=3, max_tokens=800)
+    """
+
+    def __init__(self, index_dir: Union[str, Path]):
+        """
+        Raises:
+            FileNotFoundError: If no index has been built in `index_dir`.
+            ValueError: If the index is incomplete or from another version.
+        """
+        self.index_dir = Path(index_dir).expanduser()
+        build = (self.index_dir / _CURRENT).read_text().strip()
+        self.build_dir = self.index_dir / build
+        manifest = json.loads((self.build_dir / _MANIFEST).read_text())
+        if manifest.get("version") != INDEX_VERSION:
+            raise ValueError(f"{self.index_dir} was built by another version.")
+        self.manifest = manifest
+        self.dimensions: int = manifest["dimensions"]
+        self.count: int = manifest["count"]
+        self._offsets: List[int] = manifest["offsets"]
+        self._idf: List[float] = manifest["idf"]
+
+        # Chunks are read by slicing a map rather than seeking a shared file
+        # position, so concurrent searches cannot interleave their reads.
+        self._chunks: Optional[mmap.mmap] = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._vectors: Union[memoryview, "np.ndarray", None] = None
+        if self.count:
+            with open(self.build_dir / _CHUNKS, "rb") as f:
+                self._chunks = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            with open(self.build_dir / _VECTORS, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            if len(self._mmap) != 4 * self.dimensions * self.count:
+                self.close()
+                raise ValueError(f"{self.index_dir} is incomplete; rebuild it.")
+            if np is not None:
+                self._vectors = np.frombuffer(self._mmap, dtype=np.float32).reshape(
+                    self.dimensions, self.count
+                )
+            else:
+                self._vectors = memoryview(self._mmap).cast("f")
+
+    def close(self):
+        if isinstance(self._vectors, memoryview):
+            self._vectors.release()
+        self._vectors = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._chunks is not None:
+            self._chunks.close()
+            self._chunks = None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _scores(self, query: Dict[int, float]) -> Union[List[float], "np.ndarray"]:
+        n = self.count
+        weighted = ((d, w * self._idf[d]) for d, w in query.items())
+        weights = dict(heapq.nlargest(MAX_QUERY_DIMS, weighted, lambda p: abs(p[1])))
+        if np is not None:
+            dims = np.fromiter(weights.keys(), dtype=np.intp, count=len(weights))
+            values = np.fromiter(weights.values(), dtype=np.float32, count=len(weights))
+            return values @ self._vectors[dims]
+        scores = [0.0] * n
+        for d, w in weights.items():
+            column = self._vectors[d * n : (d + 1) * n]
+            scores = list(map(add, scores, map(w.__mul__, column)))
+        return scores
+
+    def search(
+        self, query: str, k: int = 3, max_tokens: Optional[int] = None
+    ) -> List[RunbookChunk]:
+        """
+        Returns up to `k` chunks most similar to `query`, best first, whose
+        combined size fits in `max_tokens`.
+        """
+        vector = embed(query, self.dimensions)
+        if not vector or not self.count or k <= 0:
+            return []
+        scores = self._scores(vector)
+        # Fetch a few spare candidates in case the best ones overflow the budget.
+        candidates = min(self.count, k * 3)
+        if np is not None:
+            top = np.argpartition(-scores, candidates - 1)[:candidates]
+            ranked = sorted(top.tolist(), key=lambda i: -scores[i])
+        else:
+            ranked = heapq.nlargest(candidates, range(self.count), scores.__getitem__)
+
+        results: List[RunbookChunk] = []
+        budget = max_tokens if max_tokens is not None else math.inf
+        for i in ranked:
+            if scores[i] <= 0 or len(results) == k:
+                break
+            chunk = self._read_chunk(i, float(scores[i]))
+            if chunk.tokens <= budget:
+                results.append(chunk)
+                budget -= chunk.tokens
+        return results
+
+    def _read_chunk(self, i: int, score: float) -> RunbookChunk:
+        start = self._offsets[i]
+        end = self._offsets[i + 1] if i + 1 < self.count else len(self._chunks)
+        record = json.loads(self._chunks[start:end])
+        return RunbookChunk(record["path"], record["heading"], record["text"], score)
+
+
+def _hash_file(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _iter_docs(docs_dir: Path) -> Iterator[Path]:
+    for pattern in ("*.md", "*.markdown"):
+        yield from docs_dir.rglob(pattern)
+
+
+def build_index(
+    docs_dir: Union[str, Path],
+    index_dir: Union[str, Path],
+    dimensions: int = DIMENSIONS,
+) -> BuildStats:
+    """
+    Indexes the markdown files under `docs_dir` into `index_dir`. Files whose
+    content hash is unchanged since the last build keep their vectors. The
+    build replaces the current one in a single step; the one before it is
+    kept for readers that are still opening it.
+
+    Raises:
+        FileNotFoundError: If `docs_dir` does not exist.
+    """
+    docs_dir = Path(docs_dir).expanduser()
+    index_dir = Path(index_dir).expanduser()
+    if not docs_dir.is_dir():
+        raise FileNotFoundError(f"Docs directory not found: {docs_dir}")
+
+    previous: Optional[RunbookIndex] = None
+    try:
+        previous = RunbookIndex(index_dir)
+        if previous.dimensions != dimensions:
+            previous.close()
+            previous = None
+    except (OSError, ValueError, KeyError):
+        previous = None
+    old_files = previous.manifest["files"] if previous else {}
+
+    files: Dict[str, dict] = {}
+    records: List[RunbookChunk] = []
+    embedded: List[Tuple[int, Dict[int, float]]] = []
+    # (new first row, old first row, count) for files that did not change.
+    reused: List[Tuple[int, int, int]] = []
+    added = updated = unchanged = 0
+    for path in sorted(_iter_docs(docs_dir)):
+        rel = path.relative_to(docs_dir).as_posix()
+        digest = _hash_file(path)
+        old = old_files.get(rel)
+        first = len(records)
+        if old is not None and old["sha256"] == digest:
+            unchanged += 1
+            old_first, count = old["chunks"]
+            reused.append((first, old_first, count))
+            records.extend(
+                previous._read_chunk(row, 0.0)
+                for row in range(old_first, old_first + count)
+            )
+        else:
+            if old is None:
+                added += 1
+            else:
+                updated += 1
+            text = path.read_text(encoding="utf-8", errors="replace")
+            for heading, body in chunk_markdown(text):
+                embedded.append(
+                    (len(records), embed(f"{rel} {heading}\n{body}", dimensions))
+                )
+                records.append(RunbookChunk(rel, heading, body))
+        files[rel] = {"sha256": digest, "chunks": [first, len(records) - first]}
+
+    n = len(records)
+    buffer = bytearray(4 * dimensions * n)
+    vectors = memoryview(buffer).cast("f")
+    for i, vector in embedded:
+        for d, value in vector.items():
+            vectors[d * n + i] = value
+    if previous is not None:
+        old_n = previous.count
+        if reused:
+            old_vectors = memoryview(previous._mmap).cast("f")
+            for d in range(dimensions):
+                for first, old_first, count in reused:
+                    start = d * old_n + old_first
+                    vectors[d * n + first : d * n + first + count] = old_vectors[
+                        start : start + count
+                    ]
+            old_vectors.release()
+        previous.close()
+    # Smoothed inverse document frequency, applied to queries at search time.
+    doc_freq = [
+        n - vectors[d * n : (d + 1) * n].tolist().count(0.0) for d in range(dimensions)
+    ]
+    vectors.release()
+    idf = [math.log((1 + n) / (1 + df)) + 1 for df in doc_freq]
+
+    index_dir.mkdir(parents=True, exist_ok=True)
+    numbers = [
+        int(match.group(1))
+        for match in map(_BUILD.match, (p.name for p in index_dir.iterdir()))
+        if match
+    ]
+    build_dir = index_dir / f"build-{max(numbers, default=0) + 1}"
+    build_dir.mkdir()
+    offsets: List[int] = []
+    with open(build_dir / _CHUNKS, "wb") as f:
+        for record in records:
+            offsets.append(f.tell())
+            line = json.dumps(
+                {"path": record.path, "heading": record.heading, "text": record.text}
+            )
+            f.write(line.encode() + b"\n")
+    with open(build_dir / _VECTORS, "wb") as f:
+        f.write(buffer)
+    manifest = {
+        "version": INDEX_VERSION,
+        "dimensions": dimensions,
+        "count": n,
+        "files": files,
+        "offsets": offsets,
+        "idf": idf,
+    }
+    (build_dir / _MANIFEST).write_text(json.dumps(manifest))
+    try:
+        current = (index_dir / _CURRENT).read_text().strip()
+    except OSError:
+        current = None
+    (index_dir / f"{_CURRENT}.tmp").write_text(build_dir.name)
+    os.replace(index_dir / f"{_CURRENT}.tmp", index_dir / _CURRENT)
+    # Readers that read CURRENT just before the switch may still open the
+    # previous build; anything older is unreachable.
+    for path in index_dir.iterdir():
+        if _BUILD.match(path.name) and path.name not in (build_dir.name, current):
+            shutil.rmtree(path, ignore_errors=True)
+
+    removed = len(old_files.keys() - files.keys())
+    return BuildStats(added, updated, removed, unchanged, n)
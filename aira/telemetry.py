@@ -0,0 +1,290 @@
+# aira/telemetry.py
+
+"""
+Pipeline instrumentation: stage spans, latency histograms and counters.
+
+A process-wide `Telemetry` instance is returned by `get_telemetry()`. It is
+a no-op until `configure_telemetry()` enables it, so instrumented code pays
+a single method call with no locking or allocation when telemetry is off.
+
+Metrics can be exported in the Prometheus text format (for the node_exporter
+textfile collector, which suits short-lived CLI runs) and mirrored to
+OpenTelemetry when the `opentelemetry-api` package is installed.
+"""
+
+import contextlib
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+# Latency buckets in seconds, from a local cache hit up to a slow LLM call.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# Every metric Aira records: name -> (type, help text).
+METRICS: Dict[str, Tuple[str, str]] = {
+    "aira_stage_duration_seconds": (
+        "histogram",
+        "Time spent in each pipeline stage.",
+    ),
+    "aira_connector_call_duration_seconds": (
+        "histogram",
+        "Latency of connector calls made by the Orchestrator.",
+    ),
+    "aira_connector_errors_total": ("counter", "Connector calls that failed."),
+    "aira_circuit_open_skips_total": (
+        "counter",
+        "Connector calls skipped because the circuit was open.",
+    ),
+    "aira_http_request_duration_seconds": (
+        "histogram",
+        "Latency of HTTP requests made by connectors.",
+    ),
+    "aira_http_response_bytes_total": (
+        "counter",
+        "Bytes received from upstream APIs.",
+    ),
+    "aira_llm_tokens_total": ("counter", "LLM tokens consumed, by direction."),
+    "aira_cache_hits_total": ("counter", "Cache lookups that avoided work."),
+    "aira_cache_misses_total": ("counter", "Cache lookups that had to do work."),
+    "aira_retries_total": ("counter", "Operations retried after a failure."),
+    "aira_agent_steps_total": ("counter", "LLM turns taken by agentic analyses."),
+    "aira_agent_tool_calls_total": (
+        "counter",
+        "Connector tools called by the agent, by tool.",
+    ),
+    "aira_agent_budget_exhausted_total": (
+        "counter",
+        "Agentic analyses cut short by a budget, by budget.",
+    ),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class _Histogram:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self, buckets: int):
+        self.counts = [0] * (buckets + 1)  # The last slot is +Inf
+        self.total = 0.0
+        self.count = 0
+
+
+class Telemetry:
+    """Records metrics and spans; every method is a no-op while disabled."""
+
+    def __init__(self, enabled: bool = False, buckets=DEFAULT_BUCKETS):
+        self.enabled = enabled
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, _Histogram]] = {}
+        self._tracer = None
+        self._meter = None
+        self._otel_instruments: Dict[str, Any] = {}
+
+    # --- Recording ---
+
+    def increment(self, name: str, value: float = 1, **labels: str):
+        """Adds `value` to a counter."""
+        if not self.enabled:
+            return
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+        self._otel_record(name, value, labels)
+
+    def observe(self, name: str, value: float, **labels: str):
+        """Records one observation in a histogram."""
+        if not self.enabled:
+            return
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram(len(self.buckets))
+            histogram.counts[bisect_left(self.buckets, value)] += 1
+            histogram.total += value
+            histogram.count += 1
+        self._otel_record(name, value, labels)
+
+    @contextlib.contextmanager
+    def _timed(self, metric: str, span_name: str, labels: Dict[str, str]):
+        span_cm = (
+            self._tracer.start_as_current_span(span_name, attributes=labels)
+            if self._tracer
+            else contextlib.nullcontext()
+        )
+        start = time.perf_counter()
+        with span_cm:
+            try:
+                yield
+            finally:
+                self.observe(metric, time.perf_counter() - start, **labels)
+
+    def span(self, stage: str, **labels: str):
+        """
+        Times a block as a pipeline stage.
+
+        Usage:
+            with telemetry.span("gather"):
+                ...
+        """
+        if not self.enabled:
+            return _NULL_CONTEXT
+        return self._timed(
+            "aira_stage_duration_seconds", f"aira.{stage}", {"stage": stage, **labels}
+        )
+
+    def timer(self, metric: str, **labels: str):
+        """Times a block into an arbitrary histogram metric."""
+        if not self.enabled:
+            return _NULL_CONTEXT
+        return self._timed(metric, metric, labels)
+
+    # --- Reading & Export ---
+
+    def counter_value(self, name: str, **labels: str) -> float:
+        """Returns a counter's current value (0 if never incremented)."""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            return self._counters.get(name, {}).get(key, 0)
+
+    def histogram_count(self, name: str, **labels: str) -> int:
+        """Returns how many observations a histogram series holds."""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            histogram = self._histograms.get(name, {}).get(key)
+            return histogram.count if histogram else 0
+
+    def quantile(self, name: str, q: float, **labels: str) -> float:
+        """
+        Estimates a quantile of a histogram series the way Prometheus'
+        `histogram_quantile` does: linear interpolation inside the bucket
+        holding the q-th observation. Returns 0.0 for an empty series.
+        """
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            histogram = self._histograms.get(name, {}).get(key)
+            if not histogram or not histogram.count:
+                return 0.0
+            counts = list(histogram.counts)
+        rank = q * sum(counts)
+        cumulative, lower = 0, 0.0
+        for bound, count in zip(self.buckets, counts):
+            if count and cumulative + count >= rank:
+                return lower + (bound - lower) * (rank - cumulative) / count
+            cumulative += count
+            lower = bound
+        return self.buckets[-1]
+
+    def render_prometheus(self) -> str:
+        """Renders every recorded metric in the Prometheus text format."""
+        lines: List[str] = []
+        with self._lock:
+            for name in sorted({*self._counters, *self._histograms}):
+                kind, help_text = METRICS.get(name, ("untyped", name))
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for key, value in sorted(self._counters.get(name, {}).items()):
+                    lines.append(f"{name}{_format_labels(key)} {value:g}")
+                for key, hist in sorted(self._histograms.get(name, {}).items()):
+                    cumulative = 0
+                    for bound, count in zip(self.buckets, hist.counts):
+                        cumulative += count
+                        le = _format_labels(key + (("le", f"{bound:g}"),))
+                        lines.append(f"{name}_bucket{le} {cumulative}")
+                    inf = _format_labels(key + (("le", "+Inf"),))
+                    lines.append(f"{name}_bucket{inf} {hist.count}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {hist.total:g}")
+                    lines.append(f"{name}_count{_format_labels(key)} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus_textfile(self, path: Path):
+        """Atomically writes the metrics for the node_exporter textfile collector."""
+        if not self.enabled:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+        with os.fdopen(fd, "w") as f:
+            f.write(self.render_prometheus())
+        os.replace(tmp, path)
+
+    def reset(self):
+        """Discards every recorded metric."""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    # --- OpenTelemetry ---
+
+    def enable_opentelemetry(self) -> bool:
+        """
+        Mirrors spans and metrics to OpenTelemetry, if `opentelemetry-api` is
+        installed. Where the data goes is decided by the OTel SDK configured
+        by the host process.
+
+        Returns:
+            bool: True if OpenTelemetry is available.
+        """
+        try:
+            from opentelemetry import metrics, trace
+        except ImportError:
+            return False
+        self._tracer = trace.get_tracer("aira")
+        self._meter = metrics.get_meter("aira")
+        return True
+
+    def _otel_record(self, name: str, value: float, labels: Dict[str, str]):
+        if self._meter is None:
+            return
+        instrument = self._otel_instruments.get(name)
+        if instrument is None:
+            kind, help_text = METRICS.get(name, ("counter", name))
+            if kind == "histogram":
+                instrument = self._meter.create_histogram(name, description=help_text)
+            else:
+                instrument = self._meter.create_counter(name, description=help_text)
+            self._otel_instruments[name] = instrument
+        if hasattr(instrument, "record"):
+            instrument.record(value, attributes=labels)
+        else:
+            instrument.add(value, attributes=labels)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+
+
+_NULL_CONTEXT = contextlib.nullcontext()
+_telemetry = Telemetry(enabled=False)
+
+
+def get_telemetry() -> Telemetry:
+    """Returns the process-wide Telemetry instance."""
+    return _telemetry
+
+
+def configure_telemetry(enabled: bool, opentelemetry: bool = False) -> Telemetry:
+    """
+    Enables or disables the process-wide Telemetry instance.
+
+    Returns:
+        Telemetry: The configured instance.
+    """
+    _telemetry.enabled = enabled
+    if enabled and opentelemetry and not _telemetry.enable_opentelemetry():
+        print("⚠️ opentelemetry-api is not installed; OpenTelemetry export is off.")
+    return _telemetry
@@ -0,0 +1,81 @@
+# benchmarks/import_time.py
+
+"""
+Import-time regression benchmark for the Aira CLI.
+
+Runs each target in a fresh interpreter with `-X importtime`, reports the
+cumulative import cost of the `aira` modules, and fails if a target exceeds
+its budget or drags in a module that should stay lazy.
+
+Usage:
+    python -m benchmarks.import_time [--repeat 5]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# Target statement -> (budget in milliseconds, modules that must NOT be imported).
+TARGETS: Dict[str, Tuple[float, List[str]]] = {
+    "import aira.cli": (250.0, ["openai", "requests", "yaml", "pydantic"]),
+    "import aira.connectors": (600.0, ["openai", "requests"]),
+    "import aira.orchestrator": (800.0, ["openai", "requests"]),
+}
+
+
+def measure(statement: str) -> Tuple[float, List[str]]:
+    """
+    Imports `statement` in a fresh interpreter.
+
+    Returns:
+        Tuple[float, List[str]]: The cumulative import time in milliseconds of
+        the top-level module, and every module name that was imported.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    target = statement.split()[-1]
+    cumulative_us, modules = 0, []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[12:].split("|"))
+        if not cumulative.isdigit():
+            continue  # The header row
+        modules.append(name)
+        if name == target:
+            cumulative_us = int(cumulative)
+    return cumulative_us / 1000, modules
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    failed = False
+    for statement, (budget_ms, forbidden) in TARGETS.items():
+        timings, modules = [], []
+        for _ in range(args.repeat):
+            elapsed, modules = measure(statement)
+            timings.append(elapsed)
+        median = statistics.median(timings)
+        leaked = [m for m in forbidden if m in modules]
+        status = "ok"
+        if median > budget_ms or leaked:
+            status, failed = "FAIL", True
+        print(
+            f"{status:4} {statement:28} median {median:7.1f} ms "
+            f"(budget {budget_ms:.0f} ms)"
+            + (f" leaked: {', '.join(leaked)}" if leaked else "")
+        )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,222 @@
+# benchmarks/mock_services.py
+
+"""
+Local stand-in HTTP servers for the services Aira talks to.
+
+Each server replays a recorded fixture from `benchmarks/fixtures/` with
+configurable latency, error rate and payload size, so the full pipeline can
+be benchmarked offline and reproducibly.
+"""
+
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+_MINUTES_AGO = re.compile(r"\{\{minutes_ago:(\d+)\}\}")
+
+
+@dataclass
+class ServiceProfile:
+    """How a stand-in service behaves."""
+
+    latency_ms: float = 0.0
+    # Uniform jitter added on top of `latency_ms`.
+    jitter_ms: float = 0.0
+    # Fraction of requests answered with HTTP 503.
+    error_rate: float = 0.0
+    # List payloads (commits, log lines) are repeated to this many items.
+    payload_items: Optional[int] = None
+
+
+def load_fixture(name: str) -> str:
+    """Reads a fixture file as raw text (placeholders still unresolved)."""
+    return (FIXTURES_DIR / name).read_text()
+
+
+def render_fixture(raw: str, items: Optional[int] = None) -> Any:
+    """
+    Resolves `{{minutes_ago:N}}` placeholders to timestamps relative to now,
+    then optionally grows the fixture's main list to `items` entries.
+    """
+    now = datetime.now(timezone.utc)
+    text = _MINUTES_AGO.sub(
+        lambda m: (now - timedelta(minutes=int(m.group(1)))).strftime(
+            "%Y-%m-%dT%H:%M:%SZ"
+        ),
+        raw,
+    )
+    payload = json.loads(text)
+    if items is None:
+        return payload
+    target = payload if isinstance(payload, list) else payload.get("data")
+    if isinstance(target, list) and target:
+        template = list(target)
+        target[:] = [_vary(template[i % len(template)], i) for i in range(items)]
+    return payload
+
+
+def _vary(item: Dict[str, Any], index: int) -> Dict[str, Any]:
+    """Copies a list item, giving it a distinct identifier."""
+    copy = json.loads(json.dumps(item))
+    if "sha" in copy:
+        copy["sha"] = f"{index:040x}"
+    if "id" in copy:
+        copy["id"] = f"{copy['id']}-{index}"
+    return copy
+
+
+# A route is (method, path regex) -> handler returning (status, payload).
+Route = Tuple[
+    str, "re.Pattern[str]", Callable[[re.Match, ServiceProfile], Tuple[int, Any]]
+]
+
+
+def _fixture_route(method: str, pattern: str, fixture: str) -> Route:
+    raw = load_fixture(fixture)
+    return (
+        method,
+        re.compile(pattern),
+        lambda match, profile: (200, render_fixture(raw, profile.payload_items)),
+    )
+
+
+def _static_route(method: str, pattern: str, payload: Any) -> Route:
+    return method, re.compile(pattern), lambda match, profile: (200, payload)
+
+
+SERVICE_ROUTES: Dict[str, Callable[[], List[Route]]] = {
+    "github": lambda: [
+        _static_route("GET", r"^/user$", {"login": "aira-bench"}),
+        _fixture_route("GET", r"^/repos/[^/]+/[^/]+/commits$", "github_commits.json"),
+    ],
+    "pagerduty": lambda: [
+        _static_route("GET", r"^/incidents$", {"incidents": [], "more": False}),
+        _fixture_route("GET", r"^/incidents/[^/]+$", "pagerduty_incident.json"),
+    ],
+    "jsm": lambda: [
+        _static_route("GET", r"^/rest/api/3/myself$", {"displayName": "Aira Bench"}),
+        _fixture_route("GET", r"^/rest/api/3/issue/[^/]+$", "jsm_issue.json"),
+        _static_route(
+            "GET",
+            r"^/rest/api/3/issue/[^/]+/comment$",
+            {"comments": [], "startAt": 0, "total": 0},
+        ),
+    ],
+    "datadog": lambda: [
+        _static_route("GET", r"^/api/v1/validate$", {"valid": True}),
+        _fixture_route("POST", r"^/api/v2/logs/events/search$", "datadog_logs.json"),
+    ],
+    "slack": lambda: [
+        (
+            "POST",
+            re.compile(r"^/services/.+$"),
+            lambda match, profile: (200, "ok"),
+        ),
+    ],
+    "openai": lambda: [
+        _static_route("GET", r"^/v1/models$", {"object": "list", "data": []}),
+        _fixture_route("POST", r"^/v1/chat/completions$", "openai_chat.json"),
+    ],
+}
+
+
+class StandInServer:
+    """
+    A threaded HTTP server on 127.0.0.1 that serves one service's routes.
+
+    Usage:
+        with StandInServer("github", ServiceProfile(latency_ms=80)) as server:
+            url = server.url
+    """
+
+    def __init__(self, service: str, profile: Optional[ServiceProfile] = None):
+        self.service = service
+        self.profile = profile or ServiceProfile()
+        self.routes = SERVICE_ROUTES[service]()
+        self.requests_served = 0
+        self._counter_lock = threading.Lock()
+        self._random = random.Random(0)
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler_class(self):
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _serve(self, method: str):
+                length = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    self.rfile.read(length)
+                status, payload = stand_in.respond(method, self.path.split("?")[0])
+                body = payload if isinstance(payload, str) else json.dumps(payload)
+                data = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header(
+                    "Content-Type",
+                    "text/plain" if isinstance(payload, str) else "application/json",
+                )
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._serve("GET")
+
+            def do_POST(self):
+                self._serve("POST")
+
+            def log_message(self, format, *args):
+                pass  # Keep benchmark output clean
+
+        return Handler
+
+    def respond(self, method: str, path: str) -> Tuple[int, Any]:
+        """Applies the profile and dispatches a request to its route."""
+        with self._counter_lock:
+            self.requests_served += 1
+            jitter = self._random.uniform(0, self.profile.jitter_ms)
+            failed = self._random.random() < self.profile.error_rate
+        delay = (self.profile.latency_ms + jitter) / 1000
+        if delay:
+            time.sleep(delay)
+        if failed:
+            return 503, {"error": "stand-in injected failure"}
+        for route_method, pattern, handler in self.routes:
+            match = pattern.match(path)
+            if route_method == method and match:
+                return handler(match, self.profile)
+        return 404, {"error": f"no stand-in route for {method} {path}"}
+
+    def start(self) -> "StandInServer":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name=f"stand-in-{self.service}"
+        )
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StandInServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
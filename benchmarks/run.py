@@ -0,0 +1,276 @@
+# benchmarks/run.py
+
+"""
+End-to-end benchmark of the incident-analysis pipeline against local stand-ins.
+
+Starts stand-in servers for GitHub, PagerDuty, JSM, Datadog, Slack and OpenAI,
+points a real Orchestrator at them, and runs analyses at several concurrency
+levels. Reports throughput, end-to-end latency percentiles and per-stage
+latency percentiles, and can fail on regressions against a saved baseline.
+
+Usage:
+    python -m benchmarks.run --concurrency 1,4,16 --iterations 40 \\
+        --latency openai=800,datadog=150 --error-rate datadog=0.05 \\
+        --payload-items datadog=1000 --json results.json --baseline previous.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from aira.config import AppConfig
+from aira.orchestrator import Orchestrator
+from aira.telemetry import get_telemetry
+from benchmarks.mock_services import SERVICE_ROUTES, ServiceProfile, StandInServer
+
+STAGES = ("gather", "correlate", "render", "llm", "notify")
+
+# Realistic defaults: the LLM dominates, SaaS APIs take tens to hundreds of ms.
+DEFAULT_LATENCY_MS = {
+    "github": 120,
+    "pagerduty": 90,
+    "jsm": 150,
+    "datadog": 200,
+    "slack": 60,
+    "openai": 900,
+}
+
+TRIGGERS = [
+    {
+        "incident_id": "Q1ABCDEF23GHIJ",
+        "source": "pagerduty",
+        "log_query": "service:checkout status:error",
+    },
+    {
+        "incident_id": "OPS-1289",
+        "source": "jsm",
+        "log_query": "service:checkout status:error",
+    },
+]
+
+
+def _parse_mapping(value: str, cast=float) -> Dict[str, Any]:
+    """Parses 'service=value,service=value' command-line options."""
+    mapping = {}
+    for pair in filter(None, value.split(",")):
+        service, _, raw = pair.partition("=")
+        if service not in SERVICE_ROUTES:
+            raise argparse.ArgumentTypeError(f"Unknown service '{service}'.")
+        mapping[service] = cast(raw)
+    return mapping
+
+
+def build_config(servers: Dict[str, StandInServer]) -> AppConfig:
+    """Builds an AppConfig whose connectors all point at the stand-ins."""
+    return AppConfig(
+        llm={
+            "provider": "openai",
+            "model": "gpt-4o",
+            "api_key": "bench-key",
+            "base_url": f"{servers['openai'].url}/v1",
+        },
+        connections={
+            "github": {
+                "type": "github",
+                "token": "bench-token",
+                "default_repo": "acme/checkout",
+                "api_base_url": servers["github"].url,
+            },
+            "pagerduty": {
+                "type": "pagerduty",
+                "api_key": "bench-key",
+                "from_email": "bench@example.com",
+                "api_base_url": servers["pagerduty"].url,
+            },
+            "jsm": {
+                "type": "jsm",
+                "instance_url": servers["jsm"].url,
+                "user_email": "bench@example.com",
+                "api_token": "bench-token",
+            },
+            "datadog": {
+                "type": "datadog",
+                "api_key": "bench-key",
+                "app_key": "bench-app",
+                "api_base_url": servers["datadog"].url,
+            },
+        },
+        actions={
+            "slack": {
+                "type": "slack",
+                "webhook_url": f"{servers['slack'].url}/services/T000/B000/XXXX",
+            }
+        },
+        telemetry={"enabled": True},
+    )
+
+
+def run_level(orchestrator: Orchestrator, concurrency: int, iterations: int) -> Dict:
+    """Runs `iterations` analyses with `concurrency` workers and summarises them."""
+    telemetry = get_telemetry()
+    telemetry.reset()
+    slack = orchestrator.connectors["slack"]
+
+    def one(index: int) -> float:
+        start = time.perf_counter()
+        result = orchestrator.run_analysis(TRIGGERS[index % len(TRIGGERS)])
+        with telemetry.span("notify"):
+            slack.post_message(
+                [
+                    {
+                        "type": "section",
+                        "text": {"type": "mrkdwn", "text": result.hypothesis},
+                    }
+                ]
+            )
+        return time.perf_counter() - start
+
+    wall_start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            latencies = sorted(pool.map(one, range(iterations)))
+    wall = time.perf_counter() - wall_start
+
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "concurrency": concurrency,
+        "iterations": iterations,
+        "throughput_per_s": iterations / wall,
+        "e2e_ms": {
+            "p50": cuts[49] * 1000,
+            "p95": cuts[94] * 1000,
+            "p99": cuts[98] * 1000,
+            "max": latencies[-1] * 1000,
+        },
+        "stages_ms": {
+            stage: {
+                q: telemetry.quantile("aira_stage_duration_seconds", value, stage=stage)
+                * 1000
+                for q, value in (("p50", 0.5), ("p95", 0.95))
+            }
+            for stage in STAGES
+        },
+        "circuit_skips": sum(
+            telemetry.counter_value("aira_circuit_open_skips_total", connector=name)
+            for name in orchestrator.connectors
+        ),
+    }
+
+
+def run_benchmark(
+    concurrency_levels: List[int],
+    iterations: int,
+    profiles: Dict[str, ServiceProfile],
+) -> List[Dict]:
+    """Starts the stand-ins and benchmarks every concurrency level."""
+    servers = {
+        service: StandInServer(service, profiles.get(service)).start()
+        for service in SERVICE_ROUTES
+    }
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            orchestrator = Orchestrator(build_config(servers), [True])
+        return [
+            run_level(orchestrator, level, iterations) for level in concurrency_levels
+        ]
+    finally:
+        for server in servers.values():
+            server.stop()
+
+
+def print_report(results: List[Dict]):
+    header = f"{'conc':>4} {'rps':>7} {'p50':>8} {'p95':>8} {'p99':>8}  per-stage p50/p95 (ms)"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        e2e = r["e2e_ms"]
+        stages = "  ".join(
+            f"{s}={v['p50']:.0f}/{v['p95']:.0f}"
+            for s, v in r["stages_ms"].items()
+            if v["p95"]
+        )
+        print(
+            f"{r['concurrency']:>4} {r['throughput_per_s']:>7.2f} "
+            f"{e2e['p50']:>8.1f} {e2e['p95']:>8.1f} {e2e['p99']:>8.1f}  {stages}"
+            + (f"  circuit_skips={r['circuit_skips']:g}" if r["circuit_skips"] else "")
+        )
+
+
+def compare_to_baseline(
+    results: List[Dict], baseline: List[Dict], tolerance: float
+) -> List[str]:
+    """Returns a description of every regression beyond `tolerance`."""
+    previous = {r["concurrency"]: r for r in baseline}
+    regressions = []
+    for r in results:
+        old = previous.get(r["concurrency"])
+        if not old:
+            continue
+        if r["e2e_ms"]["p95"] > old["e2e_ms"]["p95"] * (1 + tolerance):
+            regressions.append(
+                f"concurrency {r['concurrency']}: p95 {old['e2e_ms']['p95']:.0f}ms "
+                f"-> {r['e2e_ms']['p95']:.0f}ms"
+            )
+        if r["throughput_per_s"] < old["throughput_per_s"] * (1 - tolerance):
+            regressions.append(
+                f"concurrency {r['concurrency']}: throughput "
+                f"{old['throughput_per_s']:.2f}/s -> {r['throughput_per_s']:.2f}/s"
+            )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the Aira pipeline against local stand-in services."
+    )
+    parser.add_argument("--concurrency", default="1,4,16")
+    parser.add_argument("--iterations", type=int, default=40)
+    parser.add_argument(
+        "--latency", type=_parse_mapping, default={}, help="e.g. openai=800,github=50"
+    )
+    parser.add_argument("--jitter", type=_parse_mapping, default={})
+    parser.add_argument("--error-rate", type=_parse_mapping, default={})
+    parser.add_argument(
+        "--payload-items",
+        type=lambda v: _parse_mapping(v, int),
+        default={},
+        help="Grow list payloads, e.g. datadog=1000,github=300",
+    )
+    parser.add_argument("--json", help="Write results to this file.")
+    parser.add_argument("--baseline", help="Fail on regressions against this file.")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    profiles = {
+        service: ServiceProfile(
+            latency_ms=args.latency.get(service, DEFAULT_LATENCY_MS[service]),
+            jitter_ms=args.jitter.get(service, 0.0),
+            error_rate=args.error_rate.get(service, 0.0),
+            payload_items=args.payload_items.get(service),
+        )
+        for service in SERVICE_ROUTES
+    }
+    levels = [int(level) for level in args.concurrency.split(",")]
+    results = run_benchmark(levels, args.iterations, profiles)
+    print_report(results)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare_to_baseline(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
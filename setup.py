@@ -43,6 +43,8 @@ setup(
     # Extra dependencies for development. Install with: pip install -e ".[dev]"
     extras_require={
         "dev": dev_requirements,
+        # Vectorised runbook retrieval; a pure-Python fallback is used without it.
+        "vectors": ["numpy>=1.24"],
     },
     # This creates the `aira` command-line script
     entry_points={
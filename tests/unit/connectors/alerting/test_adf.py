@@ -0,0 +1,57 @@
+from aira.connectors.alerting.adf import adf_to_text
+
+
+def _text(text: str, **extra) -> dict:
+    return {"type": "text", "text": text, **extra}
+
+
+def test_adf_to_text_flattens_blocks_lists_and_inline_nodes():
+    """Tests that ADF becomes one compact line per block."""
+    document = {
+        "type": "doc",
+        "content": [
+            {"type": "heading", "attrs": {"level": 2}, "content": [_text("Impact")]},
+            {
+                "type": "paragraph",
+                "content": [
+                    _text("Checkout "),
+                    _text("is down", marks=[{"type": "strong"}]),
+                    {"type": "hardBreak"},
+                    {"type": "mention", "attrs": {"text": "@ada"}},
+                ],
+            },
+            {"type": "paragraph", "content": []},
+            {
+                "type": "bulletList",
+                "content": [
+                    {
+                        "type": "listItem",
+                        "content": [{"type": "paragraph", "content": [_text(item)]}],
+                    }
+                    for item in ("rollback", "page db")
+                ],
+            },
+        ],
+    }
+
+    assert adf_to_text(document) == (
+        "Impact\nCheckout is down\n@ada\n- rollback\n- page db"
+    )
+
+
+def test_adf_to_text_caps_size_and_handles_deep_trees():
+    """Tests the size cap and that deep nesting does not recurse."""
+    node = _text("x" * 10)
+    for _ in range(5000):
+        node = {"type": "blockquote", "content": [node]}
+    document = {"type": "doc", "content": [node] * 50}
+
+    text = adf_to_text(document, max_chars=100)
+
+    assert 90 <= len(text) <= 100
+    assert text.endswith("…")
+
+
+def test_adf_to_text_accepts_plain_strings_and_none():
+    assert adf_to_text("line one\n\n\nline two") == "line one\nline two"
+    assert adf_to_text(None) == ""
@@ -1,6 +1,9 @@
+from datetime import datetime, timezone
+
 import pytest
 from pydantic import ValidationError
 from aira.connectors.alerting.jsm import JSMConnector
+from aira.connectors.base import NotFoundError
 
 
 @pytest.fixture
@@ -60,10 +63,71 @@ def test_get_incident_details_success(requests_mock, valid_jsm_config):
         json=mock_response,
         status_code=200,
     )
+    requests_mock.get(
+        f"https://test-company.atlassian.net/rest/api/3/issue/{issue_key}/comment",
+        json={"comments": [], "total": 0},
+    )
     connector = JSMConnector(name="test_jsm", config=valid_jsm_config)
     details = connector.get_incident_details(issue_key)
-    assert details["key"] == issue_key
-    assert details["fields"]["summary"] == "API Gateway is down"
+    assert details.id == issue_key
+    assert details.title == "API Gateway is down"
+    assert details.status == "Investigating"
+
+
+def _adf(*paragraphs: str) -> dict:
+    return {
+        "type": "doc",
+        "content": [
+            {"type": "paragraph", "content": [{"type": "text", "text": p}]}
+            for p in paragraphs
+        ],
+    }
+
+
+def test_get_incident_details_flattens_description_and_latest_comments(
+    requests_mock, valid_jsm_config
+):
+    """Tests ADF flattening and paging through the newest comments."""
+    valid_jsm_config["max_comments"] = 3
+    base = "https://test-company.atlassian.net/rest/api/3/issue/OPS-1"
+    requests_mock.get(
+        base,
+        json={"key": "OPS-1", "fields": {"description": _adf("Checkout", "is down")}},
+    )
+    comments = requests_mock.get(
+        f"{base}/comment",
+        [
+            {
+                "json": {
+                    "comments": [
+                        {"author": {"displayName": "Ada"}, "body": _adf("rolled back")},
+                        {"author": {"displayName": "Bob"}, "body": _adf("paging db")},
+                    ],
+                    "total": 10,
+                }
+            },
+            {
+                "json": {
+                    "comments": [
+                        {"author": {"displayName": "Cy"}, "body": _adf("ack")}
+                    ],
+                    "total": 10,
+                }
+            },
+        ],
+    )
+    connector = JSMConnector(name="jsm", config=valid_jsm_config)
+
+    incident = connector.get_incident_details("OPS-1")
+
+    assert incident.description == "Checkout\nis down"
+    assert [(c.author, c.body) for c in incident.comments] == [
+        ("Cy", "ack"),
+        ("Bob", "paging db"),
+        ("Ada", "rolled back"),
+    ]
+    assert [r.qs["startat"] for r in comments.request_history] == [["0"], ["2"]]
+    assert comments.request_history[0].qs["orderby"] == ["-created"]
 
 
 def test_get_incident_details_not_found(requests_mock, valid_jsm_config):
@@ -73,5 +137,102 @@ def test_get_incident_details_not_found(requests_mock, valid_jsm_config):
         status_code=404,
     )
     connector = JSMConnector(name="test_jsm", config=valid_jsm_config)
-    details = connector.get_incident_details(issue_key)
-    assert details == {}
+    with pytest.raises(NotFoundError):
+        connector.get_incident_details(issue_key)
+
+
+def test_fetch_updated_incidents_pages_through_search(requests_mock, valid_jsm_config):
+    """Tests the JQL change query and nextPageToken pagination."""
+    valid_jsm_config["feed_jql"] = "project = OPS"
+    mock = requests_mock.post(
+        "https://test-company.atlassian.net/rest/api/3/search/jql",
+        [
+            {
+                "json": {
+                    "issues": [
+                        {
+                            "key": "OPS-1",
+                            "fields": {"updated": "2024-05-01T12:01:00.000+0000"},
+                        }
+                    ],
+                    "nextPageToken": "next",
+                    "isLast": False,
+                }
+            },
+            {
+                "json": {
+                    "issues": [
+                        {
+                            "key": "OPS-2",
+                            "fields": {"updated": "2024-05-01T12:09:00.000+0000"},
+                        },
+                        {
+                            "key": "OPS-3",
+                            "fields": {"updated": "2024-05-01T12:30:00.000+0000"},
+                        },
+                    ],
+                    "isLast": True,
+                }
+            },
+        ],
+    )
+    connector = JSMConnector(name="jsm", config=valid_jsm_config)
+    since = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+    until = datetime(2024, 5, 1, 12, 10, tzinfo=timezone.utc)
+
+    incidents = connector.fetch_updated_incidents(since, until)
+
+    assert [i.id for i in incidents] == ["OPS-1", "OPS-2"]  # OPS-3 is after `until`
+    first, second = (r.json() for r in mock.request_history)
+    assert first["jql"].startswith('(project = OPS) AND updated >= "-')
+    assert "updated" in first["fields"]
+    assert second["nextPageToken"] == "next"
+
+
+def test_get_incident_details_requests_only_needed_fields(
+    requests_mock, valid_jsm_config
+):
+    """Tests that the issue GET is projected to the configured fields."""
+    valid_jsm_config["fields"] = ["summary", "status"]
+    valid_jsm_config["max_comments"] = 0
+    mock = requests_mock.get(
+        "https://test-company.atlassian.net/rest/api/3/issue/OPS-1",
+        json={"key": "OPS-1", "fields": {"summary": "Down"}},
+    )
+    connector = JSMConnector(name="jsm", config=valid_jsm_config)
+
+    incident = connector.get_incident_details("OPS-1")
+
+    assert incident.title == "Down"
+    assert mock.last_request.qs["fields"] == ["summary,status"]
+
+
+def test_get_incidents_fetches_keys_in_bulk(requests_mock, valid_jsm_config):
+    """Tests that many issues come back from one search, in request order."""
+    mock = requests_mock.post(
+        "https://test-company.atlassian.net/rest/api/3/search/jql",
+        json={
+            "issues": [
+                {"key": "OPS-2", "fields": {"summary": "Second"}},
+                {"key": "OPS-1", "fields": {"summary": "First"}},
+            ],
+            "isLast": True,
+        },
+    )
+    connector = JSMConnector(name="jsm", config=valid_jsm_config)
+
+    incidents = connector.get_incidents(["OPS-1", "OPS-2", "OPS-1", "OPS-9"])
+
+    assert [i.title for i in incidents] == ["First", "Second"]
+    assert mock.call_count == 1
+    body = mock.last_request.json()
+    assert body["jql"] == 'key in ("OPS-1", "OPS-2", "OPS-9")'
+    assert body["fields"] == [
+        "summary",
+        "status",
+        "priority",
+        "components",
+        "created",
+        "updated",
+        "description",
+    ]
@@ -1,6 +1,8 @@
 import pytest
+from datetime import datetime, timezone
 from pydantic import ValidationError
 from aira.connectors.alerting.pagerduty import PagerDutyConnector
+from aira.connectors.base import NotFoundError
 
 
 @pytest.fixture
@@ -81,8 +83,9 @@ def test_get_incident_details_success(requests_mock, valid_pagerduty_config):
     details = connector.get_incident_details(incident_id)
 
     # Assert
-    assert details["id"] == incident_id
-    assert details["title"] == "High CPU on database"
+    assert details.id == incident_id
+    assert details.title == "High CPU on database"
+    assert details.service == "Primary Database"
 
 
 def test_get_incident_details_not_found(requests_mock, valid_pagerduty_config):
@@ -94,8 +97,127 @@ def test_get_incident_details_not_found(requests_mock, valid_pagerduty_config):
     )
     connector = PagerDutyConnector(name="test_pagerduty", config=valid_pagerduty_config)
 
+    # Action & Assert
+    with pytest.raises(NotFoundError, match="not found"):
+        connector.get_incident_details(incident_id)
+
+
+def test_get_incident_details_expands_includes(requests_mock, valid_pagerduty_config):
+    """Tests that one request returns the service, assignees and trigger summary."""
+    # Arrange
+    mock = requests_mock.get(
+        "https://api.pagerduty.com/incidents/P1",
+        json={
+            "incident": {
+                "id": "P1",
+                "title": "Checkout down",
+                "service": {"id": "S1", "name": "checkout"},
+                "assignments": [{"assignee": {"id": "U1", "name": "Ada"}}],
+                "first_trigger_log_entry": {
+                    "channel": {"summary": "5xx rate above 5% for 5 minutes"}
+                },
+            }
+        },
+    )
+    connector = PagerDutyConnector(name="pd", config=valid_pagerduty_config)
+
     # Action
-    details = connector.get_incident_details(incident_id)
+    incident = connector.get_incident_details("P1")
 
     # Assert
-    assert details == {}  # Should return an empty dict on failure
+    assert mock.call_count == 1
+    assert mock.last_request.qs["include[]"] == [
+        "services",
+        "assignees",
+        "first_trigger_log_entries",
+    ]
+    assert incident.service == "checkout"
+    assert incident.assignees == ("Ada",)
+    assert incident.description == "5xx rate above 5% for 5 minutes"
+
+
+def test_list_incidents_follows_pagination(requests_mock, valid_pagerduty_config):
+    """Tests that every page of a filtered incident listing is fetched."""
+    # Arrange
+    mock = requests_mock.get(
+        "https://api.pagerduty.com/incidents",
+        [
+            {"json": {"incidents": [{"id": "P1"}, {"id": "P2"}], "more": True}},
+            {"json": {"incidents": [{"id": "P3"}], "more": False}},
+        ],
+    )
+    connector = PagerDutyConnector(name="pd", config=valid_pagerduty_config)
+
+    # Action
+    incidents = connector.list_incidents(service_ids=["S1"], urgencies=["high"])
+
+    # Assert
+    assert [i.id for i in incidents] == ["P1", "P2", "P3"]
+    assert [r.qs["offset"] for r in mock.request_history] == [["0"], ["2"]]
+    assert mock.last_request.qs["service_ids[]"] == ["s1"]
+    assert mock.last_request.qs["urgencies[]"] == ["high"]
+
+
+def test_get_related_alerts(requests_mock, valid_pagerduty_config):
+    """Tests that an incident's alerts are mapped onto Alert records."""
+    # Arrange
+    requests_mock.get(
+        "https://api.pagerduty.com/incidents/P1/alerts",
+        json={
+            "alerts": [
+                {
+                    "id": "A1",
+                    "summary": "High latency",
+                    "severity": "critical",
+                    "service": {"summary": "checkout"},
+                    "created_at": "2024-05-01T12:00:00Z",
+                }
+            ],
+            "more": False,
+        },
+    )
+    connector = PagerDutyConnector(name="pd", config=valid_pagerduty_config)
+
+    # Action
+    alerts = connector.get_related_alerts("P1")
+
+    # Assert
+    assert [(a.id, a.severity, a.service, a.incident_id) for a in alerts] == [
+        ("A1", "critical", "checkout", "P1")
+    ]
+
+
+def test_fetch_updated_incidents_reads_changes_from_log_entries(
+    requests_mock, valid_pagerduty_config
+):
+    """Tests that incidents updated in the window surface at their latest change."""
+    entries = requests_mock.get(
+        "https://api.pagerduty.com/log_entries",
+        json={
+            "log_entries": [
+                {
+                    "created_at": "2024-05-01T12:09:00Z",
+                    "incident": {"id": "P2", "title": "Old incident, acked"},
+                },
+                {
+                    "created_at": "2024-05-01T12:05:00Z",
+                    "incident": {"id": "P1", "title": "Checkout down"},
+                },
+                {
+                    "created_at": "2024-05-01T12:01:00Z",
+                    "incident": {"id": "P1", "title": "Checkout down"},
+                },
+            ],
+            "more": False,
+        },
+    )
+    connector = PagerDutyConnector(name="pd", config=valid_pagerduty_config)
+
+    incidents = connector.fetch_updated_incidents(
+        datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc),
+        datetime(2024, 5, 1, 12, 10, tzinfo=timezone.utc),
+    )
+
+    assert [(i.id, i.updated_at.minute) for i in incidents] == [("P1", 5), ("P2", 9)]
+    assert entries.last_request.qs["since"] == ["2024-05-01t12:00:00+00:00"]
+    assert entries.last_request.qs["include[]"] == ["incidents"]
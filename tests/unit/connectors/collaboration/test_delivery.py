@@ -0,0 +1,69 @@
+import threading
+import time
+
+from aira.connectors.base import ConnectorError
+from aira.connectors.collaboration.delivery import DeliveryQueue, RateLimitedError
+
+
+def _block(text: str) -> dict:
+    return {"type": "section", "text": {"type": "mrkdwn", "text": text}}
+
+
+class Recorder:
+    """A send function that records batches and can be told to fail."""
+
+    def __init__(self, failures=()):
+        self.batches = []
+        self.failures = list(failures)
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def __call__(self, batch):
+        self.gate.wait()
+        if self.failures:
+            raise self.failures.pop(0)
+        self.batches.append([(m.key, m.blocks[0]["text"]["text"]) for m in batch])
+
+
+def test_waiting_updates_coalesce_and_batch():
+    """Tests that newer updates replace older ones and the rest share a post."""
+    send = Recorder()
+    send.gate.clear()  # Hold the first post so the others queue up behind it
+    queue = DeliveryQueue("test", send, min_interval=0.01)
+
+    queue.submit([_block("first")], key="P0")
+    deadline = time.monotonic() + 5
+    while len(queue) and time.monotonic() < deadline:
+        time.sleep(0.001)  # Wait for the worker to pick up P0
+    queue.submit([_block("P1 v1")], key="P1")
+    queue.submit([_block("P2 v1")], key="P2")
+    queue.submit([_block("P1 v2")], key="P1")
+    send.gate.set()
+
+    assert queue.flush(timeout=5)
+    assert send.batches[-1] == [("P1", "P1 v2"), ("P2", "P2 v1")]
+    assert send.batches[0] == [("P0", "first")]
+
+
+def test_rate_limit_is_honoured_and_message_retried():
+    """Tests that a 429 delays the retry by Retry-After instead of dropping."""
+    send = Recorder([RateLimitedError("slow down", retry_after=0.05)])
+    queue = DeliveryQueue("test", send, min_interval=0.0)
+
+    queue.submit([_block("hello")])
+
+    assert queue.flush(timeout=5)
+    assert send.batches == [[(None, "hello")]]
+    assert queue.dropped == 0
+
+
+def test_client_errors_are_dropped_server_errors_retried():
+    """Tests the retry policy for 4xx and 5xx failures."""
+    send = Recorder([ConnectorError("bad", 503), ConnectorError("nope", 400)])
+    queue = DeliveryQueue("test", send, min_interval=0.001, max_retries=3)
+
+    queue.submit([_block("a")])
+    queue.flush(timeout=5)
+
+    assert send.batches == []
+    assert queue.dropped == 1
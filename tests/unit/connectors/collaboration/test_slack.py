@@ -117,3 +117,81 @@ def test_post_message_success(requests_mock, valid_slack_config):
     # Assert
     assert requests_mock.called
     assert requests_mock.last_request.json() == {"blocks": test_blocks}
+
+
+def test_enqueue_message_retries_after_rate_limit(requests_mock):
+    """Tests that queued delivery waits out a 429 and then posts."""
+    webhook_url = "https://hooks.slack.com/services/T0000/B0000/QUEUE"
+    mock = requests_mock.post(
+        webhook_url,
+        [
+            {"status_code": 429, "headers": {"Retry-After": "0"}},
+            {"text": "ok", "status_code": 200},
+        ],
+    )
+    connector = SlackConnector(
+        name="test_slack",
+        config={
+            "type": "slack",
+            "webhook_url": webhook_url,
+            "min_post_interval_seconds": 0,
+        },
+    )
+
+    connector.enqueue_message([{"type": "divider"}], key="P1")
+
+    assert connector.flush(timeout=5)
+    assert mock.call_count == 2
+
+
+def test_web_api_threads_follow_up_updates(requests_mock):
+    """Tests that later updates for an incident are posted as thread replies."""
+    mock = requests_mock.post(
+        "https://slack.com/api/chat.postMessage", json={"ok": True, "ts": "111.222"}
+    )
+    connector = SlackConnector(
+        name="test_slack",
+        config={
+            "type": "slack",
+            "bot_token": "xoxb-test",
+            "channel": "C-THREADS",
+            "min_post_interval_seconds": 0,
+        },
+    )
+
+    connector.enqueue_message([{"type": "divider"}], key="P1")
+    assert connector.flush(timeout=5)
+    connector.enqueue_message([{"type": "divider"}], key="P1")
+    assert connector.flush(timeout=5)
+
+    first, second = (r.json() for r in mock.request_history)
+    assert first["channel"] == "C-THREADS"
+    assert "thread_ts" not in first
+    assert second["thread_ts"] == "111.222"
+    assert mock.last_request.headers["Authorization"] == "Bearer xoxb-test"
+
+
+def test_replacement_connector_keeps_threads_and_uses_its_own_token(requests_mock):
+    """Tests that a reloaded connector threads under the first connector's post."""
+    mock = requests_mock.post(
+        "https://slack.com/api/chat.postMessage", json={"ok": True, "ts": "333.444"}
+    )
+    config = {
+        "type": "slack",
+        "bot_token": "xoxb-old",
+        "channel": "C-RELOAD",
+        "min_post_interval_seconds": 0,
+    }
+    first = SlackConnector(name="test_slack", config=config)
+    first.enqueue_message([{"type": "divider"}], key="P1")
+    assert first.flush(timeout=5)
+
+    second = SlackConnector(
+        name="test_slack", config={**config, "bot_token": "xoxb-new"}
+    )
+    second.enqueue_message([{"type": "divider"}], key="P1")
+    assert second.flush(timeout=5)
+
+    assert second.delivery_queue is first.delivery_queue
+    assert mock.last_request.json()["thread_ts"] == "333.444"
+    assert mock.last_request.headers["Authorization"] == "Bearer xoxb-new"
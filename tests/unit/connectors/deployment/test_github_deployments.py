@@ -0,0 +1,182 @@
+# tests/unit/connectors/deployment/test_github_deployments.py
+
+import threading
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from aira.connectors.base import ConnectorError, NotFoundError
+from aira.connectors.deployment.github import (
+    DeployTimeline,
+    GitHubDeploymentsConnector,
+)
+from aira.connectors.records import Deployment
+
+API = "https://api.github.com/repos/shop/checkout"
+NOW = datetime.now(timezone.utc)
+
+
+def ago(minutes: float) -> str:
+    return (NOW - timedelta(minutes=minutes)).isoformat().replace("+00:00", "Z")
+
+
+def deployment(id, minutes, environment="production"):
+    return {
+        "id": id,
+        "ref": "main",
+        "sha": "abc1234def",
+        "environment": environment,
+        "created_at": ago(minutes),
+        "creator": {"login": "deploy-bot"},
+    }
+
+
+def status(state, minutes):
+    return [{"state": state, "created_at": ago(minutes), "log_url": "https://ci/1"}]
+
+
+@pytest.fixture
+def connector():
+    return GitHubDeploymentsConnector(
+        "gh_deploys",
+        {
+            "type": "github_deployments",
+            "token": "fake_token",
+            "repos": ["shop/checkout"],
+            "environments": ["production"],
+            "services": {"shop/checkout": "checkout-api"},
+        },
+    )
+
+
+def test_timeline_window_replace_and_prune():
+    """Tests window queries across services, replacement by id and pruning."""
+    timeline = DeployTimeline()
+    at = lambda minutes: NOW - timedelta(minutes=minutes)  # noqa: E731
+    timeline.add(Deployment("1", "checkout", timestamp=at(90)))
+    timeline.add(Deployment("2", "cart", timestamp=at(30)))
+    timeline.add(Deployment("3", "checkout", timestamp=at(10), status="in_progress"))
+    timeline.add(Deployment("4", "checkout"))
+
+    assert [d.id for d in timeline.between(at(60), NOW)] == ["2", "3"]
+    assert [d.id for d in timeline.between(at(120), NOW, ["checkout"])] == ["1", "3"]
+
+    timeline.add(Deployment("3", "checkout", timestamp=at(5), status="success"))
+    assert timeline.between(at(8), NOW)[0].status == "success"
+    assert timeline.between(at(12), at(8)) == []
+
+    timeline.prune(at(60))
+    assert len(timeline) == 2
+    assert "1" not in timeline
+
+
+def test_refresh_is_incremental(requests_mock, connector):
+    """Tests that refreshes only read new deploys and poll unfinished ones."""
+    next_page = f"{API}/deployments?per_page=100&page=2"
+    listing = requests_mock.get(
+        f"{API}/deployments",
+        [
+            {
+                "json": [deployment(12, 5), deployment(11, 20, "staging")],
+                "headers": {"ETag": '"v1"', "Link": f'<{next_page}>; rel="next"'},
+            },
+            {"json": [deployment(10, 40), deployment(9, 60 * 30)]},
+            {"status_code": 304},
+        ],
+    )
+    requests_mock.get(f"{API}/deployments/12/statuses", json=status("in_progress", 4))
+    requests_mock.get(f"{API}/deployments/10/statuses", json=status("success", 38))
+
+    deploys = connector.fetch_recent_deployments(3)
+
+    assert [(d.id, d.service, d.status) for d in deploys] == [
+        ("10", "checkout-api", "success"),
+        ("12", "checkout-api", "in_progress"),
+    ]
+    assert deploys[0].timestamp == NOW - timedelta(minutes=38)
+    assert deploys[0].url == "https://ci/1"
+    assert connector.cursors["shop/checkout"].newest_id == 12
+
+    # Within the refresh interval the timeline answers on its own.
+    calls = requests_mock.call_count
+    assert connector.fetch_recent_deployments(1)[-1].id == "12"
+    assert requests_mock.call_count == calls
+
+    # Refreshing only lists; the unfinished deploy is polled when looked up.
+    requests_mock.get(f"{API}/deployments/12/statuses", json=status("failure", 1))
+    connector.refresh(force=True)
+    connector.fetch_recent_deployments(3)
+
+    assert listing.last_request.headers["If-None-Match"] == '"v1"'
+    assert [r.url for r in requests_mock.request_history[calls:]] == [
+        f"{API}/deployments?per_page=100",
+        f"{API}/deployments/12/statuses?per_page=1",
+    ]
+    assert connector.timeline.get("12").status == "failure"
+
+
+def test_failed_page_does_not_advance_the_cursor(requests_mock, connector):
+    """Tests that a listing failing partway is read again in full."""
+    next_page = f"{API}/deployments?per_page=100&page=2"
+    listing = requests_mock.get(
+        f"{API}/deployments",
+        json=[deployment(12, 5)],
+        headers={"ETag": '"v2"', "Link": f'<{next_page}>; rel="next"'},
+    )
+    requests_mock.get(next_page, status_code=502)
+
+    with pytest.raises(ConnectorError):
+        connector.refresh(force=True)
+    assert connector.cursors["shop/checkout"].etag is None
+    assert connector.cursors["shop/checkout"].newest_id == 0
+
+    requests_mock.get(next_page, json=[deployment(10, 40)])
+    connector.refresh(force=True)
+
+    assert "If-None-Match" not in listing.last_request.headers
+    assert connector.cursors["shop/checkout"].etag == '"v2"'
+    assert connector.cursors["shop/checkout"].newest_id == 12
+    assert {"10", "12"} <= {
+        d.id for d in connector.timeline.between(NOW - timedelta(hours=1), NOW)
+    }
+
+
+def test_statuses_are_read_concurrently_for_the_requested_deploys(
+    requests_mock, connector
+):
+    """Tests that only deploys in the window and services get status lookups."""
+    requests_mock.get(
+        f"{API}/deployments",
+        json=[deployment(n, n) for n in range(1, 9)] + [deployment(99, 60 * 2)],
+    )
+    barrier = threading.Barrier(8, timeout=2)
+    polled = []
+
+    def with_status(repo, deploy):
+        polled.append(deploy.id)
+        barrier.wait()
+        return replace(deploy, status="success")
+
+    connector._with_status = with_status
+
+    deploys = connector.fetch_recent_deployments(1, ["checkout-api"])
+
+    assert [d.id for d in deploys] == [str(n) for n in range(8, 0, -1)]
+    assert sorted(polled, key=int) == [str(n) for n in range(1, 9)]
+    assert connector.fetch_recent_deployments(1, ["cart"]) == []
+
+
+def test_get_deployment_status(requests_mock, connector):
+    """Tests status lookups by cached id and by repository-qualified id."""
+    requests_mock.get(f"{API}/deployments/12", json=deployment(12, 5))
+    requests_mock.get(f"{API}/deployments/12/statuses", json=status("success", 2))
+
+    with pytest.raises(NotFoundError):
+        connector.get_deployment_status("12")
+    result = connector.get_deployment_status("shop/checkout#12")
+
+    assert result.startswith(
+        "shop/checkout deployment 12 of main to production: success (by deploy-bot, "
+    )
+    assert result.endswith("\n  - https://ci/1")
@@ -0,0 +1,177 @@
+from datetime import datetime, timezone
+
+import boto3
+import pytest
+from botocore.stub import ANY, Stubber
+
+from aira.connectors.base import ConnectorError, NotFoundError
+from aira.connectors.infrastructure.aws import AWSConnector, parse_resource
+
+REGIONS = ["us-east-1", "eu-west-1"]
+NOW = datetime(2026, 10, 19, 12, 5, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def connector():
+    return AWSConnector("aws_prod", {"type": "aws", "regions": REGIONS})
+
+
+@pytest.fixture
+def stubs(connector):
+    """Installs a stubbed client for every service and region."""
+    stubs = {}
+    for service in ("ecs", "cloudwatch", "cloudtrail", "rds"):
+        for region in REGIONS:
+            client = boto3.client(
+                service,
+                region_name=region,
+                aws_access_key_id="test",
+                aws_secret_access_key="test",
+            )
+            connector._clients[(service, region)] = client
+            stubs[(service, region)] = Stubber(client)
+            stubs[(service, region)].activate()
+    yield stubs
+    for stub in stubs.values():
+        stub.assert_no_pending_responses()
+
+
+ALARM = {
+    "AlarmName": "checkout-5xx-rate",
+    "StateValue": "ALARM",
+    "StateReason": "Threshold Crossed: 1 datapoint [12.0] > 5.0",
+    "StateUpdatedTimestamp": NOW,
+    "Dimensions": [{"Name": "ServiceName", "Value": "checkout"}],
+}
+
+
+def add_alarms(stubs, region, alarms):
+    stubs[("cloudwatch", region)].add_response(
+        "describe_alarms",
+        {"MetricAlarms": alarms, "CompositeAlarms": []},
+        {"StateValue": "ALARM", "AlarmTypes": ["MetricAlarm", "CompositeAlarm"]},
+    )
+
+
+def add_changes(stubs, region, events):
+    stubs[("cloudtrail", region)].add_response(
+        "lookup_events",
+        {"Events": events},
+        {
+            "LookupAttributes": [
+                {"AttributeKey": "ResourceName", "AttributeValue": "checkout"}
+            ],
+            "StartTime": ANY,
+            "EndTime": ANY,
+            "MaxResults": 20,
+        },
+    )
+
+
+def test_parse_resource_accepts_prefixes_arns_and_names():
+    """Tests the supported resource id formats."""
+    assert parse_resource("ecs:prod/checkout").id == "prod/checkout"
+    arn = parse_resource("arn:aws:ecs:eu-west-1:123456789012:service/prod/checkout")
+    assert (arn.kind, arn.id, arn.region) == ("ecs", "prod/checkout", "eu-west-1")
+    assert parse_resource("i-0abc12345def67890").kind == "ec2"
+    assert parse_resource("arn:aws:rds:us-east-1:1:db:orders").id == "orders"
+    assert parse_resource("checkout").kind == "name"
+
+
+def test_ecs_status_combines_regions_alarms_metrics_and_changes(connector, stubs):
+    """Tests one lookup across regions with batched alarm and metric calls."""
+    stubs[("ecs", "us-east-1")].add_response(
+        "describe_services",
+        {
+            "services": [
+                {
+                    "serviceName": "checkout",
+                    "status": "ACTIVE",
+                    "desiredCount": 4,
+                    "runningCount": 2,
+                    "pendingCount": 2,
+                    "deployments": [{"rolloutState": "IN_PROGRESS"}],
+                    "events": [{"message": "(service checkout) is unhealthy"}],
+                }
+            ]
+        },
+        {"cluster": "prod", "services": ["checkout"]},
+    )
+    stubs[("ecs", "eu-west-1")].add_client_error(
+        "describe_services", service_error_code="ClusterNotFoundException"
+    )
+    add_alarms(stubs, "us-east-1", [ALARM])
+    add_alarms(stubs, "eu-west-1", [])
+    add_changes(
+        stubs,
+        "us-east-1",
+        [
+            {"EventName": "DescribeServices", "ReadOnly": "true"},
+            {
+                "EventName": "UpdateService",
+                "ReadOnly": "false",
+                "Username": "deploy-bot",
+                "EventTime": NOW,
+            },
+        ],
+    )
+    add_changes(stubs, "eu-west-1", [])
+    stubs[("cloudwatch", "us-east-1")].add_response(
+        "get_metric_data",
+        {
+            "MetricDataResults": [
+                {"Label": "CPUUtilization Average", "Values": [91.25]},
+                {"Label": "CPUUtilization Maximum", "Values": [99.0]},
+                {"Label": "MemoryUtilization Average", "Values": []},
+            ]
+        },
+        {"MetricDataQueries": ANY, "StartTime": ANY, "EndTime": ANY},
+    )
+
+    status = connector.get_resource_status("ecs:prod/checkout")
+
+    assert status.splitlines() == [
+        "aws_prod: us-east-1 ecs prod/checkout: 2/4 tasks running, 2 pending, "
+        "deployment IN_PROGRESS; latest event: (service checkout) is unhealthy",
+        "  - ALARM checkout-5xx-rate since 12:05 UTC: "
+        "Threshold Crossed: 1 datapoint [12.0] > 5.0",
+        "  - CPUUtilization avg 91.2, max 99.0 (last 15m)",
+        "  - Change: UpdateService by deploy-bot at 12:05 UTC",
+    ]
+
+
+def test_bare_name_uses_cached_alarms(connector, stubs):
+    """Tests that alarms are fetched once per region and shared between lookups."""
+    add_alarms(stubs, "us-east-1", [ALARM])
+    add_alarms(stubs, "eu-west-1", [])
+    for _ in range(2):
+        add_changes(stubs, "us-east-1", [])
+        add_changes(stubs, "eu-west-1", [])
+
+    first = connector.get_resource_status("checkout")
+    second = connector.get_resource_status("checkout")
+
+    assert first == second
+    assert first.startswith("aws_prod: us-east-1 checkout\n  - ALARM checkout-5xx-rate")
+
+
+def test_unknown_resource_and_failing_regions(connector, stubs):
+    """Tests NotFoundError when nothing matches and ConnectorError when all regions fail."""
+    for region in REGIONS:
+        stubs[("rds", region)].add_client_error(
+            "describe_db_instances", service_error_code="DBInstanceNotFound"
+        )
+        add_alarms(stubs, region, [])
+        stubs[("cloudtrail", region)].add_response("lookup_events", {"Events": []})
+    with pytest.raises(NotFoundError):
+        connector.get_resource_status("rds:orders")
+
+    connector._alarms.clear()
+    for region in REGIONS:
+        stubs[("cloudwatch", region)].add_client_error(
+            "describe_alarms", service_error_code="AccessDenied", http_status_code=403
+        )
+        stubs[("cloudtrail", region)].add_response("lookup_events", {"Events": []})
+    with pytest.raises(ConnectorError) as excinfo:
+        connector.get_resource_status("checkout")
+    assert not isinstance(excinfo.value, NotFoundError)
@@ -0,0 +1,210 @@
+import json
+import threading
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from kubernetes.client.rest import ApiException
+
+from aira.connectors.base import NotFoundError
+from aira.connectors.infrastructure.kubernetes import (
+    ClusterCache,
+    Informer,
+    KubernetesConnector,
+)
+
+
+def pod(name, ready=True, restarts=0, waiting=None, last_terminated=None):
+    return {
+        "metadata": {
+            "namespace": "shop",
+            "name": name,
+            "labels": {"pod-template-hash": "7d9f8"},
+            "ownerReferences": [
+                {"kind": "ReplicaSet", "name": "checkout-7d9f8", "controller": True}
+            ],
+        },
+        "spec": {"nodeName": "node-1"},
+        "status": {
+            "phase": "Running",
+            "containerStatuses": [
+                {
+                    "ready": ready,
+                    "restartCount": restarts,
+                    "state": {"waiting": {"reason": waiting}} if waiting else {},
+                    "lastState": (
+                        {"terminated": {"reason": last_terminated}}
+                        if last_terminated
+                        else {}
+                    ),
+                }
+            ],
+        },
+    }
+
+
+DEPLOYMENT = {
+    "metadata": {"namespace": "shop", "name": "checkout", "generation": 4},
+    "spec": {"replicas": 3},
+    "status": {
+        "readyReplicas": 2,
+        "updatedReplicas": 3,
+        "availableReplicas": 2,
+        "observedGeneration": 4,
+    },
+}
+
+EVENT = {
+    "metadata": {"namespace": "shop", "name": "ev1", "uid": "u1"},
+    "type": "Warning",
+    "reason": "BackOff",
+    "message": "Back-off restarting failed container",
+    "count": 12,
+    "involvedObject": {"kind": "Pod", "name": "checkout-7d9f8-b"},
+    "lastTimestamp": datetime.now(timezone.utc).isoformat(),
+}
+
+
+class FakeList:
+    """Stands in for a list API call made with _preload_content=False."""
+
+    def __init__(self, items, version="100"):
+        self.items = items
+        self.version = version
+
+    def __call__(self, **kwargs):
+        body = {"metadata": {"resourceVersion": self.version}, "items": self.items}
+        return SimpleNamespace(data=json.dumps(body).encode())
+
+
+class FakeWatch:
+    def __init__(self, events=(), error=None):
+        self.events = events
+        self.error = error
+        self.calls = []
+
+    def __call__(self):
+        return self
+
+    def stream(self, func, **kwargs):
+        self.calls.append(kwargs)
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+        yield from self.events
+
+
+def test_workload_health_is_aggregated_incrementally():
+    """Tests that pod events update per-workload counters in place."""
+    cache = ClusterCache()
+    cache.replace("pods", [pod("checkout-7d9f8-a"), pod("checkout-7d9f8-b")])
+    cache.apply(
+        "pods",
+        "MODIFIED",
+        pod(
+            "checkout-7d9f8-b",
+            ready=False,
+            restarts=7,
+            waiting="CrashLoopBackOff",
+            last_terminated="OOMKilled",
+        ),
+    )
+
+    health, _ = cache.workload("shop", "checkout")
+    assert (health.pods, health.ready, health.restarts) == (2, 1, 7)
+    assert (health.crash_looping, health.oom_killed) == (1, 1)
+    assert [h.name for h in cache.unhealthy_workloads()] == ["checkout"]
+
+    cache.apply("pods", "DELETED", pod("checkout-7d9f8-b"))
+    health, _ = cache.workload(None, "checkout")
+    assert (health.pods, health.ready, health.restarts, health.crash_looping) == (
+        1,
+        1,
+        0,
+        0,
+    )
+    assert cache.unhealthy_workloads() == []
+
+    cache.replace("pods", [])
+    assert cache.workload("shop", "checkout") == (None, None)
+
+
+def test_informer_lists_then_follows_the_watch():
+    """Tests that the watch resumes from the listed version and updates the cache."""
+    cache = ClusterCache()
+    watch = FakeWatch(
+        [
+            {"type": "ADDED", "raw_object": pod("checkout-7d9f8-a")},
+            {
+                "type": "BOOKMARK",
+                "raw_object": {"metadata": {"resourceVersion": "105"}},
+            },
+        ]
+    )
+    informer = Informer("pods", FakeList([]), cache, watch_factory=watch)
+
+    informer.list()
+    informer.watch_once()
+
+    assert informer.synced.is_set()
+    assert watch.calls[0]["resource_version"] == "100"
+    assert informer.resource_version == "105"
+    assert "shop/checkout-7d9f8-a" in cache.pods
+
+
+def test_informer_relists_when_version_expires():
+    """Tests that a 410 Gone from the watch triggers a fresh list."""
+    cache = ClusterCache()
+    stop = threading.Event()
+    lister = FakeList([pod("checkout-7d9f8-a")])
+    watch = FakeWatch(error=ApiException(status=410))
+    informer = Informer("pods", lister, cache, watch_factory=watch)
+
+    def stop_after_relist(**kwargs):
+        if len(watch.calls) >= 1:
+            stop.set()
+        return FakeList.__call__(lister, **kwargs)
+
+    informer.list_fn = stop_after_relist
+    informer.run(stop)
+
+    assert len(watch.calls) == 2
+    assert "shop/checkout-7d9f8-a" in cache.pods
+
+
+@pytest.fixture
+def connector():
+    connector = KubernetesConnector(
+        "prod-eu", {"type": "kubernetes"}, api_client=object()
+    )
+    for kind, items in (
+        (
+            "pods",
+            [
+                pod("checkout-7d9f8-a"),
+                pod("checkout-7d9f8-b", False, 12, "CrashLoopBackOff"),
+            ],
+        ),
+        ("deployments", [DEPLOYMENT]),
+        ("events", [EVENT, {**EVENT, "type": "Normal", "metadata": {"uid": "u2"}}]),
+    ):
+        informer = Informer(
+            kind, FakeList(items), connector.cache, watch_factory=FakeWatch()
+        )
+        informer.list()
+        connector.informers.append(informer)
+    return connector
+
+
+def test_get_resource_status_reads_from_cache(connector):
+    """Tests that status lookups summarise the cached workload and its events."""
+    status = connector.get_resource_status("checkout")
+
+    assert status.splitlines() == [
+        "prod-eu: shop/checkout: 2/3 replicas ready, 3 updated, 12 restarts, "
+        "1 pod(s) in CrashLoopBackOff",
+        "  - BackOff (x12) on Pod checkout-7d9f8-b: Back-off restarting failed container",
+    ]
+    assert connector.get_resource_status("shop/checkout") == status
+    with pytest.raises(NotFoundError):
+        connector.get_resource_status("other/checkout")
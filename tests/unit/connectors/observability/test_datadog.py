@@ -1,5 +1,6 @@
 import pytest
 from pydantic import ValidationError
+from aira.connectors.base import ConnectorError
 from aira.connectors.observability.datadog import DatadogConnector
 
 
@@ -51,7 +52,7 @@ def test_connection_failure_invalid_keys(requests_mock, valid_datadog_config):
 
 
 def test_fetch_logs_success(requests_mock, valid_datadog_config):
-    """Tests successfully fetching and formatting logs."""
+    """Tests successfully fetching logs as structured records."""
     mock_response = {
         "data": [
             {"attributes": {"status": "error", "message": "Service unavailable"}},
@@ -65,8 +66,10 @@ def test_fetch_logs_success(requests_mock, valid_datadog_config):
     )
     connector = DatadogConnector(name="test_datadog", config=valid_datadog_config)
     result = connector.fetch_logs(query="service:test", time_window_minutes=10)
-    assert "[ERROR] Service unavailable" in result
-    assert "[INFO] User login successful" in result
+    assert [(e.status, e.message) for e in result] == [
+        ("error", "Service unavailable"),
+        ("info", "User login successful"),
+    ]
 
 
 def test_fetch_logs_no_logs_found(requests_mock, valid_datadog_config):
@@ -77,5 +80,15 @@ def test_fetch_logs_no_logs_found(requests_mock, valid_datadog_config):
         status_code=200,
     )
     connector = DatadogConnector(name="test_datadog", config=valid_datadog_config)
-    result = connector.fetch_logs(query="service:test", time_window_minutes=10)
-    assert "No logs found" in result
+    assert connector.fetch_logs(query="service:test", time_window_minutes=10) == []
+
+
+def test_fetch_logs_server_error(requests_mock, valid_datadog_config):
+    """Tests that an upstream failure raises ConnectorError with the status."""
+    requests_mock.post(
+        "https://api.datadoghq.com/api/v2/logs/events/search", status_code=503
+    )
+    connector = DatadogConnector(name="test_datadog", config=valid_datadog_config)
+    with pytest.raises(ConnectorError, match="HTTP 503") as excinfo:
+        connector.fetch_logs(query="service:test", time_window_minutes=10)
+    assert excinfo.value.status_code == 503
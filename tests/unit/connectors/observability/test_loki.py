@@ -0,0 +1,90 @@
+import time
+
+import pytest
+
+from aira.connectors.base import ConnectorError
+from aira.connectors.observability.loki import LokiConnector
+
+BASE = "http://loki:3100/loki/api/v1"
+NOW_NS = time.time_ns()
+
+
+@pytest.fixture
+def connector():
+    return LokiConnector(
+        "loki",
+        {"type": "loki", "url": "http://loki:3100", "tenant_id": "ops", "max_lines": 2},
+    )
+
+
+def streams(*result):
+    return {"status": "success", "data": {"resultType": "streams", "result": result}}
+
+
+def test_fetch_logs_returns_counts_then_newest_lines(requests_mock, connector):
+    """Tests that lines are capped and the volume is counted server-side."""
+    requests_mock.get(
+        f"{BASE}/query_range",
+        json=streams(
+            {
+                "stream": {"service_name": "checkout", "detected_level": "error"},
+                "values": [
+                    [str(NOW_NS - 1_000_000_000), "timeout calling redis"],
+                    [str(NOW_NS - 3_000_000_000), "timeout calling redis"],
+                ],
+            },
+            {
+                "stream": {"job": "cart", "level": "warn"},
+                "values": [[str(NOW_NS - 2_000_000_000), "slow query"]],
+            },
+        ),
+    )
+    counts = requests_mock.get(
+        f"{BASE}/query",
+        json={
+            "status": "success",
+            "data": {
+                "resultType": "vector",
+                "result": [
+                    {
+                        "metric": {"service_name": "cart", "detected_level": "warn"},
+                        "value": [NOW_NS / 1e9, "12"],
+                    },
+                    {
+                        "metric": {
+                            "service_name": "checkout",
+                            "detected_level": "error",
+                        },
+                        "value": [NOW_NS / 1e9, "1204"],
+                    },
+                ],
+            },
+        },
+    )
+
+    events = connector.fetch_logs('{namespace="shop"} |= "timeout"', 15)
+
+    lines = requests_mock.request_history[0]
+    assert lines.headers["X-Scope-OrgID"] == "ops"
+    assert (lines.qs["limit"], lines.qs["direction"]) == (["2"], ["backward"])
+    assert counts.last_request.qs["query"] == [
+        "topk(5, sum by (service_name, detected_level) "
+        '(count_over_time({namespace="shop"} |= "timeout" [15m])))'
+    ]
+    assert [(e.status, e.service, e.message) for e in events] == [
+        ("error", "checkout", "checkout: 1204 error lines in the last 15 minutes"),
+        ("warn", "cart", "cart: 12 warn lines in the last 15 minutes"),
+        ("error", "checkout", "timeout calling redis"),
+        ("warn", "cart", "slow query"),
+    ]
+
+
+def test_fetch_logs_rejects_metric_queries(requests_mock, connector):
+    """Tests that a metric query is reported instead of misread."""
+    requests_mock.get(
+        f"{BASE}/query_range",
+        json={"status": "success", "data": {"resultType": "matrix", "result": []}},
+    )
+
+    with pytest.raises(ConnectorError, match="log query is expected"):
+        connector.fetch_logs('rate({app="x"}[5m])')
@@ -0,0 +1,111 @@
+import time
+
+import pytest
+
+from aira.connectors.base import ConnectorError
+from aira.connectors.observability.prometheus import (
+    PrometheusConnector,
+    batch_queries,
+    split_batch,
+)
+
+URL = "http://prometheus:9090/api/v1/query_range"
+NOW = time.time()
+
+
+@pytest.fixture
+def connector():
+    return PrometheusConnector(
+        "prom",
+        {
+            "type": "prometheus",
+            "url": "http://prometheus:9090/",
+            "bearer_token": "secret",
+            "max_series": 2,
+        },
+    )
+
+
+def matrix(*series):
+    return {"status": "success", "data": {"resultType": "matrix", "result": series}}
+
+
+def series(index, metric, values):
+    return {
+        "metric": {**metric, "aira_query": str(index)},
+        "values": [
+            [NOW - 60 * (len(values) - i), str(v)] for i, v in enumerate(values)
+        ],
+    }
+
+
+def test_batch_round_trip():
+    """Tests that batched series are split back out by their tag."""
+    expr = batch_queries(["up", "rate(x[5m])"])
+
+    assert expr == (
+        'label_replace(up, "aira_query", "0", "", "") or '
+        'label_replace(rate(x[5m]), "aira_query", "1", "", "")'
+    )
+    result = [series(1, {"a": "1"}, [1]), series(0, {"a": "1"}, [2])]
+    assert split_batch(result, 2) == [
+        [{"metric": {"a": "1"}, "values": result[1]["values"]}],
+        [{"metric": {"a": "1"}, "values": result[0]["values"]}],
+    ]
+
+
+def test_fetch_logs_batches_series_and_alerts(requests_mock, connector):
+    """Tests one request for the top series and firing alerts."""
+    requests_mock.get(
+        URL,
+        json=matrix(
+            series(0, {"__name__": "errors", "service": "checkout"}, [1, 4, 2]),
+            series(0, {"__name__": "errors", "service": "cart"}, [0, 1, 3]),
+            series(
+                1,
+                {
+                    "__name__": "ALERTS",
+                    "alertname": "HighErrorRate",
+                    "severity": "critical",
+                    "service": "checkout",
+                },
+                [1, 1],
+            ),
+        ),
+    )
+
+    events = connector.fetch_logs("sum by (service) (rate(errors[5m]))", 30)
+
+    request = requests_mock.last_request
+    assert request.headers["Authorization"] == "Bearer secret"
+    assert request.qs["query"][0].startswith(
+        'label_replace(topk(2, sum by (service) (rate(errors[5m]))), "aira_query", "0"'
+    )
+    assert request.qs["step"] == ["15s"]
+    assert [(e.status, e.service) for e in events] == [
+        ("alert", "checkout"),
+        ("info", "cart"),
+        ("info", "checkout"),
+    ]
+    assert events[0].message.startswith("Alert HighErrorRate (critical) firing since")
+    assert events[0].timestamp.timestamp() == pytest.approx(NOW - 120)
+    assert events[2].message == (
+        'errors{service="checkout"} = 2 (min 1, max 4 over the last 30m)'
+    )
+
+
+def test_query_errors_and_oversized_responses(requests_mock, connector):
+    """Tests that failed and oversized queries raise ConnectorError."""
+    requests_mock.get(
+        URL,
+        status_code=400,
+        json={"status": "error", "error": "parse error: unexpected ')'"},
+    )
+    with pytest.raises(ConnectorError, match="parse error") as excinfo:
+        connector.fetch_logs("rate(x[5m]))")
+    assert excinfo.value.status_code == 400
+
+    connector.validated_config.max_response_bytes = 100
+    requests_mock.get(URL, json=matrix(series(0, {"a": "b" * 200}, [1])))
+    with pytest.raises(ConnectorError, match="exceeded 100 bytes"):
+        connector.fetch_logs("up")
@@ -2,6 +2,7 @@
 
 import pytest
 from pydantic import ValidationError
+from aira.connectors.base import NotFoundError
 from aira.connectors.source_control.github import GitHubConnector
 
 
@@ -52,14 +53,14 @@ def test_connection_failure_invalid_token(requests_mock, valid_github_config):
 
 
 def test_fetch_recent_commits_success(requests_mock, valid_github_config):
-    """Tests successfully fetching and formatting recent commits."""
+    """Tests successfully fetching recent commits as structured records."""
     connector = GitHubConnector(name="test_github", config=valid_github_config)
     repo = "test/repo"
     mock_response = [
         {
             "sha": "a1b2c3d4e5f6",
             "commit": {
-                "author": {"name": "Test User"},
+                "author": {"name": "Test User", "date": "2024-05-01T10:00:00Z"},
                 "message": "feat: Add new feature",
             },
         },
@@ -77,25 +78,27 @@ def test_fetch_recent_commits_success(requests_mock, valid_github_config):
         status_code=200,
     )
     result = connector.fetch_recent_commits(repo=repo, hours=1)
-    assert "Commit `a1b2c3d` by *Test User*: feat: Add new feature" in result
-    assert "Commit `f6e5d4c` by *Test User*: fix: Correct a bug" in result
+    assert [c.short_sha for c in result] == ["a1b2c3d", "f6e5d4c"]
+    assert result[0].author == "Test User"
+    assert result[0].timestamp.isoformat() == "2024-05-01T10:00:00+00:00"
+    assert result[1].summary == "fix: Correct a bug"
+    assert result[1].repo == repo
 
 
 def test_fetch_recent_commits_repo_not_found(requests_mock, valid_github_config):
-    """Tests the error message when the repository is not found (HTTP 404)."""
+    """Tests that a missing repository raises NotFoundError (HTTP 404)."""
     connector = GitHubConnector(name="test_github", config=valid_github_config)
     repo = "test/repo_not_found"
     requests_mock.get(f"https://api.github.com/repos/{repo}/commits", status_code=404)
-    result = connector.fetch_recent_commits(repo=repo, hours=1)
-    assert f"Error: Repository '{repo}' not found or access denied" in result
+    with pytest.raises(NotFoundError, match="not found or access denied"):
+        connector.fetch_recent_commits(repo=repo, hours=1)
 
 
 def test_fetch_recent_commits_no_commits(requests_mock, valid_github_config):
-    """Tests the message when there are no new commits in the time window."""
+    """Tests that no commits in the time window yields an empty list."""
     connector = GitHubConnector(name="test_github", config=valid_github_config)
     repo = "test/repo"
     requests_mock.get(
         f"https://api.github.com/repos/{repo}/commits", json=[], status_code=200
     )
-    result = connector.fetch_recent_commits(repo=repo, hours=1)
-    assert f"No new commits found in repository '{repo}'" in result
+    assert connector.fetch_recent_commits(repo=repo, hours=1) == []
@@ -1,10 +1,15 @@
 import pytest
 import os
+import json
+from openai import APITimeoutError
 from pydantic import ValidationError
 from unittest.mock import MagicMock
 
 from aira.config import OpenAIConfig
+from aira.llm_interfaces import LLMError
 from aira.llm_interfaces.openai_provider import OpenAIProvider
+from aira.llm_interfaces.tools import ChatTurn, ToolCall, ToolResult, ToolSpec
+from aira.telemetry import configure_telemetry
 
 
 # Pytest fixture to create a valid config object for tests
@@ -94,3 +99,153 @@ def test_generate_hypothesis_success_mocked(monkeypatch):
     mock_create.assert_called_once()
     # 6. Check that the returned hypothesis matches our mock's content
     assert hypothesis == "This is a test hypothesis."
+
+
+def test_generate_hypothesis_raises_on_failure(monkeypatch):
+    """Tests that a failed request raises instead of returning an error as text."""
+    monkeypatch.setattr(
+        "openai.resources.chat.completions.Completions.create",
+        MagicMock(side_effect=RuntimeError("quota exceeded")),
+    )
+    provider = OpenAIProvider(
+        config=OpenAIConfig(provider="openai", model="gpt-4o", api_key="key")
+    )
+
+    with pytest.raises(LLMError, match="quota exceeded"):
+        provider.generate_hypothesis("ctx", "prompt")
+    with pytest.raises(LLMError, match="quota exceeded"):
+        provider.generate_structured("ctx", "prompt")
+
+
+def test_generate_hypothesis_records_token_usage(monkeypatch):
+    """Tests that prompt and completion tokens are counted when telemetry is on."""
+    mock_response = MagicMock()
+    mock_response.choices = [MagicMock()]
+    mock_response.usage.prompt_tokens = 120
+    mock_response.usage.completion_tokens = 30
+    monkeypatch.setattr(
+        "openai.resources.chat.completions.Completions.create",
+        MagicMock(return_value=mock_response),
+    )
+    telemetry = configure_telemetry(enabled=True)
+    telemetry.reset()
+    config = OpenAIConfig(provider="openai", model="gpt-4o", api_key="key")
+
+    try:
+        OpenAIProvider(config=config).generate_hypothesis("ctx", "prompt")
+        assert (
+            telemetry.counter_value(
+                "aira_llm_tokens_total", direction="in", model="gpt-4o"
+            )
+            == 120
+        )
+        assert (
+            telemetry.counter_value(
+                "aira_llm_tokens_total", direction="out", model="gpt-4o"
+            )
+            == 30
+        )
+    finally:
+        configure_telemetry(enabled=False)
+        telemetry.reset()
+
+
+def test_generate_structured_streams_fields(monkeypatch):
+    """Tests schema-constrained streaming, field callbacks and token usage."""
+    text = json.dumps(
+        {
+            "probable_cause": "Redis is out of memory.",
+            "confidence": "medium",
+            "evidence": [{"ref": "logs", "detail": "OOM command not allowed"}],
+            "next_steps": ["Raise maxmemory."],
+        }
+    )
+    chunks = []
+    for start in range(0, len(text), 9):
+        chunk = MagicMock(usage=None)
+        chunk.choices = [MagicMock()]
+        chunk.choices[0].delta.content = text[start : start + 9]
+        chunks.append(chunk)
+    final = MagicMock(choices=[])
+    final.usage.prompt_tokens, final.usage.completion_tokens = 200, 40
+    mock_create = MagicMock(return_value=iter(chunks + [final]))
+    monkeypatch.setattr(
+        "openai.resources.chat.completions.Completions.create", mock_create
+    )
+    telemetry = configure_telemetry(enabled=True)
+    telemetry.reset()
+    config = OpenAIConfig(provider="openai", model="gpt-4o", api_key="key")
+    seen = []
+
+    try:
+        hypothesis = OpenAIProvider(config=config).generate_structured(
+            "ctx", "prompt", lambda key, value: seen.append(key)
+        )
+        assert (
+            telemetry.counter_value(
+                "aira_llm_tokens_total", direction="out", model="gpt-4o"
+            )
+            == 40
+        )
+    finally:
+        configure_telemetry(enabled=False)
+        telemetry.reset()
+
+    kwargs = mock_create.call_args.kwargs
+    assert kwargs["stream"] is True
+    assert kwargs["response_format"]["json_schema"]["strict"] is True
+    assert seen == ["probable_cause", "confidence", "evidence", "next_steps"]
+    assert hypothesis.probable_cause == "Redis is out of memory."
+    assert hypothesis.next_steps == ("Raise maxmemory.",)
+
+
+def test_chat_translates_tool_calls(monkeypatch):
+    """Tests the tool-calling wire format in both directions."""
+    call = MagicMock(id="call_2")
+    call.function.name = "fetch_logs"
+    call.function.arguments = '{"connection": "dd", "query": "x"}'
+    response = MagicMock()
+    response.choices = [MagicMock()]
+    response.choices[0].message.content = None
+    response.choices[0].message.tool_calls = [call]
+    response.usage.total_tokens = 321
+    mock_create = MagicMock(return_value=response)
+    monkeypatch.setattr(
+        "openai.resources.chat.completions.Completions.create", mock_create
+    )
+    config = OpenAIConfig(provider="openai", model="gpt-4o", api_key="key")
+    spec = ToolSpec("fetch_logs", "Runs a log query.", {"type": "object"})
+    earlier = ChatTurn("", (ToolCall("call_1", "fetch_logs", "{}"),))
+
+    turn = OpenAIProvider(config=config).chat(
+        [
+            {"role": "system", "content": "s"},
+            earlier,
+            ToolResult("call_1", "- [ERROR] boom"),
+        ],
+        [spec],
+    )
+
+    assert turn == ChatTurn(
+        "", (ToolCall("call_2", "fetch_logs", call.function.arguments),), 321
+    )
+    kwargs = mock_create.call_args.kwargs
+    assert kwargs["tools"][0]["function"]["name"] == "fetch_logs"
+    assert kwargs["messages"][1]["tool_calls"][0]["id"] == "call_1"
+    assert kwargs["messages"][2] == {
+        "role": "tool",
+        "tool_call_id": "call_1",
+        "content": "- [ERROR] boom",
+    }
+
+
+def test_chat_timeouts_raise_timeout_error(monkeypatch):
+    """Tests that a request outliving its timeout surfaces as TimeoutError."""
+    mock_create = MagicMock(side_effect=APITimeoutError(request=MagicMock()))
+    monkeypatch.setattr(
+        "openai.resources.chat.completions.Completions.create", mock_create
+    )
+    config = OpenAIConfig(provider="openai", model="gpt-4o", api_key="key")
+
+    with pytest.raises(TimeoutError):
+        OpenAIProvider(config=config).chat([{"role": "user", "content": "x"}], (), 5)
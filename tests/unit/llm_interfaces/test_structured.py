@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+from aira.llm_interfaces.structured import (
+    Evidence,
+    Hypothesis,
+    IncrementalJSONParser,
+)
+
+PAYLOAD = {
+    "probable_cause": 'Deploy 42 set the pool size to 1 ("max_conns": 1).',
+    "confidence": "high",
+    "evidence": [
+        {"ref": "deploy 42", "detail": "Finished 3 minutes before the alert."},
+        {"ref": "logs", "detail": "pool exhausted {x3}"},
+    ],
+    "next_steps": ["Roll back deploy 42.", "Alert on pool saturation."],
+}
+
+
+@pytest.mark.parametrize("size", [1, 3, 7, 10_000])
+def test_parser_reports_fields_as_they_complete(size):
+    """Tests that fields and array elements stream out however text is split."""
+    text = "```json\n" + json.dumps(PAYLOAD, indent=2) + "\n```"
+    parser = IncrementalJSONParser()
+    events = []
+    for start in range(0, len(text), size):
+        events += parser.feed(text[start : start + size])
+
+    assert parser.complete
+    assert parser.fields == PAYLOAD
+    assert [key for key, _ in events] == [
+        "probable_cause",
+        "confidence",
+        "evidence",
+        "evidence",
+        "next_steps",
+        "next_steps",
+    ]
+
+
+def test_parser_keeps_completed_fields_of_a_truncated_response():
+    """Tests that a cut-off response still yields the fields written in full."""
+    parser = IncrementalJSONParser()
+    events = parser.feed(json.dumps(PAYLOAD)[:-40])
+
+    assert not parser.complete
+    assert [key for key, _ in events][:3] == [
+        "probable_cause",
+        "confidence",
+        "evidence",
+    ]
+    hypothesis = Hypothesis.from_dict(parser.fields)
+    assert hypothesis.confidence == "high"
+    assert hypothesis.evidence[0] == Evidence(
+        "deploy 42", "Finished 3 minutes before the alert."
+    )
+
+
+def test_hypothesis_from_dict_tolerates_loose_output():
+    """Tests that unknown confidences and bare evidence strings are accepted."""
+    hypothesis = Hypothesis.from_dict(
+        {"probable_cause": "DNS", "confidence": "Certain", "evidence": ["logs"]}
+    )
+
+    assert hypothesis == Hypothesis("DNS", "low", (Evidence("logs"),), ())
+    assert Hypothesis.from_dict(PAYLOAD).to_markdown() == (
+        "*Probable cause* (high confidence): " + PAYLOAD["probable_cause"] + "\n\n"
+        "*Evidence*\n"
+        "- `deploy 42`: Finished 3 minutes before the alert.\n"
+        "- `logs`: pool exhausted {x3}\n\n"
+        "*Next steps*\n"
+        "1. Roll back deploy 42.\n"
+        "2. Alert on pool saturation."
+    )
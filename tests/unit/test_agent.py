@@ -0,0 +1,272 @@
+import json
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from aira.agent import BUDGET_SPENT, TIMED_OUT, Tool, ToolOutput, run_agent
+from aira.config import AgentConfig, AppConfig
+from aira.llm_interfaces import LLMError
+from aira.llm_interfaces.tools import ChatTurn, ToolCall, ToolResult, ToolSpec
+from aira.orchestrator import Orchestrator
+from aira.recording import Recording, Replayer
+
+
+def tool(name, run):
+    return Tool(
+        ToolSpec(name, name, {"type": "object", "properties": {}}),
+        lambda **kwargs: ToolOutput(run(**kwargs)),
+    )
+
+
+def calls(*names, **arguments):
+    return tuple(
+        ToolCall(f"c{n}", name, json.dumps(arguments)) for n, name in enumerate(names)
+    )
+
+
+def scripted(*turns):
+    """A provider that replies with `turns` in order, keeping what it was sent."""
+    provider = MagicMock()
+    provider.sent = []
+    provider.timeouts = []
+
+    def chat(messages, tools=(), timeout=None):
+        provider.sent.append((list(messages), list(tools)))
+        provider.timeouts.append(timeout)
+        turn = turns[len(provider.sent) - 1]
+        if isinstance(turn, Exception):
+            raise turn
+        return turn
+
+    provider.chat.side_effect = chat
+    return provider
+
+
+def test_tool_calls_of_a_turn_run_in_parallel():
+    """Tests that a turn's calls overlap and every call gets an answer."""
+    barrier = threading.Barrier(2, timeout=2)
+
+    def meet():
+        barrier.wait()
+        return "met"
+
+    provider = scripted(
+        ChatTurn("", calls("meet", "meet", "nope"), tokens=10),
+        ChatTurn("Done.", tokens=5),
+    )
+
+    run = run_agent(
+        provider.chat,
+        "system",
+        "prompt",
+        [tool("meet", meet), tool("count", lambda n: str(n))],
+        AgentConfig(enabled=True),
+    )
+
+    assert (run.text, run.steps, run.tokens, run.tool_calls) == ("Done.", 2, 15, 3)
+    assert run.exhausted is None
+    results = [m for m in provider.sent[1][0] if isinstance(m, ToolResult)]
+    assert [r.content for r in results] == [
+        "met",
+        "met",
+        "Error: there is no tool named 'nope'.",
+    ]
+
+
+@pytest.mark.parametrize(
+    "budget, tokens, exhausted",
+    [
+        (AgentConfig(max_steps=3), 1, "step"),
+        (AgentConfig(max_tokens=50), 60, "token"),
+    ],
+)
+def test_spent_budget_withdraws_the_tools(budget, tokens, exhausted):
+    """Tests that once a budget is spent, the model must answer without tools."""
+    # The model keeps asking for tools; it only stops when they are withdrawn.
+    provider = scripted(*[ChatTurn("Answer.", calls("echo"), tokens=tokens)] * 3)
+
+    run = run_agent(provider.chat, "s", "p", [tool("echo", lambda: "ok")], budget)
+
+    assert run.exhausted == exhausted
+    assert run.text == "Answer."
+    messages, tools = provider.sent[-1]
+    assert tools == []
+    assert messages[-1]["content"] == BUDGET_SPENT.format(budget=exhausted)
+    assert len(provider.sent) == (3 if exhausted == "step" else 2)
+
+
+def test_time_budget_abandons_slow_tools():
+    """Tests that calls outliving the time budget are reported and discarded."""
+    release = threading.Event()
+    provider = scripted(
+        ChatTurn("", calls("slow", "fast")),
+        ChatTurn("Partial answer."),
+    )
+
+    started = time.monotonic()
+    try:
+        run = run_agent(
+            provider.chat,
+            "s",
+            "p",
+            [tool("slow", lambda: release.wait(5) and "late"), tool("fast", str)],
+            AgentConfig(max_seconds=1.2, answer_seconds=1.0),
+        )
+    finally:
+        release.set()
+
+    assert time.monotonic() - started < 2
+    assert run.exhausted == "time"
+    assert [r.content for r in provider.sent[1][0][-3:-1]] == [
+        "Timed out: the time budget ran out before this returned.",
+        "",
+    ]
+    assert [o.text for o in run.outputs] == [""]
+    # Every request is bounded by the time that was left for it.
+    assert provider.timeouts[0] <= 0.2
+    assert 0.9 < provider.timeouts[1] <= 1.0
+
+
+def test_llm_timeouts_end_the_run_within_its_budget():
+    """Tests that a late reply withdraws the tools, and a late answer ends the run."""
+    provider = scripted(TimeoutError(), TimeoutError())
+
+    run = run_agent(
+        provider.chat,
+        "s",
+        "p",
+        [tool("echo", lambda: "ok")],
+        AgentConfig(max_seconds=0.3, answer_seconds=0.1),
+    )
+
+    assert (run.text, run.exhausted, run.steps) == (TIMED_OUT, "time", 0)
+    assert [tools for _, tools in provider.sent][-1] == []
+
+
+DD_URL = "https://api.datadoghq.com/api/v2/logs/events/search"
+
+
+def test_orchestrator_fetches_only_what_the_agent_asks_for(requests_mock):
+    """Tests that only the incident is pre-fetched and tools fill in the rest."""
+    config = AppConfig(
+        llm={"provider": "openai", "model": "gpt-4o", "api_key": "test-key"},
+        connections={
+            "pd": {"type": "pagerduty", "api_key": "k", "from_email": "a@b.c"},
+            "dd": {"type": "datadog", "api_key": "dd-key", "app_key": "dd-app"},
+        },
+        agent={"enabled": True},
+    )
+    orch = Orchestrator(config, [True])
+    orch.llm_provider = scripted(
+        ChatTurn(
+            "",
+            (
+                ToolCall(
+                    "1",
+                    "fetch_logs",
+                    '{"connection": "dd", "query": "service:api", "minutes": 30}',
+                ),
+            ),
+        ),
+        ChatTurn("Redis is down."),
+    )
+    requests_mock.get(
+        "https://api.pagerduty.com/incidents/P1",
+        json={"incident": {"id": "P1", "title": "API errors"}},
+    )
+    dd = requests_mock.post(
+        DD_URL,
+        json={
+            "data": [{"attributes": {"status": "error", "message": "redis timeout"}}]
+        },
+    )
+
+    result = orch.run_analysis({"incident_id": "P1", "log_query": "service:*"})
+
+    assert result.hypothesis == "Redis is down."
+    assert dd.call_count == 1
+    assert json.loads(dd.last_request.body)["filter"]["query"] == "service:api"
+    messages, tools = orch.llm_provider.sent[0]
+    assert "API errors" in messages[1]["content"]
+    assert "- Log query: `service:*`" in messages[1]["content"]
+    assert "redis timeout" not in messages[1]["content"]
+    assert [t.name for t in tools] == ["get_incident_details", "fetch_logs"]
+    assert tools[1].parameters["properties"]["connection"]["enum"] == ["dd"]
+    assert orch.llm_provider.sent[1][0][-1].content == "- [ERROR] redis timeout"
+
+
+def test_agentic_analyses_replay_their_turns_and_tools(requests_mock, tmp_path):
+    """Tests that a recorded agentic analysis replays through the agent loop."""
+    config = AppConfig(
+        llm={"provider": "openai", "model": "gpt-4o", "api_key": "test-key"},
+        connections={
+            "pd": {"type": "pagerduty", "api_key": "k", "from_email": "a@b.c"},
+            "dd": {"type": "datadog", "api_key": "dd-key", "app_key": "dd-app"},
+        },
+        agent={"enabled": True},
+    )
+    orch = Orchestrator(config, [True])
+    orch.llm_provider = scripted(
+        ChatTurn(
+            "",
+            (ToolCall("1", "fetch_logs", '{"connection": "dd", "query": "q"}'),),
+        ),
+        ChatTurn("Redis is down."),
+    )
+    requests_mock.get(
+        "https://api.pagerduty.com/incidents/P1",
+        json={"incident": {"id": "P1", "title": "API errors"}},
+    )
+    requests_mock.post(
+        DD_URL,
+        json={
+            "data": [{"attributes": {"status": "error", "message": "redis timeout"}}]
+        },
+    )
+    recording = Recording({"incident_id": "P1"})
+    orch.run_analysis({"incident_id": "P1"}, recording=recording)
+    recording.save(tmp_path / "P1.json.gz")
+
+    requests_mock.reset_mock()
+    orch.llm_provider = None
+    replayer = Replayer(Recording.load(tmp_path / "P1.json.gz"))
+    seen = []
+    original = replayer.replay_call
+
+    def replay_call(connector, method, args):
+        seen.append((connector, method, args))
+        return original(connector, method, args)
+
+    replayer.replay_call = replay_call
+    result = orch.replay_analysis(replayer)
+
+    assert result.hypothesis == "Redis is down."
+    assert not result.missing_context
+    assert seen == [
+        ("pd", "get_incident_details", ("P1",)),
+        ("dd", "fetch_logs", ("q", 15)),
+    ]
+    assert requests_mock.call_count == 0
+
+
+def test_orchestrator_raises_when_the_agent_never_answers(requests_mock):
+    """Tests that a timed-out investigation is an error, not a hypothesis."""
+    config = AppConfig(
+        llm={"provider": "openai", "model": "gpt-4o", "api_key": "test-key"},
+        connections={
+            "pd": {"type": "pagerduty", "api_key": "k", "from_email": "a@b.c"},
+        },
+        agent={"enabled": True},
+    )
+    orch = Orchestrator(config, [True])
+    orch.llm_provider = scripted(TimeoutError(), TimeoutError())
+    requests_mock.get(
+        "https://api.pagerduty.com/incidents/P1",
+        json={"incident": {"id": "P1", "title": "API errors"}},
+    )
+
+    with pytest.raises(LLMError, match="time budget"):
+        orch.run_analysis({"incident_id": "P1"}, incremental=True)
+    assert len(orch.follow_ups) == 0
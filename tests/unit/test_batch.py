@@ -0,0 +1,55 @@
+import json
+import threading
+import time
+
+from aira.batch import load_triggers, run_batch
+
+
+def test_load_triggers_reads_directories_and_flags_bad_events(tmp_path):
+    """Tests that YAML, JSON and JSONL are read and bad events don't stop the rest."""
+    (tmp_path / "a.yaml").write_text("incident_id: P1\n")
+    (tmp_path / "b.json").write_text(json.dumps([{"incident_id": "P2"}]))
+    (tmp_path / "c.jsonl").write_text('{"incident_id": "P3"}\nnot json\n[1]\n')
+    (tmp_path / "notes.txt").write_text("ignored")
+
+    triggers = list(load_triggers(str(tmp_path)))
+
+    assert [t for _, t in triggers[:3]] == [
+        {"incident_id": "P1"},
+        {"incident_id": "P2"},
+        {"incident_id": "P3"},
+    ]
+    assert triggers[3][0].endswith("c.jsonl:2")
+    assert isinstance(triggers[3][1], ValueError)
+    assert "must be a mapping" in str(triggers[4][1])
+
+
+def test_run_batch_bounds_concurrency_and_reports_errors():
+    """Tests that at most `parallel` items run at once and failures are isolated."""
+    running, peak, lock = 0, 0, threading.Lock()
+
+    def analyze(index, item):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.01)
+        with lock:
+            running -= 1
+        if item == "bad":
+            raise RuntimeError("boom")
+        return {"item": item}
+
+    items = [(f"s{i}", "bad" if i == 3 else i) for i in range(12)]
+    results = list(run_batch(items, analyze, parallel=3))
+
+    assert len(results) == 12
+    assert peak <= 3
+    errors = [r for r in results if "error" in r]
+    assert errors == [
+        {
+            "source": "s3",
+            "error": "boom",
+            "duration_seconds": errors[0]["duration_seconds"],
+        }
+    ]
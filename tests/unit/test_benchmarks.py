@@ -0,0 +1,33 @@
+import requests
+
+from benchmarks.mock_services import ServiceProfile, StandInServer, render_fixture
+from benchmarks.run import compare_to_baseline
+
+
+def test_render_fixture_resolves_timestamps_and_grows_lists():
+    raw = '[{"sha": "abc", "at": "{{minutes_ago:5}}"}]'
+
+    payload = render_fixture(raw, items=3)
+
+    assert len(payload) == 3
+    assert len({item["sha"] for item in payload}) == 3
+    assert payload[0]["at"].endswith("Z")
+
+
+def test_stand_in_server_serves_fixture_and_injects_failures():
+    with StandInServer("github") as server:
+        response = requests.get(f"{server.url}/repos/acme/checkout/commits")
+        assert response.status_code == 200
+        assert response.json()[0]["sha"]
+
+    with StandInServer("github", ServiceProfile(error_rate=1.0)) as server:
+        assert requests.get(f"{server.url}/user").status_code == 503
+
+
+def test_compare_to_baseline_flags_only_regressions_beyond_tolerance():
+    baseline = [{"concurrency": 4, "throughput_per_s": 10.0, "e2e_ms": {"p95": 100.0}}]
+    within = [{"concurrency": 4, "throughput_per_s": 9.0, "e2e_ms": {"p95": 110.0}}]
+    slower = [{"concurrency": 4, "throughput_per_s": 5.0, "e2e_ms": {"p95": 200.0}}]
+
+    assert compare_to_baseline(within, baseline, tolerance=0.2) == []
+    assert len(compare_to_baseline(slower, baseline, tolerance=0.2)) == 2
@@ -0,0 +1,73 @@
+from aira.circuit_breaker import CircuitBreaker, CircuitState
+
+
+class FakeClock:
+    """A controllable monotonic clock for driving state transitions."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_breaker_opens_after_threshold():
+    """Tests that consecutive failures open the circuit and block calls."""
+    breaker = CircuitBreaker("test", failure_threshold=2, recovery_timeout=30)
+    breaker.record_failure()
+    assert breaker.state is CircuitState.CLOSED
+    breaker.record_failure()
+    assert breaker.state is CircuitState.OPEN
+    assert breaker.allow_request() is False
+
+
+def test_breaker_success_resets_failure_count():
+    """Tests that a success between failures keeps the circuit closed."""
+    breaker = CircuitBreaker("test", failure_threshold=2)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state is CircuitState.CLOSED
+
+
+def test_breaker_half_open_allows_single_trial():
+    """Tests the open -> half-open transition after the recovery timeout."""
+    clock = FakeClock()
+    breaker = CircuitBreaker(
+        "test", failure_threshold=1, recovery_timeout=30, clock=clock
+    )
+    breaker.record_failure()
+    assert breaker.allow_request() is False
+
+    clock.now = 31
+    assert breaker.state is CircuitState.HALF_OPEN
+    assert breaker.allow_request() is True
+    assert breaker.allow_request() is False  # Only one trial call at a time
+
+
+def test_breaker_half_open_failure_reopens():
+    """Tests that a failed trial call reopens the circuit."""
+    clock = FakeClock()
+    breaker = CircuitBreaker(
+        "test", failure_threshold=3, recovery_timeout=10, clock=clock
+    )
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now = 11
+    assert breaker.allow_request() is True
+    breaker.record_failure()
+    assert breaker.state is CircuitState.OPEN
+
+
+def test_breaker_half_open_success_closes():
+    """Tests that a successful trial call closes the circuit."""
+    clock = FakeClock()
+    breaker = CircuitBreaker(
+        "test", failure_threshold=1, recovery_timeout=10, clock=clock
+    )
+    breaker.record_failure()
+    clock.now = 11
+    assert breaker.allow_request() is True
+    breaker.record_success()
+    assert breaker.state is CircuitState.CLOSED
+    assert breaker.allow_request() is True
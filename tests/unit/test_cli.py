@@ -0,0 +1,240 @@
+import json
+import subprocess
+import sys
+
+from typer.testing import CliRunner
+
+from aira.cli import app, load_prompts
+
+
+def _imported_modules(code: str) -> set:
+    """Runs `code` in a fresh interpreter and returns the modules it imported."""
+    result = subprocess.run(
+        [sys.executable, "-c", f"{code}\nimport sys; print('\\n'.join(sys.modules))"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(result.stdout.split())
+
+
+def test_cli_import_is_lazy():
+    """Tests that importing the CLI loads no connectors or provider SDKs."""
+    modules = _imported_modules("import aira.cli")
+    assert "openai" not in modules
+    assert "requests" not in modules
+    assert not any(m.startswith("aira.connectors") for m in modules)
+
+
+def test_get_connector_imports_only_requested_type():
+    """Tests that building one connector does not import its siblings."""
+    modules = _imported_modules(
+        "from aira.config import GitHubConfig\n"
+        "from aira.connectors import get_connector\n"
+        "get_connector('gh', GitHubConfig(type='github', token='t', default_repo='o/r'))"
+    )
+    assert "aira.connectors.source_control.github" in modules
+    assert "aira.connectors.alerting.pagerduty" not in modules
+    assert "aira.connectors.observability.datadog" not in modules
+    assert "openai" not in modules
+
+
+def test_help_runs():
+    """Tests that `aira --help` lists the commands."""
+    result = CliRunner().invoke(app, ["--help"])
+    assert result.exit_code == 0
+    assert "doctor" in result.output
+
+
+def test_load_prompts_reads_templates():
+    """Tests that the init prompts are loaded on demand."""
+    secret_prompts, non_secret_prompts = load_prompts()
+    assert secret_prompts
+    assert non_secret_prompts
+
+
+def test_analyze_streams_json_lines(tmp_path, monkeypatch):
+    """Tests that `aira analyze` reads a JSONL batch and emits one line per event."""
+    from aira.orchestrator import AnalysisResult, Orchestrator
+
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text(
+        "llm: {provider: openai, api_key: test-key}\nconnections: {}\n"
+    )
+    triggers = tmp_path / "triggers.jsonl"
+    triggers.write_text('{"incident_id": "P1"}\n{"incident_id": "P2"}\n{oops\n')
+    monkeypatch.setattr(
+        Orchestrator,
+        "run_analysis",
+        lambda self, trigger, recording=None, incremental=False: AnalysisResult(
+            f"Cause of {trigger['incident_id']}"
+        ),
+    )
+
+    result = CliRunner().invoke(
+        app, ["analyze", str(triggers), "-c", str(config_file), "--parallel", "2"]
+    )
+
+    lines = [json.loads(line) for line in result.stdout.splitlines()]
+    assert result.exit_code == 1  # The malformed line is reported as a failure
+    assert sorted(line.get("hypothesis", "") for line in lines) == [
+        "",
+        "Cause of P1",
+        "Cause of P2",
+    ]
+    assert any("invalid JSON" in line.get("error", "") for line in lines)
+
+
+def test_analyze_rejects_recording_incremental_runs(tmp_path):
+    """Tests that --incremental cannot be combined with --record."""
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text("llm: {provider: openai, api_key: test-key}\n")
+    triggers = tmp_path / "triggers.jsonl"
+    triggers.write_text('{"incident_id": "P1"}\n')
+
+    result = CliRunner().invoke(
+        app,
+        [
+            "analyze",
+            str(triggers),
+            "-c",
+            str(config_file),
+            "--incremental",
+            "--record",
+            str(tmp_path / "rec"),
+        ],
+    )
+
+    assert result.exit_code == 1
+    assert "--incremental cannot be combined" in result.stderr
+
+
+def test_watch_once_analyzes_new_and_updated_incidents(tmp_path, monkeypatch):
+    """Tests that `aira watch --once` analyzes each change once, with defaults."""
+    from datetime import datetime, timezone
+
+    from aira.connectors.alerting.pagerduty import PagerDutyConnector
+    from aira.connectors.records import Incident
+    from aira.orchestrator import AnalysisResult, Orchestrator
+
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text(
+        "llm: {provider: openai, api_key: test-key}\n"
+        "connections:\n"
+        "  pd: {type: pagerduty, api_key: k, from_email: a@b.c}\n"
+    )
+    defaults = tmp_path / "trigger.json"
+    defaults.write_text('{"repo": "shop/checkout"}')
+    now = datetime.now(timezone.utc)
+    monkeypatch.setattr(
+        PagerDutyConnector,
+        "fetch_updated_incidents",
+        lambda self, since, until: [Incident("P1", "Down", updated_at=now)],
+    )
+    analyzed = []
+
+    def run_analysis(self, trigger, recording=None, incremental=False):
+        analyzed.append((trigger, incremental))
+        return AnalysisResult(f"Cause of {trigger['incident_id']}")
+
+    monkeypatch.setattr(Orchestrator, "run_analysis", run_analysis)
+    args = ["watch", "--once", "-c", str(config_file), "--trigger", str(defaults)]
+    args += ["--state-dir", str(tmp_path / "feeds")]
+
+    first = CliRunner().invoke(app, args)
+    second = CliRunner().invoke(app, args)
+
+    assert first.exit_code == 0, first.output
+    assert [json.loads(line)["hypothesis"] for line in first.stdout.splitlines()] == [
+        "Cause of P1"
+    ]
+    assert analyzed == [
+        ({"repo": "shop/checkout", "incident_id": "P1", "source": "pd"}, True)
+    ]
+    assert second.exit_code == 0 and second.stdout == ""
+
+
+def test_watch_reloads_edited_config_into_its_feeds(tmp_path, monkeypatch):
+    """Tests that `aira watch` hot-reloads the config and moves feeds over."""
+    import functools
+    import threading
+
+    from aira.config import ConfigWatcher
+    from aira.feed import IncidentFeed
+
+    config_file = tmp_path / "config.yaml"
+    config = "llm: {provider: openai, api_key: test-key}\nconnections:\n"
+    config_file.write_text(
+        config + "  pd: {type: pagerduty, api_key: k, from_email: a@b.c}\n"
+    )
+    monkeypatch.setattr(
+        ConfigWatcher,
+        "__init__",
+        functools.partialmethod(ConfigWatcher.__init__, interval=0.05),
+    )
+    connectors = []
+
+    def run(self, on_incidents, stop):
+        connectors.append(self.connector)
+        config_file.write_text(
+            config + "  pd: {type: pagerduty, api_key: k2, from_email: a@b.c}\n"
+        )
+        for _ in range(100):
+            if self.connector is not connectors[0]:
+                break
+            threading.Event().wait(0.05)
+        connectors.append(self.connector)
+        stop.set()
+
+    monkeypatch.setattr(IncidentFeed, "run", run)
+
+    result = CliRunner().invoke(
+        app,
+        ["watch", "-c", str(config_file), "--state-dir", str(tmp_path / "feeds")],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert connectors[1] is not connectors[0]
+    assert connectors[1].validated_config.api_key.get_secret_value() == "k2"
+    assert "Reloaded" in result.stderr
+
+
+def test_watch_stops_removed_feeds_and_starts_added_ones(tmp_path, monkeypatch):
+    """Tests that a reload stops the feed of a removed connection and starts new ones."""
+    import functools
+
+    from aira.config import ConfigWatcher
+    from aira.feed import IncidentFeed
+
+    config_file = tmp_path / "config.yaml"
+    config = "llm: {provider: openai, api_key: test-key}\nconnections:\n"
+    config_file.write_text(
+        config + "  pd: {type: pagerduty, api_key: k, from_email: a@b.c}\n"
+    )
+    monkeypatch.setattr(
+        ConfigWatcher,
+        "__init__",
+        functools.partialmethod(ConfigWatcher.__init__, interval=0.05),
+    )
+    stopped = {}
+
+    def run(self, on_incidents, stop):
+        if self.connector.name == "pd":
+            config_file.write_text(
+                config + "  pd2: {type: pagerduty, api_key: k, from_email: a@b.c}\n"
+            )
+            stopped["pd"] = stop.wait(5)
+        else:
+            stopped[self.connector.name] = stop.is_set()
+
+    monkeypatch.setattr(IncidentFeed, "run", run)
+
+    result = CliRunner().invoke(
+        app,
+        ["watch", "-c", str(config_file), "--state-dir", str(tmp_path / "feeds")],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert stopped == {"pd": True, "pd2": False}
+    assert "Stopped the feed for removed 'pd'" in result.stderr
+    assert "Started a feed for 'pd2'" in result.stderr
@@ -1,7 +1,7 @@
 import pytest
 import yaml
 from pathlib import Path
-from aira.config import load_config, AppConfig, OpenAIConfig
+from aira.config import load_config, AppConfig, OpenAIConfig, ConfigWatcher
 
 
 @pytest.fixture
@@ -102,3 +102,81 @@ def test_load_config_env_var_substitution(temp_config_dir: Path, monkeypatch):
 
     app_config = load_config(config_file)
     assert app_config.llm.api_key.get_secret_value() == "my-secret-key-from-env"
+
+
+def _write_config(path: Path, repo: str = "org/repo"):
+    path.write_text(
+        yaml.dump(
+            {
+                "llm": {"provider": "openai", "api_key": "test-key"},
+                "connections": {
+                    "gh": {"type": "github", "token": "t", "default_repo": repo}
+                },
+            }
+        )
+    )
+
+
+def test_load_config_is_cached_until_content_changes(temp_config_dir: Path):
+    """Tests that an unchanged file returns the already-validated config."""
+    config_file = temp_config_dir / "config.yaml"
+    _write_config(config_file)
+
+    first = load_config(config_file)
+    assert load_config(config_file) is first
+
+    _write_config(config_file, repo="org/other")
+    second = load_config(config_file)
+    assert second is not first
+    assert second.connections["gh"].default_repo == "org/other"
+
+
+def test_config_watcher_delivers_valid_changes(temp_config_dir: Path):
+    """Tests that the watcher reloads edits and ignores invalid ones."""
+    config_file = temp_config_dir / "config.yaml"
+    _write_config(config_file)
+    load_config(config_file)
+    received = []
+    watcher = ConfigWatcher(config_file, received.append)
+
+    assert watcher.check() is False  # Nothing changed yet
+
+    _write_config(config_file, repo="org/changed-repo")
+    assert watcher.check() is True
+    assert received[-1].connections["gh"].default_repo == "org/changed-repo"
+
+    config_file.write_text("llm: {}\nconnections: {}\n")
+    assert watcher.check() is False
+    assert len(received) == 1
+
+
+def test_config_watcher_applies_env_file_edits(temp_config_dir: Path, monkeypatch):
+    """Tests that editing only the .env reloads the config with the new value."""
+    monkeypatch.delenv("AIRA_TEST_REPO", raising=False)
+    config_file = temp_config_dir / "config.yaml"
+    _write_config(config_file, repo="${AIRA_TEST_REPO}")
+    env_file = temp_config_dir / ".env"
+    env_file.write_text("AIRA_TEST_REPO=org/first\n")
+    assert load_config(config_file).connections["gh"].default_repo == "org/first"
+    received = []
+    watcher = ConfigWatcher(config_file, received.append)
+
+    env_file.write_text("AIRA_TEST_REPO=org/second-repo\n")
+
+    assert watcher.check() is True
+    assert received[-1].connections["gh"].default_repo == "org/second-repo"
+
+
+def test_exported_environment_wins_over_env_file(temp_config_dir: Path, monkeypatch):
+    """Tests that a variable exported before loading is not overridden by .env."""
+    monkeypatch.setenv("AIRA_TEST_REPO", "org/from-environment")
+    config_file = temp_config_dir / "config.yaml"
+    _write_config(config_file, repo="${AIRA_TEST_REPO}")
+    env_file = temp_config_dir / ".env"
+    env_file.write_text("AIRA_TEST_REPO=org/first\n")
+    config = load_config(config_file)
+    assert config.connections["gh"].default_repo == "org/from-environment"
+
+    env_file.write_text("AIRA_TEST_REPO=org/second-repo\n")
+    config = load_config(config_file)
+    assert config.connections["gh"].default_repo == "org/from-environment"
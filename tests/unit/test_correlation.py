@@ -0,0 +1,115 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+from aira.connectors.records import Commit, Deployment, Incident, LogEvent
+from aira.context import IncidentContext
+from aira.correlation import Timeline, correlate, service_tokens
+
+T0 = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def at(minutes: float) -> datetime:
+    return T0 + timedelta(minutes=minutes)
+
+
+def test_timeline_between_is_inclusive():
+    """Tests window queries against the sorted index."""
+    timeline = Timeline([(30, "c"), (10, "a"), (20, "b")])
+    assert timeline.between(10, 20) == ["a", "b"]
+    assert timeline.between(21, 29) == []
+    assert len(timeline) == 3
+
+
+def test_service_tokens_ignore_generic_words():
+    """Tests that generic words do not create false service overlaps."""
+    assert service_tokens("acme/checkout-api") == {"acme", "checkout"}
+    assert not service_tokens("payments-api") & service_tokens("search-api")
+
+
+def test_correlate_prefers_close_same_service_cause():
+    """Tests ranking by temporal proximity and service overlap."""
+    near_same = Commit(
+        sha="a" * 40, author="A", message="x", timestamp=at(-5), repo="acme/checkout"
+    )
+    near_other = Commit(
+        sha="b" * 40, author="B", message="y", timestamp=at(-5), repo="acme/search"
+    )
+    far = Commit(
+        sha="c" * 40, author="C", message="z", timestamp=at(-50), repo="acme/checkout"
+    )
+    after = Commit(
+        sha="d" * 40, author="D", message="w", timestamp=at(10), repo="acme/checkout"
+    )
+    context = IncidentContext(
+        trigger={},
+        commits=[far, after, near_other, near_same],
+        incidents=[
+            Incident(id="P1", title="down", service="checkout", created_at=at(2))
+        ],
+        logs=[
+            LogEvent(
+                message="boom", status="error", timestamp=at(0), service="checkout"
+            ),
+            LogEvent(
+                message="ok", status="info", timestamp=at(-40), service="checkout"
+            ),
+        ],
+    )
+
+    suspects = correlate(context)
+
+    assert [s.cause for s in suspects] == [near_same, near_other, far]
+    assert any("same service" in e for e in suspects[0].evidence)
+
+
+def test_correlate_includes_deployments():
+    """Tests that deployments are ranked alongside commits."""
+    deploy = Deployment(id="42", service="checkout", status="success", timestamp=at(-3))
+    context = IncidentContext(
+        trigger={},
+        deployments=[deploy],
+        incidents=[
+            Incident(id="P1", title="down", service="checkout", created_at=at(0))
+        ],
+    )
+    assert correlate(context)[0].cause is deploy
+
+
+def test_correlate_without_symptoms_returns_nothing():
+    """Tests that causes are not ranked when there is nothing to explain."""
+    commit = Commit(sha="a" * 40, author="A", message="x", timestamp=at(0), repo="r")
+    assert correlate(IncidentContext(trigger={}, commits=[commit])) == []
+
+
+def test_correlate_scales_to_thousands_of_events():
+    """Tests that a large incident is ranked well within interactive latency."""
+    commits = [
+        Commit(
+            sha=f"{i:040x}",
+            author="A",
+            message="x",
+            timestamp=at(-i % 600),
+            repo=f"org/svc{i % 50}",
+        )
+        for i in range(5000)
+    ]
+    logs = [
+        LogEvent(
+            message="e", status="error", timestamp=at(i % 120), service=f"svc{i % 50}"
+        )
+        for i in range(5000)
+    ]
+    incidents = [
+        Incident(id=f"P{i}", title="t", service=f"svc{i}", created_at=at(i))
+        for i in range(50)
+    ]
+    context = IncidentContext(
+        trigger={}, commits=commits, logs=logs, incidents=incidents
+    )
+
+    start = time.perf_counter()
+    suspects = correlate(context, max_suspects=10)
+    elapsed = time.perf_counter() - start
+
+    assert len(suspects) == 10
+    assert elapsed < 0.5
@@ -0,0 +1,111 @@
+import threading
+import time
+
+import pytest
+
+from aira.config import AppConfig, RouteConfig
+from aira.connectors.base import CollaborationProvider
+from aira.dispatch import ActionDispatcher, analysis_blocks
+
+
+class FakeDestination(CollaborationProvider):
+    """Records posts; optionally blocks or fails first."""
+
+    def __init__(self, name, gate=None, failures=0):
+        super().__init__(name, {})
+        self.posted = []
+        self.gate = gate
+        self.failures = failures
+
+    def test_connection(self):
+        return True, "ok"
+
+    def post_message(self, blocks):
+        if self.gate is not None:
+            self.gate.wait(5)
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("temporarily down")
+        self.posted.append(blocks)
+
+
+BLOCKS = analysis_blocks("Bad deploy.")
+
+
+def test_destinations_match_routes_by_service_and_severity():
+    """Tests that only routes matching the incident select their actions."""
+    dispatcher = ActionDispatcher(
+        [
+            RouteConfig(actions=["payments"], services=["Checkout"]),
+            RouteConfig(actions=["pager", "payments"], severities=["sev1"]),
+            RouteConfig(actions=["everything"]),
+        ]
+    )
+    available = ["payments", "pager", "everything"]
+
+    assert dispatcher.destinations(available, ["checkout"], ["sev3"]) == [
+        "payments",
+        "everything",
+    ]
+    assert dispatcher.destinations(available, ["search"], ["SEV1"]) == [
+        "pager",
+        "payments",
+        "everything",
+    ]
+    assert ActionDispatcher().destinations(available) == available
+
+
+def test_slow_destination_does_not_delay_others():
+    """Tests that each destination is served by its own worker."""
+    gate = threading.Event()
+    slow = FakeDestination("slow", gate=gate)
+    fast = FakeDestination("fast")
+    dispatcher = ActionDispatcher()
+    connectors = {"slow": slow, "fast": fast, "not_an_action": object()}
+
+    started = time.monotonic()
+    routed = dispatcher.dispatch(connectors, BLOCKS)
+    assert time.monotonic() - started < 1
+    assert routed == ["slow", "fast"]
+
+    deadline = time.monotonic() + 2
+    while not fast.posted and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert fast.posted == [BLOCKS]
+    assert slow.posted == []
+
+    gate.set()
+    assert dispatcher.flush(connectors, timeout=5)
+    assert slow.posted == [BLOCKS]
+    dispatcher.close()
+
+
+def test_failed_post_is_retried():
+    """Tests that a failing destination is retried with backoff."""
+    flaky = FakeDestination("flaky", failures=2)
+    dispatcher = ActionDispatcher(max_retries=2, retry_delay=0)
+
+    dispatcher.dispatch({"flaky": flaky}, BLOCKS)
+
+    assert dispatcher.flush({"flaky": flaky}, timeout=5)
+    assert flaky.posted == [BLOCKS]
+    dispatcher.close()
+
+
+def test_analysis_blocks_split_long_text():
+    """Tests that long analyses are split across Slack-sized sections."""
+    blocks = analysis_blocks("x" * 7000, title="P123: Down")
+
+    assert blocks[0]["type"] == "header"
+    assert [len(b["text"]["text"]) for b in blocks[1:]] == [3000, 3000, 1000]
+
+
+def test_routes_must_refer_to_known_actions():
+    """Tests that a route naming an undefined action is rejected."""
+    with pytest.raises(ValueError, match="unknown actions"):
+        AppConfig(
+            llm={"provider": "openai", "model": "gpt-4o", "api_key": "k"},
+            connections={},
+            actions={"oncall": {"type": "slack", "webhook_url": "http://x"}},
+            routes=[{"actions": ["missing"]}],
+        )
@@ -0,0 +1,108 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from aira.connectors.base import AlertingProvider, ConnectorError
+from aira.connectors.records import Incident
+from aira.feed import IncidentFeed
+
+
+def _ts(epoch: float) -> datetime:
+    return datetime.fromtimestamp(epoch, timezone.utc)
+
+
+class FakeAlerting(AlertingProvider):
+    """Serves a fixed list of incidents, filtered by update time."""
+
+    def __init__(self, incidents):
+        super().__init__("fake", {})
+        self.incidents = incidents
+        self.windows = []
+        self.fail = False
+
+    def test_connection(self):
+        return True, "ok"
+
+    def get_incident_details(self, incident_id):
+        raise NotImplementedError
+
+    def fetch_updated_incidents(self, since, until):
+        if self.fail:
+            raise ConnectorError("down", 503)
+        self.windows.append((since, until))
+        return [i for i in self.incidents if since <= i.updated_at <= until]
+
+
+@pytest.fixture
+def clock():
+    now = [1_000_000.0]
+    return now
+
+
+def test_poll_dedupes_overlapping_windows_and_adapts_interval(clock):
+    """Tests that overlap repeats are dropped and idle polls back off."""
+    connector = FakeAlerting([Incident("P1", "a", updated_at=_ts(999_990))])
+    feed = IncidentFeed(
+        connector, min_interval=5, max_interval=20, clock=lambda: clock[0]
+    )
+
+    assert [i.id for i in feed.poll()] == ["P1"]
+    assert feed.interval == 5
+
+    clock[0] += 5
+    assert feed.poll() == []  # P1 is inside the overlap but already seen
+    assert connector.windows[-1][0] == _ts(1_000_000 - 60)
+    assert feed.interval == 10
+    feed.poll()
+    feed.poll()
+    assert feed.interval == 20
+
+    connector.incidents.append(Incident("P1", "a", updated_at=_ts(clock[0])))
+    assert [i.id for i in feed.poll()] == ["P1"]  # A new version of P1
+    assert feed.interval == 5
+
+
+def test_failed_poll_keeps_cursor_and_backs_off(clock):
+    """Tests that the cursor only advances on success."""
+    connector = FakeAlerting([])
+    feed = IncidentFeed(connector, min_interval=5, clock=lambda: clock[0])
+    cursor = feed.cursor
+    connector.fail = True
+
+    with pytest.raises(ConnectorError):
+        feed.poll()
+
+    assert feed.cursor == cursor
+    assert feed.interval == 10
+
+
+def test_state_persists_across_restarts(tmp_path, clock):
+    """Tests that a restarted feed resumes from its cursor and seen-set."""
+    state = tmp_path / "feed.json"
+    connector = FakeAlerting([Incident("P1", "a", updated_at=_ts(999_990))])
+    IncidentFeed(connector, state_path=state, clock=lambda: clock[0]).poll()
+
+    clock[0] += 30
+    restarted = IncidentFeed(connector, state_path=state, clock=lambda: clock[0])
+
+    assert restarted.cursor == 1_000_000
+    assert restarted.poll() == []
+
+
+def test_stale_copies_of_a_change_are_not_emitted_again(clock):
+    """Tests that only changes newer than the last one emitted come through."""
+    connector = FakeAlerting(
+        [Incident("P1", "a", updated_at=_ts(999_950)), Incident("P2", "b")]
+    )
+    connector.fetch_updated_incidents = lambda since, until: connector.incidents
+    feed = IncidentFeed(connector, clock=lambda: clock[0])
+
+    assert [i.id for i in feed.poll()] == ["P1", "P2"]
+
+    # An older copy of P1 and a repeat of the undated P2 are both dropped.
+    connector.incidents = [
+        Incident("P1", "a", updated_at=_ts(999_900)),
+        Incident("P2", "b"),
+        Incident("P1", "a", updated_at=_ts(999_990)),
+    ]
+    assert [i.updated_at for i in feed.poll()] == [_ts(999_990)]
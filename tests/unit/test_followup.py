@@ -0,0 +1,192 @@
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+import pytest
+
+from aira.config import AppConfig
+from aira.connectors.records import Deployment, Incident, LogEvent
+from aira.context import IncidentContext
+from aira.followup import (
+    FollowUpState,
+    FollowUpTracker,
+    has_evidence,
+    high_water_mark,
+)
+from aira.orchestrator import FOLLOW_UP_SYSTEM_PROMPT, Orchestrator
+from aira.recording import Recording
+
+T0 = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+
+
+def test_absorb_returns_only_new_or_changed_records():
+    """Tests that repeats are dropped and changed records replace the old."""
+    boom = LogEvent("boom", "error", T0, "api")
+    context = IncidentContext(
+        trigger={"incident_id": "P1", "lookback_hours": 3},
+        incidents=[Incident("P1", "Down", status="triggered", source="pd")],
+        deployments=[Deployment("7", "api", status="in_progress", timestamp=T0)],
+        logs=[boom],
+        infrastructure=["k8s: api 1/3 ready"],
+        marks={"dd": T0 - timedelta(minutes=30)},
+    )
+    state = FollowUpState(context, "Bad deploy.", T0)
+
+    assert state.since(["dd", "gh"]) == {
+        "dd": T0 - timedelta(minutes=31),
+        "gh": T0 - timedelta(minutes=1),
+    }
+
+    fresh = IncidentContext(
+        trigger={},
+        incidents=[Incident("P1", "Down", status="acknowledged", source="pd")],
+        deployments=[Deployment("7", "api", status="failure", timestamp=T0)],
+        logs=[boom, LogEvent("rollback started", "info", T0, "api")],
+        infrastructure=["k8s: api 1/3 ready"],
+        missing=["dd: timeout"],
+    )
+    delta = state.absorb(fresh)
+
+    assert [i.status for i in delta.incidents] == ["acknowledged"]
+    assert [d.status for d in delta.deployments] == ["failure"]
+    assert [e.message for e in delta.logs] == ["rollback started"]
+    assert delta.infrastructure == []
+    assert delta.missing == ["dd: timeout"]
+    assert [i.status for i in context.incidents] == ["acknowledged"]
+    assert [d.status for d in context.deployments] == ["failure"]
+    assert len(context.logs) == 2
+    assert not has_evidence(state.absorb(fresh))
+
+
+def test_high_water_mark_waits_for_deploys_in_progress():
+    """Tests that marks stay on unfinished deploys, else the newest record."""
+    done = Deployment("1", "api", status="success", timestamp=T0)
+    running = Deployment("2", "api", status="in_progress", timestamp=T0)
+    later = Deployment("3", "api", status="success", timestamp=T0 + timedelta(hours=1))
+
+    assert high_water_mark([done, later]) == later.timestamp
+    assert high_water_mark([running, later]) == running.timestamp
+    assert high_water_mark([LogEvent("no time")]) is None
+
+
+def test_tracker_evicts_least_recently_used():
+    """Tests that the tracker keeps a bounded number of incidents."""
+    tracker = FollowUpTracker(max_incidents=2)
+    for key in ("a", "b"):
+        tracker.put(key, FollowUpState(IncidentContext(trigger={}), key, T0))
+    tracker.get("a")
+    tracker.put("c", FollowUpState(IncidentContext(trigger={}), "c", T0))
+
+    assert len(tracker) == 2
+    assert tracker.get("b") is None
+    assert tracker.get("a").hypothesis == "a"
+
+
+def test_tracker_locks_serialize_and_do_not_outlive_their_users():
+    """Tests that one incident's callers take turns and leave no lock behind."""
+    tracker = FollowUpTracker(max_incidents=1)
+    inside, overlaps = [], []
+
+    def analyze():
+        with tracker.lock("a"):
+            inside.append(1)
+            overlaps.append(len(inside))
+            time.sleep(0.01)
+            inside.pop()
+            # Eviction must not hand a third caller a fresh lock.
+            tracker.put("b", FollowUpState(IncidentContext(trigger={}), "b", T0))
+
+    threads = [threading.Thread(target=analyze) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    with tracker.lock("c"):
+        tracker.discard("c")
+
+    assert overlaps == [1, 1, 1]
+    assert tracker._locks == {}
+
+
+@pytest.fixture
+def orchestrator():
+    config = AppConfig(
+        llm={"provider": "openai", "model": "gpt-4o", "api_key": "test-key"},
+        connections={
+            "dd": {"type": "datadog", "api_key": "dd-key", "app_key": "dd-app"}
+        },
+    )
+    orch = Orchestrator(config, [True])
+    orch.llm_provider = MagicMock()
+    return orch
+
+
+DD_URL = "https://api.datadoghq.com/api/v2/logs/events/search"
+TRIGGER = {"incident_id": "P1", "log_query": "service:api status:error"}
+
+
+def log(message, minutes_ago):
+    when = datetime.now(timezone.utc) - timedelta(minutes=minutes_ago)
+    return {
+        "attributes": {
+            "status": "error",
+            "message": message,
+            "timestamp": when.isoformat(),
+        }
+    }
+
+
+def test_incremental_analysis_sends_only_the_delta(requests_mock, orchestrator):
+    """Tests that follow-ups fetch a narrow window and send only new evidence."""
+    llm = orchestrator.llm_provider.generate_hypothesis
+    llm.side_effect = ["Redis is down.", "Redis recovered; errors now from DNS."]
+    redis, dns = log("redis timeout", 5), log("dns lookup failed", 0)
+    dd = requests_mock.post(
+        DD_URL,
+        [
+            {"json": {"data": [redis]}},
+            {"json": {"data": [dns, redis]}},
+            {"json": {"data": [redis]}},
+        ],
+    )
+
+    first = orchestrator.run_analysis(TRIGGER, incremental=True)
+    second = orchestrator.run_analysis(TRIGGER, incremental=True)
+    third = orchestrator.run_analysis(TRIGGER, incremental=True)
+
+    assert (first.follow_up, second.follow_up, third.follow_up) == (False, True, True)
+    windows = [json.loads(r.body)["filter"]["from"] for r in dd.request_history]
+    assert windows[1] > windows[0]
+    prompt, system_prompt = llm.call_args_list[1][0]
+    assert system_prompt == FOLLOW_UP_SYSTEM_PROMPT
+    assert prompt.startswith("## Previous hypothesis (")
+    assert "Redis is down." in prompt
+    assert "[ERROR] dns lookup failed" in prompt
+    assert "redis timeout" not in prompt
+    # Nothing new the third time, so the hypothesis stands without an LLM call.
+    assert llm.call_count == 2
+    assert third.hypothesis == "Redis recovered; errors now from DNS."
+
+
+def test_incremental_analysis_starts_over_after_a_failure(requests_mock, orchestrator):
+    """Tests that a failed follow-up does not leave half-updated state behind."""
+    llm = orchestrator.llm_provider.generate_hypothesis
+    llm.side_effect = ["Redis is down.", RuntimeError("LLM unavailable"), "Fresh."]
+    requests_mock.post(DD_URL, json={"data": [log("redis timeout", 1)]})
+
+    orchestrator.run_analysis(TRIGGER, incremental=True)
+    requests_mock.post(DD_URL, json={"data": [log("dns lookup failed", 0)]})
+    with pytest.raises(RuntimeError):
+        orchestrator.run_analysis(TRIGGER, incremental=True)
+    result = orchestrator.run_analysis(TRIGGER, incremental=True)
+
+    assert result.follow_up is False
+    assert llm.call_args[0][0].startswith("## Logs for")
+
+
+def test_incremental_analyses_are_not_recorded(orchestrator):
+    """Tests that follow-ups, which replay cannot rebuild, refuse to record."""
+    with pytest.raises(ValueError, match="cannot be recorded"):
+        orchestrator.run_analysis(TRIGGER, Recording(TRIGGER), incremental=True)
@@ -0,0 +1,93 @@
+import pytest
+
+from aira.connectors.records import Incident, LogEvent
+from aira.context import IncidentContext
+from aira.knowledge import KnowledgeStore, fingerprint
+from aira.render import render_context
+
+
+@pytest.fixture
+def store(tmp_path) -> KnowledgeStore:
+    store = KnowledgeStore(tmp_path / "knowledge.db")
+    yield store
+    store.close()
+
+
+def make_context(incident_id, title, service="checkout", logs=()) -> IncidentContext:
+    return IncidentContext(
+        trigger={"incident_id": incident_id},
+        incidents=[Incident(incident_id, title, source="pagerduty", service=service)],
+        logs=[LogEvent(message, status="error") for message in logs],
+    )
+
+
+def test_fingerprint_ignores_ids_and_numbers():
+    """Tests that recurrences of one problem share a fingerprint."""
+    first = Incident("P1", "Disk 91% full on db-7f3a9c21", service="db")
+    again = Incident("P2", "Disk 97% full on db-0bd4e512", service="db")
+    other = Incident("P3", "Disk 97% full on db-0bd4e512", service="search")
+
+    assert fingerprint(first) == fingerprint(again)
+    assert fingerprint(first) != fingerprint(other)
+
+
+def test_similar_returns_recurrences_then_text_matches(store):
+    """Tests that lookups rank recurrences first and exclude the incident itself."""
+    store.record(
+        make_context("P1", "Checkout latency above 2s on pod 1234"), "Slow DB pool."
+    )
+    store.record(
+        make_context("P2", "Payment errors", logs=["connection pool exhausted"]),
+        "Pool too small.",
+    )
+    store.record(make_context("P3", "Search index stale", service="search"), "Cron.")
+    store.resolve("P2", "Raised the pool size to 50.")
+
+    current = make_context(
+        "P9", "Checkout latency above 2s on pod 9876", logs=["pool exhausted"]
+    )
+    store.record(current, "In progress.")
+    similar = store.similar(current, limit=2)
+
+    assert [p.incident_id for p in similar] == ["P1", "P2"]
+    assert similar[0].recurrence is True
+    assert similar[1].resolution == "Raised the pool size to 50."
+    assert len(store) == 4
+
+
+def test_terms_first_seen_in_a_lookup_stay_searchable(store):
+    """Tests that a lookup before an incident is recorded does not hide it."""
+    first = make_context("P1", "Kafka consumer lag", service="orders")
+    assert store.similar(first) == []
+    store.record(first, "Slow consumer.")
+
+    similar = store.similar(make_context("P2", "Kafka consumer lag", service="billing"))
+
+    assert [p.incident_id for p in similar] == ["P1"]
+
+
+def test_record_updates_in_place_and_keeps_resolution(store):
+    """Tests that re-analyzing an incident reindexes it without losing its resolution."""
+    store.record(make_context("P1", "Queue backlog"), "First guess.")
+    store.resolve("P1", "Scaled consumers.")
+    store.record(make_context("P1", "Queue backlog growing"), "Second guess.")
+
+    similar = store.similar(make_context("P2", "backlog growing"), limit=5)
+
+    assert len(store) == 1
+    assert similar[0].hypothesis == "Second guess."
+    assert similar[0].resolution == "Scaled consumers."
+    assert store.resolve("unknown", "n/a") == 0
+
+
+def test_render_includes_similar_incidents(store):
+    """Tests that prior incidents are rendered into the prompt."""
+    store.record(make_context("P1", "Checkout down"), "Bad deploy of checkout.")
+    context = make_context("P2", "Checkout down")
+    context.similar = store.similar(context)
+
+    prompt = render_context(context)
+
+    assert "## Similar past incidents" in prompt
+    assert "Recurrence of *P1*: Checkout down" in prompt
+    assert "Hypothesis: Bad deploy of checkout." in prompt
@@ -0,0 +1,408 @@
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+from aira.config import AppConfig, GitHubDeploymentsConfig, KubernetesConfig
+from aira.circuit_breaker import CircuitState
+from aira.connectors.base import DeploymentProvider
+from aira.connectors.records import Deployment
+from aira.llm_interfaces import LLMError
+from aira.llm_interfaces.structured import Evidence, Hypothesis
+from aira.orchestrator import Orchestrator
+from aira.recording import Recording, Replayer
+
+
+@pytest.fixture
+def app_config() -> AppConfig:
+    """Provides a config with one alerting and one observability connector."""
+    return AppConfig(
+        llm={"provider": "openai", "model": "gpt-4o", "api_key": "test-key"},
+        connections={
+            "pd": {
+                "type": "pagerduty",
+                "api_key": "pd-key",
+                "from_email": "test@test.com",
+            },
+            "dd": {"type": "datadog", "api_key": "dd-key", "app_key": "dd-app"},
+        },
+        circuit_breaker={"failure_threshold": 2, "recovery_timeout_seconds": 60},
+    )
+
+
+@pytest.fixture
+def orchestrator(app_config) -> Orchestrator:
+    """Provides an Orchestrator whose LLM provider is mocked out."""
+    orch = Orchestrator(app_config, [True])
+    orch.llm_provider = MagicMock()
+    orch.llm_provider.generate_hypothesis.return_value = "Bad deploy."
+    return orch
+
+
+TRIGGER = {"incident_id": "P123", "log_query": "service:api status:error"}
+PD_URL = "https://api.pagerduty.com/incidents/P123"
+DD_URL = "https://api.datadoghq.com/api/v2/logs/events/search"
+
+
+def test_run_analysis_all_sources_healthy(requests_mock, orchestrator):
+    """Tests that context from every source reaches the LLM."""
+    requests_mock.get(PD_URL, json={"incident": {"id": "P123", "title": "Down"}})
+    requests_mock.post(
+        DD_URL, json={"data": [{"attributes": {"status": "error", "message": "boom"}}]}
+    )
+
+    result = orchestrator.run_analysis(TRIGGER)
+
+    assert result.hypothesis == "Bad deploy."
+    assert result.degraded is False
+    context = orchestrator.llm_provider.generate_hypothesis.call_args[0][0]
+    assert "[ERROR] boom" in context
+    assert "Missing context" not in context
+
+
+def test_run_analysis_open_circuit_skips_source(requests_mock, orchestrator):
+    """Tests that a failing source trips its breaker and is then skipped."""
+    requests_mock.get(PD_URL, json={"incident": {"id": "P123"}})
+    dd_mock = requests_mock.post(DD_URL, status_code=503)
+
+    orchestrator.run_analysis(TRIGGER)
+    orchestrator.run_analysis(TRIGGER)
+    assert orchestrator.breakers["dd"].state is CircuitState.OPEN
+    assert dd_mock.call_count == 2
+
+    result = orchestrator.run_analysis(TRIGGER)
+
+    assert dd_mock.call_count == 2  # The open circuit prevented a third call
+    assert result.degraded is True
+    assert "dd: skipped, circuit open" in result.missing_context[0]
+    assert "Degraded analysis" in result.hypothesis
+    context = orchestrator.llm_provider.generate_hypothesis.call_args[0][0]
+    assert "## Missing context" in context
+
+
+def test_connectors_receive_validated_models(orchestrator, app_config):
+    """Tests that connectors use the config models without revalidating them."""
+    assert (
+        orchestrator.connectors["pd"].validated_config is app_config.connections["pd"]
+    )
+
+
+def test_reload_rebuilds_only_changed_connectors(orchestrator, app_config):
+    """Tests that a reload keeps unchanged connectors and their breakers."""
+    pd, dd = orchestrator.connectors["pd"], orchestrator.connectors["dd"]
+    dd_breaker = orchestrator.breakers["dd"]
+    new_config = AppConfig(
+        llm=app_config.llm,
+        connections={
+            "pd": {
+                "type": "pagerduty",
+                "api_key": "pd-key",
+                "from_email": "new@test.com",
+            },
+            "dd": {"type": "datadog", "api_key": "dd-key", "app_key": "dd-app"},
+            "gh": {"type": "github", "token": "t", "default_repo": "org/repo"},
+        },
+        circuit_breaker=app_config.circuit_breaker,
+    )
+
+    changed = orchestrator.reload(new_config)
+
+    assert changed == ["gh", "pd"]
+    assert orchestrator.connectors["dd"] is dd
+    assert orchestrator.breakers["dd"] is dd_breaker
+    assert orchestrator.connectors["pd"] is not pd
+    assert orchestrator.connectors["gh"].validated_config.default_repo == "org/repo"
+
+
+def test_run_analysis_records_telemetry(requests_mock, app_config):
+    """Tests that stages, connector calls and bytes fetched are measured."""
+    app_config.telemetry.enabled = True
+    orch = Orchestrator(app_config, [True])
+    orch.llm_provider = MagicMock()
+    orch.llm_provider.generate_hypothesis.return_value = "Bad deploy."
+    orch.telemetry.reset()
+    requests_mock.get(PD_URL, json={"incident": {"id": "P123"}})
+    requests_mock.post(DD_URL, status_code=503)
+
+    try:
+        orch.run_analysis(TRIGGER)
+        telemetry = orch.telemetry
+        for stage in ("gather", "correlate", "render", "llm"):
+            assert (
+                telemetry.histogram_count("aira_stage_duration_seconds", stage=stage)
+                == 1
+            )
+        assert (
+            telemetry.histogram_count(
+                "aira_connector_call_duration_seconds",
+                connector="pd",
+                method="get_incident_details",
+            )
+            == 1
+        )
+        assert (
+            telemetry.counter_value("aira_connector_errors_total", connector="dd") == 1
+        )
+        assert (
+            telemetry.counter_value("aira_http_response_bytes_total", connector="pd")
+            > 0
+        )
+    finally:
+        orch.telemetry.enabled = False
+        orch.telemetry.reset()
+
+
+def test_replay_reproduces_recorded_analysis(requests_mock, orchestrator, tmp_path):
+    """Tests that a recorded analysis replays without network or LLM calls."""
+    requests_mock.get(PD_URL, json={"incident": {"id": "P123", "title": "Down"}})
+    requests_mock.post(DD_URL, status_code=503)
+    recording = Recording(TRIGGER)
+    live = orchestrator.run_analysis(TRIGGER, recording=recording)
+    recording.save(tmp_path / "P123.json.gz")
+    live_prompt = orchestrator.llm_provider.generate_hypothesis.call_args[0][0]
+    requests_mock.reset_mock()
+    orchestrator.llm_provider.reset_mock()
+
+    replayer = Replayer(Recording.load(tmp_path / "P123.json.gz"))
+    replayed = orchestrator.replay_analysis(replayer)
+
+    assert replayed == live
+    assert replayer.prompts == [live_prompt]
+    assert requests_mock.call_count == 0
+    orchestrator.llm_provider.generate_hypothesis.assert_not_called()
+
+
+def test_run_analysis_recalls_similar_incidents(requests_mock, app_config, tmp_path):
+    """Tests that earlier analyses are stored and offered to later ones."""
+    app_config.knowledge.path = tmp_path / "knowledge.db"
+    orch = Orchestrator(app_config, [True])
+    orch.llm_provider = MagicMock()
+    orch.llm_provider.generate_hypothesis.return_value = "Bad deploy."
+    requests_mock.get(PD_URL, json={"incident": {"id": "P123", "title": "API down"}})
+    requests_mock.get(
+        "https://api.pagerduty.com/incidents/P456",
+        json={"incident": {"id": "P456", "title": "API down"}},
+    )
+    requests_mock.post(DD_URL, json={"data": []})
+
+    orch.run_analysis(TRIGGER)
+    orch.run_analysis({**TRIGGER, "incident_id": "P456"})
+
+    first, second = [
+        call[0][0] for call in orch.llm_provider.generate_hypothesis.call_args_list
+    ]
+    assert "Similar past incidents" not in first
+    assert "Recurrence of *P123*" in second
+    assert len(orch.knowledge) == 2
+
+
+def test_failed_llm_analysis_is_not_remembered(requests_mock, app_config, tmp_path):
+    """Tests that an LLM failure is raised rather than stored as a finding."""
+    app_config.knowledge.path = tmp_path / "knowledge.db"
+    orch = Orchestrator(app_config, [True])
+    orch.llm_provider = MagicMock()
+    orch.llm_provider.generate_hypothesis.side_effect = LLMError("quota exceeded")
+    requests_mock.get(PD_URL, json={"incident": {"id": "P123", "title": "API down"}})
+    requests_mock.post(DD_URL, json={"data": []})
+
+    with pytest.raises(LLMError):
+        orch.run_analysis(TRIGGER, incremental=True)
+
+    assert len(orch.knowledge) == 0
+    assert len(orch.follow_ups) == 0
+
+
+def test_run_analysis_includes_relevant_runbooks(requests_mock, app_config, tmp_path):
+    """Tests that runbook excerpts matching the incident reach the LLM."""
+    from aira.runbooks import build_index
+
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "api.md").write_text("# API down\nRoll back the last API deploy.\n")
+    (docs / "db.md").write_text("# Disk full\nPrune old WAL segments.\n")
+    build_index(docs, tmp_path / "index")
+    app_config.runbooks.docs_dir = docs
+    app_config.runbooks.index_dir = tmp_path / "index"
+    orch = Orchestrator(app_config, [True])
+    orch.llm_provider = MagicMock()
+    orch.llm_provider.generate_hypothesis.return_value = "Bad deploy."
+    requests_mock.get(PD_URL, json={"incident": {"id": "P123", "title": "API down"}})
+    requests_mock.post(DD_URL, json={"data": []})
+
+    orch.run_analysis(TRIGGER)
+
+    prompt = orch.llm_provider.generate_hypothesis.call_args[0][0]
+    assert "## Relevant runbooks\n### api.md › API down" in prompt
+    assert "Roll back the last API deploy." in prompt
+
+
+def test_run_analysis_checks_incident_services_on_infrastructure(
+    requests_mock, app_config
+):
+    """Tests that infrastructure status is looked up for the incident's service."""
+    app_config.connections["k8s"] = KubernetesConfig(type="kubernetes")
+    orch = Orchestrator(app_config, [True])
+    orch.llm_provider = MagicMock()
+    orch.llm_provider.generate_hypothesis.return_value = "Bad deploy."
+    orch.connectors["k8s"].get_resource_status = MagicMock(
+        return_value="k8s: shop/checkout: 1/3 replicas ready"
+    )
+    requests_mock.get(
+        PD_URL,
+        json={
+            "incident": {
+                "id": "P123",
+                "title": "Down",
+                "service": {"summary": "checkout"},
+            }
+        },
+    )
+    requests_mock.post(DD_URL, json={"data": []})
+
+    result = orch.run_analysis(TRIGGER)
+
+    orch.connectors["k8s"].get_resource_status.assert_called_once_with("checkout")
+    prompt = orch.llm_provider.generate_hypothesis.call_args[0][0]
+    assert "## Infrastructure status\nk8s: shop/checkout: 1/3 replicas ready" in prompt
+    assert result.degraded is False
+
+
+def test_run_analysis_ranks_recent_deploys(requests_mock, app_config):
+    """Tests that deploys are gathered and correlated with the incident."""
+    app_config.connections["deploys"] = GitHubDeploymentsConfig(
+        type="github_deployments", token="gh-token", repos=["shop/checkout"]
+    )
+    orch = Orchestrator(app_config, [True])
+    orch.llm_provider = MagicMock()
+    orch.llm_provider.generate_hypothesis.return_value = "Bad deploy."
+    deploy = Deployment(
+        "42",
+        "checkout",
+        status="success",
+        environment="production",
+        timestamp=datetime(2026, 10, 19, 11, 55, tzinfo=timezone.utc),
+        ref="main",
+    )
+    orch.connectors["deploys"].fetch_recent_deployments = MagicMock(
+        return_value=[deploy]
+    )
+    requests_mock.get(
+        PD_URL,
+        json={
+            "incident": {
+                "id": "P123",
+                "title": "Down",
+                "created_at": "2026-10-19T12:00:00Z",
+                "service": {"summary": "checkout"},
+            }
+        },
+    )
+    requests_mock.post(DD_URL, json={"data": []})
+
+    orch.run_analysis(TRIGGER)
+
+    orch.connectors["deploys"].fetch_recent_deployments.assert_called_once_with(
+        3, ["checkout"]
+    )
+    prompt = orch.llm_provider.generate_hypothesis.call_args[0][0]
+    assert "1. Deploy `42` of *checkout* (success)" in prompt
+    assert "## Recent deployments\n0 other deploy(s)" in prompt
+
+
+def test_run_analysis_returns_structured_hypothesis(
+    requests_mock, app_config, tmp_path
+):
+    """Tests that structured output reaches the result and the field callback."""
+    app_config.llm.structured_output = True
+    orch = Orchestrator(app_config, [True])
+    orch.llm_provider = MagicMock()
+    structured = Hypothesis("Bad deploy.", "high", (Evidence("deploy 42"),))
+    orch.llm_provider.generate_structured.return_value = structured
+    requests_mock.get(PD_URL, json={"incident": {"id": "P123", "title": "Down"}})
+    requests_mock.post(DD_URL, status_code=500)
+    on_field = MagicMock()
+
+    recording = Recording(TRIGGER)
+
+    result = orch.run_analysis(TRIGGER, recording, on_field=on_field)
+
+    orch.llm_provider.generate_hypothesis.assert_not_called()
+    assert orch.llm_provider.generate_structured.call_args[0][2] is on_field
+    assert result.structured == structured
+    assert result.hypothesis.startswith(structured.to_markdown() + "\n\n⚠️ Degraded")
+    recording.save(tmp_path / "P123.json.gz")
+    replayer = Replayer(Recording.load(tmp_path / "P123.json.gz"))
+    assert orch.replay_analysis(replayer) == result
+
+
+def test_each_observability_connection_runs_its_own_query(requests_mock, app_config):
+    """Tests that `log_queries` overrides the shared query per connection."""
+    connections = {
+        **app_config.model_dump()["connections"],
+        "loki": {"type": "loki", "url": "http://loki:3100"},
+    }
+    config = AppConfig(**{**app_config.model_dump(), "connections": connections})
+    orch = Orchestrator(config, [True])
+    orch.llm_provider = MagicMock()
+    orch.llm_provider.generate_hypothesis.return_value = "Bad deploy."
+    requests_mock.get(PD_URL, json={"incident": {"id": "P123", "title": "Down"}})
+    dd = requests_mock.post(DD_URL, json={"data": []})
+    loki_lines = requests_mock.get(
+        "http://loki:3100/loki/api/v1/query_range",
+        json={"status": "success", "data": {"resultType": "streams", "result": []}},
+    )
+    requests_mock.get(
+        "http://loki:3100/loki/api/v1/query",
+        json={"status": "success", "data": {"resultType": "vector", "result": []}},
+    )
+    logql = '{app="api"} |= "error"'
+
+    orch.run_analysis({**TRIGGER, "log_queries": {"loki": logql}})
+
+    assert dd.last_request.json()["filter"]["query"] == TRIGGER["log_query"]
+    assert loki_lines.last_request.qs["query"] == [logql.lower()]
+    context = orch.llm_provider.generate_hypothesis.call_args[0][0]
+    assert f"## Logs for '{TRIGGER['log_query']}', '{logql}'" in context
+
+
+def test_deployment_providers_that_cannot_list_are_not_asked(
+    requests_mock, orchestrator
+):
+    """Tests that the default fetch_recent_deployments neither runs nor trips."""
+
+    class JobStatus(DeploymentProvider):
+        def test_connection(self):
+            return True, "ok"
+
+        def get_deployment_status(self, deployment_id):
+            return "running"
+
+    jobs = JobStatus("jobs", {"type": "jobs"})
+    orchestrator.connectors["jobs"] = jobs
+    orchestrator.breakers["jobs"] = orchestrator._new_breaker("jobs")
+    requests_mock.get(PD_URL, json={"incident": {"id": "P123", "title": "Down"}})
+    requests_mock.post(DD_URL, json={"data": []})
+
+    result = orchestrator.run_analysis(TRIGGER)
+
+    assert result.degraded is False
+    for _ in range(3):
+        assert orchestrator._call_connector("jobs", "fetch_recent_deployments", 3)[1]
+    assert orchestrator.breakers["jobs"].state == CircuitState.CLOSED
+
+
+def test_reload_closes_replaced_and_removed_connectors(orchestrator, app_config):
+    """Tests that connectors dropped by a reload release their resources."""
+    pd, dd = orchestrator.connectors["pd"], orchestrator.connectors["dd"]
+    pd.close, dd.close = MagicMock(), MagicMock(side_effect=RuntimeError("busy"))
+    new_config = AppConfig(
+        llm=app_config.llm,
+        connections={
+            "pd": {"type": "pagerduty", "api_key": "new", "from_email": "a@b.c"},
+        },
+        circuit_breaker=app_config.circuit_breaker,
+    )
+
+    assert orchestrator.reload(new_config) == ["dd", "pd"]
+    pd.close.assert_called_once_with()
+    dd.close.assert_called_once_with()
+    assert orchestrator.connectors["pd"] is not pd
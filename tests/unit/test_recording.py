@@ -0,0 +1,76 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from aira.connectors.records import Commit, LogEvent
+from aira.llm_interfaces.tools import ChatTurn, ToolCall
+from aira.recording import Recording, Replayer
+
+TS = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def test_recording_round_trips_records_through_archive(tmp_path):
+    """Tests that records, datetimes and reasons survive save and load."""
+    recording = Recording({"incident_id": "P1"})
+    commits = [Commit(sha="abc", author="dev", message="fix", timestamp=TS)]
+    recording.record_call("gh", "fetch_recent_commits", ("org/repo", 3), commits, None)
+    recording.record_call("dd", "fetch_logs", ("q", 15), None, "dd: 503")
+    recording.record_llm("system", "prompt", "Bad deploy.")
+
+    path = tmp_path / "P1.json.gz"
+    recording.save(path)
+    replayer = Replayer(Recording.load(path))
+
+    assert replayer.replay_call("gh", "fetch_recent_commits", ("org/repo", 3)) == (
+        commits,
+        None,
+    )
+    assert replayer.replay_call("dd", "fetch_logs", ("q", 15)) == (None, "dd: 503")
+    assert replayer.replay_llm("new prompt") == "Bad deploy."
+    assert replayer.prompts == ["new prompt"]
+
+
+def test_save_is_deterministic(tmp_path):
+    """Tests that saving the same recording twice produces identical bytes."""
+    recording = Recording({"incident_id": "P1"})
+    recording.record_call("dd", "fetch_logs", ("q", 15), [LogEvent("boom")], None)
+
+    recording.save(tmp_path / "a.json.gz")
+    recording.save(tmp_path / "b.json.gz")
+
+    assert (tmp_path / "a.json.gz").read_bytes() == (
+        tmp_path / "b.json.gz"
+    ).read_bytes()
+
+
+def test_replay_reports_unrecorded_calls():
+    """Tests that calls missing from the recording become missing context."""
+    replayer = Replayer(Recording({}))
+
+    assert replayer.replay_call("gh", "fetch_recent_commits", ("org/repo", 3)) == (
+        None,
+        "gh: no recorded response for fetch_recent_commits",
+    )
+    with pytest.raises(LookupError):
+        replayer.replay_llm("prompt")
+
+
+def test_chat_turns_round_trip_through_archive(tmp_path):
+    """Tests that agent turns, including timed-out ones, replay in order."""
+    recording = Recording({"incident_id": "P1"})
+    call = ToolCall("c1", "fetch_logs", '{"connection": "dd", "query": "q"}')
+    recording.record_turn(ChatTurn("", (call,), tokens=12))
+    recording.record_turn(None)
+    recording.record_turn(ChatTurn("Bad deploy.", tokens=3))
+
+    recording.save(tmp_path / "P1.json.gz")
+    loaded = Recording.load(tmp_path / "P1.json.gz")
+    replayer = Replayer(loaded)
+
+    assert loaded.agentic
+    assert replayer.replay_turn() == ChatTurn("", (call,), tokens=12)
+    with pytest.raises(TimeoutError):
+        replayer.replay_turn()
+    assert replayer.replay_turn() == ChatTurn("Bad deploy.", tokens=3)
+    with pytest.raises(LookupError):
+        replayer.replay_turn()
@@ -0,0 +1,115 @@
+import sys
+import types
+from importlib.metadata import EntryPoint
+from typing import Tuple
+
+import pytest
+from pydantic import ValidationError
+
+import aira.registry
+from aira.config import AppConfig, ConnectorConfig
+from aira.connectors import CONNECTOR_REGISTRY, get_connector
+from aira.connectors.base import CollaborationProvider, ObservabilityProvider
+from aira.registry import LazyRegistry, import_string
+
+LLM = {"provider": "openai", "model": "gpt-4o", "api_key": "test-key"}
+
+
+class InfluxConfig(ConnectorConfig):
+    url: str
+
+
+class InfluxConnector(ObservabilityProvider):
+    config_model = InfluxConfig
+
+    def test_connection(self) -> Tuple[bool, str]:
+        return True, "ok"
+
+    def fetch_logs(self, query, time_window_minutes):
+        return []
+
+
+class PagerConnector(CollaborationProvider):
+    config_model = InfluxConfig
+
+    def test_connection(self) -> Tuple[bool, str]:
+        return True, "ok"
+
+    def post_message(self, blocks):
+        pass
+
+
+@pytest.fixture
+def plugin_entry_points(monkeypatch):
+    """Installs a fake plugin module and advertises it via entry points."""
+    module = types.ModuleType("fake_aira_plugin")
+    module.InfluxConnector = InfluxConnector
+    module.PagerConnector = PagerConnector
+    monkeypatch.setitem(sys.modules, "fake_aira_plugin", module)
+
+    advertised = [
+        EntryPoint("influxdb", "fake_aira_plugin:InfluxConnector", "aira.connectors"),
+        EntryPoint("pager", "fake_aira_plugin:PagerConnector", "aira.connectors"),
+        EntryPoint("github", "fake_aira_plugin:InfluxConnector", "aira.connectors"),
+    ]
+    monkeypatch.setattr(
+        aira.registry,
+        "entry_points",
+        lambda group: [ep for ep in advertised if ep.group == group],
+    )
+    monkeypatch.setattr(
+        CONNECTOR_REGISTRY, "_entries", dict(CONNECTOR_REGISTRY._entries)
+    )
+    monkeypatch.setattr(CONNECTOR_REGISTRY, "_discovered", False)
+
+
+def test_import_string_rejects_bad_paths():
+    """Tests that malformed or unknown import paths raise ImportError."""
+    assert import_string("aira.registry:LazyRegistry") is LazyRegistry
+    with pytest.raises(ImportError):
+        import_string("aira.registry")
+    with pytest.raises(ImportError):
+        import_string("aira.registry:Missing")
+
+
+def test_registry_builtins_take_precedence(plugin_entry_points):
+    """Tests that a plugin cannot shadow a built-in connector type."""
+    assert CONNECTOR_REGISTRY.get("github").__name__ == "GitHubConnector"
+    assert CONNECTOR_REGISTRY.get("influxdb") is InfluxConnector
+    assert "influxdb" in CONNECTOR_REGISTRY.names()
+    assert CONNECTOR_REGISTRY.get("nope") is None
+
+
+def test_plugin_config_validated_by_plugin_model(plugin_entry_points):
+    """Tests that a plugin connection is validated by its own config model."""
+    config = AppConfig(
+        llm=LLM,
+        connections={"influx": {"type": "influxdb", "url": "http://influx:8086"}},
+    )
+    assert isinstance(config.connections["influx"], InfluxConfig)
+    assert config.model_dump()["connections"]["influx"]["url"] == "http://influx:8086"
+
+    connector = get_connector("influx", config.connections["influx"])
+    assert isinstance(connector, InfluxConnector)
+
+
+def test_plugin_config_validation_failure(plugin_entry_points):
+    """Tests that the plugin's required fields are enforced."""
+    with pytest.raises(ValidationError, match="url"):
+        AppConfig(llm=LLM, connections={"influx": {"type": "influxdb"}})
+
+
+def test_plugin_category_is_enforced(plugin_entry_points):
+    """Tests that a collaboration plugin cannot be used as a connection."""
+    with pytest.raises(ValidationError, match="cannot be configured under"):
+        AppConfig(llm=LLM, connections={"p": {"type": "pager", "url": "x"}})
+    config = AppConfig(
+        llm=LLM, connections={}, actions={"p": {"type": "pager", "url": "x"}}
+    )
+    assert isinstance(config.actions["p"], InfluxConfig)
+
+
+def test_unknown_connector_type(plugin_entry_points):
+    """Tests that an unknown type lists the available connectors."""
+    with pytest.raises(ValidationError, match="Unknown connector type 'splunk'"):
+        AppConfig(llm=LLM, connections={"s": {"type": "splunk"}})
@@ -0,0 +1,73 @@
+from datetime import datetime, timezone
+
+from aira.connectors.records import Commit, Incident, LogEvent, parse_timestamp
+from aira.context import IncidentContext
+from aira.correlation import Suspect
+from aira.render import render_commits, render_context, render_logs
+
+
+def test_parse_timestamp_variants():
+    """Tests the ISO 8601 variants returned by the provider APIs."""
+    expected = datetime(2024, 5, 1, 10, 0, tzinfo=timezone.utc)
+    assert parse_timestamp("2024-05-01T10:00:00Z") == expected
+    assert parse_timestamp("2024-05-01T10:00:00.000+0000") == expected
+    assert parse_timestamp("not-a-date") is None
+    assert parse_timestamp(None) is None
+
+
+def test_render_commits():
+    """Tests the commit bullet format used in prompts."""
+    commits = [
+        Commit(sha="a1b2c3d4e5f6", author="Test User", message="feat: x\n\nbody")
+    ]
+    assert render_commits(commits, "org/repo", 3) == (
+        "- Commit `a1b2c3d` by *Test User*: feat: x"
+    )
+    assert "No new commits found in repository 'org/repo'" in render_commits(
+        [], "org/repo", 3
+    )
+
+
+def test_render_logs():
+    """Tests the log bullet format used in prompts."""
+    events = [LogEvent(message="Service unavailable", status="error")]
+    assert render_logs(events, "service:api", 15) == "- [ERROR] Service unavailable"
+    assert "No logs found" in render_logs([], "service:api", 15)
+
+
+def test_render_context_sections():
+    """Tests that only checked sources and missing context are rendered."""
+    context = IncidentContext(
+        trigger={"log_query": "service:api"},
+        incidents=[
+            Incident(id="P1", title="API down", source="pd", status="triggered")
+        ],
+        repos_checked=["org/repo"],
+        missing=["dd: circuit open"],
+    )
+    rendered = render_context(context)
+    assert "## Incident P1 (pd)" in rendered
+    assert "status: triggered" in rendered
+    assert "## Recent commits in org/repo\nNo new commits found" in rendered
+    assert "## Logs for" not in rendered  # Logs were never fetched
+    assert "## Missing context\n- dd: circuit open" in rendered
+
+
+def test_render_context_with_suspects_omits_uncorrelated_commits():
+    """Tests that ranked suspects replace the full commit list in the prompt."""
+    suspect = Commit(sha="a" * 40, author="A", message="bad change", repo="org/repo")
+    other = Commit(sha="b" * 40, author="B", message="docs", repo="org/repo")
+    context = IncidentContext(
+        trigger={},
+        commits=[suspect, other],
+        repos_checked=["org/repo"],
+        suspects=[Suspect(cause=suspect, score=1.5, evidence=["alert 3m after x"])],
+    )
+    rendered = render_context(context)
+    assert (
+        "## Ranked suspects\n1. Commit `aaaaaaa` by *A*: bad change (score 1.50)"
+        in rendered
+    )
+    assert "   - alert 3m after x" in rendered
+    assert "docs" not in rendered
+    assert "1 other commit(s) not correlated" in rendered
@@ -0,0 +1,148 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from typer.testing import CliRunner
+
+from aira.cli import app
+from aira.runbooks import RunbookIndex, build_index, chunk_markdown, embed
+
+REDIS = """# Redis failover
+
+When the redis master crashes, checkout requests time out.
+
+## Steps
+
+1. Promote the replica with `redis-cli failover`.
+2. Restart the checkout pods.
+"""
+
+KAFKA = """# Kafka consumer lag
+
+Scale the consumer group when lag on the orders topic grows.
+"""
+
+
+@pytest.fixture
+def docs(tmp_path):
+    docs = tmp_path / "docs"
+    (docs / "data").mkdir(parents=True)
+    (docs / "data" / "redis.md").write_text(REDIS)
+    (docs / "kafka.md").write_text(KAFKA)
+    (docs / "notes.txt").write_text("not markdown")
+    return docs
+
+
+def test_chunk_markdown_scopes_chunks_to_headings():
+    """Tests that chunks carry their heading path and code fences stay intact."""
+    text = (
+        "# DB\nintro\n\n## Failover\nstep\n\n```\n# not a heading\n```\n# Cache\nflush"
+    )
+
+    assert chunk_markdown(text) == [
+        ("DB", "intro"),
+        ("DB › Failover", "step\n\n```\n# not a heading\n```"),
+        ("Cache", "flush"),
+    ]
+    assert [len(body) for _, body in chunk_markdown("x" * 250, max_chars=100)] == [
+        100,
+        100,
+        50,
+    ]
+
+
+def test_embed_is_deterministic_and_normalised():
+    """Tests that embeddings are stable and unit length."""
+    vector = embed("redis master crashed")
+
+    assert vector == embed("Redis master crashed")
+    assert sum(v * v for v in vector.values()) == pytest.approx(1.0)
+    assert embed("") == {}
+
+
+def test_search_ranks_relevant_chunks_within_budget(docs, tmp_path):
+    """Tests that retrieval returns the closest chunks that fit the token budget."""
+    build_index(docs, tmp_path / "index")
+    index = RunbookIndex(tmp_path / "index")
+
+    results = index.search("checkout timeouts after redis master crash", k=2)
+
+    assert len(index) == 3
+    assert results[0].path == "data/redis.md"
+    assert all(r.path != "kafka.md" for r in results)
+    assert index.search("checkout redis crash", k=2, max_tokens=20)[0].tokens <= 20
+    assert index.search("checkout redis crash", k=2, max_tokens=1) == []
+    index.close()
+
+
+def test_concurrent_searches_read_their_own_chunks(docs, tmp_path):
+    """Tests that searches from many threads never interleave chunk reads."""
+    build_index(docs, tmp_path / "index")
+    index = RunbookIndex(tmp_path / "index")
+    queries = {"redis master crash": "data/redis.md", "kafka lag": "kafka.md"}
+
+    def search(n):
+        query = list(queries)[n % 2]
+        return [index.search(query, k=1)[0].path == queries[query] for _ in range(50)]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = [ok for batch in pool.map(search, range(16)) for ok in batch]
+
+    assert all(results) and len(results) == 800
+    index.close()
+
+
+def test_rebuild_only_reembeds_changed_files(docs, tmp_path):
+    """Tests that unchanged files keep their vectors across rebuilds."""
+    first = build_index(docs, tmp_path / "index")
+    (docs / "kafka.md").write_text(KAFKA + "\nAlso check the broker disk usage.\n")
+    (docs / "data" / "redis.md").unlink()
+    (docs / "dns.md").write_text("# DNS\nFlush the resolver cache.\n")
+
+    second = build_index(docs, tmp_path / "index")
+    index = RunbookIndex(tmp_path / "index")
+
+    assert (first.added, first.chunks) == (2, 3)
+    assert (second.added, second.updated, second.removed, second.unchanged) == (
+        1,
+        1,
+        1,
+        0,
+    )
+    assert index.search("resolver cache", k=1)[0].path == "dns.md"
+    assert index.search("broker disk", k=1)[0].path == "kafka.md"
+    index.close()
+
+    third = build_index(docs, tmp_path / "index")
+    index = RunbookIndex(tmp_path / "index")
+    assert third.unchanged == 2
+    assert index.search("resolver cache", k=1)[0].path == "dns.md"
+    index.close()
+
+
+def test_rebuild_switches_builds_without_disturbing_open_readers(docs, tmp_path):
+    """Tests that a reader keeps its build and old builds are cleaned up."""
+    build_index(docs, tmp_path / "index")
+    reader = RunbookIndex(tmp_path / "index")
+    (docs / "kafka.md").unlink()
+    build_index(docs, tmp_path / "index")
+    build_index(docs, tmp_path / "index")
+
+    assert len(reader) == 3
+    assert reader.search("kafka lag", k=1)[0].path == "kafka.md"
+    reader.close()
+    fresh = RunbookIndex(tmp_path / "index")
+    assert len(fresh) == 2
+    fresh.close()
+    builds = sorted(p.name for p in (tmp_path / "index").glob("build-*"))
+    assert builds == ["build-2", "build-3"]
+
+
+def test_index_command_builds_index(docs, tmp_path):
+    """Tests that 'aira index' reports what it indexed."""
+    result = CliRunner().invoke(
+        app, ["index", str(docs), "--index-dir", str(tmp_path / "index")]
+    )
+
+    assert result.exit_code == 0
+    assert "Indexed 3 chunks" in result.output
+    assert (tmp_path / "index" / "CURRENT").read_text() == "build-1"
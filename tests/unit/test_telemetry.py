@@ -0,0 +1,82 @@
+import re
+from pathlib import Path
+
+import aira
+from aira.telemetry import METRICS, Telemetry
+
+
+def test_disabled_telemetry_records_nothing():
+    """Tests the no-op fast path."""
+    telemetry = Telemetry(enabled=False)
+    telemetry.increment("aira_retries_total", component="x")
+    with telemetry.span("gather"):
+        pass
+    assert telemetry.counter_value("aira_retries_total", component="x") == 0
+    assert telemetry.render_prometheus() == "\n"
+
+
+def test_counters_and_histograms_render_as_prometheus():
+    """Tests the Prometheus text exposition format."""
+    telemetry = Telemetry(enabled=True, buckets=(0.1, 1))
+    telemetry.increment("aira_http_response_bytes_total", 512, connector="gh")
+    telemetry.increment("aira_http_response_bytes_total", 512, connector="gh")
+    telemetry.observe("aira_stage_duration_seconds", 0.05, stage="gather")
+    telemetry.observe("aira_stage_duration_seconds", 0.5, stage="gather")
+    telemetry.observe("aira_stage_duration_seconds", 5, stage="gather")
+
+    text = telemetry.render_prometheus()
+
+    assert "# TYPE aira_http_response_bytes_total counter" in text
+    assert 'aira_http_response_bytes_total{connector="gh"} 1024' in text
+    assert 'aira_stage_duration_seconds_bucket{stage="gather",le="0.1"} 1' in text
+    assert 'aira_stage_duration_seconds_bucket{stage="gather",le="1"} 2' in text
+    assert 'aira_stage_duration_seconds_bucket{stage="gather",le="+Inf"} 3' in text
+    assert 'aira_stage_duration_seconds_count{stage="gather"} 3' in text
+
+
+def test_span_times_a_stage():
+    """Tests that spans land in the stage histogram."""
+    telemetry = Telemetry(enabled=True)
+    with telemetry.span("llm"):
+        pass
+    assert telemetry.histogram_count("aira_stage_duration_seconds", stage="llm") == 1
+
+
+def test_label_values_are_escaped():
+    """Tests that quotes in label values cannot break the exposition format."""
+    telemetry = Telemetry(enabled=True)
+    telemetry.increment("aira_retries_total", component='say "hi"')
+    assert 'component="say \\"hi\\""' in telemetry.render_prometheus()
+
+
+def test_write_prometheus_textfile(tmp_path: Path):
+    """Tests the atomic textfile export."""
+    telemetry = Telemetry(enabled=True)
+    telemetry.increment("aira_retries_total", component="gh")
+    target = tmp_path / "metrics" / "aira.prom"
+    telemetry.write_prometheus_textfile(target)
+    assert 'aira_retries_total{component="gh"} 1' in target.read_text()
+
+
+def test_quantile_interpolates_within_buckets():
+    """Tests histogram quantile estimation."""
+    telemetry = Telemetry(enabled=True, buckets=(1, 2, 4))
+    for value in (0.5, 1.5, 1.5, 3):
+        telemetry.observe("aira_stage_duration_seconds", value, stage="llm")
+    assert telemetry.quantile("aira_stage_duration_seconds", 0.5, stage="llm") == 1.5
+    assert telemetry.quantile("aira_stage_duration_seconds", 1.0, stage="llm") == 4
+    assert telemetry.quantile("aira_stage_duration_seconds", 0.5, stage="none") == 0.0
+
+
+def test_every_recorded_metric_is_registered():
+    """Tests that no metric is exported untyped, with its name as help text."""
+    recorded = {
+        name
+        for path in Path(aira.__file__).parent.rglob("*.py")
+        for name in re.findall(
+            r'(?:increment|observe)\(\s*"(aira_\w+)"', path.read_text()
+        )
+    }
+
+    assert "aira_agent_steps_total" in recorded
+    assert recorded - METRICS.keys() == set()